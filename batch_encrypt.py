@@ -0,0 +1,566 @@
+"""
+ChaosPolybius-2026 - Klasör Toplu Şifreleme/Deşifreleme Aracı
+
+Bir klasördeki (veya glob desenine uyan) tüm görüntüleri işlem havuzu ile
+şifreler/deşifreler:
+- Çıktılar atomik yazılır (geçici dosya + os.replace)
+- İlerleme manifest dosyasına kaydedilir; yarıda kalan iş kaldığı yerden devam eder
+- Sonunda dosya/s ve MB/s verimi raporlanır
+- Şifreli çıktılar PNG yerine kap dosyası (.cpb, bkz. cipher_container.py)
+  olarak yazılabilir; deşifrelemede .cpb girdiler bellek eşlemeli okunur
+
+Kullanım:
+    python batch_encrypt.py encrypt girdiler/ sifreli/ --workers 8
+    python batch_encrypt.py encrypt girdiler/ sifreli/ --pipeline --readers 4 --writers 4
+    python batch_encrypt.py encrypt girdiler/ sifreli/ --format container
+    python batch_encrypt.py decrypt sifreli/ cozulmus/ --key 0.5 0.3 3.99 0.2 0.3 0.4 0.1
+"""
+
+import argparse
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from multiprocessing import get_context
+
+import cv2
+import numpy as np
+from cipher_container import CONTAINER_EXTENSION, check_container, read_container, write_container
+from encryption import encrypt_image_from_array, decrypt_image
+from key_schedule import USE_NUMBA, image_depth, key_fingerprint, warm_up_kernels
+
+if USE_NUMBA:
+    from fast_numba import set_kernel_threads
+
+
+DEFAULT_KEY = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.pgm')
+INPUT_EXTENSIONS = IMAGE_EXTENSIONS + (CONTAINER_EXTENSION,)
+OUTPUT_FORMATS = ('png', 'container')
+MANIFEST_NAME = '.chaospolybius_manifest.jsonl'
+
+# İşçi süreç durumu (Pool initializer ile bir kez ayarlanır)
+_worker_config = {}
+
+
+def collect_inputs(source):
+    """
+    Girdi klasöründeki (özyinelemeli) veya glob desenine uyan görüntüleri bul
+
+    Args:
+    source : str - Klasör yolu veya glob deseni (ör. 'data/**/*.png')
+
+    Returns:
+    tuple: (kök klasör, sıralı göreli yollar listesi)
+    """
+    if os.path.isdir(source):
+        root = source
+        paths = []
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if name.lower().endswith(INPUT_EXTENSIONS):
+                    paths.append(os.path.join(dirpath, name))
+    else:
+        paths = [p for p in glob.glob(source, recursive=True)
+                 if os.path.isfile(p) and p.lower().endswith(INPUT_EXTENSIONS)]
+        if not paths:
+            return source, []
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+        paths = [os.path.abspath(p) for p in paths]
+
+    return root, sorted(os.path.relpath(p, root) for p in paths)
+
+
+def is_within(path, root):
+    """path, root klasörünün içinde mi (veya root'un kendisi mi)"""
+    path, root = os.path.realpath(path), os.path.realpath(root)
+    return os.path.commonpath([path, root]) == root
+
+
+def output_path_for(rel_path, fmt='png'):
+    """Çıktı kayıpsız olmalı: uzantı .png (veya kap biçiminde .cpb)"""
+    return os.path.splitext(rel_path)[0] + ('.png' if fmt == 'png' else CONTAINER_EXTENSION)
+
+
+def check_output_collisions(rel_paths, fmt='png'):
+    """
+    Aynı çıktı dosyasına yazılacak girdileri reddet (ör. a.png ve a.jpg -> a.png)
+
+    Args:
+    rel_paths : list - Göreli girdi yolları
+    fmt : str - Çıktı biçimi
+
+    Raises:
+    ValueError: Çıktı adı çakışan girdiler varsa (işlem başlamadan)
+    """
+    targets = {}
+    for rel_path in rel_paths:
+        target = os.path.normcase(output_path_for(rel_path, fmt))
+        targets.setdefault(target, []).append(rel_path)
+    collisions = [sources for sources in targets.values() if len(sources) > 1]
+    if collisions:
+        listed = '; '.join(', '.join(sources) for sources in collisions[:5])
+        raise ValueError(f"{len(collisions)} çıktı dosyası birden çok girdiden yazılacak "
+                         f"(aynı ad, farklı uzantı): {listed}")
+
+
+def atomic_write_png(path, image):
+    """
+    Görüntüyü PNG olarak atomik yaz (yarım dosya asla görünmez)
+
+    Geçici dosya adı süreç ve iş parçacığına özgüdür: aynı süreçteki
+    yazıcı iş parçacıkları birbirinin geçici dosyasını taşımaz.
+
+    Args:
+    path : str - Hedef dosya
+    image : numpy.ndarray - Yazılacak görüntü
+
+    Returns:
+    int: Yazılan byte sayısı
+    """
+    ok, buffer = cv2.imencode('.png', image)
+    if not ok:
+        raise IOError(f"PNG kodlanamadı: {path}")
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    return len(buffer)
+
+
+def write_output(path, result, fmt='png', base_key=None, options=None):
+    """
+    Sonucu PNG veya kap dosyası (.cpb) olarak atomik yaz
+
+    Args:
+    path : str - Hedef dosya
+    result : numpy.ndarray - Yazılacak görüntü
+    fmt : str - 'png' veya 'container'
+    base_key : list - Kap başlığındaki anahtar parmak izi için
+    options : dict - Kap başlığına yazılan şifreleme seçenekleri
+
+    Returns:
+    int: Yazılan byte sayısı
+    """
+    if fmt == 'container':
+        return write_container(path, result, base_key=base_key, **(options or {}))
+    return atomic_write_png(path, result)
+
+
+def _init_worker(mode, base_key, options, input_root, output_root, fmt='png'):
+    """İşçi süreç başlangıcı: ortak ayarları bir kez al"""
+    # Her süreç tek dosya işler: paralel çekirdekler de tüm CPU'ları kullanırsa
+    # süreç × iş parçacığı aşırı aboneliği oluşur
+    if USE_NUMBA:
+        set_kernel_threads(1)
+
+    _worker_config.update(mode=mode, base_key=base_key, options=options,
+                          input_root=input_root, output_root=output_root, fmt=fmt)
+
+
+def _read_image(src, color=False, base_key=None, options=None):
+    """
+    Aşama 1: Dosyayı oku ve çöz (gri seviye veya renkli BGR/BGRA; 8/16-bit derinlik korunur)
+
+    Kap dosyaları (.cpb) kopyasız np.memmap olarak açılır; başlıktaki anahtar
+    parmak izi ve seçenekler base_key / options ile karşılaştırılır.
+
+    Returns:
+    tuple: (görüntü, dosya boyutu byte)
+    """
+    if src.lower().endswith(CONTAINER_EXTENSION):
+        img, header = read_container(src)
+        if header['stack']:
+            raise ValueError(f"Kap dosyası kare yığını içeriyor: {src}")
+        check_container(header, base_key, **(options or {}))
+        return img, os.path.getsize(src)
+
+    with open(src, 'rb') as f:
+        data = f.read()
+    read_flag = cv2.IMREAD_UNCHANGED if color else cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), read_flag)
+    if img is None:
+        raise IOError(f"Görüntü okunamadı: {src}")
+    image_depth(img)
+    return img, len(data)
+
+
+def _transform(mode, img, base_key, options):
+    """Aşama 2: Şifrele veya deşifrele"""
+    if mode == 'encrypt':
+        return encrypt_image_from_array(img, base_key, **options)
+    return decrypt_image(img, base_key, None, **options)
+
+
+def _error_record(rel_path, exc, fmt='png'):
+    """Hata kaydı (manifest'te 'ok' olmadığı için sonraki çalıştırmada tekrar denenir)"""
+    return {'input': rel_path, 'output': output_path_for(rel_path, fmt), 'status': 'error',
+            'error': f"{type(exc).__name__}: {exc}"}
+
+
+def _process_file(rel_path):
+    """
+    Tek dosyayı şifrele/deşifrele (işçi süreçte çalışır)
+
+    Returns:
+    dict: Manifest kaydı
+    """
+    cfg = _worker_config
+    fmt = cfg.get('fmt', 'png')
+    out_rel = output_path_for(rel_path, fmt)
+
+    try:
+        img, bytes_in = _read_image(os.path.join(cfg['input_root'], rel_path),
+                                    color='color_mode' in cfg['options'],
+                                    base_key=cfg['base_key'], options=cfg['options'])
+        result = _transform(cfg['mode'], img, cfg['base_key'], cfg['options'])
+        bytes_out = write_output(os.path.join(cfg['output_root'], out_rel), result, fmt,
+                                 cfg['base_key'], cfg['options'])
+    except Exception as exc:
+        return _error_record(rel_path, exc, fmt)
+
+    return {'input': rel_path, 'output': out_rel, 'bytes_in': bytes_in,
+            'bytes_out': bytes_out, 'status': 'ok'}
+
+
+def pipeline_records(mode, rel_paths, input_root, output_root, base_key, options,
+                     readers=2, writers=2, queue_size=16, fmt='png'):
+    """
+    Okuma -> şifreleme -> yazma aşamalarını sınırlı kuyruklarla eşzamanlı çalıştır
+
+    Okuyucu ve yazıcı iş parçacıkları (cv2.imdecode / cv2.imencode ve dosya
+    G/Ç'si GIL'i bırakır) şifreleme aşamasıyla üst üste biner; sınırlı kuyruklar
+    bellekte en fazla ~2 * queue_size görüntü tutar.
+
+    Args:
+    mode : str - 'encrypt' veya 'decrypt'
+    rel_paths : list - İşlenecek göreli yollar
+    input_root, output_root : str - Girdi ve çıktı kökleri
+    base_key : list - Anahtar
+    options : dict - Şifreleme seçenekleri
+    readers : int - Okuyucu (çözücü) iş parçacığı sayısı
+    writers : int - Yazıcı (PNG kodlayıcı) iş parçacığı sayısı
+    queue_size : int - Aşamalar arası kuyruk kapasitesi
+    fmt : str - Çıktı biçimi: 'png' veya 'container'
+
+    Yields:
+    dict: Her dosya için manifest kaydı (tamamlanma sırasıyla)
+    """
+    paths_q = queue.Queue()
+    decoded_q = queue.Queue(maxsize=queue_size)
+    encrypted_q = queue.Queue(maxsize=queue_size)
+    results_q = queue.Queue()
+
+    for rel_path in rel_paths:
+        paths_q.put(rel_path)
+    for _ in range(readers):
+        paths_q.put(None)
+
+    def read_stage():
+        while True:
+            rel_path = paths_q.get()
+            if rel_path is None:
+                return
+            try:
+                img, bytes_in = _read_image(os.path.join(input_root, rel_path),
+                                            color='color_mode' in options,
+                                            base_key=base_key, options=options)
+                decoded_q.put((rel_path, img, bytes_in))
+            except Exception as exc:
+                results_q.put(_error_record(rel_path, exc, fmt))
+
+    def encrypt_stage():
+        while True:
+            item = decoded_q.get()
+            if item is None:
+                return
+            rel_path, img, bytes_in = item
+            try:
+                encrypted_q.put((rel_path, _transform(mode, img, base_key, options), bytes_in))
+            except Exception as exc:
+                results_q.put(_error_record(rel_path, exc, fmt))
+
+    def write_stage():
+        while True:
+            item = encrypted_q.get()
+            if item is None:
+                return
+            rel_path, result, bytes_in = item
+            out_rel = output_path_for(rel_path, fmt)
+            try:
+                bytes_out = write_output(os.path.join(output_root, out_rel), result, fmt,
+                                         base_key, options)
+                results_q.put({'input': rel_path, 'output': out_rel, 'bytes_in': bytes_in,
+                               'bytes_out': bytes_out, 'status': 'ok'})
+            except Exception as exc:
+                results_q.put(_error_record(rel_path, exc, fmt))
+
+    # Paralel numba çekirdekleri ilk kez ana iş parçacığında çalışmalı: TBB iş
+    # parçacığı havuzu yan iş parçacığında başlatılırsa süreç çıkışta kilitlenir
+    warm_up_kernels()
+
+    stages = ([threading.Thread(target=read_stage, daemon=True) for _ in range(readers)] +
+              [threading.Thread(target=encrypt_stage, daemon=True)] +
+              [threading.Thread(target=write_stage, daemon=True) for _ in range(writers)])
+    for thread in stages:
+        thread.start()
+
+    # Her dosya tam olarak bir kayıt üretir (başarılı veya hatalı)
+    for _ in range(len(rel_paths)):
+        yield results_q.get()
+
+    decoded_q.put(None)
+    for _ in range(writers):
+        encrypted_q.put(None)
+    for thread in stages:
+        thread.join()
+
+
+def load_manifest(manifest_path, header):
+    """
+    Manifest'i oku, tamamlanmış dosyaları döndür
+
+    Başlık (mod, anahtar parmak izi, seçenekler) farklıysa başka bir işin
+    manifest'i üzerine devam edilmez.
+
+    Args:
+    manifest_path : str
+    header : dict - Bu işin başlık kaydı
+
+    Returns:
+    set: Başarıyla tamamlanmış göreli girdi yolları
+    """
+    done = set()
+    if not os.path.exists(manifest_path):
+        return done
+
+    with open(manifest_path) as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Kesinti sırasında yarım yazılmış son satır
+            if line_no == 0:
+                if record != header:
+                    raise ValueError(f"Manifest başka bir işe ait: {manifest_path} "
+                                     f"(mod/anahtar/seçenekler farklı)")
+                continue
+            if record.get('status') == 'ok':
+                done.add(record['input'])
+            else:
+                done.discard(record['input'])
+
+    return done
+
+
+def run_batch(mode, source, output_root, base_key=None, workers=None, chunksize=4,
+              sbox_candidates=1, sbox_bank=1, sbox_bits=8, color_mode=None, diffusion_version=1,
+              key_version=1, tile_size=None, pipeline=False, readers=2, writers=2, queue_size=16,
+              fmt='png', verbose=True):
+    """
+    Klasör/glob içindeki görüntüleri toplu şifrele/deşifrele
+
+    İki çalışma biçimi vardır: işlem havuzu (varsayılan; her işçi dosyayı
+    baştan sona işler) veya pipeline=True ile tek süreçte okuma -> şifreleme
+    -> yazma boru hattı (bkz. pipeline_records).
+
+    Args:
+    mode : str - 'encrypt' veya 'decrypt'
+    source : str - Girdi klasörü veya glob deseni
+    output_root : str - Çıktı klasörü (manifest burada tutulur)
+    base_key : list - Anahtar (varsayılan DEFAULT_KEY)
+    workers : int - Süreç sayısı (varsayılan: tüm çekirdekler)
+    chunksize : int - İşçiye tek seferde gönderilen dosya sayısı
+    sbox_candidates, sbox_bank, sbox_bits : Şifreleme seçenekleri
+    color_mode : str - None = gri seviye oku; 'flat' / 'channel' / 'cross' = renkleri koru
+    diffusion_version : int - 1 = XOR zinciri, 2 = 2-D satır/sütun difüzyonu
+    key_version : int - 1 = tek dinamik anahtar, 2 = aşama başına alt anahtar
+    tile_size : int - Verilirse döşemeli mod (bölge deşifreleme; bkz. tiled_encrypt.py)
+    pipeline : bool - İşlem havuzu yerine boru hattı kullan
+    readers, writers : int - Boru hattı okuyucu/yazıcı iş parçacığı sayısı
+    queue_size : int - Boru hattı kuyruk kapasitesi
+    fmt : str - Şifreli çıktı biçimi: 'png' (varsayılan) veya 'container' (.cpb kap dosyası)
+    verbose : bool - İlerlemeyi yazdır
+
+    Returns:
+    dict: İstatistikler (processed, skipped, errors, seconds, files_per_sec, mb_per_sec)
+
+    Raises:
+    ValueError: Aynı çıktı dosyasına yazılacak girdiler varsa (ör. a.png ve a.jpg)
+    """
+    if mode not in ('encrypt', 'decrypt'):
+        raise ValueError("mode: 'encrypt' veya 'decrypt'")
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"fmt: {OUTPUT_FORMATS} değerlerinden biri olmalı")
+    if fmt == 'container' and mode == 'decrypt':
+        raise ValueError("Kap biçimi yalnızca şifreli çıktılar içindir")
+
+    base_key = list(DEFAULT_KEY if base_key is None else base_key)
+    options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank, 'sbox_bits': sbox_bits}
+    if color_mode is not None:
+        # Renkli okuma; gri seviye işlerin manifest başlığı değişmez
+        options['color_mode'] = color_mode
+    if diffusion_version != 1:
+        options['diffusion_version'] = diffusion_version
+    if key_version != 1:
+        options['key_version'] = key_version
+    if tile_size:
+        options['tile_size'] = tile_size
+    workers = workers or os.cpu_count() or 1
+
+    input_root, rel_paths = collect_inputs(source)
+    # Çıktı klasörü girdinin içindeyse önceki çıktılar yeniden girdi sayılmasın
+    rel_paths = [p for p in rel_paths
+                 if not is_within(os.path.join(input_root, p), output_root)]
+    check_output_collisions(rel_paths, fmt)
+    os.makedirs(output_root, exist_ok=True)
+
+    manifest_path = os.path.join(output_root, MANIFEST_NAME)
+    header = {'mode': mode, 'key': key_fingerprint(base_key), 'options': options}
+    if fmt != 'png':
+        header['format'] = fmt
+    done = load_manifest(manifest_path, header)
+
+    # Manifest'te 'ok' olup çıktısı silinmiş dosyalar yeniden işlenir
+    pending = [p for p in rel_paths
+               if p not in done or
+               not os.path.exists(os.path.join(output_root, output_path_for(p, fmt)))]
+    skipped = len(rel_paths) - len(pending)
+
+    if verbose:
+        runner = (f"boru hattı: {readers} okuyucu, {writers} yazıcı" if pipeline
+                  else f"{workers} süreç")
+        print(f"{len(rel_paths)} görüntü bulundu, {skipped} tanesi zaten tamamlanmış, "
+              f"{len(pending)} işlenecek ({runner})")
+
+    stats = {'processed': 0, 'skipped': skipped, 'errors': 0, 'bytes_in': 0, 'bytes_out': 0}
+    start = time.time()
+
+    new_manifest = not os.path.exists(manifest_path) or os.path.getsize(manifest_path) == 0
+    with open(manifest_path, 'a') as manifest:
+        if new_manifest:
+            manifest.write(json.dumps(header) + '\n')
+            manifest.flush()
+
+        if pending and pipeline:
+            records = pipeline_records(mode, pending, input_root, output_root, base_key, options,
+                                       readers=readers, writers=writers, queue_size=queue_size,
+                                       fmt=fmt)
+            _consume_records(records, manifest, stats, len(pending), verbose)
+        elif pending:
+            # İşçiler 'spawn' ile başlar: fork, numba'nın TBB/OpenMP iş parçacığı
+            # havuzlarıyla kilitlenebilir. Derlenmiş çekirdekler disk önbelleğinden gelir.
+            warm_up_kernels()
+            pool = get_context('spawn').Pool(workers, initializer=_init_worker,
+                                             initargs=(mode, base_key, options, input_root,
+                                                       output_root, fmt))
+            with pool:
+                records = pool.imap_unordered(_process_file, pending, chunksize=chunksize)
+                _consume_records(records, manifest, stats, len(pending), verbose)
+
+    elapsed = time.time() - start
+    stats['seconds'] = elapsed
+    stats['files_per_sec'] = stats['processed'] / elapsed if elapsed > 0 else 0.0
+    stats['mb_per_sec'] = stats['bytes_in'] / 1e6 / elapsed if elapsed > 0 else 0.0
+
+    if verbose:
+        print_report(stats)
+
+    return stats
+
+
+def _consume_records(records, manifest, stats, total, verbose):
+    """Kayıtları manifest'e yaz ve istatistikleri güncelle"""
+    for record in records:
+        # Her sonuç hemen kalıcı: kesintide en fazla uçuştaki dosyalar tekrar edilir
+        manifest.write(json.dumps(record) + '\n')
+        manifest.flush()
+
+        if record['status'] == 'ok':
+            stats['processed'] += 1
+            stats['bytes_in'] += record['bytes_in']
+            stats['bytes_out'] += record['bytes_out']
+        else:
+            stats['errors'] += 1
+            if verbose:
+                print(f"❌ {record['input']}: {record['error']}")
+
+        finished = stats['processed'] + stats['errors']
+        if verbose and (finished % 1000 == 0 or finished == total):
+            print(f"  {finished}/{total} dosya")
+
+
+def print_report(stats):
+    """
+    Toplu işlem raporunu yazdır
+
+    Args:
+    stats : dict - run_batch() çıktısı
+    """
+    print("="*60)
+    print("TOPLU İŞLEM RAPORU")
+    print("="*60)
+    print(f"İşlenen:     {stats['processed']} dosya")
+    print(f"Atlanan:     {stats['skipped']} dosya (önceki çalıştırmada tamamlanmış)")
+    print(f"Hatalı:      {stats['errors']} dosya")
+    print(f"Süre:        {stats['seconds']:.2f} s")
+    print(f"Verim:       {stats['files_per_sec']:.1f} dosya/s, {stats['mb_per_sec']:.2f} MB/s")
+    print("="*60)
+
+
+def main(argv=None):
+    """Komut satırı giriş noktası"""
+    parser = argparse.ArgumentParser(
+        description="ChaosPolybius-2026 klasör toplu şifreleme/deşifreleme")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('source', help="Girdi klasörü veya glob deseni (ör. 'data/**/*.png')")
+    parser.add_argument('output', help="Çıktı klasörü (manifest burada tutulur)")
+    parser.add_argument('--key', type=float, nargs=7, default=DEFAULT_KEY,
+                        metavar=('X0', 'U0', 'R', 'A', 'B', 'C', 'DELTA'))
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Süreç sayısı (varsayılan: tüm çekirdekler)")
+    parser.add_argument('--chunksize', type=int, default=4)
+    parser.add_argument('--sbox-candidates', type=int, default=1)
+    parser.add_argument('--sbox-bank', type=int, default=1)
+    parser.add_argument('--sbox-bits', type=int, choices=[8, 16], default=8)
+    parser.add_argument('--color-mode', choices=['flat', 'channel', 'cross'], default=None,
+                        help="Renkleri koru (varsayılan: gri seviye)")
+    parser.add_argument('--diffusion-version', type=int, choices=[1, 2], default=1,
+                        help="1 = XOR zinciri, 2 = 2-D satır/sütun difüzyonu")
+    parser.add_argument('--key-version', type=int, choices=[1, 2], default=1,
+                        help="1 = tek dinamik anahtar, 2 = aşama başına alt anahtar")
+    parser.add_argument('--tile-size', type=int, default=None,
+                        help="Döşemeli mod: bölgeler ayrı deşifre edilebilir (ör. 256)")
+    parser.add_argument('--format', choices=list(OUTPUT_FORMATS), default='png',
+                        help="Şifreli çıktı biçimi: png veya container (.cpb, ham veri + başlık)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="İşlem havuzu yerine okuma/şifreleme/yazma boru hattı")
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    stats = run_batch(args.mode, args.source, args.output, base_key=args.key,
+                      workers=args.workers, chunksize=args.chunksize,
+                      sbox_candidates=args.sbox_candidates, sbox_bank=args.sbox_bank,
+                      sbox_bits=args.sbox_bits, color_mode=args.color_mode,
+                      diffusion_version=args.diffusion_version, key_version=args.key_version,
+                      tile_size=args.tile_size, pipeline=args.pipeline, readers=args.readers,
+                      writers=args.writers,
+                      queue_size=args.queue_size, fmt=args.format)
+
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
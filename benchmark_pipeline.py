@@ -0,0 +1,112 @@
+"""
+ChaosPolybius-2026 - Toplu Şifreleme Verim Karşılaştırması
+
+Karışık boyutlu (JPEG + PNG) bir klasörde uçtan uca dosya/s ölçer. İki
+çalıştırma da run_batch() ile aynı okuma, atomik yazma (fsync) ve manifest
+yolundan geçer; yalnızca zamanlama farklıdır:
+1. Sıralı: tek işçi süreç, her dosya bir öncekini bekler (önce; işçi
+   sürecinin başlatılması da süreye dahildir)
+2. Boru hattı: okuyucu/yazıcı iş parçacıkları şifrelemeyle üst üste biner (sonra)
+
+Kullanım:
+    python benchmark_pipeline.py --count 200 --readers 4 --writers 4
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+from encryption import encrypt_image_from_array
+from batch_encrypt import run_batch, DEFAULT_KEY
+from key_schedule import warm_up_kernels
+
+
+SIZES = [(64, 64), (256, 256), (480, 640), (512, 512), (1024, 768), (1080, 1920)]
+
+
+def make_mixed_directory(root, count, seed=0):
+    """
+    Yapısal (sıkıştırılabilir) test görüntülerinden karışık boyutlu klasör oluştur
+
+    Args:
+    root : str - Hedef klasör
+    count : int - Görüntü sayısı
+    seed : int - Rastgelelik tohumu
+
+    Returns:
+    int: Toplam dosya boyutu (byte)
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(root, exist_ok=True)
+    total = 0
+
+    for i in range(count):
+        H, W = SIZES[i % len(SIZES)]
+        yy, xx = np.mgrid[0:H, 0:W]
+        img = ((xx * 0.5 + yy * 0.5 + 40 * np.sin(yy / 13.0) + 40 * np.cos(xx / 17.0)) % 256
+               + rng.normal(0, 4, (H, W))).clip(0, 255).astype(np.uint8)
+
+        ext = '.jpg' if i % 2 else '.png'
+        path = os.path.join(root, f'img_{i:05d}{ext}')
+        cv2.imwrite(path, img)
+        total += os.path.getsize(path)
+
+    return total
+
+
+def main(argv=None):
+    """Karşılaştırmayı çalıştır ve tabloyu yazdır"""
+    parser = argparse.ArgumentParser(description="Toplu şifreleme verim karşılaştırması")
+    parser.add_argument('--count', type=int, default=120)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args(argv)
+
+    base_key = DEFAULT_KEY
+    work = tempfile.mkdtemp(prefix='chaospolybius_bench_')
+    src = os.path.join(work, 'girdi')
+
+    print("="*60)
+    print("Toplu Şifreleme Verim Karşılaştırması")
+    print("="*60)
+
+    try:
+        total = make_mixed_directory(src, args.count)
+        print(f"\n{args.count} görüntü ({total / 1e6:.1f} MB, {len(SIZES)} farklı boyut, JPEG + PNG)")
+
+        # Anahtar çizelgeleri ve numba çekirdekleri ölçüme girmesin
+        warm_up_kernels()
+        for H, W in SIZES:
+            encrypt_image_from_array(np.zeros((H, W), dtype=np.uint8), base_key)
+
+        results = {}
+        results['Sıralı (önce)'] = run_batch(
+            'encrypt', src, os.path.join(work, 'sirali'), base_key=base_key, pipeline=False,
+            workers=1, verbose=False)
+        results['Boru hattı (sonra)'] = run_batch(
+            'encrypt', src, os.path.join(work, 'boru'), base_key=base_key, pipeline=True,
+            readers=args.readers, writers=args.writers, verbose=False)
+
+        baseline = results['Sıralı (önce)']['files_per_sec']
+        print(f"\n{'Yöntem':<22}{'Süre (s)':>10}{'dosya/s':>10}{'MB/s':>9}{'Hız':>8}")
+        print("-"*60)
+        for name, stats in results.items():
+            print(f"{name:<22}{stats['seconds']:>10.2f}{stats['files_per_sec']:>10.1f}"
+                  f"{stats['mb_per_sec']:>9.2f}{stats['files_per_sec'] / baseline:>7.2f}x")
+
+        # Çıktılar aynı olmalı
+        same = all(np.array_equal(cv2.imread(os.path.join(work, 'sirali', f), cv2.IMREAD_UNCHANGED),
+                                  cv2.imread(os.path.join(work, 'boru', f), cv2.IMREAD_UNCHANGED))
+                   for f in os.listdir(os.path.join(work, 'sirali')) if f.endswith('.png'))
+        print(f"\nBoru hattı çıktıları sıralı çıktılarla aynı mı? {same}")
+    finally:
+        shutil.rmtree(work)
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
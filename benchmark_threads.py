@@ -0,0 +1,99 @@
+"""
+ChaosPolybius-2026 - İş Parçacığı Ölçekleme Karşılaştırması
+
+Tek süreçte EncryptionEngine ile aynı görüntü kümesini 1, 2, 4, ...
+iş parçacığıyla şifreler ve verimi tek iş parçacığına göre karşılaştırır.
+Çekirdekler GIL'i bıraktığı için hız çekirdek sayısına kadar yaklaşık
+doğrusal artmalıdır (verim = hız / iş parçacığı sayısı).
+
+Kullanım:
+    python benchmark_threads.py --count 64 --size 1024 --threads 1 2 4 8
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+from batch_encrypt import DEFAULT_KEY
+from threaded_encrypt import EncryptionEngine
+
+
+def run_threads(engine, images, threads, repeat=3):
+    """
+    Görüntüleri threads iş parçacığında şifrele (her iş parçacığı kendi payını işler)
+
+    Motorun havuzu yerine doğrudan iş parçacıkları kullanılır: web sunucusunda
+    olduğu gibi her iş parçacığı engine.encrypt() çağırır.
+
+    Args:
+    engine : EncryptionEngine
+    images : numpy.ndarray (N, H, W)
+    threads : int - İş parçacığı sayısı
+    repeat : int - Tekrar sayısı (en iyi süre alınır)
+
+    Returns:
+    float: En iyi süre (saniye)
+    """
+    out = np.empty_like(images)
+
+    def work(indices):
+        engine.init_thread()
+        for i in indices:
+            engine.encrypt(images[i], out=out[i])
+
+    best = float('inf')
+    for _ in range(repeat):
+        workers = [threading.Thread(target=work, args=(range(t, len(images), threads),))
+                   for t in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main(argv=None):
+    """Karşılaştırmayı çalıştır ve tabloyu yazdır"""
+    cpus = os.cpu_count() or 1
+    default_threads = sorted({1, 2, 4, cpus} | {t for t in (8, 16) if t <= cpus})
+    parser = argparse.ArgumentParser(description="İş parçacığı ölçekleme karşılaştırması")
+    parser.add_argument('--count', type=int, default=32)
+    parser.add_argument('--size', type=int, default=1024)
+    parser.add_argument('--threads', type=int, nargs='+', default=default_threads)
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("İş Parçacığı Ölçekleme Karşılaştırması")
+    print("="*60)
+
+    images = np.random.default_rng(0).integers(0, 256, (args.count, args.size, args.size),
+                                               dtype=np.uint8)
+    print(f"\n{args.count} görüntü {args.size}x{args.size} "
+          f"({images.nbytes / 1e6:.1f} MB), {cpus} CPU")
+
+    # Anahtar çizelgesi ve numba çekirdekleri ölçüme girmesin
+    engine = EncryptionEngine(DEFAULT_KEY)
+    engine.encrypt(images[0])
+
+    results = {threads: run_threads(engine, images, threads)
+               for threads in sorted(set(args.threads) | {1})}
+
+    baseline = results[1]
+    print(f"\n{'İş parçacığı':<14}{'Süre (s)':>10}{'görüntü/s':>11}{'MB/s':>9}{'Hız':>8}"
+          f"{'Verim':>8}")
+    print("-"*60)
+    for threads, seconds in results.items():
+        speedup = baseline / seconds
+        print(f"{threads:<14}{seconds:>10.3f}{args.count / seconds:>11.1f}"
+              f"{images.nbytes / 1e6 / seconds:>9.1f}{speedup:>7.2f}x{speedup / threads:>8.0%}")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""
+ChaosPolybius-2026 - Şifreli Görüntü Kap Dosyası (.cpb)
+
+Şifreli görüntüler rastgele görünür: PNG'nin deflate sıkıştırması yavaştır
+ve hiçbir şey kazandırmaz, PNG dosyası da boyut/derinlik dışında şifreleme
+seçeneklerini ve anahtarı kaydetmez. Kap dosyası:
+
+    [başlık 128 byte][parça indeksi (isteğe bağlı)][dolgu][ham veri]
+
+- Başlık: sihirli sayı, biçim sürümü, boyut, derinlik, şifreleme seçenekleri
+  (S-Box, difüzyon ve anahtar sürümü, renk modu) ve anahtar parmak izi
+- Ham veri PAYLOAD_ALIGN (4096) byte sınırında başlar, C sıralı piksellerdir
+- Parça indeksi: satır (yığında kare) bantlarının konumu ve CRC32 değeri
+
+Yazma tek sistem çağrısıdır (os.writev; başlık ve veri kopyalanmadan) ve
+atomiktir (geçici dosya + os.replace). Okuma np.memmap ile kopyasızdır.
+Parmak izi ile önbellekteki çizelge anahtar yeniden girilmeden bulunur.
+
+Kullanım:
+    write_container('sifreli.cpb', encrypted, base_key=base_key)
+    encrypted, header = read_container('sifreli.cpb')      # np.memmap
+    decrypted = decrypt_container('sifreli.cpb', base_key)
+    view = decrypt_container_region('uydu.cpb', top, left, 1024, 1024, base_key)   # Döşemeli
+"""
+
+import os
+import struct
+import threading
+import zlib
+
+import numpy as np
+from key_schedule import (COLOR_MODES, DEPTH_DTYPES, get_key_schedule, key_fingerprint,
+                          schedule_cache)
+from tiled_encrypt import TILE_VERSION, TILE_VERSIONS
+
+
+CONTAINER_EXTENSION = '.cpb'
+MAGIC = b'CPB2026\x00'
+
+# 1: ilk biçim; 2: döşemeli mod alanları (döşemesiz kaplar sürüm 1 olarak yazılır)
+FORMAT_VERSION = 2
+
+# Ham verinin hizası (sayfa boyutu: memmap ve doğrudan G/Ç için)
+PAYLOAD_ALIGN = 4096
+
+# Başlık bayrakları
+FLAG_CHUNK_INDEX = 1
+FLAG_STACK = 2          # (N, H, W) aynı boyutlu kare yığını
+
+# magic, sürüm, başlık boyutu, bayraklar, veri konumu, veri boyutu, indeks konumu,
+# parça sayısı, derinlik, boyut sayısı, renk modu, sbox_bits, difüzyon sürümü,
+# anahtar sürümü, sbox_candidates, sbox_bank, boyutlar (4), parmak izi, döşeme boyutu,
+# döşemeli mod sürümü
+HEADER = struct.Struct('<8sHHIQQQQBBBBBBHH4Q16sIB17x')
+CHUNK_ENTRY = struct.Struct('<QQI4x')    # konum (veriye göre), boyut, CRC32
+
+# Başlıkta saklanan şifreleme seçeneklerinin varsayılanları
+DEFAULT_OPTIONS = {'sbox_candidates': 1, 'sbox_bank': 1, 'sbox_bits': 8,
+                   'diffusion_version': 1, 'key_version': 1}
+
+
+def _align(offset):
+    """offset'i PAYLOAD_ALIGN katına yuvarla"""
+    return -(-offset // PAYLOAD_ALIGN) * PAYLOAD_ALIGN
+
+
+def _chunk_ranges(shape, itemsize, chunk_bytes):
+    """Veriyi ilk eksen boyunca ~chunk_bytes'lık bantlara böl: [(konum, boyut)]"""
+    row_bytes = int(np.prod(shape[1:])) * itemsize
+    rows = max(1, chunk_bytes // max(row_bytes, 1))
+    return [(start * row_bytes, (min(start + rows, shape[0]) - start) * row_bytes)
+            for start in range(0, shape[0], rows)]
+
+
+def _header_block(shape, dtype, stack, fingerprint, options, chunks):
+    """Başlık + parça indeksi + hizalama dolgusu (tek bytes nesnesi)"""
+    depths = {np.dtype(v): depth for depth, v in DEPTH_DTYPES.items()}
+    if dtype not in depths:
+        raise ValueError(f"Desteklenmeyen piksel tipi: {dtype} (uint8 veya uint16 olmalı)")
+    index = b''.join(CHUNK_ENTRY.pack(*chunk) for chunk in chunks)
+    payload_offset = _align(HEADER.size + len(index))
+    flags = (FLAG_CHUNK_INDEX if chunks else 0) | (FLAG_STACK if stack else 0)
+    color_mode = options.get('color_mode')
+    tile_size = options.get('tile_size') or 0
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION if tile_size else 1, HEADER.size, flags, payload_offset, nbytes,
+        HEADER.size if chunks else 0, len(chunks), depths[dtype], len(shape),
+        COLOR_MODES.index(color_mode) + 1 if color_mode else 0,
+        options['sbox_bits'], options['diffusion_version'], options['key_version'],
+        options['sbox_candidates'], options['sbox_bank'],
+        *(tuple(shape) + (0,) * (4 - len(shape))),
+        (fingerprint or '').encode('ascii'), tile_size, TILE_VERSION if tile_size else 0)
+    return header + index + bytes(payload_offset - HEADER.size - len(index))
+
+
+def _write_buffers(fd, buffers):
+    """Tamponları tek os.writev çağrısıyla yaz (kısmi yazımda kalan kısım sırayla)"""
+    views = [memoryview(buffer).cast('B') for buffer in buffers]
+    written = os.writev(fd, views) if hasattr(os, 'writev') else 0
+    for view in views:
+        if written >= len(view):
+            written -= len(view)
+            continue
+        view, written = view[written:], 0
+        while view:
+            view = view[os.write(fd, view):]
+
+
+def _container_options(image, stack, options):
+    """Başlığa yazılacak seçenekler (eksikler varsayılan; renkli görüntüde color_mode)"""
+    merged = dict(DEFAULT_OPTIONS)
+    merged.update((k, v) for k, v in options.items() if k in DEFAULT_OPTIONS and v is not None)
+    if options.get('tile_size'):
+        if stack:
+            raise ValueError("Döşemeli mod kare yığınlarında kullanılamaz")
+        merged['tile_size'] = int(options['tile_size'])
+    if image.ndim == 3 and not stack:
+        merged['color_mode'] = options.get('color_mode') or 'flat'
+    elif image.ndim != (3 if stack else 2):
+        raise ValueError(f"(H, W), (H, W, C) veya yığın (N, H, W) bekleniyor, "
+                         f"gelen: {image.shape}")
+    return merged
+
+
+def write_container(path, image, base_key=None, fingerprint=None, stack=False, chunk_bytes=None,
+                    fsync=True, **options):
+    """
+    Şifreli görüntüyü kap dosyasına yaz (atomik, tek os.writev çağrısı)
+
+    Args:
+    path : str - Hedef dosya (.cpb)
+    image : numpy.ndarray - Şifreli görüntü (H, W) / (H, W, C) veya stack=True ile (N, H, W);
+            uint8 veya uint16
+    base_key : list - Parmak izi için anahtar (anahtarın kendisi yazılmaz)
+    fingerprint : str - base_key yerine hazır parmak izi (ikisi de yoksa boş)
+    stack : bool - image aynı boyutlu karelerden oluşan (N, H, W) yığın
+    chunk_bytes : int - Verilirse ~bu boyutta bantlar için CRC32'li parça indeksi yazılır
+    fsync : bool - Dosyayı diske zorla (os.replace'ten önce)
+    **options : Şifrelemede kullanılan seçenekler (sbox_candidates, sbox_bank, sbox_bits,
+                diffusion_version, key_version, color_mode, tile_size)
+
+    Returns:
+    int: Yazılan byte sayısı
+    """
+    if base_key is not None:
+        fingerprint = key_fingerprint(base_key)
+    payload = np.ascontiguousarray(image)
+    merged = _container_options(payload, stack, options)
+
+    chunks = []
+    if chunk_bytes:
+        data = payload.reshape(-1).view(np.uint8)
+        chunks = [(offset, size, zlib.crc32(data[offset:offset + size]))
+                  for offset, size in _chunk_ranges(payload.shape, payload.itemsize, chunk_bytes)]
+    block = _header_block(payload.shape, payload.dtype, stack, fingerprint, merged, chunks)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+                 0o644)
+    try:
+        _write_buffers(fd, [block, payload])
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+    return len(block) + payload.nbytes
+
+
+def create_container(path, shape, dtype=np.uint8, base_key=None, fingerprint=None,
+                     stack=False, **options):
+    """
+    Boş kap dosyası oluştur ve verisini yazılabilir np.memmap olarak aç
+
+    Bellek dışı şifreleme (memmap_encrypt) sonucu doğrudan dosyaya yazar;
+    bu yol atomik değildir ve parça indeksi yazmaz.
+
+    Args:
+    path : str - Hedef dosya (.cpb)
+    shape : tuple - Görüntü (veya stack=True ile yığın) boyutu
+    dtype : np.uint8 veya np.uint16
+    base_key, fingerprint, stack, **options : write_container() ile aynı
+
+    Returns:
+    np.memmap: 'r+' kipinde veri görünümü
+    """
+    if base_key is not None:
+        fingerprint = key_fingerprint(base_key)
+    shape = tuple(int(v) for v in shape)
+    dtype = np.dtype(dtype)
+    merged = _container_options(np.empty((0,) * len(shape), dtype), stack, options)
+    block = _header_block(shape, dtype, stack, fingerprint, merged, [])
+
+    with open(path, 'wb') as f:
+        f.write(block)
+        f.truncate(len(block) + int(np.prod(shape)) * dtype.itemsize)
+    return np.memmap(path, dtype=dtype, mode='r+', offset=len(block), shape=shape)
+
+
+def read_header(path):
+    """
+    Kap dosyasının başlığını ve parça indeksini oku
+
+    Args:
+    path : str - Kap dosyası
+
+    Returns:
+    dict: version, shape, dtype, depth, stack, key (parmak izi veya None), options
+          (döşemeli kapta tile_size dahil), tile_version, payload_offset, payload_nbytes,
+          chunks [(konum, boyut, crc32)]
+    """
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size or raw[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"ChaosPolybius kap dosyası değil: {path}")
+        (_, version, header_size, flags, payload_offset, payload_nbytes, index_offset, count,
+         depth, ndim, color_code, sbox_bits, diffusion_version, key_version, sbox_candidates,
+         sbox_bank, *rest) = HEADER.unpack(raw)
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen kap sürümü {version} (en fazla {FORMAT_VERSION})")
+
+        chunks = []
+        if flags & FLAG_CHUNK_INDEX:
+            f.seek(index_offset)
+            index = f.read(count * CHUNK_ENTRY.size)
+            chunks = [CHUNK_ENTRY.unpack_from(index, i * CHUNK_ENTRY.size) for i in range(count)]
+
+    if depth not in DEPTH_DTYPES or not 2 <= ndim <= 4:
+        raise ValueError(f"Bozuk kap başlığı: {path}")
+    shape, fingerprint = tuple(int(v) for v in rest[:ndim]), rest[4].rstrip(b'\0').decode('ascii')
+    tile_size, tile_version = rest[5:7]
+    if tile_size and tile_version not in TILE_VERSIONS:
+        raise ValueError(f"Desteklenmeyen döşemeli mod sürümü {tile_version}: {path}")
+    dtype = np.dtype(DEPTH_DTYPES[depth])
+    if int(np.prod(shape)) * dtype.itemsize != payload_nbytes:
+        raise ValueError(f"Bozuk kap başlığı (boyut ve veri uzunluğu uyuşmuyor): {path}")
+    if os.path.getsize(path) < payload_offset + payload_nbytes:
+        raise ValueError(f"Kap dosyası kesik: {path}")
+
+    options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank,
+               'sbox_bits': sbox_bits, 'diffusion_version': diffusion_version,
+               'key_version': key_version}
+    if color_code:
+        options['color_mode'] = COLOR_MODES[color_code - 1]
+    if tile_size:
+        options['tile_size'] = tile_size
+
+    return {'version': version, 'shape': shape, 'dtype': dtype, 'depth': depth,
+            'stack': bool(flags & FLAG_STACK), 'key': fingerprint or None, 'options': options,
+            'tile_version': tile_version if tile_size else 0,
+            'payload_offset': payload_offset, 'payload_nbytes': payload_nbytes,
+            'chunks': chunks}
+
+
+def read_container(path, mmap=True):
+    """
+    Kap dosyasını oku
+
+    Args:
+    path : str - Kap dosyası
+    mmap : bool - True: salt okunur np.memmap (kopyasız); False: belleğe oku
+
+    Returns:
+    tuple: (şifreli görüntü, başlık dict; bkz. read_header)
+    """
+    header = read_header(path)
+    if mmap:
+        array = np.memmap(path, dtype=header['dtype'], mode='r',
+                          offset=header['payload_offset'], shape=header['shape'])
+    else:
+        array = np.fromfile(path, dtype=header['dtype'], count=int(np.prod(header['shape'])),
+                            offset=header['payload_offset']).reshape(header['shape'])
+    return array, header
+
+
+def verify_container(path):
+    """
+    Parça indeksindeki CRC32 değerlerini doğrula
+
+    Args:
+    path : str - Kap dosyası
+
+    Returns:
+    list: Bozuk parçaların indeksleri (indeks yoksa veya hepsi sağlamsa boş)
+    """
+    array, header = read_container(path)
+    data = array.reshape(-1).view(np.uint8)
+    return [i for i, (offset, size, crc) in enumerate(header['chunks'])
+            if zlib.crc32(data[offset:offset + size]) != crc]
+
+
+def check_container(header, base_key=None, **options):
+    """
+    Başlığın anahtar ve seçeneklerle uyumlu olduğunu doğrula
+
+    Args:
+    header : dict - read_header() çıktısı
+    base_key : list - Deşifrelemede kullanılacak anahtar (None = parmak izi kontrolü yok)
+    **options : Beklenen seçenekler (verilmeyenler kontrol edilmez)
+
+    Raises:
+    ValueError: Parmak izi veya seçenek uyuşmazlığı
+    """
+    if base_key is not None and header['key'] and header['key'] != key_fingerprint(base_key):
+        raise ValueError("Anahtar kap dosyasının anahtar parmak izi ile uyuşmuyor")
+    stored = dict(header['options'])
+    if 'tile_size' in options and (options['tile_size'] or 0) != stored.get('tile_size', 0):
+        raise ValueError(f"Seçenek uyuşmuyor: tile_size={options['tile_size']}, "
+                         f"kapta {stored.get('tile_size')}")
+    for name, value in options.items():
+        if name == 'color_mode' and 'color_mode' not in stored:
+            continue
+        if name in stored and value is not None and stored[name] != value:
+            raise ValueError(f"Seçenek uyuşmuyor: {name}={value}, kapta {stored[name]}")
+
+
+def container_schedule(header, base_key=None):
+    """
+    Kap dosyasının çizelgesi: önce parmak iziyle önbellekte aranır
+
+    Args:
+    header : dict - read_header() çıktısı
+    base_key : list - Anahtar (önbellekte yoksa gerekli)
+
+    Returns:
+    KeySchedule veya ColorKeySchedule
+    """
+    shape = header['shape'][1:] if header['stack'] else header['shape']
+    options = dict(header['options'], depth=header['depth'])
+    check_container(header, base_key)
+
+    if header['key']:
+        schedule = schedule_cache.find(header['key'], shape, **options)
+        if schedule is not None:
+            return schedule
+    if base_key is None:
+        raise ValueError("Çizelge önbellekte yok: deşifreleme için anahtar gerekli")
+    return get_key_schedule(base_key, shape, **options)
+
+
+def decrypt_container(path, base_key=None, out=None, workspace=None):
+    """
+    Kap dosyasını deşifrele (seçenekler başlıktan alınır)
+
+    Args:
+    path : str - Kap dosyası
+    base_key : list - Anahtar (aynı anahtarın çizelgesi önbellekteyse verilmeyebilir)
+    out : numpy.ndarray - Sonucun yazılacağı dizi
+    workspace : Workspace - Yeniden kullanılan çalışma tamponları
+
+    Returns:
+    numpy.ndarray: Deşifre edilmiş görüntü veya yığın
+    """
+    encrypted, header = read_container(path)
+    schedule = container_schedule(header, base_key)
+    if header['stack']:
+        return schedule.decrypt_batch(encrypted, out=out, workspace=workspace)
+    return schedule.decrypt(encrypted, out=out, workspace=workspace)
+
+
+def decrypt_container_region(path, top, left, height, width, base_key=None, out=None,
+                             workspace=None):
+    """
+    Kap dosyasındaki görüntünün dikdörtgen bölgesini deşifrele
+
+    Döşemeli kapta (tile_size) yalnızca bölgeyle örtüşen döşemelerin
+    sayfaları okunur; döşemesiz kapta tüm görüntü deşifre edilip kırpılır.
+
+    Args:
+    path : str - Kap dosyası
+    top, left : int - Bölgenin sol üst köşesi
+    height, width : int - Bölge boyutu
+    base_key : list - Anahtar (aynı anahtarın çizelgesi önbellekteyse verilmeyebilir)
+    out : numpy.ndarray - Sonucun yazılacağı dizi
+    workspace : Workspace - Yeniden kullanılan çalışma tamponları
+
+    Returns:
+    numpy.ndarray: Deşifre edilmiş bölge (height, width[, C])
+    """
+    encrypted, header = read_container(path)
+    if header['stack']:
+        raise ValueError("Bölge deşifreleme kare yığınlarında kullanılamaz")
+    H, W = header['shape'][:2]
+    if not (0 <= top and 0 <= left and height > 0 and width > 0 and
+            top + height <= H and left + width <= W):
+        raise ValueError(f"Bölge ({top}, {left}, {height}, {width}) görüntü ({H}x{W}) dışında")
+    schedule = container_schedule(header, base_key)
+    if 'tile_size' in header['options']:
+        return schedule.decrypt_region(encrypted, top, left, height, width, out=out,
+                                       workspace=workspace)
+
+    region = schedule.decrypt(encrypted, workspace=workspace)[top:top + height, left:left + width]
+    if out is None:
+        return region
+    np.copyto(out, region)
+    return out
+
+
+if __name__ == "__main__":
+    # Test kodu
+    import tempfile
+    import time
+    import cv2
+    from encryption import encrypt_image_from_array
+
+    print("="*60)
+    print("Şifreli Görüntü Kap Dosyası Test")
+    print("="*60)
+
+    base_key = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+    img = np.random.randint(0, 256, (2048, 2048), dtype=np.uint8)
+    encrypted = encrypt_image_from_array(img, base_key)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        png_path = os.path.join(tmp, 'sifreli.png')
+        cpb_path = os.path.join(tmp, 'sifreli' + CONTAINER_EXTENSION)
+
+        start = time.perf_counter()
+        cv2.imwrite(png_path, encrypted)
+        png_write = time.perf_counter() - start
+        start = time.perf_counter()
+        write_container(cpb_path, encrypted, base_key=base_key, chunk_bytes=1 << 20)
+        cpb_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cv2.imread(png_path, cv2.IMREAD_UNCHANGED)
+        png_read = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded, header = read_container(cpb_path)
+        cpb_read = time.perf_counter() - start
+
+        print(f"\nPNG: yazma {png_write * 1000:.1f} ms, okuma {png_read * 1000:.1f} ms, "
+              f"{os.path.getsize(png_path) / 1e6:.2f} MB")
+        print(f"Kap: yazma {cpb_write * 1000:.1f} ms, okuma {cpb_read * 1000:.2f} ms (memmap), "
+              f"{os.path.getsize(cpb_path) / 1e6:.2f} MB")
+        print(f"Başlık: {header['shape']} {header['dtype']}, anahtar {header['key']}, "
+              f"{len(header['chunks'])} parça")
+        print(f"Parçalar sağlam mı? {not verify_container(cpb_path)}")
+        print(f"Deşifreleme başarılı mı? "
+              f"{np.array_equal(decrypt_container(cpb_path, base_key), img)}")
+        del loaded
+
+    print("\n" + "="*60)
@@ -5,8 +5,179 @@ Rapordaki Bölüm 4.3'ü uygular.
 Her oturumda FPLM ile karıştırılan 8x8 Polybius matrisi.
 """
 
+import hashlib
 import numpy as np
-from fplm import FPLM
+from fplm import FPLM, fplm_batch_sequences
+from sbox_metrics import SBoxMetrics, POPCOUNT_LUT
+
+# Numba hızlandırma (opsiyonel - yoksa saf Python döngüsü kullanılır)
+try:
+    from fast_numba import fast_fisher_yates, fast_fisher_yates_batch
+    USE_NUMBA = True
+except ImportError:
+    USE_NUMBA = False
+
+
+# Anahtar-bağımlı S-Box aramasında oturum başına en fazla aday sayısı
+# (puanlama aday başına ~1 ms, çoğu diferansiyel düzgünlük; tek çekirdekte
+# 8 aday ~7 ms, 64 aday ~60 ms ölçüldü)
+MAX_SBOX_CANDIDATES = 8
+
+# S-Box bankasında (bölge başına S-Box) en fazla tablo sayısı
+MAX_SBOX_BANK = 256
+
+# Aday/banka FPLM'lerinde atılan transient adım sayısı
+CANDIDATE_DISCARD = 100
+
+# Aday akışında gereken en az farklı değer sayısı (255 değerden); sabit
+# noktaya veya kısa periyoda oturan akışlar zayıf S-Box verir ve atlanır
+CANDIDATE_MIN_DISTINCT = 128
+
+# Reddedilen adayların yerine yeni aday türetme turu sayısı
+CANDIDATE_ROUNDS = 8
+
+
+def keyed_permutation(rand_vals, n=256):
+    """
+    FPLM değerlerinden Fisher-Yates ile 0..n-1 permütasyonu üret
+    
+    Args:
+    rand_vals : n-1 adet FPLM değeri (FPLM.generate(n - 1) çıktısı)
+    n : Permütasyon uzunluğu
+    
+    Returns:
+    numpy.ndarray: Karıştırılmış permütasyon (int64)
+    """
+    if USE_NUMBA:
+        return fast_fisher_yates(rand_vals, n)
+    
+    # Swap indekslerini vektörize hesapla, sadece swap'ler döngüde kalsın
+    sizes = np.arange(n, 1, -1)
+    swap_indices = (rand_vals * sizes).astype(np.int64) % sizes
+    
+    perm = list(range(n))
+    for i, j in zip(range(n - 1, 0, -1), swap_indices.tolist()):
+        perm[i], perm[j] = perm[j], perm[i]
+    
+    return np.array(perm, dtype=np.int64)
+
+
+def keyed_permutations(rand_vals, n=256):
+    """
+    Her satır için ayrı Fisher-Yates permütasyonu (Numba varsa paralel)
+    
+    Args:
+    rand_vals : (K, n-1) FPLM değerleri
+    n : Permütasyon uzunluğu
+    
+    Returns:
+    numpy.ndarray: (K, n) permütasyonlar (int64)
+    """
+    rand_vals = np.ascontiguousarray(rand_vals, dtype=np.float64)
+    
+    if USE_NUMBA:
+        return fast_fisher_yates_batch(rand_vals, n)
+    
+    return np.stack([keyed_permutation(row, n) for row in rand_vals])
+
+
+def candidate_fplm_params(fplm, count, purpose='sbox', start=0):
+    """
+    FPLM durumundan deterministik aday FPLM parametreleri türet
+    
+    Aday k'nın yedi parametresinin tümü FPLM durumu, amaç etiketi ve k'nın
+    SHA-256 özetinden alınır (sha256_key_derivation ile aynı yöntem):
+    x0, u0, a, b, c, delta [0, 1), r [3.57, 4.0]. Anahtarın a, b, c, delta
+    değerleri taşınmaz; bu değerler sabit noktaya oturuyorsa tüm adaylar
+    da oturur.
+    
+    Args:
+    fplm : FPLM nesnesi (durumu değiştirilmez)
+    count : Aday sayısı
+    purpose : Etiket ('sbox' = arama, 'bank' = S-Box bankası)
+    start : İlk adayın indeksi k (reddedilenlerin yerine yenileri için)
+    
+    Returns:
+    numpy.ndarray: (count, 7) [x0, u0, r, a, b, c, delta] satırları
+    """
+    state = [fplm.x_prev, fplm.x_curr, fplm.r, fplm.a, fplm.b, fplm.c, fplm.delta]
+    state_str = ','.join(map(str, map(float, state)))
+    
+    params = np.empty((count, 7), dtype=np.float64)
+    for k in range(count):
+        digest = hashlib.sha256(f"{state_str},{purpose},{start + k}".encode()).hexdigest()
+        x0, u0, r_val, a, b, c, delta = (int(digest[i:i+8], 16) / 0xFFFFFFFF
+                                         for i in range(0, 56, 8))
+        
+        params[k] = [x0, u0, 3.57 + 0.43 * r_val, a, b, c, delta]
+    
+    return params
+
+
+def distinct_counts(rand_vals):
+    """
+    Her satırdaki farklı değer sayısı
+    
+    Args:
+    rand_vals : (K, n) FPLM değerleri
+    
+    Returns:
+    numpy.ndarray: (K,) farklı değer sayıları
+    """
+    ordered = np.sort(rand_vals, axis=-1)
+    return 1 + np.count_nonzero(np.diff(ordered, axis=-1) > 1e-12, axis=-1)
+
+
+def candidate_sequences(fplm, count, purpose='sbox'):
+    """
+    Aday FPLM'lerden Fisher-Yates için 255'er değer üret
+    
+    CANDIDATE_MIN_DISTINCT'ten az farklı değer veren (sabit noktaya veya
+    kısa periyoda oturan) akışlar atılır; yerlerine sonraki k indeksleriyle
+    yeni adaylar türetilir. Seçim yalnızca FPLM durumuna bağlıdır.
+    
+    Args:
+    fplm : FPLM nesnesi (durumu değiştirilmez)
+    count : Aday sayısı
+    purpose : Etiket ('sbox' = arama, 'bank' = S-Box bankası)
+    
+    Returns:
+    numpy.ndarray: (count, 255) float64 FPLM değerleri
+    """
+    kept = np.empty((0, 255), dtype=np.float64)
+    rejected = kept
+    start = 0
+    for _ in range(CANDIDATE_ROUNDS):
+        needed = count - len(kept)
+        if needed == 0:
+            break
+        
+        params = candidate_fplm_params(fplm, needed, purpose, start=start)
+        rand_vals = fplm_batch_sequences(params, 255, discard=CANDIDATE_DISCARD)
+        good = distinct_counts(rand_vals) >= CANDIDATE_MIN_DISTINCT
+        kept = np.concatenate((kept, rand_vals[good]))
+        rejected = np.concatenate((rejected, rand_vals[~good]))
+        start += needed
+    
+    # Turlar yetmezse (pratikte olmaz) eksikler reddedilenlerden tamamlanır
+    return np.concatenate((kept, rejected[:count - len(kept)]))
+
+
+def inverse_permutation(perm):
+    """
+    Permütasyonun (veya son eksende permütasyon yığınının) tersini
+    tek bir vektörize scatter ile hesapla
+    
+    Args:
+    perm : numpy.ndarray - Permütasyon (n,) veya yığın (K, n)
+    
+    Returns:
+    numpy.ndarray: inverse[perm[i]] = i olan ters permütasyon (aynı dtype)
+    """
+    inverse = np.empty_like(perm)
+    identity = np.arange(perm.shape[-1], dtype=perm.dtype)
+    np.put_along_axis(inverse, perm, np.broadcast_to(identity, perm.shape), axis=-1)
+    return inverse
 
 
 class DynamicPolybius:
@@ -17,19 +188,57 @@ class DynamicPolybius:
     karıştırılan dinamik bir substitution box kullanır.
     """
     
-    def __init__(self, fplm, size=16):
+    def __init__(self, fplm, size=16, candidates=1, bank_size=1, bits=8):
         """
         Args:
         fplm : FPLM nesnesi
         size : S-Box boyutu (16x16 = 256 karakter)
+        candidates : Anahtar-bağımlı arama için aday sayısı
+                     (1 = klasik tek S-Box, en fazla MAX_SBOX_CANDIDATES)
+        bank_size : Bölge (satır bandı) başına S-Box sayısı
+                    (1 = tek S-Box, en fazla MAX_SBOX_BANK)
+        bits : 8 = byte S-Box, 16 = ek olarak piksel çifti S-Box'ı (65536 eleman)
         """
+        if bits not in (8, 16):
+            raise ValueError("bits 8 veya 16 olmalı")
+        if bits == 16 and (candidates > 1 or bank_size > 1):
+            raise ValueError("16-bit S-Box sadece tek S-Box modunda kullanılabilir")
+        if not 1 <= candidates <= MAX_SBOX_CANDIDATES:
+            raise ValueError(f"candidates 1 ile {MAX_SBOX_CANDIDATES} arasında olmalı")
+        if not 1 <= bank_size <= MAX_SBOX_BANK:
+            raise ValueError(f"bank_size 1 ile {MAX_SBOX_BANK} arasında olmalı")
+        if candidates > 1 and bank_size > 1:
+            raise ValueError("candidates ve bank_size birlikte kullanılamaz")
+        
         self.fplm = fplm
         self.size = size
+        self.candidates = candidates
+        self.bank_size = bank_size
+        self.bits = bits
         self.sbox = None
         self.inverse_sbox = None
+        self.sbox_bank = None
+        self.inverse_bank = None
+        self.sbox16 = None
+        self.inverse_sbox16 = None
+        self.search_result = None
         
         # S-Box'ı oluştur
-        self.generate_sbox()
+        if bank_size > 1:
+            self.generate_bank(bank_size)
+        elif candidates > 1:
+            self.search_sbox(candidates)
+        else:
+            self.generate_sbox()
+        
+        # 16-bit tablo 8-bit S-Box'tan sonra aynı FPLM akışından üretilir
+        if bits == 16:
+            self.generate_sbox16()
+        
+        # Tek S-Box modlarında banka, S-Box'ın (1, 256) görünümüdür
+        if self.sbox_bank is None:
+            self.sbox_bank = self.sbox[None, :]
+            self.inverse_bank = self.inverse_sbox[None, :]
     
     def generate_sbox(self):
         """
@@ -37,23 +246,178 @@ class DynamicPolybius:
         
         256 elemanlı bir array oluşturulur ve FPLM'den gelen
         kaotik sayılarla Fisher-Yates shuffle algoritması ile karıştırılır.
-        """
-        # 0-255 arası tüm byte değerlerini içeren array
-        self.sbox = np.arange(256, dtype=np.uint8)
         
-        # Fisher-Yates shuffle (FPLM destekli)
-        for i in range(255, 0, -1):
-            # FPLM'den rastgele indeks
-            rand_val = self.fplm.step()
-            j = int(rand_val * (i + 1)) % (i + 1)
-            
-            # Swap
-            self.sbox[i], self.sbox[j] = self.sbox[j], self.sbox[i]
+        255 FPLM değeri tek bir toplu çağrıyla alınır, karıştırma derlenmiş
+        kodda yapılır; tablo eski adım adım sürümle bit-bit aynıdır.
+        """
+        # Fisher-Yates shuffle (FPLM destekli): i = 255 ... 1 için birer değer
+        rand_vals = self.fplm.generate(255)
+        self.sbox = keyed_permutation(rand_vals, 256).astype(np.uint8)
         
         # Ters S-Box oluştur (deşifreleme için)
-        self.inverse_sbox = np.zeros(256, dtype=np.uint8)
-        for i in range(256):
-            self.inverse_sbox[self.sbox[i]] = i
+        self.inverse_sbox = inverse_permutation(self.sbox)
+    
+    def search_sbox(self, candidates):
+        """
+        Anahtar-bağımlı S-Box araması
+        
+        Aday 0 klasik FPLM karıştırmasıdır; diğer adaylar FPLM durumundan
+        türetilen bağımsız FPLM'lerle toplu ve paralel üretilir (sabit veya
+        kısa periyotlu akışlar puanlanmadan atılır). Her aday
+        nonlinearity (büyük), diferansiyel düzgünlük (küçük) ve SAC sapması
+        (küçük) ile puanlanır; sıralama eşitlikte en küçük indekse gider,
+        böylece seçim anahtar için tekrarlanabilirdir.
+        
+        Args:
+        candidates : Aday sayısı
+        """
+        # Aday akışları ana FPLM ilerlemeden önceki durumdan türetilir
+        derived = candidate_sequences(self.fplm, candidates - 1)
+        
+        rand_vals = np.empty((candidates, 255), dtype=np.float64)
+        rand_vals[0] = self.fplm.generate(255)
+        rand_vals[1:] = derived
+        
+        sboxes = keyed_permutations(rand_vals, 256).astype(np.uint8)
+        
+        nl = SBoxMetrics.nonlinearity(sboxes)
+        du = SBoxMetrics.differential_uniformity(sboxes)
+        sac_dev = SBoxMetrics.sac_summary(sboxes)['max_deviation']
+        
+        # Aday 0 anahtarın kendi akışıdır; zayıfsa türetilmiş adayların arkasına düşer
+        weak = distinct_counts(rand_vals) < CANDIDATE_MIN_DISTINCT
+        
+        # np.lexsort: son anahtar birincil -> (weak, -nl, du, sac_dev, indeks)
+        order = np.lexsort((np.arange(candidates), sac_dev, du, -nl, weak))
+        best = int(order[0])
+        
+        self.sbox = sboxes[best]
+        self.inverse_sbox = inverse_permutation(self.sbox)
+        self.search_result = {
+            'index': best,
+            'nonlinearity': int(nl[best]),
+            'differential_uniformity': int(du[best]),
+            'sac_max_deviation': float(sac_dev[best]),
+            'candidates': candidates
+        }
+    
+    def generate_bank(self, bank_size):
+        """
+        Bölge başına S-Box bankası oluştur (tek toplu geçiş)
+        
+        Tablo 0 klasik FPLM karıştırmasıdır (bank_size=1 ile aynı S-Box);
+        diğer tablolar FPLM durumundan türetilen bağımsız FPLM'lerle
+        toplu ve paralel üretilir, tersleri tek scatter ile hesaplanır.
+        
+        Args:
+        bank_size : Tablo sayısı K
+        """
+        derived = candidate_sequences(self.fplm, bank_size - 1, purpose='bank')
+        
+        rand_vals = np.empty((bank_size, 255), dtype=np.float64)
+        rand_vals[0] = self.fplm.generate(255)
+        rand_vals[1:] = derived
+        
+        self.sbox_bank = keyed_permutations(rand_vals, 256).astype(np.uint8)
+        self.inverse_bank = inverse_permutation(self.sbox_bank)
+        
+        self.sbox = self.sbox_bank[0]
+        self.inverse_sbox = self.inverse_bank[0]
+    
+    def generate_sbox16(self):
+        """
+        Piksel çifti (16-bit) S-Box'ı oluştur
+        
+        65535 FPLM değeri tek toplu çağrıyla alınır ve 65536 elemanlı
+        tablo derlenmiş Fisher-Yates ile karıştırılır (128 KB, L2'ye sığar).
+        """
+        rand_vals = self.fplm.generate(65535)
+        self.sbox16 = keyed_permutation(rand_vals, 65536).astype(np.uint16)
+        self.inverse_sbox16 = inverse_permutation(self.sbox16)
+    
+    def _apply_pairs(self, data, table16, table8):
+        """Çiftleri little-endian uint16 olarak tablo16'dan, tek kalan byte'ı tablo8'den geçir"""
+        data = np.asarray(data, dtype=np.uint8)
+        length = data.shape[-1]
+        n_pairs = length // 2
+        
+        # Son eksen boyunca çiftler: (..., L) -> (..., L//2) uint16
+        result = np.empty(data.shape, dtype=np.uint8)
+        pairs = np.ascontiguousarray(data[..., :2 * n_pairs]).view('<u2')
+        result[..., :2 * n_pairs] = np.take(table16, pairs).astype('<u2', copy=False).view(np.uint8)
+        
+        if length % 2:
+            result[..., -1] = table8[data[..., -1]]
+        
+        return result
+    
+    def substitute_pairs(self, data):
+        """
+        16-bit S-Box ile piksel çifti substitution'ı
+        
+        Ardışık iki piksel little-endian uint16 olarak tek aramada
+        değiştirilir; tek sayıda pikselde son piksel 8-bit S-Box'tan geçer.
+        Çok boyutlu girdide çiftler son eksen boyunca alınır (her satır ayrı).
+        
+        Args:
+        data : numpy array (uint8, düz veya (..., L))
+        
+        Returns:
+        numpy array: Substitute edilmiş veri (uint8, girdiyle aynı şekil)
+        """
+        return self._apply_pairs(data, self.sbox16, self.sbox)
+    
+    def inverse_substitute_pairs(self, data):
+        """
+        16-bit ters S-Box ile piksel çifti substitution'ını geri al
+        
+        Args:
+        data : numpy array (uint8, düz veya (..., L))
+        
+        Returns:
+        numpy array: Orijinal veri (uint8, girdiyle aynı şekil)
+        """
+        return self._apply_pairs(data, self.inverse_sbox16, self.inverse_sbox)
+    
+    def bank_rows(self, height):
+        """
+        Her görüntü satırının kullandığı banka tablosu (eşit satır bantları)
+        
+        Args:
+        height : Görüntü yüksekliği H
+        
+        Returns:
+        numpy.ndarray: (H,) tablo indeksleri, satır r -> r * K // H
+        """
+        return (np.arange(height) * len(self.sbox_bank)) // height
+    
+    def substitute_bank(self, data):
+        """
+        Satır bandı başına S-Box ile substitution
+        
+        (K, 256) yığını üzerinde tek bir fancy-index gather yapılır.
+        
+        Args:
+        data : numpy array (H, W) veya (N, H, W) uint8
+        
+        Returns:
+        numpy array: Aynı şekilde substitute edilmiş veri
+        """
+        rows = self.bank_rows(data.shape[-2])
+        return self.sbox_bank[rows[:, None], data]
+    
+    def inverse_substitute_bank(self, data):
+        """
+        Satır bandı başına ters S-Box ile substitution'ı geri al
+        
+        Args:
+        data : numpy array (H, W) veya (N, H, W) uint8
+        
+        Returns:
+        numpy array: Aynı şekilde orijinal veri
+        """
+        rows = self.bank_rows(data.shape[-2])
+        return self.inverse_bank[rows[:, None], data]
     
     def substitute(self, data):
         """
@@ -65,7 +429,7 @@ class DynamicPolybius:
         Returns:
         numpy array: Substitute edilmiş veri
         """
-        return self.sbox[data]
+        return np.take(self.sbox, data)
     
     def inverse_substitute(self, data):
         """
@@ -77,7 +441,7 @@ class DynamicPolybius:
         Returns:
         numpy array: Orijinal veri
         """
-        return self.inverse_sbox[data]
+        return np.take(self.inverse_sbox, data)
     
     def get_sbox_matrix(self):
         """
@@ -96,50 +460,80 @@ class DynamicPolybius:
         Returns:
         float: Ortalama değişen bit sayısı (ideal: 4.0 bit = %50)
         """
-        total_changed_bits = 0
-        test_count = 256
+        # 256 girişin hepsi için ilk biti flip et, değişen bitleri popcount tablosuyla say
+        x = np.arange(256)
+        changed_bits = POPCOUNT_LUT[self.sbox[x] ^ self.sbox[x ^ 1]]
+        
+        return float(changed_bits.mean())
+    
+    def sac_matrix(self):
+        """
+        Tam Strict Avalanche Criterion (SAC) matrisi
         
-        for val in range(test_count):
-            original = np.uint8(val)
-            substituted = self.sbox[original]
-            
-            # 1 bit değiştir
-            flipped = original ^ 1  # İlk biti flip et
-            substituted_flipped = self.sbox[flipped]
-            
-            # Kaç bit değişti?
-            xor_result = substituted ^ substituted_flipped
-            changed_bits = bin(xor_result).count('1')
-            
-            total_changed_bits += changed_bits
+        8 giriş bitinin her biri 256 girişin hepsi için çevrilir.
         
-        avg_changed_bits = total_changed_bits / test_count
+        Returns:
+        numpy.ndarray: 8x8 matris, [i, j] = giriş biti i çevrilince
+                       çıkış biti j'nin değişme olasılığı (ideal: 0.5)
+        """
+        return SBoxMetrics.sac_matrix(self.sbox)
+    
+    def bit_independence(self):
+        """
+        Bit Independence Criterion (BIC) istatistikleri
         
-        return avg_changed_bits
+        Returns:
+        dict: SBoxMetrics.bit_independence() çıktısı
+        """
+        return SBoxMetrics.bit_independence(self.sbox)
     
     def nonlinearity(self):
         """
         S-Box'ın doğrusal olmama (nonlinearity) derecesini ölç
         
+        Tüm 255x255 giriş/çıkış maske çifti üzerinden, hızlı
+        Walsh-Hadamard dönüşümüyle tam olarak hesaplanır.
+        
         Returns:
-        float: Nonlinearity skoru (yüksek = iyi)
+        float: Nonlinearity skoru (yüksek = iyi, AES: 112)
         """
-        # Walsh spektrum analizi (basitleştirilmiş)
-        walsh_values = []
+        return float(SBoxMetrics.nonlinearity(self.sbox))
+    
+    def linear_approximation_table(self):
+        """
+        Linear Approximation Table (LAT)
         
-        for a in range(1, 256, 16):  # Her 16'da bir test et (hız için)
-            walsh_sum = 0
-            for x in range(256):
-                fx = self.sbox[x]
-                parity = bin((a & x) ^ fx).count('1') % 2
-                walsh_sum += (-1) ** parity
-            
-            walsh_values.append(abs(walsh_sum))
+        Returns:
+        numpy.ndarray: 256x256, LAT[a, b] = #{x : a·x = b·S(x)} - 128
+        """
+        return SBoxMetrics.linear_approximation_table(self.sbox)
+    
+    def difference_distribution_table(self):
+        """
+        Difference Distribution Table (DDT)
         
-        max_walsh = max(walsh_values)
-        nonlinearity = 128 - (max_walsh / 2)
+        Returns:
+        numpy.ndarray: 256x256, DDT[dx, dy] = #{x : S(x) ⊕ S(x ⊕ dx) = dy}
+        """
+        return SBoxMetrics.difference_distribution_table(self.sbox)
+    
+    def differential_uniformity(self):
+        """
+        Diferansiyel düzgünlük (küçük = iyi, AES: 4)
         
-        return nonlinearity
+        Returns:
+        int: max_{dx≠0, dy} DDT[dx, dy]
+        """
+        return int(SBoxMetrics.differential_uniformity(self.sbox))
+    
+    def differential_summary(self):
+        """
+        Diferansiyel ve boomerang analiz özeti
+        
+        Returns:
+        dict: SBoxMetrics.differential_summary() çıktısı
+        """
+        return SBoxMetrics.differential_summary(self.sbox)
     
     def visualize_sbox(self, save_path=None):
         """
@@ -188,6 +582,15 @@ class DynamicPolybius:
         plt.show()
     
     def __repr__(self):
+        if self.bits == 16:
+            return (f"DynamicPolybius(size={self.size}x{self.size}, elements={self.size**2}, "
+                    f"pair_elements=65536)")
+        if self.bank_size > 1:
+            return (f"DynamicPolybius(size={self.size}x{self.size}, elements={self.size**2}, "
+                    f"bank_size={self.bank_size})")
+        if self.candidates > 1:
+            return (f"DynamicPolybius(size={self.size}x{self.size}, elements={self.size**2}, "
+                    f"candidates={self.candidates})")
         return f"DynamicPolybius(size={self.size}x{self.size}, elements={self.size**2})"
 
 
@@ -233,17 +636,39 @@ if __name__ == "__main__":
     else:
         print("  ❌ Avalanche testi BAŞARISIZ")
     
+    # SAC / BIC
+    sac = sbox.sac_matrix()
+    bic = sbox.bit_independence()
+    print(f"\nSAC Matrisi:")
+    print(f"  Ortalama: {sac.mean():.4f} (İdeal: 0.5)")
+    print(f"  Aralık:   {sac.min():.4f} - {sac.max():.4f}")
+    print(f"  BIC max korelasyon: {bic['max_correlation']:.4f}")
+    
     # Nonlinearity
     nonlin = sbox.nonlinearity()
     print(f"\nNonlinearity:")
     print(f"  Skor: {nonlin:.2f}")
-    print(f"  İdeal: >100")
+    print(f"  İdeal: >100 (AES: 112)")
     
     if nonlin > 100:
         print("  ✅ Nonlinearity testi GEÇTI")
     else:
         print("  ⚠️  Nonlinearity düşük")
     
+    # Diferansiyel analiz
+    diff = sbox.differential_summary()
+    print(f"\nDiferansiyel Analiz:")
+    print(f"  Diferansiyel düzgünlük: {diff['differential_uniformity']} (AES: 4)")
+    print(f"  Boomerang düzgünlüğü:   {diff['boomerang_uniformity']} (AES: 6)")
+    
+    # Anahtar-bağımlı S-Box araması
+    searched = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99), candidates=8)
+    result = searched.search_result
+    print(f"\nS-Box Araması ({result['candidates']} aday):")
+    print(f"  Seçilen aday: {result['index']}")
+    print(f"  Nonlinearity: {result['nonlinearity']}")
+    print(f"  Diferansiyel düzgünlük: {result['differential_uniformity']}")
+    
     # Görselleştir
     print("\nS-Box görselleştiriliyor...")
     sbox.visualize_sbox("sbox_visualization.png")
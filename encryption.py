@@ -10,68 +10,26 @@ Bu modül tüm bileşenleri bir araya getirir:
 """
 
 import cv2
-import hashlib
 import numpy as np
-from fplm import FPLM
-from toroidal_dfs import ToroidalDFS
-from dynamic_polybius import DynamicPolybius
+from key_schedule import (KeySchedule, get_key_schedule, image_depth, pixel_array,
+                          sha256_key_derivation, USE_NUMBA)
+from instrumentation import logger
 
 # Numba hızlandırma (opsiyonel - yoksa normal Python çalışır)
-try:
-    from fast_numba import (
-        fast_permutation_apply,
-        fast_inverse_permutation_apply,
-        fast_xor_diffusion,
-        fast_inverse_xor_diffusion,
-        fast_sbox_substitute,
-        fast_sbox_inverse
-    )
-    USE_NUMBA = True
-    print("✅ Numba hızlandırma aktif!")
-except ImportError:
-    USE_NUMBA = False
-    print("⚠️  Numba bulunamadı - normal hız modunda çalışıyor")
+if USE_NUMBA:
+    logger.debug("Numba hızlandırma aktif")
+else:
+    logger.warning("Numba bulunamadı - normal hız modunda çalışıyor")
 
 
-def sha256_key_derivation(image, base_key):
-    """
-    Base key'den deterministik anahtar türet
-    
-    NOT: Önceki sürümde görüntü hash'i kullanılıyordu ama bu deşifreleme 
-    için orijinal görüntüyü gerektiriyordu (yanlış tasarım).
-    Şimdi sadece base_key'den türetiliyor.
-    
-    Args:
-    image : numpy array (görüntü) - kullanılmıyor, geriye uyumluluk için
-    base_key : list [x0, u0, r, a, b, c, delta]
-    
-    Returns:
-    list: Dinamik anahtar
-    """
-    # Base key'den deterministik hash üret
-    key_str = ','.join(map(str, base_key))
-    hash_digest = hashlib.sha256(key_str.encode()).hexdigest()
-    
-    # Hash'ten 7 sayı türet
-    hash_values = []
-    for i in range(0, 56, 8):
-        hex_chunk = hash_digest[i:i+8]
-        value = int(hex_chunk, 16) / 0xFFFFFFFF  # [0, 1] normalize
-        hash_values.append(value)
-    
-    # Base key ile karıştır
-    dynamic_key = list(base_key)
-    dynamic_key[0] = (dynamic_key[0] + hash_values[0]) % 1.0  # x0
-    dynamic_key[1] = (dynamic_key[1] + hash_values[1]) % 1.0  # u0
-    dynamic_key[2] = dynamic_key[2] + (hash_values[2] * 0.1)  # r (küçük değişim)
-    
-    # Parametreleri sınırla
-    dynamic_key[2] = max(3.57, min(4.0, dynamic_key[2]))
-    
-    return dynamic_key
+def _check_stack(images):
+    """Toplu API yalnızca gri seviye (N, H, W) yığınları kabul eder"""
+    if images.ndim != 3:
+        raise ValueError(f"Gri seviye (N, H, W) görüntü yığını bekleniyor, gelen: {images.shape}")
 
 
-def encrypt_image(image_path, base_key):
+def encrypt_image(image_path, base_key, sbox_candidates=1, sbox_bank=1, sbox_bits=8,
+                  color_mode=None, diffusion_version=1, key_version=1, tile_size=None):
     """
     Görüntüyü şifrele
     
@@ -82,202 +40,198 @@ def encrypt_image(image_path, base_key):
     4. Dinamik S-Box ile substitution yap
     5. XOR zincirleme ile difüzyon yap
     
+    2-5. adımların tabloları (anahtar, boyut) başına bir kez KeySchedule
+    olarak üretilir ve önbellekte tutulur. 16-bit dosyalar (PNG/TIFF)
+    kesilmeden uint16 olarak okunur ve 16-bit modda şifrelenir.
+    
     Args:
     image_path : str - Görüntü yolu
     base_key : list [x0, u0, r, a, b, c, delta]
+    sbox_candidates : int - Anahtar-bağımlı S-Box araması aday sayısı
+                      (1 = klasik S-Box; deşifrelemede aynı değer verilmeli)
+    sbox_bank : int - Satır bandı başına S-Box sayısı (1 = tek S-Box)
+    sbox_bits : int - 8 = byte S-Box, 16 = piksel çifti (uint16) S-Box'ı
+    color_mode : str - None = gri seviye oku (varsayılan); 'flat', 'channel' veya
+                 'cross' = renkleri (BGR/BGRA) koruyarak oku ve bu modla şifrele
+    diffusion_version : int - 1 = XOR zinciri (varsayılan), 2 = 2-D satır/sütun
+                        difüzyonu (tek piksel değişimi tüm görüntüye yayılır)
+    key_version : int - 1 = tek dinamik anahtar (varsayılan), 2 = permütasyon, S-Box ve
+                  difüzyon için ayrı alt anahtarlar
+    tile_size : int - Verilirse döşemeli mod: bölgeler ayrı deşifre edilebilir
+                (bkz. tiled_encrypt.py)
     
     Returns:
     numpy.ndarray: Şifreli görüntü
     """
-    # 1. Görüntüyü yükle (gri seviye)
-    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    # 1. Görüntüyü yükle (gri seviye veya renkli; 8/16-bit derinlik korunur)
+    if color_mode is None:
+        read_flag = cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH
+    else:
+        read_flag = cv2.IMREAD_UNCHANGED
+    img = cv2.imread(image_path, read_flag)
     if img is None:
         raise FileNotFoundError(f"Görüntü bulunamadı: {image_path}")
+    depth = image_depth(img)
     
-    H, W = img.shape
-    
-    print(f"Görüntü yüklendi: {H}x{W}")
-    
-    # 2. Dinamik anahtar türet
-    dynamic_key = sha256_key_derivation(img, base_key)
-    print(f"Dinamik anahtar türetildi")
+    logger.info("Görüntü yüklendi: %s (%d-bit)", 'x'.join(map(str, img.shape)), depth)
     
-    # 3. FPLM başlat - Her işlem için AYRI state'e sahip kopyalar
-    fplm_perm = FPLM(*dynamic_key)
-    fplm_sbox = FPLM(*dynamic_key)  
-    fplm_diff = FPLM(*dynamic_key)
+    # 2-5. Anahtar çizelgesi (dinamik anahtar, permütasyon, S-Box, anahtar akışı)
+    schedule = get_key_schedule(base_key, img.shape, sbox_candidates=sbox_candidates,
+                                sbox_bank=sbox_bank, sbox_bits=sbox_bits, depth=depth,
+                                color_mode=color_mode or 'flat',
+                                diffusion_version=diffusion_version, key_version=key_version,
+                                tile_size=tile_size)
     
-    # 4. Permütasyon (Toroidal DFS)
-    print(f"Permütasyon yapılıyor...")
-    dfs = ToroidalDFS(H, W, fplm_perm)
-    path = dfs.generate_path()
-    
-    flat_img = img.flatten()
-    
-    # Permütasyon: NumPy vektörizasyonu
-    path_flat_indices = np.array([r * W + c for r, c in path], dtype=np.int32)
-    if USE_NUMBA:
-        permuted_flat = fast_permutation_apply(flat_img, path_flat_indices)
-    else:
-        permuted_flat = flat_img[path_flat_indices]
+    logger.info("Permütasyon, S-Box ve XOR difüzyonu yapılıyor (%s)",
+                'Numba' if USE_NUMBA else 'NumPy')
+    encrypted_img = schedule.encrypt(img)
     
-    print(f"Permütasyon tamamlandı {'(Numba)' if USE_NUMBA else '(NumPy)'}")
-    
-    # 5. S-Box Substitution
-    print(f"S-Box substitution yapılıyor...")
-    sbox = DynamicPolybius(fplm_sbox)
-    
-    substituted_flat = sbox.substitute(permuted_flat)  # Zaten NumPy vektörize: sbox[data]
-    
-    # 6. XOR Difüzyon (Zincirleme)
-    print(f"XOR difüzyonu yapılıyor...")
-    
-    # FPLM'den anahtar akışı üret
-    key_stream = fplm_diff.get_key_stream(H * W)
-    
-    # XOR Difüzyon: Önce P XOR K hesapla (vektörize), sonra zincirleme
-    xored = np.bitwise_xor(substituted_flat, key_stream)
-    if USE_NUMBA:
-        encrypted_flat = fast_xor_diffusion(substituted_flat, key_stream)
-    else:
-        encrypted_flat = np.empty(H * W, dtype=np.uint8)
-        encrypted_flat[0] = xored[0]
-        for i in range(1, H * W):
-            encrypted_flat[i] = xored[i] ^ encrypted_flat[i - 1]
-    
-    encrypted_img = encrypted_flat.reshape(H, W)
-    
-    print(f"Şifreleme tamamlandı")
+    logger.info("Şifreleme tamamlandı")
     
     return encrypted_img
 
 
-def decrypt_image(encrypted_img, base_key, original_img_for_hash):
+def decrypt_image(encrypted_img, base_key, original_img_for_hash, sbox_candidates=1,
+                  sbox_bank=1, sbox_bits=8, color_mode='flat', diffusion_version=1, key_version=1,
+                  tile_size=None, out=None, workspace=None):
     """
     Şifreli görüntüyü deşifrele
     
     Şifreleme adımlarını tersten uygular.
     
     Args:
-    encrypted_img : numpy.ndarray - Şifreli görüntü
+    encrypted_img : numpy.ndarray - Şifreli görüntü (uint8 veya uint16; diğer türler
+                    uint8'e çevrilir)
     base_key : list - Şifreleme anahtarı
-    original_img_for_hash : numpy.ndarray - SHA-256 için orijinal görüntü
+    original_img_for_hash : numpy.ndarray - Kullanılmıyor, geriye uyumluluk için
+    sbox_candidates : int - Şifrelemede kullanılan S-Box aday sayısı
+    sbox_bank : int - Şifrelemede kullanılan S-Box bankası boyutu
+    sbox_bits : int - Şifrelemede kullanılan S-Box bit genişliği
+    color_mode : str - Renkli (H, W, C) görüntülerde şifrelemede kullanılan mod
+    diffusion_version : int - Şifrelemede kullanılan difüzyon sürümü
+    key_version : int - Şifrelemede kullanılan anahtar sürümü
+    tile_size : int - Şifrelemede kullanılan döşeme boyutu (None = döşemesiz)
+    out : numpy.ndarray - Sonucun yazılacağı dizi (encrypted_img olabilir: yerinde deşifreleme)
+    workspace : Workspace - Yeniden kullanılan çalışma tamponları
     
     Returns:
-    numpy.ndarray: Deşifre edilmiş görüntü
+    numpy.ndarray: Deşifre edilmiş görüntü (out verilmişse out)
     """
-    H, W = encrypted_img.shape
-    
-    print(f"Deşifreleme başlıyor: {H}x{W}")
-    
-    # 1. Aynı dinamik anahtarı üret
-    dynamic_key = sha256_key_derivation(original_img_for_hash, base_key)
-    
-    # 2. FPLM'leri başlat (şifreleme ile AYNI SIRADA ve AYRI state'ler)
-    fplm_perm = FPLM(*dynamic_key)
-    fplm_sbox = FPLM(*dynamic_key)  
-    fplm_diff = FPLM(*dynamic_key)
-    
-    # 3. Toroidal DFS yolunu oluştur (şifreleme ile aynı)
-    print(f"DFS yolu oluşturuluyor...")
-    dfs = ToroidalDFS(H, W, fplm_perm)
-    path = dfs.generate_path()
-    
-    # 4. S-Box oluştur (şifreleme ile aynı sırada)
-    sbox = DynamicPolybius(fplm_sbox)
-    
-    # 5. XOR difüzyonunu ters çöz
-    print(f"XOR difüzyonu çözülüyor...")
-    key_stream = fplm_diff.get_key_stream(H * W)
+    logger.info("Deşifreleme başlıyor: %s", 'x'.join(map(str, encrypted_img.shape)))
+    encrypted_img = pixel_array(encrypted_img)
     
-    flat_encrypted = encrypted_img.flatten()
+    # Şifreleme ile aynı çizelge (önbellekte varsa yeniden üretilmez)
+    schedule = get_key_schedule(base_key, encrypted_img.shape, sbox_candidates=sbox_candidates,
+                                sbox_bank=sbox_bank, sbox_bits=sbox_bits,
+                                depth=image_depth(encrypted_img), color_mode=color_mode,
+                                diffusion_version=diffusion_version, key_version=key_version,
+                                tile_size=tile_size)
     
-    # Ters XOR difüzyon: NumPy vektörizasyonu
-    if USE_NUMBA:
-        substituted_flat = fast_inverse_xor_diffusion(flat_encrypted, key_stream)
-    else:
-        prev_chain = np.empty_like(flat_encrypted)
-        prev_chain[0] = 0
-        prev_chain[1:] = flat_encrypted[:-1]
-        substituted_flat = np.bitwise_xor(np.bitwise_xor(flat_encrypted, key_stream), prev_chain)
-    
-    # 6. S-Box'ı ters uygula
-    print(f"S-Box ters substitution yapılıyor...")
-    
-    permuted_flat = sbox.inverse_substitute(substituted_flat)  # Zaten NumPy vektörize
-    
-    # 7. Permütasyonu ters çöz
-    print(f"Permütasyon tersine çevriliyor...")
+    logger.info("XOR difüzyonu, S-Box ve permütasyon tersine çevriliyor")
+    decrypted_img = schedule.decrypt(encrypted_img, out=out, workspace=workspace)
     
-    path_flat_indices = np.array([r * W + c for r, c in path], dtype=np.int32)
-    if USE_NUMBA:
-        decrypted_flat = fast_inverse_permutation_apply(permuted_flat, path_flat_indices)
-    else:
-        decrypted_flat = np.empty_like(permuted_flat)
-        decrypted_flat[path_flat_indices] = permuted_flat
-    
-    decrypted_img = decrypted_flat.reshape(H, W)
-    
-    print(f"Deşifreleme tamamlandı")
+    logger.info("Deşifreleme tamamlandı")
     
     return decrypted_img
 
 
-def encrypt_image_from_array(img_array, base_key):
+def encrypt_image_from_array(img_array, base_key, sbox_candidates=1, sbox_bank=1,
+                             sbox_bits=8, color_mode='flat', diffusion_version=1, key_version=1,
+                             tile_size=None, out=None, workspace=None):
     """
     Numpy array'den direkt şifreleme yap
     (Test amaçlı - dosya kaydetmeye gerek yok)
     
     Args:
-    img_array : numpy.ndarray - Görüntü array'i
+    img_array : numpy.ndarray - (H, W) gri veya (H, W, C) renkli, uint8 veya uint16
+                (diğer türler uint8'e çevrilir)
     base_key : list - Anahtar
+    sbox_candidates : int - Anahtar-bağımlı S-Box araması aday sayısı
+    sbox_bank : int - Satır bandı başına S-Box sayısı (1 = tek S-Box)
+    sbox_bits : int - 8 = byte S-Box, 16 = piksel çifti (uint16) S-Box'ı
+    color_mode : str - Renkli görüntülerde 'flat' (tek permütasyon alanı),
+                 'channel' (kanal başına çizelge) veya 'cross' (kanallar arası difüzyon)
+    diffusion_version : int - 1 = XOR zinciri, 2 = 2-D satır/sütun difüzyonu
+                        (renkli görüntülerde yalnızca 'flat')
+    key_version : int - 1 = tek dinamik anahtar, 2 = aşama başına alt anahtar
+    tile_size : int - Verilirse döşemeli mod (bölge deşifreleme için; bkz. tiled_encrypt.py)
+    out : numpy.ndarray - Sonucun yazılacağı dizi (img_array olabilir: yerinde şifreleme)
+    workspace : Workspace - Yeniden kullanılan çalışma tamponları (bkz. workspace.py)
     
     Returns:
-    numpy.ndarray: Şifreli görüntü
+    numpy.ndarray: Şifreli görüntü (out verilmişse out)
     """
-    H, W = img_array.shape
-    
-    # Dinamik anahtar türet
-    dynamic_key = sha256_key_derivation(img_array, base_key)
-    
-    # FPLM'leri başlat - Her işlem için AYRI state'e sahip kopyalar (şifreleme ile AYNI SIRA)
-    fplm_perm = FPLM(*dynamic_key)
-    fplm_sbox = FPLM(*dynamic_key)
-    fplm_diff = FPLM(*dynamic_key)
-    
-    # Permütasyon
-    dfs = ToroidalDFS(H, W, fplm_perm)
-    path = dfs.generate_path()
+    img_array = pixel_array(img_array)
+    schedule = get_key_schedule(base_key, img_array.shape, sbox_candidates=sbox_candidates,
+                                sbox_bank=sbox_bank, sbox_bits=sbox_bits,
+                                depth=image_depth(img_array), color_mode=color_mode,
+                                diffusion_version=diffusion_version, key_version=key_version,
+                                tile_size=tile_size)
+    return schedule.encrypt(img_array, out=out, workspace=workspace)
+
+
+def encrypt_images_from_array(images, base_key, sbox_candidates=1, sbox_bank=1, sbox_bits=8,
+                              diffusion_version=1, key_version=1, out=None, workspace=None):
+    """
+    (N, H, W) aynı boyutlu görüntü yığınını toplu şifrele
+    (video parçası, veri seti parçası vb.)
     
-    flat_img = img_array.flatten()
+    Her kare encrypt_image_from_array() sonucu ile bit bit aynıdır ve
+    decrypt_image() ile tek başına deşifre edilebilir.
     
-    # Permütasyon: NumPy vektörizasyonu
-    path_flat_indices = np.array([r * W + c for r, c in path], dtype=np.int32)
-    if USE_NUMBA:
-        permuted_flat = fast_permutation_apply(flat_img, path_flat_indices)
-    else:
-        permuted_flat = flat_img[path_flat_indices]
-    
-    # S-Box (şifreleme ile aynı sırada)
-    sbox = DynamicPolybius(fplm_sbox)
-    substituted_flat = sbox.substitute(permuted_flat)  # NumPy vektörize
+    Args:
+    images : numpy.ndarray - (N, H, W) uint8 veya uint16 görüntü yığını
+    base_key : list - Anahtar
+    sbox_candidates : int - Anahtar-bağımlı S-Box araması aday sayısı
+    sbox_bank : int - Satır bandı başına S-Box sayısı (1 = tek S-Box)
+    sbox_bits : int - 8 = byte S-Box, 16 = piksel çifti (uint16) S-Box'ı
+    diffusion_version : int - 1 = XOR zinciri, 2 = 2-D satır/sütun difüzyonu
+    key_version : int - 1 = tek dinamik anahtar, 2 = aşama başına alt anahtar
+    out : numpy.ndarray - Sonucun yazılacağı (N, H, W) dizi (images olabilir)
+    workspace : Workspace - Yeniden kullanılan çalışma tamponları
     
-    # XOR
-    key_stream = fplm_diff.get_key_stream(H * W)
+    Returns:
+    numpy.ndarray: (N, H, W) şifreli yığın (out verilmişse out)
+    """
+    _check_stack(images)
+    schedule = get_key_schedule(base_key, images.shape[1:], sbox_candidates=sbox_candidates,
+                                sbox_bank=sbox_bank, sbox_bits=sbox_bits,
+                                depth=image_depth(images), diffusion_version=diffusion_version,
+                                key_version=key_version)
+    return schedule.encrypt_batch(images, out=out, workspace=workspace)
+
+
+def decrypt_images(encrypted_images, base_key, sbox_candidates=1, sbox_bank=1, sbox_bits=8,
+                   diffusion_version=1, key_version=1, out=None, workspace=None):
+    """
+    (N, H, W) şifreli görüntü yığınını toplu deşifrele
     
-    xored = np.bitwise_xor(substituted_flat, key_stream)
-    if USE_NUMBA:
-        encrypted_flat = fast_xor_diffusion(substituted_flat, key_stream)
-    else:
-        encrypted_flat = np.empty(H * W, dtype=np.uint8)
-        encrypted_flat[0] = xored[0]
-        for i in range(1, H * W):
-            encrypted_flat[i] = xored[i] ^ encrypted_flat[i - 1]
+    Args:
+    encrypted_images : numpy.ndarray - (N, H, W) şifreli yığın
+    base_key : list - Şifreleme anahtarı
+    sbox_candidates : int - Şifrelemede kullanılan S-Box aday sayısı
+    sbox_bank : int - Şifrelemede kullanılan S-Box bankası boyutu
+    sbox_bits : int - Şifrelemede kullanılan S-Box bit genişliği
+    diffusion_version : int - Şifrelemede kullanılan difüzyon sürümü
+    key_version : int - Şifrelemede kullanılan anahtar sürümü
+    out : numpy.ndarray - Sonucun yazılacağı (N, H, W) dizi (encrypted_images olabilir)
+    workspace : Workspace - Yeniden kullanılan çalışma tamponları
     
-    return encrypted_flat.reshape(H, W)
+    Returns:
+    numpy.ndarray: (N, H, W) deşifre edilmiş yığın (out verilmişse out)
+    """
+    _check_stack(encrypted_images)
+    schedule = get_key_schedule(base_key, encrypted_images.shape[1:],
+                                sbox_candidates=sbox_candidates, sbox_bank=sbox_bank,
+                                sbox_bits=sbox_bits, depth=image_depth(encrypted_images),
+                                diffusion_version=diffusion_version, key_version=key_version)
+    return schedule.decrypt_batch(encrypted_images, out=out, workspace=workspace)
 
 
 if __name__ == "__main__":
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Test kodu
     print("="*60)
     print("ChaosPolybius-2026 Encryption System Test")
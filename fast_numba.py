@@ -2,12 +2,103 @@
 ChaosPolybius-2026 - Numba ile Hızlandırılmış Yardımcı Fonksiyonlar
 
 Mevcut sistemi bozmadan, kritik döngüleri numba ile optimize eder.
+Derlenen kod diske önbelleklenir (cache=True): yeni süreçler (ör. işlem
+havuzu işçileri) JIT derlemesi yapmadan önbellekten yükler.
+
+Permütasyon ve difüzyon çekirdekleri girdinin dtype'ını korur: uint8 ve
+uint16 (16-bit derinlik) görüntüler için ayrı ayrı derlenir.
+
+Tüm çekirdekler GIL'i bırakır (nogil=True): aynı süreçte farklı iş
+parçacıklarından çağrılan şifreleme işlemleri birbirini beklemez.
+
+Paralel (prange) çekirdeklerin her birinin seri bir ikizi vardır (bkz.
+KernelPair): çağıran iş parçacığında tek Numba iş parçacığı varsa
+(set_kernel_threads(1), şifreleme motoru iş parçacıkları) seri ikiz
+çalışır ve Numba'nın iş parçacığı havuzuna girilmez. 'workqueue' katmanı
+aynı anda birden çok iş parçacığından paralel çekirdek çağrılmasına izin
+vermez (süreç sonlanır); tbb katmanı izin verir.
 """
 
+import contextlib
+import itertools
+import math
+import types
 import numpy as np
-from numba import jit
+from numba import config, jit, prange, get_num_threads, set_num_threads, threading_layer
+
+
+def set_kernel_threads(count):
+    """
+    Bu iş parçacığından çağrılan paralel çekirdeklerin iş parçacığı sayısı
+
+    Numba'nın ayarı iş parçacığına özeldir: birçok iş parçacığı ayrı
+    görüntüleri işlerken her birini 1'e indirmek çekirdeklerin aşırı
+    abonelik yapmasını önler. NUMBA_NUM_THREADS ile sınırlanır.
+
+    Args:
+    count : int - İstenen iş parçacığı sayısı
+    """
+    set_num_threads(max(1, min(int(count), config.NUMBA_NUM_THREADS)))
+
+
+@contextlib.contextmanager
+def kernel_threads(count):
+    """
+    Blok süresince bu iş parçacığının paralel çekirdek iş parçacığı sayısı
+
+    Çıkışta önceki sayı geri yüklenir (count=1: yalnızca seri ikizler çalışır).
+    """
+    previous = get_num_threads()
+    set_kernel_threads(count)
+    try:
+        yield
+    finally:
+        set_num_threads(previous)
+
+
+def parallel_threadsafe():
+    """
+    Paralel çekirdekler birden çok iş parçacığından aynı anda çağrılabilir mi
+
+    'workqueue' katmanı iş parçacığı güvenli değildir; katman ilk paralel
+    çekirdek çalıştığında seçilir (o zamana kadar güvensiz sayılır).
+    """
+    try:
+        return threading_layer() != 'workqueue'
+    except ValueError:
+        return False
+
+
+class KernelPair:
+    """
+    Paralel (prange) çekirdek ve seri ikizi
+
+    Seri ikiz aynı kaynaktan parallel=False ile derlenir (prange = range).
+    Numba'nın disk önbelleği derleme seçeneklerini ayırt etmediği için ikiz
+    ayrı bir adla (ayrı önbellek dosyası) derlenir. Çağrı, çağıran iş
+    parçacığında birden fazla Numba iş parçacığı varsa paralel, yoksa seri
+    derlemeye gider; iki derleme bit bit aynı sonucu verir.
+    """
+
+    def __init__(self, kernel):
+        func = kernel.py_func
+        twin = types.FunctionType(func.__code__, func.__globals__, func.__name__ + '_serial',
+                                  func.__defaults__, func.__closure__)
+        twin.__qualname__ = func.__qualname__ + '_serial'
+        self.parallel = kernel
+        self.serial = jit(nopython=True, nogil=True, cache=True)(twin)
+        self.__name__, self.__doc__ = func.__name__, func.__doc__
+
+    def __call__(self, *args):
+        if get_num_threads() > 1:
+            return self.parallel(*args)
+        return self.serial(*args)
+
+    def __repr__(self):
+        return f"KernelPair({self.__name__})"
+
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def fast_permutation_apply(flat_img, path_flat_indices):
     """
     Permütasyon işlemini numba ile hızlandır
@@ -20,7 +111,7 @@ def fast_permutation_apply(flat_img, path_flat_indices):
         Permütasyon uygulanmış array
     """
     N = len(flat_img)
-    permuted = np.zeros(N, dtype=np.uint8)
+    permuted = np.zeros(N, dtype=flat_img.dtype)
     
     for i in range(N):
         orig_idx = path_flat_indices[i]
@@ -29,13 +120,13 @@ def fast_permutation_apply(flat_img, path_flat_indices):
     return permuted
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def fast_inverse_permutation_apply(permuted_flat, path_flat_indices):
     """
     Ters permütasyonu numba ile hızlandır
     """
     N = len(permuted_flat)
-    decrypted = np.zeros(N, dtype=np.uint8)
+    decrypted = np.zeros(N, dtype=permuted_flat.dtype)
     
     for i in range(N):
         orig_idx = path_flat_indices[i]
@@ -44,14 +135,14 @@ def fast_inverse_permutation_apply(permuted_flat, path_flat_indices):
     return decrypted
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def fast_xor_diffusion(substituted_flat, key_stream):
     """
     XOR zincirleme difüzyonunu numba ile hızlandır
     """
     N = len(substituted_flat)
-    encrypted = np.zeros(N, dtype=np.uint8)
-    prev = np.uint8(0)
+    encrypted = np.zeros(N, dtype=substituted_flat.dtype)
+    prev = 0
     
     for i in range(N):
         encrypted[i] = substituted_flat[i] ^ key_stream[i] ^ prev
@@ -60,14 +151,14 @@ def fast_xor_diffusion(substituted_flat, key_stream):
     return encrypted
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def fast_inverse_xor_diffusion(flat_encrypted, key_stream):
     """
     Ters XOR difüzyonunu numba ile hızlandır
     """
     N = len(flat_encrypted)
-    substituted = np.zeros(N, dtype=np.uint8)
-    prev = np.uint8(0)
+    substituted = np.zeros(N, dtype=flat_encrypted.dtype)
+    prev = 0
     
     for i in range(N):
         substituted[i] = flat_encrypted[i] ^ key_stream[i] ^ prev
@@ -76,14 +167,659 @@ def fast_inverse_xor_diffusion(flat_encrypted, key_stream):
     return substituted
 
 
+@jit(nopython=True, nogil=True, cache=True)
+def _xor_reduce(data, key_stream):
+    """data ^ key_stream dizisinin toplam XOR'u (parça toplamı)"""
+    total = 0
+    for i in range(len(data)):
+        total ^= data[i] ^ key_stream[i]
+    return total
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _xor_scan(data, key_stream, out, prev):
+    """prev taşımasıyla başlayan XOR zinciri (parça içi önek taraması)"""
+    for i in range(len(data)):
+        prev = data[i] ^ key_stream[i] ^ prev
+        out[i] = prev
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _inverse_xor_scan(encrypted, key_stream, out, prev):
+    """prev = önceki parçanın son şifreli elemanı ile ters XOR zinciri"""
+    for i in range(len(encrypted)):
+        out[i] = encrypted[i] ^ key_stream[i] ^ prev
+        prev = encrypted[i]
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_xor_diffusion_parallel(substituted_flat, key_stream, n_chunks):
+    """
+    XOR zincirleme difüzyonu, çok çekirdekli önek XOR taraması
+    
+    Zincir c[i] = s[i] ^ k[i] ^ c[i-1], s ^ k dizisinin önek XOR'udur:
+    1. Her parçanın toplam XOR'u hesaplanır (paralel, vektörize)
+    2. Toplamlardan her parçaya giren taşıma bulunur (sıralı, n_chunks adım)
+    3. Her parça kendi taşımasıyla taranır (paralel)
+    Sonuç fast_xor_diffusion ile bit bit aynıdır. Parça döngüleri ayrı
+    çekirdeklerde dilimler üzerinde çalışır (prange gövdesindeki indeksli
+    döngüler negatif indeks kontrolü yüzünden yavaş derleniyor).
+    """
+    N = len(substituted_flat)
+    encrypted = np.empty(N, dtype=substituted_flat.dtype)
+    size = (N + n_chunks - 1) // n_chunks
+    
+    totals = np.zeros(n_chunks, dtype=substituted_flat.dtype)
+    for c in prange(n_chunks):
+        start = min(c * size, N)
+        stop = min(start + size, N)
+        totals[c] = _xor_reduce(substituted_flat[start:stop], key_stream[start:stop])
+    
+    carries = np.zeros(n_chunks, dtype=substituted_flat.dtype)
+    for c in range(1, n_chunks):
+        carries[c] = carries[c - 1] ^ totals[c - 1]
+    
+    for c in prange(n_chunks):
+        start = min(c * size, N)
+        stop = min(start + size, N)
+        _xor_scan(substituted_flat[start:stop], key_stream[start:stop],
+                  encrypted[start:stop], carries[c])
+    
+    return encrypted
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_inverse_xor_diffusion_parallel(flat_encrypted, key_stream, n_chunks):
+    """
+    Ters XOR difüzyonu, çok çekirdekli (her eleman yalnızca c[i-1]'e bağlı)
+    """
+    N = len(flat_encrypted)
+    substituted = np.empty(N, dtype=flat_encrypted.dtype)
+    size = (N + n_chunks - 1) // n_chunks
+    
+    for c in prange(n_chunks):
+        start = min(c * size, N)
+        stop = min(start + size, N)
+        prev = flat_encrypted[start - 1] if start > 0 else flat_encrypted.dtype.type(0)
+        _inverse_xor_scan(flat_encrypted[start:stop], key_stream[start:stop],
+                          substituted[start:stop], prev)
+    
+    return substituted
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _fused_scan(flat_img, path_flat_indices, key_stream, sbox, out, prev):
+    """Permütasyon gather + S-Box + XOR zinciri tek geçişte; son zincir değerini döndürür"""
+    for i in range(len(out)):
+        prev = sbox[flat_img[path_flat_indices[i]]] ^ key_stream[i] ^ prev
+        out[i] = prev
+    return prev
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _xor_carry(out, carry):
+    """Parçaya önceki parçalardan gelen taşımayı uygula"""
+    for i in range(len(out)):
+        out[i] ^= carry
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _inverse_fused_scatter(encrypted, key_stream, path_flat_indices, inverse_sbox, out, prev):
+    """Ters XOR zinciri + ters S-Box + permütasyon scatter tek geçişte"""
+    for i in range(len(encrypted)):
+        out[path_flat_indices[i]] = inverse_sbox[encrypted[i] ^ key_stream[i] ^ prev]
+        prev = encrypted[i]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fast_encrypt_fused(flat_img, path_flat_indices, sbox, key_stream, out):
+    """
+    Permütasyon, S-Box ve XOR difüzyonu tek geçişte
+    
+    Her piksel bir kez okunur (permütasyon sırasıyla), S-Box'tan geçer,
+    zincire eklenir ve bir kez yazılır; ara diziler oluşturulmaz.
+    Sonuç ayrı ayrı uygulanan üç adımla bit bit aynıdır.
+    
+    Args:
+        flat_img: (H*W,) düz görüntü (uint8 veya uint16)
+        path_flat_indices: Permütasyon (düz indeksler)
+        sbox: Piksel S-Box'ı (256 veya 65536 eleman)
+        key_stream: (H*W,) anahtar akışı
+        out: (H*W,) çıktı dizisi (flat_img ile örtüşmemeli)
+    """
+    _fused_scan(flat_img, path_flat_indices, key_stream, sbox, out, 0)
+    return out
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_encrypt_fused_parallel(flat_img, path_flat_indices, sbox, key_stream, n_chunks, out):
+    """
+    Tek geçişli şifreleme, çok çekirdekli
+    
+    1. Her parça gather + S-Box + yerel XOR zincirini paralel hesaplar
+       (zincirin son değeri parçanın toplam XOR'udur)
+    2. Toplamlardan her parçaya giren taşıma bulunur (sıralı, n_chunks adım)
+    3. Taşıma parçalara paralel uygulanır (sıralı okuma/yazma)
+    Sonuç out dizisine yazılır (flat_img ile örtüşmemeli).
+    """
+    N = len(flat_img)
+    size = (N + n_chunks - 1) // n_chunks
+    
+    totals = np.zeros(n_chunks, dtype=flat_img.dtype)
+    for c in prange(n_chunks):
+        start = min(c * size, N)
+        stop = min(start + size, N)
+        totals[c] = _fused_scan(flat_img, path_flat_indices[start:stop], key_stream[start:stop],
+                                sbox, out[start:stop], 0)
+    
+    carries = np.zeros(n_chunks, dtype=flat_img.dtype)
+    for c in range(1, n_chunks):
+        carries[c] = carries[c - 1] ^ totals[c - 1]
+    
+    for c in prange(1, n_chunks):
+        start = min(c * size, N)
+        stop = min(start + size, N)
+        _xor_carry(out[start:stop], carries[c])
+    
+    return out
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_decrypt_fused(flat_encrypted, path_flat_indices, inverse_sbox, key_stream, n_chunks, out):
+    """
+    Ters XOR difüzyonu, ters S-Box ve ters permütasyon tek geçişte (paralel)
+    
+    Her eleman yalnızca kendisine ve bir önceki şifreli elemana bağlı
+    olduğu için parçalar bağımsızdır. Sonuç permütasyon indeksleriyle
+    doğrudan out dizisine yazılır (scatter; girdiyle örtüşmemeli), ters
+    permütasyon tablosu gerekmez.
+    """
+    N = len(flat_encrypted)
+    size = (N + n_chunks - 1) // n_chunks
+    
+    for c in prange(n_chunks):
+        start = min(c * size, N)
+        stop = min(start + size, N)
+        prev = flat_encrypted[start - 1] if start > 0 else flat_encrypted.dtype.type(0)
+        _inverse_fused_scatter(flat_encrypted[start:stop], key_stream[start:stop],
+                               path_flat_indices[start:stop], inverse_sbox, out, prev)
+    
+    return out
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_encrypt_fused_batch(flat_imgs, path_flat_indices, sbox, key_stream, out):
+    """
+    (N, H*W) görüntü yığınını tek geçişte şifrele: her kare kendi zinciriyle (paralel)
+    """
+    N = flat_imgs.shape[0]
+    
+    for n in prange(N):
+        _fused_scan(flat_imgs[n], path_flat_indices, key_stream, sbox, out[n], 0)
+    
+    return out
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_decrypt_fused_batch(flat_encrypted, path_flat_indices, inverse_sbox, key_stream, out):
+    """
+    (N, H*W) şifreli yığını tek geçişte deşifrele: kareler bağımsız (paralel)
+    """
+    N = flat_encrypted.shape[0]
+    
+    for n in prange(N):
+        _inverse_fused_scatter(flat_encrypted[n], key_stream, path_flat_indices, inverse_sbox,
+                               out[n], flat_encrypted.dtype.type(0))
+    
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _row_diffusion_2d(row, key, sbox):
+    """Satırda anahtarlı ileri ve anahtarsız geri S-Box zinciri (yerinde)"""
+    W = len(row)
+    prev = 0
+    for j in range(W):
+        prev = sbox[row[j] ^ key[j] ^ prev]
+        row[j] = prev
+    prev = 0
+    for j in range(W):
+        m = W - 1 - j
+        prev = sbox[row[m] ^ prev]
+        row[m] = prev
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _column_diffusion_2d(block, key, sbox):
+    """(H, w) sütun bloğunda anahtarlı ileri (aşağı) ve geri (yukarı) S-Box zinciri"""
+    H, w = block.shape
+    for c in range(w):
+        block[0, c] = sbox[block[0, c] ^ key[0, c]]
+    for i in range(1, H):
+        for c in range(w):
+            block[i, c] = sbox[block[i, c] ^ key[i, c] ^ block[i - 1, c]]
+    for c in range(w):
+        block[H - 1, c] = sbox[block[H - 1, c]]
+    for k in range(1, H):
+        i = H - 1 - k
+        for c in range(w):
+            block[i, c] = sbox[block[i, c] ^ block[i + 1, c]]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _inverse_diffusion_2d_row(frame, i, key, column_key, inverse_sbox, out):
+    """2-D difüzyonun tersi, tek satır: yalnızca şifreli i-1, i, i+1 satırlarına bağlı"""
+    H, W = frame.shape
+    # Sütun geçişleri: t[r] = S^-1[e[r]] ^ e[r+1], b[i] = S^-1[t[i]] ^ ck[i] ^ t[i-1]
+    for j in range(W):
+        t = inverse_sbox[frame[i, j]]
+        if i + 1 < H:
+            t ^= frame[i + 1, j]
+        b = inverse_sbox[t] ^ column_key[j]
+        if i > 0:
+            b ^= inverse_sbox[frame[i - 1, j]] ^ frame[i, j]
+        out[j] = b
+    # Satır geçişleri: a[j] = S^-1[b[j]] ^ b[j+1], x[j] = S^-1[a[j]] ^ k[j] ^ a[j-1]
+    for j in range(W - 1):
+        out[j] = inverse_sbox[out[j]] ^ out[j + 1]
+    out[W - 1] = inverse_sbox[out[W - 1]]
+    for k in range(W - 1):
+        j = W - 1 - k
+        out[j] = inverse_sbox[out[j]] ^ key[j] ^ out[j - 1]
+    out[0] = inverse_sbox[out[0]] ^ key[0]
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_diffusion_2d(frames, key, column_key, sbox, block_width):
+    """
+    2-D difüzyon (sürüm 2): satırlarda ileri+geri, sonra sütunlarda ileri+geri
+    S-Box zinciri (paralel)
+    
+    Satır geçişleri satırlar, sütun geçişleri block_width genişliğinde sütun
+    blokları üzerinde paralel çalışır; bloklar satır satır (önbellek dostu)
+    işlenir. Tek bir pikselin değişmesi tüm kareyi etkiler.
+    
+    Args:
+        frames: (N, H, W) kareler (uint8 veya uint16)
+        key: (H, W) satır geçişi anahtar akışı
+        column_key: (H, W) sütun geçişi anahtar akışı
+        sbox: Zincirde kullanılan S-Box (256 veya 65536 eleman)
+        block_width: Sütun bloğu genişliği
+    """
+    N, H, W = frames.shape
+    out = frames.copy()
+    
+    for r in prange(N * H):
+        _row_diffusion_2d(out[r // H, r % H], key[r % H], sbox)
+    
+    n_blocks = (W + block_width - 1) // block_width
+    for t in prange(N * n_blocks):
+        n = t // n_blocks
+        start = (t % n_blocks) * block_width
+        stop = min(start + block_width, W)
+        _column_diffusion_2d(out[n, :, start:stop], column_key[:, start:stop], sbox)
+    
+    return out
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_inverse_diffusion_2d(frames, key, column_key, inverse_sbox):
+    """
+    2-D difüzyonun tersi (tüm satırlar bağımsız, paralel)
+    """
+    N, H, W = frames.shape
+    out = np.empty_like(frames)
+    
+    for r in prange(N * H):
+        n = r // H
+        i = r % H
+        _inverse_diffusion_2d_row(frames[n], i, key[i], column_key[i], inverse_sbox, out[n, i])
+    
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fast_fplm_sequence(x_prev, x_curr, r, a, b, c, delta, n):
+    """
+    FPLM dizisini derlenmiş döngüde üret
+    
+    FPLM.step() ile aynı işlem sırasını kullanır (bit-bit aynı çıktı).
+    GIL'i bırakır: çizelge üretiminde DFS ile eşzamanlı çalışabilir.
+    
+    Returns:
+        (dizi, x_prev, x_curr)
+    """
+    sequence = np.empty(n, dtype=np.float64)
+    
+    for i in range(n):
+        logistic_term = r * x_curr * (1 - x_curr)
+        perturbation = a * math.sin(math.pi * x_curr)
+        feedback = b * x_prev * math.sin(math.pi * x_curr)
+        modulation = c * math.sin(2 * math.pi * x_curr) * math.cos(math.pi * x_prev)
+        
+        x_next = (logistic_term + perturbation + feedback + modulation + delta) % 1.0
+        
+        x_prev = x_curr
+        x_curr = x_next
+        sequence[i] = x_next
+    
+    return sequence, x_prev, x_curr
+
+
+# ToroidalDFS.shuffle_neighbors() ile aynı 24 komşu sırası (4! permütasyon, sözlük sırası)
+NEIGHBOR_ORDERS = np.array(list(itertools.permutations(range(4))), dtype=np.int64)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fast_toroidal_dfs(H, W, state, path, visited, stack):
+    """
+    Toroidal DFS gezintisini derlenmiş döngüde düz indekslere üret
+    
+    ToroidalDFS.generate_path() ile aynı ziyaret sırasını ve aynı FPLM
+    adımlarını kullanır (başlangıç için 1 adım + ziyaret başına 1 adım).
+    Tamponlar çağıran tarafından verilir; np.memmap olabilirler. GIL'i
+    bırakır (çizelge üretiminde anahtar akışıyla eşzamanlı çalışır).
+    
+    Args:
+        H, W: Izgara boyutu
+        state: [x_prev, x_curr, r, a, b, c, delta] float64 (FPLM durumu, yerinde güncellenir)
+        path: (H*W,) çıktı indeksleri
+        visited: ((H*W + 7) // 8,) sıfırlanmış uint8 bit haritası
+        stack: (3*H*W + 1,) yığın tamponu (path ile aynı dtype)
+    
+    Returns:
+        Ziyaret edilen düğüm sayısı
+    """
+    x_prev = state[0]
+    x_curr = state[1]
+    r, a, b, c, delta = state[2], state[3], state[4], state[5], state[6]
+    N = H * W
+    neighbors = np.empty(4, dtype=np.int64)
+    
+    # Başlangıç noktası
+    logistic_term = r * x_curr * (1 - x_curr)
+    perturbation = a * math.sin(math.pi * x_curr)
+    feedback = b * x_prev * math.sin(math.pi * x_curr)
+    modulation = c * math.sin(2 * math.pi * x_curr) * math.cos(math.pi * x_prev)
+    start_val = (logistic_term + perturbation + feedback + modulation + delta) % 1.0
+    x_prev = x_curr
+    x_curr = start_val
+    start = (int(start_val * H) % H) * W + int((start_val * 1000) * W) % W
+    
+    n = 0
+    # k = 0: başlangıç noktası; k > 0: ziyaret edilmemiş kalan düğüm k - 1
+    for k in range(N + 1):
+        root = start if k == 0 else k - 1
+        if visited[root >> 3] & (1 << (root & 7)):
+            continue
+        
+        stack[0] = root
+        top = 1
+        while top > 0:
+            top -= 1
+            curr = np.int64(stack[top])
+            if visited[curr >> 3] & (1 << (curr & 7)):
+                continue
+            
+            visited[curr >> 3] |= 1 << (curr & 7)
+            path[n] = curr
+            n += 1
+            
+            row = curr // W
+            col = curr - row * W
+            neighbors[0] = ((row - 1) % H) * W + col
+            neighbors[1] = ((row + 1) % H) * W + col
+            neighbors[2] = row * W + (col - 1) % W
+            neighbors[3] = row * W + (col + 1) % W
+            
+            logistic_term = r * x_curr * (1 - x_curr)
+            perturbation = a * math.sin(math.pi * x_curr)
+            feedback = b * x_prev * math.sin(math.pi * x_curr)
+            modulation = c * math.sin(2 * math.pi * x_curr) * math.cos(math.pi * x_prev)
+            x_next = (logistic_term + perturbation + feedback + modulation + delta) % 1.0
+            x_prev = x_curr
+            x_curr = x_next
+            order = int(x_next * 24) % 24
+            
+            # Ters sırada it: karıştırılmış ilk komşu yığının tepesinde
+            for j in range(3, -1, -1):
+                nbr = neighbors[NEIGHBOR_ORDERS[order, j]]
+                if not visited[nbr >> 3] & (1 << (nbr & 7)):
+                    stack[top] = nbr
+                    top += 1
+    
+    state[0] = x_prev
+    state[1] = x_curr
+    return n
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _toroidal_dfs_path(H, W, state, path):
+    """Tek DFS gezintisi, kendi ziyaret ve yığın tamponlarıyla"""
+    N = H * W
+    visited = np.zeros((N + 7) // 8, dtype=np.uint8)
+    stack = np.empty(3 * N + 1, dtype=path.dtype)
+    fast_toroidal_dfs(H, W, state, path, visited, stack)
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_toroidal_dfs_batch(H, W, states, paths):
+    """
+    Aynı boyutta birden çok bağımsız Toroidal DFS gezintisi (paralel)
+    
+    Args:
+        H, W: Izgara boyutu
+        states: (K, 7) FPLM durumları (yerinde güncellenir)
+        paths: (K, H*W) çıktı indeksleri
+    
+    Returns:
+        paths
+    """
+    K = states.shape[0]
+    
+    for k in prange(K):
+        _toroidal_dfs_path(H, W, states[k], paths[k])
+    
+    return paths
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fast_fisher_yates(rand_vals, n):
+    """
+    FPLM değerleriyle Fisher-Yates karıştırması
+    
+    Args:
+        rand_vals: n-1 adet FPLM değeri (i = n-1 ... 1 sırasıyla)
+        n: Permütasyon uzunluğu
+    
+    Returns:
+        Karıştırılmış 0..n-1 permütasyonu
+    """
+    perm = np.arange(n)
+    
+    for k in range(n - 1):
+        i = n - 1 - k
+        j = int(rand_vals[k] * (i + 1)) % (i + 1)
+        tmp = perm[i]
+        perm[i] = perm[j]
+        perm[j] = tmp
+    
+    return perm
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_fplm_batch(params, n, discard):
+    """
+    Birden çok bağımsız FPLM dizisini paralel üret
+    
+    Args:
+        params: (K, 7) [x0, u0, r, a, b, c, delta] satırları
+        n: Her diziden alınacak değer sayısı
+        discard: Baştan atılacak (transient) adım sayısı
+    
+    Returns:
+        (K, n) float64 diziler
+    """
+    K = params.shape[0]
+    sequences = np.empty((K, n), dtype=np.float64)
+    
+    for k in prange(K):
+        full, _, _ = fast_fplm_sequence(params[k, 0], params[k, 1], params[k, 2],
+                                        params[k, 3], params[k, 4], params[k, 5],
+                                        params[k, 6], discard + n)
+        sequences[k, :] = full[discard:]
+    
+    return sequences
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_fisher_yates_batch(rand_vals, n):
+    """
+    Her satır için ayrı Fisher-Yates permütasyonu (paralel)
+    
+    Args:
+        rand_vals: (K, n-1) FPLM değerleri
+        n: Permütasyon uzunluğu
+    
+    Returns:
+        (K, n) permütasyonlar
+    """
+    K = rand_vals.shape[0]
+    perms = np.empty((K, n), dtype=np.int64)
+    
+    for k in prange(K):
+        perms[k, :] = fast_fisher_yates(rand_vals[k], n)
+    
+    return perms
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_permutation_apply_batch(flat_imgs, path_flat_indices):
+    """
+    Aynı permütasyonu (N, H*W) görüntü yığınının her satırına uygula (paralel)
+    """
+    N, L = flat_imgs.shape
+    permuted = np.empty((N, L), dtype=flat_imgs.dtype)
+    
+    for n in prange(N):
+        for i in range(L):
+            permuted[n, i] = flat_imgs[n, path_flat_indices[i]]
+    
+    return permuted
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_xor_diffusion_batch(substituted_flats, key_stream):
+    """
+    XOR zincirleme difüzyonu: her kare kendi zinciriyle (paralel)
+    """
+    N, L = substituted_flats.shape
+    encrypted = np.empty((N, L), dtype=substituted_flats.dtype)
+    
+    for n in prange(N):
+        prev = 0
+        for i in range(L):
+            prev = substituted_flats[n, i] ^ key_stream[i] ^ prev
+            encrypted[n, i] = prev
+    
+    return encrypted
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_inverse_xor_diffusion_batch(flat_encrypted, key_stream):
+    """
+    Ters XOR difüzyonu: her kare bağımsız (paralel)
+    """
+    N, L = flat_encrypted.shape
+    substituted = np.empty((N, L), dtype=flat_encrypted.dtype)
+    
+    for n in prange(N):
+        prev = 0
+        for i in range(L):
+            substituted[n, i] = flat_encrypted[n, i] ^ key_stream[i] ^ prev
+            prev = flat_encrypted[n, i]
+    
+    return substituted
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_permutation_apply_rows(flat_rows, row_indices):
+    """
+    Her satıra kendi permütasyonunu uygula (ör. kanal başına çizelge, paralel)
+    
+    Args:
+        flat_rows: (C, L) veri
+        row_indices: (C, L) satır başına permütasyon indeksleri
+    """
+    C, L = flat_rows.shape
+    permuted = np.empty((C, L), dtype=flat_rows.dtype)
+    
+    for c in prange(C):
+        for i in range(L):
+            permuted[c, i] = flat_rows[c, row_indices[c, i]]
+    
+    return permuted
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_xor_diffusion_rows(substituted_rows, key_streams):
+    """
+    XOR zincirleme difüzyonu: her satır kendi anahtar akışı ve zinciriyle (paralel)
+    """
+    C, L = substituted_rows.shape
+    encrypted = np.empty((C, L), dtype=substituted_rows.dtype)
+    
+    for c in prange(C):
+        prev = substituted_rows[c, 0] ^ key_streams[c, 0]
+        encrypted[c, 0] = prev
+        for i in range(1, L):
+            prev = substituted_rows[c, i] ^ key_streams[c, i] ^ prev
+            encrypted[c, i] = prev
+    
+    return encrypted
+
+
+@KernelPair
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def fast_inverse_xor_diffusion_rows(encrypted_rows, key_streams):
+    """
+    Ters XOR difüzyonu: her satır kendi anahtar akışıyla (paralel)
+    """
+    C, L = encrypted_rows.shape
+    substituted = np.empty((C, L), dtype=encrypted_rows.dtype)
+    
+    for c in prange(C):
+        substituted[c, 0] = encrypted_rows[c, 0] ^ key_streams[c, 0]
+        for i in range(1, L):
+            substituted[c, i] = encrypted_rows[c, i] ^ key_streams[c, i] ^ encrypted_rows[c, i - 1]
+    
+    return substituted
+
+
 # İsteğe bağlı: S-Box işlemlerini de hızlandırabiliriz
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def fast_sbox_substitute(data, sbox):
     """
     S-Box substitution'ı hızlandır
     """
     N = len(data)
-    result = np.zeros(N, dtype=np.uint8)
+    result = np.zeros(N, dtype=sbox.dtype)
     
     for i in range(N):
         result[i] = sbox[data[i]]
@@ -91,13 +827,13 @@ def fast_sbox_substitute(data, sbox):
     return result
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def fast_sbox_inverse(data, inverse_sbox):
     """
     Ters S-Box'ı hızlandır
     """
     N = len(data)
-    result = np.zeros(N, dtype=np.uint8)
+    result = np.zeros(N, dtype=inverse_sbox.dtype)
     
     for i in range(N):
         result[i] = inverse_sbox[data[i]]
@@ -8,8 +8,71 @@ x_{n+1} = [r * x_n * (1 - x_n) + k * x_{n-1} * sin(π * x_n)] mod 1
 Bu sistem rapordaki denklem 4.1'i uygular ve dinamik bozulmayı engeller.
 """
 
+import math
 import numpy as np
 
+# Numba hızlandırma (opsiyonel - yoksa saf Python döngüsü kullanılır)
+try:
+    from fast_numba import fast_fplm_sequence, fast_fplm_batch
+    USE_NUMBA = True
+except ImportError:
+    USE_NUMBA = False
+
+
+def _python_fplm_sequence(x_prev, x_curr, r, a, b, c, delta, n):
+    """
+    FPLM dizisini saf Python ile üret (Numba yoksa)
+    
+    step() ile aynı işlem sırasını kullanır; math.sin/cos skaler
+    np.sin/cos ile bit-bit aynı sonucu verir.
+    
+    Returns:
+    tuple: (dizi, x_prev, x_curr)
+    """
+    sin, cos, pi = math.sin, math.cos, math.pi
+    sequence = [0.0] * n
+    
+    for i in range(n):
+        logistic_term = r * x_curr * (1 - x_curr)
+        perturbation = a * sin(pi * x_curr)
+        feedback = b * x_prev * sin(pi * x_curr)
+        modulation = c * sin(2 * pi * x_curr) * cos(pi * x_prev)
+        
+        x_next = (logistic_term + perturbation + feedback + modulation + delta) % 1.0
+        
+        x_prev = x_curr
+        x_curr = x_next
+        sequence[i] = x_next
+    
+    return np.array(sequence, dtype=np.float64), x_prev, x_curr
+
+
+def fplm_batch_sequences(params, n, discard=0):
+    """
+    Birden çok bağımsız FPLM'i toplu (Numba varsa paralel) çalıştır
+    
+    Args:
+    params : (K, 7) array-like - her satır [x0, u0, r, a, b, c, delta]
+    n : Her FPLM'den alınacak değer sayısı
+    discard : Baştan atılacak transient adım sayısı
+    
+    Returns:
+    numpy.ndarray: (K, n) float64 - satır k, FPLM(*params[k]) dizisi
+    """
+    params = np.array(params, dtype=np.float64).reshape(-1, 7)
+    params[:, 0] %= 1.0
+    params[:, 1] %= 1.0
+    
+    if USE_NUMBA:
+        return fast_fplm_batch(params, int(n), int(discard))
+    
+    sequences = np.empty((len(params), int(n)), dtype=np.float64)
+    for k, (x0, u0, r, a, b, c, delta) in enumerate(params.tolist()):
+        full, _, _ = _python_fplm_sequence(x0, u0, r, a, b, c, delta, int(discard) + int(n))
+        sequences[k] = full[int(discard):]
+    
+    return sequences
+
 
 class FPLM:
     """
@@ -73,6 +136,35 @@ class FPLM:
         
         return x_next
     
+    def generate(self, n):
+        """
+        N adımı tek çağrıda (toplu) üret
+        
+        step()'i n kez çağırmakla bit-bit aynı diziyi ve son durumu verir,
+        ancak döngü Numba ile derlenmiş kodda (yoksa saf Python'da) çalışır.
+        
+        Args:
+        n : Adım sayısı
+        
+        Returns:
+        numpy.ndarray: float64 dizi (uzunluk n)
+        """
+        n = int(n)
+        if n <= 0:
+            return np.zeros(0, dtype=np.float64)
+        
+        sequence_func = fast_fplm_sequence if USE_NUMBA else _python_fplm_sequence
+        sequence, x_prev, x_curr = sequence_func(
+            float(self.x_prev), float(self.x_curr),
+            float(self.r), float(self.a), float(self.b), float(self.c), float(self.delta), n
+        )
+        
+        self.x_prev = x_prev
+        self.x_curr = x_curr
+        self.iteration_count += n
+        
+        return sequence
+    
     def iterate(self, n, discard=0):
         """
         N adım iterasyon yap
@@ -101,25 +193,22 @@ class FPLM:
         Şifreleme için anahtar akışı üret
         
         Args:
-        length : Kaç byte anahtar gerekli
-        bits : Her değer kaç bit (varsayılan 8)
+        length : Kaç değer (piksel) anahtar gerekli
+        bits : Her değer kaç bit (8 veya 16, varsayılan 8)
         skip_transient : İlk 1000 adımı atla (varsayılan: False)
         
         Returns:
-        numpy.ndarray: Uint8 anahtar akışı
+        numpy.ndarray: Uint8 (bits=8) veya uint16 (bits=16) anahtar akışı
         """
         # Transient'ı sadece istenirse at (UYARI: Her çağrıda atmak deşifrelemeyi bozar!)
         if skip_transient:
-            for _ in range(1000):
-                self.step()
-        
-        # Anahtar akışı üret
-        key_stream = np.zeros(length, dtype=np.uint8)
+            self.generate(1000)
         
-        for i in range(length):
-            # [0, 1] değerini [0, 255] aralığına dönüştür
-            val = self.step()
-            key_stream[i] = int(val * (2**bits - 1)) % (2**bits)
+        # Anahtar akışı üret: değerler tek toplu çağrıyla alınır,
+        # [0, 1] -> [0, 2^bits - 1] dönüşümü vektörize (int() ile aynı kesme)
+        values = self.generate(length)
+        dtype = np.uint8 if bits <= 8 else np.uint16
+        key_stream = ((values * (2**bits - 1)).astype(np.int64) % (2**bits)).astype(dtype)
         
         return key_stream
     
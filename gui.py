@@ -16,7 +16,10 @@ import numpy as np
 from PIL import Image, ImageTk
 import threading
 import time
+from cipher_container import CONTAINER_EXTENSION, write_container
 from encryption import encrypt_image, decrypt_image, encrypt_image_from_array
+from instrumentation import collect_stages, format_stages
+from key_schedule import warm_up_kernels
 from security_metrics import SecurityMetrics
 from quantum_simulator import QuantumSimulator
 
@@ -387,11 +390,13 @@ class ChaosPolybiusGUI:
             
             # Direkt array'den şifrele (dosya kaydetmeye gerek yok)
             from encryption import encrypt_image_from_array
-            self.encrypted_image = encrypt_image_from_array(self.original_image, self.base_key)
+            with collect_stages() as timings:
+                self.encrypted_image = encrypt_image_from_array(self.original_image, self.base_key)
             
             elapsed = (time.time() - start) * 1000
             
             self.log(f"✅ Şifreleme tamamlandı ({elapsed:.1f} ms)")
+            self.log(f"   {format_stages(timings)}")
             
             # Göster
             self.display_image(self.encrypted_image, self.encrypted_canvas)
@@ -421,11 +426,12 @@ class ChaosPolybiusGUI:
         try:
             start = time.time()
             
-            self.decrypted_image = decrypt_image(
-                self.encrypted_image, 
-                self.base_key, 
-                self.original_image
-            )
+            with collect_stages() as timings:
+                self.decrypted_image = decrypt_image(
+                    self.encrypted_image, 
+                    self.base_key, 
+                    self.original_image
+                )
             
             elapsed = (time.time() - start) * 1000
             
@@ -433,6 +439,7 @@ class ChaosPolybiusGUI:
             mse = np.mean((self.original_image - self.decrypted_image) ** 2)
             
             self.log(f"✅ Deşifreleme tamamlandı ({elapsed:.1f} ms)")
+            self.log(f"   {format_stages(timings)}")
             self.log(f"   MSE: {mse:.6f} {'✅' if mse == 0 else '❌'}")
             
             # Göster
@@ -548,11 +555,16 @@ GENEL SONUÇ: {'✅ BAŞARILI' if (entropy_enc > 7.99 and abs(corr_enc_h) < 0.01
         
         filepath = filedialog.asksaveasfilename(
             defaultextension=".png",
-            filetypes=[("PNG", "*.png"), ("Tüm Dosyalar", "*.*")]
+            filetypes=[("PNG", "*.png"), ("ChaosPolybius kabı", "*" + CONTAINER_EXTENSION),
+                       ("Tüm Dosyalar", "*.*")]
         )
         
         if filepath:
-            cv2.imwrite(filepath, self.encrypted_image)
+            if filepath.lower().endswith(CONTAINER_EXTENSION):
+                # Ham veri + başlık: PNG sıkıştırması yok, anahtar parmak izi saklanır
+                write_container(filepath, self.encrypted_image, base_key=self.base_key)
+            else:
+                cv2.imwrite(filepath, self.encrypted_image)
             self.log(f"💾 Şifreli görüntü kaydedildi: {filepath.split('/')[-1]}")
     
     def create_quantum_tab(self, parent):
@@ -860,6 +872,8 @@ aramada sağladığı hız avantajını ölçer.
         if folder:
             try:
                 cv2.imwrite(f"{folder}/encrypted.png", self.encrypted_image)
+                write_container(f"{folder}/encrypted{CONTAINER_EXTENSION}", self.encrypted_image,
+                                base_key=self.base_key)
                 if self.decrypted_image is not None:
                     cv2.imwrite(f"{folder}/decrypted.png", self.decrypted_image)
                 
@@ -876,6 +890,8 @@ aramada sağladığı hız avantajını ölçer.
 
 def main():
     """Ana fonksiyon"""
+    # Şifreleme iş parçacıklarında çalışır: paralel çekirdekler önce ana iş parçacığında derlenir
+    warm_up_kernels()
     root = tk.Tk()
     app = ChaosPolybiusGUI(root)
     root.mainloop()
@@ -0,0 +1,252 @@
+"""
+Instrumentation - Aşama Süreleri ve Sayaçlar
+
+Şifreleme hattının her aşaması (anahtar türetme, DFS yolu, indeks
+tablosu, S-Box üretimi, anahtar akışı, permütasyon, substitution,
+difüzyon) stage() ile sarılır. Her ölçüm:
+- COUNTERS kayıt defterine eklenir (çağrı sayısı, toplam süre, piksel)
+- add_hook() ile eklenen geri çağırma fonksiyonlarına iletilir
+- 'chaospolybius' logger'ına DEBUG seviyesinde yazılır
+- collect_stages() bloğu içindeyse o bloğun (iş parçacığı başına) dökümüne eklenir
+
+Kullanım:
+    from instrumentation import COUNTERS, collect_stages
+
+    with collect_stages() as timings:
+        encrypt_image_from_array(img, key)
+    print(format_stages(timings))       # dfs_path 12.1 ms, keystream 3.0 ms, ...
+    print(COUNTERS.report())            # Süreç başından beri toplamlar
+"""
+
+import contextvars
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('chaospolybius')
+
+# Hattın aşamaları (şifreleme sırasıyla; deşifreleme aşamaları 'inverse_' önekli).
+# 'fused' = permütasyon + substitution + difüzyon tek geçişli çekirdekte
+STAGES = (
+    'key_derivation',
+    'dfs_path',
+    'index_build',
+    'sbox_build',
+    'keystream',
+    'permutation',
+    'substitution',
+    'diffusion',
+    'fused',
+    'inverse_fused',
+    'inverse_diffusion',
+    'inverse_substitution',
+    'inverse_permutation',
+)
+
+# Geri çağırma fonksiyonları: hook(stage, seconds, pixels)
+_hooks = ()
+_hooks_lock = threading.Lock()
+
+# Etkin collect_stages() dökümleri. Her iş parçacığı boş bağlamla başlar;
+# çizelge üretiminin arka plan iş parçacıkları çağıranın bağlamını
+# (contextvars.copy_context) taşır.
+_collectors = contextvars.ContextVar('chaospolybius_collectors', default=())
+
+
+class StageCounters:
+    """
+    Aşama başına birikimli sayaçlar (iş parçacığı güvenli)
+
+    Her aşama için çağrı sayısı, toplam süre ve işlenen piksel sayısı
+    tutulur; regresyon takibi için snapshot() ile okunup reset() ile
+    sıfırlanabilir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, stage, seconds, pixels=0):
+        """
+        Bir ölçüm ekle
+
+        Args:
+        stage : str - Aşama adı
+        seconds : float - Süre (saniye)
+        pixels : int - Aşamada işlenen piksel sayısı
+        """
+        with self._lock:
+            counter = self._counters.get(stage)
+            if counter is None:
+                counter = self._counters[stage] = [0, 0.0, 0]
+            counter[0] += 1
+            counter[1] += seconds
+            counter[2] += pixels
+
+    def snapshot(self):
+        """
+        Sayaçların kopyası
+
+        Returns:
+        dict: {aşama: {'calls', 'seconds', 'pixels', 'mpx_per_sec'}} (STAGES sırasıyla)
+        """
+        with self._lock:
+            counters = {stage: list(values) for stage, values in self._counters.items()}
+
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        result = {}
+        for stage in sorted(counters, key=lambda s: order.get(s, len(STAGES))):
+            calls, seconds, pixels = counters[stage]
+            result[stage] = {
+                'calls': calls,
+                'seconds': seconds,
+                'pixels': pixels,
+                'mpx_per_sec': pixels / seconds / 1e6 if seconds > 0 else 0.0,
+            }
+        return result
+
+    def reset(self):
+        """Tüm sayaçları sıfırla"""
+        with self._lock:
+            self._counters.clear()
+
+    def report(self):
+        """
+        Sayaçları tablo olarak biçimlendir
+
+        Returns:
+        str: Aşama başına çağrı, toplam süre ve verim tablosu
+        """
+        lines = [f"{'Aşama':<22} {'Çağrı':>8} {'Toplam (ms)':>12} {'Mpx/s':>10}"]
+        for stage, values in self.snapshot().items():
+            lines.append(f"{stage:<22} {values['calls']:>8} {values['seconds'] * 1000:>12.2f} "
+                         f"{values['mpx_per_sec']:>10.1f}")
+        return '\n'.join(lines)
+
+
+# Süreç genelindeki sayaç kayıt defteri
+COUNTERS = StageCounters()
+
+
+def add_hook(hook):
+    """
+    Her aşama ölçümünde çağrılacak fonksiyon ekle
+
+    Hook, ölçümü yapan iş parçacığında çağrılır; hata verirse loglanır,
+    şifreleme etkilenmez.
+
+    Args:
+    hook : callable(stage, seconds, pixels)
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook):
+    """
+    add_hook() ile eklenen fonksiyonu çıkar
+
+    Args:
+    hook : callable
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h is not hook)
+
+
+class stage:
+    """
+    Aşama süresini ölçen context manager
+
+    Kullanım:
+        with stage('diffusion', pixels=H * W):
+            encrypted = fast_xor_diffusion(substituted, key_stream)
+    """
+
+    __slots__ = ('name', 'pixels', 'start')
+
+    def __init__(self, name, pixels=0):
+        self.name = name
+        self.pixels = pixels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        COUNTERS.record(self.name, seconds, self.pixels)
+
+        for timings in _collectors.get():
+            timings[self.name] = timings.get(self.name, 0.0) + seconds
+
+        for hook in _hooks:
+            try:
+                hook(self.name, seconds, self.pixels)
+            except Exception:
+                logger.exception("Aşama hook'u hata verdi: %r", hook)
+
+        logger.debug("%s: %.3f ms (%d piksel)", self.name, seconds * 1000, self.pixels)
+        return False
+
+
+class collect_stages:
+    """
+    Blok içinde (bu iş parçacığında) ölçülen aşama sürelerini topla
+
+    Kullanım:
+        with collect_stages() as timings:
+            encrypt_image_from_array(img, key)
+        timings  # {'key_derivation': 0.0001, 'dfs_path': 0.012, ...} (saniye)
+
+    Önbellekteki bir çizelge kullanılırsa çizelge aşamaları (dfs_path vb.)
+    dökümde yer almaz.
+    """
+
+    def __enter__(self):
+        self.timings = {}
+        self._token = _collectors.set(_collectors.get() + (self.timings,))
+        return self.timings
+
+    def __exit__(self, exc_type, exc, tb):
+        _collectors.reset(self._token)
+        return False
+
+
+def format_stages(timings):
+    """
+    collect_stages() dökümünü tek satır olarak biçimlendir
+
+    Args:
+    timings : dict {aşama: saniye}
+
+    Returns:
+    str: "dfs_path 12.10 ms, keystream 3.02 ms, ..."
+    """
+    return ', '.join(f"{name} {seconds * 1000:.2f} ms" for name, seconds in timings.items())
+
+
+if __name__ == "__main__":
+    import numpy as np
+    from encryption import encrypt_image_from_array, decrypt_image
+    # Betik olarak çalışırken __main__ değil, şifrelemenin kullandığı modül sayılmalı
+    from instrumentation import COUNTERS, collect_stages, format_stages
+
+    print("="*60)
+    print("Aşama Süreleri Test")
+    print("="*60)
+
+    key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+    for size in (128, 256, 512):
+        img = np.random.randint(0, 256, (size, size), dtype=np.uint8)
+        with collect_stages() as timings:
+            encrypted = encrypt_image_from_array(img, key)
+            decrypt_image(encrypted, key, None)
+        print(f"\n{size}x{size}: {format_stages(timings)}")
+
+    print("\nBirikimli sayaçlar:")
+    print(COUNTERS.report())
+    print("\n" + "="*60)
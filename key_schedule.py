@@ -0,0 +1,1337 @@
+"""
+Key Schedule - Anahtar Çizelgesi ve Önbelleği
+
+Aynı anahtar ve aynı boyuttaki çok sayıda görüntüyü şifrelerken
+SHA-256 türetme, üç FPLM, Toroidal DFS gezintisi, S-Box ve anahtar
+akışı her görüntü için yeniden üretilmez. Bunların hepsi bir kez
+KeySchedule nesnesinde tutulur; görüntü başına şifreleme/deşifreleme
+birkaç array geçişine iner.
+
+Büyük çizelgelerde üç bağımsız üretici (DFS permütasyonu, S-Box ve
+anahtar akışı) eşzamanlı çalışır: DFS ve anahtar akışı GIL'i bırakan
+Numba çekirdekleriyle arka plan iş parçacıklarında, S-Box çağıran iş
+parçacığında üretilir.
+"""
+
+import contextvars
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import numpy as np
+from fplm import FPLM, fplm_batch_sequences
+from toroidal_dfs import ToroidalDFS, dfs_batch_indices
+from dynamic_polybius import DynamicPolybius, inverse_permutation
+from instrumentation import stage
+from workspace import flat_view
+
+# Numba hızlandırma (opsiyonel - yoksa NumPy/Python yolu kullanılır)
+try:
+    from fast_numba import (
+        fast_permutation_apply,
+        fast_xor_diffusion,
+        fast_inverse_xor_diffusion,
+        fast_permutation_apply_batch,
+        fast_xor_diffusion_batch,
+        fast_inverse_xor_diffusion_batch,
+        fast_permutation_apply_rows,
+        fast_xor_diffusion_rows,
+        fast_inverse_xor_diffusion_rows,
+        fast_xor_diffusion_parallel,
+        fast_inverse_xor_diffusion_parallel,
+        fast_diffusion_2d,
+        fast_inverse_diffusion_2d,
+        fast_encrypt_fused,
+        fast_encrypt_fused_parallel,
+        fast_decrypt_fused,
+        fast_encrypt_fused_batch,
+        fast_decrypt_fused_batch,
+        get_num_threads,
+        kernel_threads
+    )
+    USE_NUMBA = True
+except ImportError:
+    USE_NUMBA = False
+
+
+# Renkli görüntü modları (bkz. ColorKeySchedule)
+COLOR_MODES = ('flat', 'channel', 'cross')
+
+# Desteklenen piksel derinlikleri (bit) ve dtype'ları
+DEPTH_DTYPES = {8: np.uint8, 16: np.uint16}
+
+# Difüzyon sürümleri: 1 = tek XOR zinciri (özgün), 2 = satır/sütun çift yönlü 2-D
+DIFFUSION_VERSIONS = (1, 2)
+
+# 2-D difüzyonun sütun geçişinde iş parçacığı başına sütun bloğu genişliği
+DIFFUSION_2D_BLOCK = 256
+
+# Anahtar sürümleri: 1 = üç FPLM aynı dinamik anahtarla (özgün),
+# 2 = permütasyon / S-Box / difüzyon için ayrı alt anahtarlar (bkz. stage_key)
+KEY_VERSIONS = (1, 2)
+
+# Bu boyuttan (piksel) büyük çizelgelerin üreticileri eşzamanlı çalışır
+CONCURRENT_BUILD_MIN = 1 << 16
+
+# Önbellekte tutulacak en fazla çizelge sayısı ve toplam bellek sınırı
+SCHEDULE_CACHE_SIZE = 8
+SCHEDULE_CACHE_BYTES = 512 * 1024 * 1024
+
+# Permütasyon indeksleri bu boyuttan (piksel) küçük görüntülerde int32 (yarı bellek)
+INDEX_INT32_MAX = 2**31
+
+# Bu uzunluktan (piksel) kısa zincirler tek iş parçacığında taranır
+PARALLEL_DIFFUSION_MIN = 1 << 18
+
+
+def sha256_key_derivation(image, base_key):
+    """
+    Base key'den deterministik anahtar türet
+
+    NOT: Önceki sürümde görüntü hash'i kullanılıyordu ama bu deşifreleme
+    için orijinal görüntüyü gerektiriyordu (yanlış tasarım).
+    Şimdi sadece base_key'den türetiliyor.
+
+    Args:
+    image : numpy array (görüntü) - kullanılmıyor, geriye uyumluluk için
+    base_key : list [x0, u0, r, a, b, c, delta]
+
+    Returns:
+    list: Dinamik anahtar
+    """
+    # Base key'den deterministik hash üret
+    key_str = ','.join(map(str, base_key))
+    hash_digest = hashlib.sha256(key_str.encode()).hexdigest()
+
+    # Hash'ten 7 sayı türet
+    hash_values = []
+    for i in range(0, 56, 8):
+        hex_chunk = hash_digest[i:i+8]
+        value = int(hex_chunk, 16) / 0xFFFFFFFF  # [0, 1] normalize
+        hash_values.append(value)
+
+    # Base key ile karıştır
+    dynamic_key = list(base_key)
+    dynamic_key[0] = (dynamic_key[0] + hash_values[0]) % 1.0  # x0
+    dynamic_key[1] = (dynamic_key[1] + hash_values[1]) % 1.0  # u0
+    dynamic_key[2] = dynamic_key[2] + (hash_values[2] * 0.1)  # r (küçük değişim)
+
+    # Parametreleri sınırla
+    dynamic_key[2] = max(3.57, min(4.0, dynamic_key[2]))
+
+    return dynamic_key
+
+
+def key_fingerprint(base_key):
+    """
+    Anahtarın kısa parmak izi (manifest ve kap dosyalarına anahtar yerine yazılır)
+
+    Özet "fingerprint" etiketiyle alınır: sha256_key_derivation() ile aynı
+    özetin ilk byte'ları dinamik anahtarın x0/u0 değerlerini verirdi.
+
+    Args:
+    base_key : list [x0, u0, r, a, b, c, delta]
+
+    Returns:
+    str: 16 hex karakter
+    """
+    key_str = ','.join(map(str, base_key))
+    return hashlib.sha256(f"{key_str},fingerprint".encode()).hexdigest()[:16]
+
+
+def stage_key(dynamic_key, stage_name, version=2):
+    """
+    Aşama başına alt anahtar türet (key_version=2)
+
+    x0 ve u0 değerleri dinamik anahtar, aşama adı ve anahtar sürümünün
+    SHA-256 özetinden alınır; r, a, b, c, delta aynı kalır. Böylece
+    permütasyon, S-Box ve difüzyon FPLM'leri aynı dizinin kopyaları olmaz.
+
+    Args:
+    dynamic_key : list - sha256_key_derivation() çıktısı
+    stage_name : str - 'permutation', 'sbox' veya 'diffusion'
+    version : int - Anahtar sürümü (türetme etiketine girer)
+
+    Returns:
+    list: Alt anahtar [x0, u0, r, a, b, c, delta]
+    """
+    key_str = ','.join(map(str, dynamic_key))
+    digest = hashlib.sha256(f"{key_str},stage,{stage_name},v{version}".encode()).hexdigest()
+
+    key = list(dynamic_key)
+    # (0, 1) aralığı: 0.0 haritanın sabit noktası
+    key[0], key[1] = ((int(digest[i:i+8], 16) + 1) / (2**32 + 1) for i in (0, 8))
+    return key
+
+
+# Çizelge üreticilerinin arka plan iş parçacıkları (ilk büyük çizelgede oluşturulur);
+# çizelge başına iki iş: çekirdek başına bir çizelge aynı anda üretilebilir
+BUILD_POOL_WORKERS = 2 * (os.cpu_count() or 1)
+_build_pool = None
+_build_pool_lock = threading.Lock()
+
+
+def _schedule_build_pool():
+    """DFS ve anahtar akışı üreticilerinin çalıştığı iş parçacığı havuzu"""
+    global _build_pool
+    with _build_pool_lock:
+        if _build_pool is None:
+            _build_pool = ThreadPoolExecutor(max_workers=BUILD_POOL_WORKERS,
+                                             thread_name_prefix='key-schedule')
+        return _build_pool
+
+
+def index_dtype(n):
+    """n elemanlı permütasyonun indeks dtype'ı (n < 2**31 ise int32, değilse int64)"""
+    return np.dtype(np.int32 if n < INDEX_INT32_MAX else np.int64)
+
+
+def pixel_array(img):
+    """
+    uint8/uint16 dizileri olduğu gibi döndür; diğer türleri (int64, float...)
+    16-bit öncesindeki gibi uint8'e çevir
+    """
+    img = np.asarray(img)
+    if any(img.dtype == dtype for dtype in DEPTH_DTYPES.values()):
+        return img
+    return img.astype(np.uint8)
+
+
+def image_depth(img):
+    """
+    Görüntünün piksel derinliği (uint8 -> 8, uint16 -> 16)
+
+    Args:
+    img : numpy.ndarray
+
+    Returns:
+    int: 8 veya 16
+    """
+    for depth, dtype in DEPTH_DTYPES.items():
+        if img.dtype == dtype:
+            return depth
+    raise ValueError(f"Yalnızca 8-bit ve 16-bit görüntüler destekleniyor, gelen: {img.dtype}")
+
+
+# Kelime içi önek XOR kaydırmaları ve taşıma çarpanı (piksel byte sayısına göre)
+_WORD_SHIFTS = {1: (8, 16, 32), 2: (16, 32)}
+_WORD_BROADCAST = {1: np.uint64(0x0101010101010101), 2: np.uint64(0x0001000100010001)}
+
+
+def numpy_xor_diffusion(rows, key_streams):
+    """
+    Numba yoksa: satır başına XOR zinciri, saf NumPy önek XOR taraması
+
+    c[i] = p[i] ^ k[i] ^ c[i-1] zinciri, p ^ k dizisinin önek XOR'udur.
+    Tarama uint64 kelimeler üzerinde yapılır: önce her kelimenin içindeki
+    8 (uint16 için 4) piksel kaydırmalarla taranır, sonra kelimelerin
+    toplam XOR'ları np.bitwise_xor.accumulate ile taşınıp kelimelere yayılır.
+
+    Args:
+    rows : numpy.ndarray (N, L) uint8 veya uint16
+    key_streams : numpy.ndarray (L,) veya (N, L) anahtar akışı
+
+    Returns:
+    numpy.ndarray: (N, L) şifreli satırlar (fast_xor_diffusion ile aynı)
+    """
+    N, L = rows.shape
+    itemsize = rows.dtype.itemsize
+    lanes = 8 // itemsize
+
+    # Kelime sınırına dolgulu tampon (dolgu sonuç dışında kalır)
+    padded = -(-L // lanes) * lanes
+    buffer = np.zeros((N, padded), dtype=rows.dtype)
+    np.bitwise_xor(rows, key_streams, out=buffer[:, :L])
+
+    words = buffer.view(np.uint64)
+    for shift in _WORD_SHIFTS[itemsize]:
+        words ^= words << np.uint64(shift)
+
+    # Önceki kelimelerin toplam XOR'u (her kelimenin en üst pikseli) tüm piksellere
+    carry = np.bitwise_xor.accumulate(words[:, :-1] >> np.uint64(64 - 8 * itemsize), axis=1)
+    words[:, 1:] ^= carry * _WORD_BROADCAST[itemsize]
+
+    return buffer[:, :L]
+
+
+def numpy_inverse_xor_diffusion(rows, key_streams):
+    """
+    Numba yoksa: ters XOR zinciri, p[i] = c[i] ^ k[i] ^ c[i-1] (tamamen vektörize)
+
+    Args:
+    rows : numpy.ndarray (N, L) şifreli satırlar
+    key_streams : numpy.ndarray (L,) veya (N, L) anahtar akışı
+
+    Returns:
+    numpy.ndarray: (N, L) difüzyondan önceki satırlar
+    """
+    result = np.bitwise_xor(rows, key_streams)
+    result[:, 1:] ^= rows[:, :-1]
+    return result
+
+
+def _kernel_input(array, shape, dtype, workspace, name, avoid=None):
+    """
+    Çekirdek girdisi: dizinin kopyasız, C-sıralı shape görünümü
+
+    Adımlı görünüm, farklı dtype veya avoid (çıktı) ile örtüşme durumunda
+    dizi tampona kopyalanır (workspace verilmişse yeniden kullanılan tampon).
+    """
+    if array.dtype == dtype and (avoid is None or not np.may_share_memory(array, avoid)):
+        view = flat_view(array, shape)
+        if view is not None and view.flags.c_contiguous:
+            return view
+
+    buffer = workspace.buffer(name, shape, dtype) if workspace is not None else np.empty(shape, dtype)
+    np.copyto(buffer.reshape(array.shape), array, casting='unsafe')
+    return buffer
+
+
+def _check_out(out, shape, dtype):
+    """out verilmişse boyutunun ve dtype'ının sonuçla aynı olduğunu doğrula"""
+    if out is not None and (out.shape != tuple(shape) or out.dtype != dtype):
+        raise ValueError(f"out: {tuple(shape)} boyutlu {np.dtype(dtype)} dizi olmalı "
+                         f"(verilen {out.shape} {out.dtype})")
+
+
+def _kernel_output(out, shape, dtype, workspace):
+    """
+    Çekirdek çıktısı: out'un kopyasız görünümü, out yoksa yeni dizi,
+    adımlı out için (workspace) tampon
+    """
+    if out is None:
+        return np.empty(shape, dtype)
+
+    view = flat_view(out, shape)
+    if view is not None and view.flags.c_contiguous:
+        return view
+    return workspace.buffer('target', shape, dtype) if workspace is not None else np.empty(shape, dtype)
+
+
+def _store(out, result, shape):
+    """Sonucu out'a yaz (görünüm değilse kopyala); out yoksa sonucu shape boyutunda döndür"""
+    if out is None:
+        return result.reshape(shape)
+    if not np.may_share_memory(out, result):
+        np.copyto(out, result.reshape(out.shape))
+    return out
+
+
+def _diffusion_chunks(length):
+    """Paralel tarama parça sayısı (0 = tek iş parçacıklı çekirdek yeterli)"""
+    threads = get_num_threads()
+    if threads < 2 or length < PARALLEL_DIFFUSION_MIN:
+        return 0
+    return threads
+
+
+def xor_diffusion(flat, key_stream):
+    """
+    Tek zincirli XOR difüzyonu (düz dizi)
+
+    Büyük dizilerde Numba'nın tüm iş parçacıklarıyla paralel önek taraması,
+    küçüklerde tek iş parçacıklı çekirdek, Numba yoksa NumPy taraması
+    kullanılır; üçü de bit bit aynı sonucu verir.
+
+    Args:
+    flat : numpy.ndarray (L,) uint8 veya uint16
+    key_stream : numpy.ndarray (L,) anahtar akışı
+
+    Returns:
+    numpy.ndarray: (L,) şifreli dizi
+    """
+    if not USE_NUMBA:
+        return numpy_xor_diffusion(flat[None, :], key_stream)[0]
+    chunks = _diffusion_chunks(len(flat))
+    if chunks:
+        return fast_xor_diffusion_parallel(flat, key_stream, chunks)
+    return fast_xor_diffusion(flat, key_stream)
+
+
+def inverse_xor_diffusion(flat, key_stream):
+    """
+    xor_diffusion() tersi (büyük dizilerde çok iş parçacıklı)
+
+    Args:
+    flat : numpy.ndarray (L,) şifreli dizi
+    key_stream : numpy.ndarray (L,) anahtar akışı
+
+    Returns:
+    numpy.ndarray: (L,) difüzyondan önceki dizi
+    """
+    if not USE_NUMBA:
+        return numpy_inverse_xor_diffusion(flat[None, :], key_stream)[0]
+    chunks = _diffusion_chunks(len(flat))
+    if chunks:
+        return fast_inverse_xor_diffusion_parallel(flat, key_stream, chunks)
+    return fast_inverse_xor_diffusion(flat, key_stream)
+
+
+def numpy_diffusion_2d(frames, key, column_key, sbox):
+    """
+    Numba yoksa: 2-D difüzyon (sürüm 2), fast_diffusion_2d ile aynı sonuç
+
+    Zincirler sırayla ilerler; her adım tüm satırlar (veya sütunlar)
+    boyunca vektörizedir (2W + 2H NumPy adımı).
+
+    Args:
+    frames : numpy.ndarray (N, H, W)
+    key, column_key : numpy.ndarray (H, W) satır ve sütun geçişi anahtar akışları
+    sbox : numpy.ndarray - Zincirde kullanılan S-Box
+
+    Returns:
+    numpy.ndarray: (N, H, W) difüzyon uygulanmış kareler
+    """
+    out = np.array(frames)
+    N, H, W = out.shape
+
+    prev = np.zeros((N, H), dtype=out.dtype)
+    for j in range(W):
+        prev = np.take(sbox, out[:, :, j] ^ key[:, j] ^ prev)
+        out[:, :, j] = prev
+    prev = np.zeros((N, H), dtype=out.dtype)
+    for j in range(W - 1, -1, -1):
+        prev = np.take(sbox, out[:, :, j] ^ prev)
+        out[:, :, j] = prev
+
+    prev = np.zeros((N, W), dtype=out.dtype)
+    for i in range(H):
+        prev = np.take(sbox, out[:, i] ^ column_key[i] ^ prev)
+        out[:, i] = prev
+    prev = np.zeros((N, W), dtype=out.dtype)
+    for i in range(H - 1, -1, -1):
+        prev = np.take(sbox, out[:, i] ^ prev)
+        out[:, i] = prev
+
+    return out
+
+
+def numpy_inverse_diffusion_2d(frames, key, column_key, inverse_sbox):
+    """
+    Numba yoksa: 2-D difüzyonun tersi (her geçişin tersi elemanlar arası, tamamen vektörize)
+
+    Args:
+    frames : numpy.ndarray (N, H, W) şifreli kareler
+    key, column_key : numpy.ndarray (H, W) satır ve sütun geçişi anahtar akışları
+    inverse_sbox : numpy.ndarray - Ters S-Box
+
+    Returns:
+    numpy.ndarray: (N, H, W) difüzyondan önceki kareler
+    """
+    # Geri sütun geçişi: t[i] = S^-1[e[i]] ^ e[i+1]
+    columns = np.take(inverse_sbox, frames)
+    columns[:, :-1] ^= frames[:, 1:]
+    # İleri sütun geçişi: b[i] = S^-1[t[i]] ^ ck[i] ^ t[i-1]
+    rows = np.take(inverse_sbox, columns) ^ column_key
+    rows[:, 1:] ^= columns[:, :-1]
+    # Geri satır geçişi: a[j] = S^-1[b[j]] ^ b[j+1]
+    columns = np.take(inverse_sbox, rows)
+    columns[..., :-1] ^= rows[..., 1:]
+    # İleri satır geçişi: x[j] = S^-1[a[j]] ^ k[j] ^ a[j-1]
+    result = np.take(inverse_sbox, columns) ^ key
+    result[..., 1:] ^= columns[..., :-1]
+    return result
+
+
+class KeySchedule:
+    """
+    Bir (anahtar, boyut) çifti için önceden hesaplanmış şifreleme tabloları
+
+    İçerik:
+    - permutation / inverse_permutation : Toroidal DFS düz indeksleri ve tersi
+    - sbox : DynamicPolybius (S-Box ve ters S-Box)
+    - key_stream : XOR difüzyon anahtar akışı
+
+    depth=16 (uint16 tıbbi/bilimsel görüntüler) için anahtar akışı 16-bit,
+    substitution 65536 elemanlı piksel S-Box'ı, XOR zinciri 16-bit'tir.
+
+    diffusion_version=2 tek XOR zinciri yerine 2-D difüzyon kullanır:
+    permütasyon ve S-Box'tan sonra kare satırlarda ileri (anahtarlı) ve
+    geri, ardından sütunlarda ileri (anahtarlı) ve geri S-Box zincirinden
+    geçer. Her geçiş satırlar/sütunlar arasında bağımsızdır (paralel) ve
+    tek bir pikselin değişmesi tüm şifreli kareyi değiştirir.
+
+    Numba varsa ve tek tablolu S-Box kullanılıyorsa (sürüm 1, banka ve
+    piksel çifti S-Box'ı hariç) üç adım tek geçişli çekirdeklerle uygulanır:
+    her piksel bir kez okunup bir kez yazılır ('fused' aşaması).
+    """
+
+    def __init__(self, base_key, shape, sbox_candidates=1, sbox_bank=1, sbox_bits=8, depth=8,
+                 diffusion_version=1, key_version=1):
+        """
+        Args:
+        base_key : list [x0, u0, r, a, b, c, delta]
+        shape : (H, W) görüntü boyutu
+        sbox_candidates : Anahtar-bağımlı S-Box araması aday sayısı
+        sbox_bank : Satır bandı başına S-Box sayısı
+        sbox_bits : 8 veya 16 (piksel çifti S-Box'ı)
+        depth : Piksel derinliği, 8 (uint8) veya 16 (uint16)
+        diffusion_version : 1 (tek XOR zinciri) veya 2 (2-D satır/sütun difüzyonu)
+        key_version : 1 (üç FPLM aynı anahtarla) veya 2 (aşama başına alt anahtar)
+        """
+        if depth not in DEPTH_DTYPES:
+            raise ValueError(f"depth: {tuple(DEPTH_DTYPES)} değerlerinden biri olmalı")
+        if diffusion_version not in DIFFUSION_VERSIONS:
+            raise ValueError(f"diffusion_version: {DIFFUSION_VERSIONS} değerlerinden biri olmalı")
+        if key_version not in KEY_VERSIONS:
+            raise ValueError(f"key_version: {KEY_VERSIONS} değerlerinden biri olmalı")
+        if depth == 16 and (sbox_candidates > 1 or sbox_bank > 1 or sbox_bits != 8):
+            raise ValueError("16-bit derinlik yalnızca tek S-Box modunda kullanılabilir")
+
+        H, W = (int(v) for v in shape)
+        N = H * W
+
+        self.base_key = list(base_key)
+        self.shape = (H, W)
+        self.sbox_candidates = sbox_candidates
+        self.sbox_bank = sbox_bank
+        self.sbox_bits = sbox_bits
+        self.depth = depth
+        self.dtype = np.dtype(DEPTH_DTYPES[depth])
+        self.diffusion_version = diffusion_version
+        self.key_version = key_version
+
+        # Dinamik anahtar ve her işlem için AYRI state'e sahip FPLM'ler
+        with stage('key_derivation'):
+            self.dynamic_key = sha256_key_derivation(None, base_key)
+            if key_version == 2:
+                keys = [stage_key(self.dynamic_key, name, key_version)
+                        for name in ('permutation', 'sbox', 'diffusion')]
+            else:
+                keys = [self.dynamic_key] * 3
+        fplm_perm, fplm_sbox, fplm_diff = (FPLM(*key) for key in keys)
+
+        if USE_NUMBA and N >= CONCURRENT_BUILD_MIN:
+            # DFS ve anahtar akışı GIL'i bırakan çekirdeklerde arka planda;
+            # S-Box (paralel aday araması dahil) bu iş parçacığında
+            pool = _schedule_build_pool()
+            jobs = [pool.submit(contextvars.copy_context().run, self._build_permutation, fplm_perm),
+                    pool.submit(contextvars.copy_context().run, self._build_key_stream, fplm_diff)]
+            try:
+                self._build_sbox(fplm_sbox)
+            finally:
+                wait(jobs)
+            for job in jobs:
+                job.result()
+        else:
+            self._build_permutation(fplm_perm)
+            self._build_sbox(fplm_sbox)
+            self._build_key_stream(fplm_diff)
+
+        # Tek tablolu S-Box modlarında (banka ve piksel çifti hariç) Numba ile
+        # permütasyon + S-Box + XOR zinciri tek geçişte uygulanır
+        self.fused_sbox = self.fused_inverse_sbox = None
+        if diffusion_version == 1 and depth == 16:
+            self.fused_sbox, self.fused_inverse_sbox = self.sbox.sbox16, self.sbox.inverse_sbox16
+        elif diffusion_version == 1 and sbox_bits == 8 and sbox_bank == 1:
+            self.fused_sbox, self.fused_inverse_sbox = self.sbox.sbox, self.sbox.inverse_sbox
+
+    def _build_permutation(self, fplm):
+        """Permütasyon (Toroidal DFS, doğrudan düz indekslere) ve tersi"""
+        H, W = self.shape
+        with stage('dfs_path', H * W):
+            dfs = ToroidalDFS(H, W, fplm)
+            self.permutation = dfs.generate_path_indices(np.empty(H * W, dtype=index_dtype(H * W)))
+        with stage('index_build', H * W):
+            self.inverse_permutation = inverse_permutation(self.permutation)
+
+    def _build_sbox(self, fplm):
+        """S-Box (16-bit derinlikte piksel değerleri sbox16'dan geçer)"""
+        with stage('sbox_build'):
+            self.sbox = DynamicPolybius(fplm, candidates=self.sbox_candidates,
+                                        bank_size=self.sbox_bank,
+                                        bits=max(self.sbox_bits, self.depth))
+            # Çizelge üretimden sonra değişmez: iş parçacıkları arasında
+            # paylaşılan FPLM durumu tutulmaz
+            self.sbox.fplm = None
+
+    def _build_key_stream(self, fplm):
+        """XOR difüzyon anahtar akışı"""
+        H, W = self.shape
+        with stage('keystream', H * W):
+            self.key_stream = fplm.get_key_stream(H * W, bits=self.depth)
+            # 2-D difüzyonun sütun geçişi aynı akışı sütun sırasıyla kullanır
+            self.column_key_stream = None
+            if self.diffusion_version == 2:
+                self.column_key_stream = np.ascontiguousarray(self.key_stream.reshape(W, H).T)
+
+    @property
+    def nbytes(self):
+        """Çizelgenin tuttuğu tabloların toplam bellek boyutu (byte)"""
+        total = self.permutation.nbytes + self.inverse_permutation.nbytes + self.key_stream.nbytes
+        total += self.sbox.sbox_bank.nbytes + self.sbox.inverse_bank.nbytes
+        if self.column_key_stream is not None:
+            total += self.column_key_stream.nbytes
+        if self.sbox.sbox16 is not None:
+            total += self.sbox.sbox16.nbytes + self.sbox.inverse_sbox16.nbytes
+        return total
+
+    def _check_shape(self, img):
+        """Görüntü boyutunun çizelgeyle aynı olduğunu doğrula"""
+        if img.shape != self.shape:
+            raise ValueError(f"Görüntü boyutu {img.shape}, çizelge boyutu {self.shape} ile uyuşmuyor")
+
+    def substitute(self, permuted_flat):
+        """S-Box modunu (tek / banka / 16-bit) uygula; girdi (H*W,) veya (N, H*W)"""
+        if self.depth == 16:
+            return np.take(self.sbox.sbox16, permuted_flat)
+        if self.sbox_bits == 16:
+            return self.sbox.substitute_pairs(permuted_flat)
+        if self.sbox_bank > 1:
+            frames = permuted_flat.reshape(permuted_flat.shape[:-1] + self.shape)
+            return self.sbox.substitute_bank(frames).reshape(permuted_flat.shape)
+        return self.sbox.substitute(permuted_flat)
+
+    def inverse_substitute(self, substituted_flat):
+        """S-Box modunun tersini uygula; girdi (H*W,) veya (N, H*W)"""
+        if self.depth == 16:
+            return np.take(self.sbox.inverse_sbox16, substituted_flat)
+        if self.sbox_bits == 16:
+            return self.sbox.inverse_substitute_pairs(substituted_flat)
+        if self.sbox_bank > 1:
+            frames = substituted_flat.reshape(substituted_flat.shape[:-1] + self.shape)
+            return self.sbox.inverse_substitute_bank(frames).reshape(substituted_flat.shape)
+        return self.sbox.inverse_substitute(substituted_flat)
+
+    @property
+    def fused(self):
+        """Şifreleme/deşifreleme tek geçişli Numba çekirdekleriyle mi yapılıyor"""
+        return USE_NUMBA and self.fused_sbox is not None
+
+    def diffusion_2d(self, rows, inverse=False):
+        """
+        2-D difüzyon (diffusion_version=2) veya tersini uygula
+
+        Args:
+        rows : numpy.ndarray (H*W,) veya (N, H*W)
+        inverse : bool - Deşifreleme yönü
+
+        Returns:
+        numpy.ndarray: Girdiyle aynı şekilde sonuç
+        """
+        frames = np.ascontiguousarray(rows).reshape((-1,) + self.shape)
+        key = self.key_stream.reshape(self.shape)
+        if self.depth == 16:
+            sbox, inverse_sbox = self.sbox.sbox16, self.sbox.inverse_sbox16
+        else:
+            sbox, inverse_sbox = self.sbox.sbox, self.sbox.inverse_sbox
+
+        if inverse and USE_NUMBA:
+            result = fast_inverse_diffusion_2d(frames, key, self.column_key_stream, inverse_sbox)
+        elif inverse:
+            result = numpy_inverse_diffusion_2d(frames, key, self.column_key_stream, inverse_sbox)
+        elif USE_NUMBA:
+            result = fast_diffusion_2d(frames, key, self.column_key_stream, sbox,
+                                       DIFFUSION_2D_BLOCK)
+        else:
+            result = numpy_diffusion_2d(frames, key, self.column_key_stream, sbox)
+        return result.reshape(rows.shape)
+
+    def encrypt(self, img, out=None, workspace=None):
+        """
+        Görüntüyü çizelgeyle şifrele
+
+        Args:
+        img : numpy.ndarray (H, W) uint8 (depth=16 ise uint16); adımlı görünüm olabilir
+        out : numpy.ndarray (H, W) - Sonucun yazılacağı dizi (img olabilir: yerinde şifreleme)
+        workspace : Workspace - Kopyalama gereken durumlar için yeniden kullanılan tamponlar
+
+        Returns:
+        numpy.ndarray: Şifreli görüntü (H, W) (out verilmişse out)
+        """
+        self._check_shape(img)
+        _check_out(out, self.shape, self.dtype)
+        H, W = self.shape
+        N = H * W
+
+        if self.fused:
+            with stage('fused', N):
+                flat_img = _kernel_input(img, (N,), self.dtype, workspace, 'source', avoid=out)
+                encrypted_flat = _kernel_output(out, (N,), self.dtype, workspace)
+                chunks = _diffusion_chunks(N)
+                if chunks:
+                    fast_encrypt_fused_parallel(flat_img, self.permutation, self.fused_sbox,
+                                                self.key_stream, chunks, encrypted_flat)
+                else:
+                    fast_encrypt_fused(flat_img, self.permutation, self.fused_sbox,
+                                       self.key_stream, encrypted_flat)
+                return _store(out, encrypted_flat, self.shape)
+
+        flat_img = np.asarray(img, dtype=self.dtype).ravel()
+
+        # Permütasyon
+        with stage('permutation', N):
+            if USE_NUMBA:
+                permuted_flat = fast_permutation_apply(flat_img, self.permutation)
+            else:
+                permuted_flat = flat_img[self.permutation]
+
+        # S-Box
+        with stage('substitution', N):
+            substituted_flat = self.substitute(permuted_flat)
+
+        # XOR difüzyon (zincirleme)
+        with stage('diffusion', N):
+            if self.diffusion_version == 2:
+                encrypted_flat = self.diffusion_2d(substituted_flat)
+            else:
+                encrypted_flat = xor_diffusion(substituted_flat, self.key_stream)
+
+        return _store(out, encrypted_flat, self.shape)
+
+    def decrypt(self, encrypted_img, out=None, workspace=None):
+        """
+        Şifreli görüntüyü çizelgeyle deşifrele
+
+        Args:
+        encrypted_img : numpy.ndarray (H, W) uint8 (depth=16 ise uint16); adımlı görünüm olabilir
+        out : numpy.ndarray (H, W) - Sonucun yazılacağı dizi (encrypted_img olabilir: yerinde)
+        workspace : Workspace - Kopyalama gereken durumlar için yeniden kullanılan tamponlar
+
+        Returns:
+        numpy.ndarray: Deşifre edilmiş görüntü (H, W) (out verilmişse out)
+        """
+        self._check_shape(encrypted_img)
+        _check_out(out, self.shape, self.dtype)
+        N = self.shape[0] * self.shape[1]
+
+        if self.fused:
+            with stage('inverse_fused', N):
+                flat_encrypted = _kernel_input(encrypted_img, (N,), self.dtype, workspace,
+                                               'source', avoid=out)
+                decrypted_flat = _kernel_output(out, (N,), self.dtype, workspace)
+                fast_decrypt_fused(flat_encrypted, self.permutation, self.fused_inverse_sbox,
+                                   self.key_stream, max(_diffusion_chunks(N), 1), decrypted_flat)
+                return _store(out, decrypted_flat, self.shape)
+
+        flat_encrypted = np.asarray(encrypted_img, dtype=self.dtype).ravel()
+
+        # Ters XOR difüzyon
+        with stage('inverse_diffusion', N):
+            if self.diffusion_version == 2:
+                substituted_flat = self.diffusion_2d(flat_encrypted, inverse=True)
+            else:
+                substituted_flat = inverse_xor_diffusion(flat_encrypted, self.key_stream)
+
+        # Ters S-Box
+        with stage('inverse_substitution', N):
+            permuted_flat = self.inverse_substitute(substituted_flat)
+
+        # Ters permütasyon: ters indekslerle gather
+        with stage('inverse_permutation', N):
+            if USE_NUMBA:
+                decrypted_flat = fast_permutation_apply(permuted_flat, self.inverse_permutation)
+            else:
+                decrypted_flat = permuted_flat[self.inverse_permutation]
+
+        return _store(out, decrypted_flat, self.shape)
+
+    def _check_batch(self, images):
+        """Yığının (N, H, W) olduğunu ve karelerin çizelgeyle aynı boyutta olduğunu doğrula"""
+        if images.ndim != 3 or images.shape[1:] != self.shape:
+            raise ValueError(f"Yığın boyutu {images.shape}, beklenen (N, {self.shape[0]}, {self.shape[1]})")
+
+    def encrypt_batch(self, images, out=None, workspace=None):
+        """
+        (N, H, W) görüntü yığınını tek geçişte şifrele
+
+        Her kare kendi XOR zinciriyle şifrelenir; sonuç her kare için
+        encrypt() ile bit bit aynıdır ve kareler ayrı ayrı deşifre edilebilir.
+
+        Args:
+        images : numpy.ndarray (N, H, W) uint8 (depth=16 ise uint16); adımlı görünüm olabilir
+        out : numpy.ndarray (N, H, W) - Sonucun yazılacağı dizi (images olabilir: yerinde)
+        workspace : Workspace - Kopyalama gereken durumlar için yeniden kullanılan tamponlar
+
+        Returns:
+        numpy.ndarray: Şifreli yığın (N, H, W) (out verilmişse out)
+        """
+        images = np.asarray(images)
+        self._check_batch(images)
+        _check_out(out, images.shape, self.dtype)
+        shape = (images.shape[0], self.shape[0] * self.shape[1])
+
+        if self.fused:
+            with stage('fused', images.size):
+                flat_imgs = _kernel_input(images, shape, self.dtype, workspace, 'source', avoid=out)
+                encrypted = _kernel_output(out, shape, self.dtype, workspace)
+                fast_encrypt_fused_batch(flat_imgs, self.permutation, self.fused_sbox,
+                                         self.key_stream, encrypted)
+                return _store(out, encrypted, images.shape)
+
+        flat_imgs = np.ascontiguousarray(images, dtype=self.dtype).reshape(shape)
+
+        # Permütasyon (tüm kareler için aynı indeksler)
+        with stage('permutation', flat_imgs.size):
+            if USE_NUMBA:
+                permuted = fast_permutation_apply_batch(flat_imgs, self.permutation)
+            else:
+                permuted = flat_imgs[:, self.permutation]
+
+        # S-Box
+        with stage('substitution', flat_imgs.size):
+            substituted = self.substitute(permuted)
+
+        # XOR difüzyon: zincir kare sınırında sıfırlanır
+        with stage('diffusion', flat_imgs.size):
+            if self.diffusion_version == 2:
+                encrypted = self.diffusion_2d(substituted)
+            elif USE_NUMBA:
+                encrypted = fast_xor_diffusion_batch(substituted, self.key_stream)
+            else:
+                encrypted = numpy_xor_diffusion(substituted, self.key_stream)
+
+        return _store(out, encrypted, images.shape)
+
+    def decrypt_batch(self, encrypted_images, out=None, workspace=None):
+        """
+        encrypt_batch() (veya kare kare encrypt()) ile şifrelenmiş yığını deşifrele
+
+        Args:
+        encrypted_images : numpy.ndarray (N, H, W) uint8 (depth=16 ise uint16)
+        out : numpy.ndarray (N, H, W) - Sonucun yazılacağı dizi (encrypted_images olabilir)
+        workspace : Workspace - Kopyalama gereken durumlar için yeniden kullanılan tamponlar
+
+        Returns:
+        numpy.ndarray: Deşifre edilmiş yığın (N, H, W) (out verilmişse out)
+        """
+        encrypted_images = np.asarray(encrypted_images)
+        self._check_batch(encrypted_images)
+        _check_out(out, encrypted_images.shape, self.dtype)
+        shape = (encrypted_images.shape[0], self.shape[0] * self.shape[1])
+
+        if self.fused:
+            with stage('inverse_fused', encrypted_images.size):
+                flat_encrypted = _kernel_input(encrypted_images, shape, self.dtype, workspace,
+                                               'source', avoid=out)
+                decrypted = _kernel_output(out, shape, self.dtype, workspace)
+                fast_decrypt_fused_batch(flat_encrypted, self.permutation,
+                                         self.fused_inverse_sbox, self.key_stream, decrypted)
+                return _store(out, decrypted, encrypted_images.shape)
+
+        flat_encrypted = np.ascontiguousarray(encrypted_images, dtype=self.dtype).reshape(shape)
+
+        # Ters XOR difüzyon
+        with stage('inverse_diffusion', flat_encrypted.size):
+            if self.diffusion_version == 2:
+                substituted = self.diffusion_2d(flat_encrypted, inverse=True)
+            elif USE_NUMBA:
+                substituted = fast_inverse_xor_diffusion_batch(flat_encrypted, self.key_stream)
+            else:
+                substituted = numpy_inverse_xor_diffusion(flat_encrypted, self.key_stream)
+
+        # Ters S-Box
+        with stage('inverse_substitution', flat_encrypted.size):
+            permuted = self.inverse_substitute(substituted)
+
+        # Ters permütasyon
+        with stage('inverse_permutation', flat_encrypted.size):
+            if USE_NUMBA:
+                decrypted = fast_permutation_apply_batch(permuted, self.inverse_permutation)
+            else:
+                decrypted = permuted[:, self.inverse_permutation]
+
+        return _store(out, decrypted, encrypted_images.shape)
+
+    def __repr__(self):
+        return (f"KeySchedule(shape={self.shape[0]}x{self.shape[1]}, depth={self.depth}, "
+                f"sbox_bits={self.sbox_bits}, diffusion_version={self.diffusion_version}, "
+                f"key_version={self.key_version}, nbytes={self.nbytes})")
+
+
+def channel_key(base_key, channel):
+    """
+    Kanal başına bağımsız anahtar türet
+
+    Kanal 0 ana anahtarı kullanır (gri seviye ile aynı tablolar); diğer
+    kanalların x0 ve u0 değerleri anahtar, 'channel' etiketi ve kanal
+    numarasının SHA-256 özetinden alınır. r, a, b, c, delta aynı kalır.
+
+    Args:
+    base_key : list [x0, u0, r, a, b, c, delta]
+    channel : int - Kanal numarası
+
+    Returns:
+    list: Kanal anahtarı
+    """
+    if channel == 0:
+        return list(base_key)
+
+    key_str = ','.join(map(str, base_key))
+    digest = hashlib.sha256(f"{key_str},channel,{channel}".encode()).hexdigest()
+
+    key = list(base_key)
+    # (0, 1) aralığı: 0.0 haritanın sabit noktası
+    key[0], key[1] = ((int(digest[i:i+8], 16) + 1) / (2**32 + 1) for i in (0, 8))
+    return key
+
+
+class ColorKeySchedule:
+    """
+    (H, W, C) renkli görüntüler (BGR / BGRA) için anahtar çizelgesi
+
+    Modlar:
+    - 'flat'    : Tüm kanallar tek permütasyon alanı; (H, W*C) gri çizelgesi
+                  araya girmiş (interleaved) byte'lar üzerinde çalışır
+    - 'channel' : Her kanalın kendi anahtarı ve çizelgesi vardır; kanallar
+                  satır başına tablolarla tek geçişte (paralel) işlenir
+    - 'cross'   : Kanal başına permütasyon ve S-Box, ardından tüm kanalları
+                  piksel sırasıyla dolaşan tek XOR zinciri (kanallar arası difüzyon)
+    """
+
+    def __init__(self, base_key, shape, color_mode='flat', sbox_candidates=1, sbox_bank=1,
+                 sbox_bits=8, depth=8, diffusion_version=1, key_version=1):
+        """
+        Args:
+        base_key : list [x0, u0, r, a, b, c, delta]
+        shape : (H, W, C) görüntü boyutu
+        color_mode : 'flat', 'channel' veya 'cross'
+        sbox_candidates, sbox_bank, sbox_bits, depth, diffusion_version, key_version :
+            KeySchedule seçenekleri
+        """
+        if color_mode not in COLOR_MODES:
+            raise ValueError(f"color_mode: {COLOR_MODES} değerlerinden biri olmalı")
+        if diffusion_version != 1 and color_mode != 'flat':
+            raise ValueError("2-D difüzyon renkli görüntülerde yalnızca 'flat' modda kullanılabilir")
+
+        H, W, C = (int(v) for v in shape)
+        options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank,
+                   'sbox_bits': sbox_bits, 'depth': depth, 'diffusion_version': diffusion_version,
+                   'key_version': key_version}
+
+        self.shape = (H, W, C)
+        self.color_mode = color_mode
+        self.dtype = np.dtype(DEPTH_DTYPES[depth])
+
+        if color_mode == 'flat':
+            self.schedules = [get_key_schedule(base_key, (H, W * C), **options)]
+            return
+
+        # Kanal çizelgeleri önbellekten; satır başına tablolar tek yığında
+        self.schedules = [get_key_schedule(channel_key(base_key, c), (H, W), **options)
+                          for c in range(C)]
+        self.permutations = np.stack([s.permutation for s in self.schedules])
+        self.inverse_permutations = np.stack([s.inverse_permutation for s in self.schedules])
+        key_streams = np.stack([s.key_stream for s in self.schedules])
+
+        if color_mode == 'cross':
+            # Piksel sırasıyla araya girmiş tek anahtar akışı: [p0c0, p0c1, ..., p1c0, ...]
+            self.key_stream = np.ascontiguousarray(key_streams.T).ravel()
+        else:
+            self.key_streams = key_streams
+
+        # Tek S-Box modunda kanallar (C, 256) yığını üzerinde tek gather
+        self.sboxes = None
+        if sbox_bits == 8 and sbox_bank == 1 and depth == 8:
+            self.sboxes = np.stack([s.sbox.sbox for s in self.schedules])
+            self.inverse_sboxes = np.stack([s.sbox.inverse_sbox for s in self.schedules])
+
+    @property
+    def nbytes(self):
+        """Kanal çizelgeleri ve yığınlanmış tabloların toplam boyutu"""
+        total = sum(s.nbytes for s in self.schedules)
+        if self.color_mode == 'flat':
+            return total
+        total += self.permutations.nbytes + self.inverse_permutations.nbytes
+        total += self.key_stream.nbytes if self.color_mode == 'cross' else self.key_streams.nbytes
+        if self.sboxes is not None:
+            total += self.sboxes.nbytes + self.inverse_sboxes.nbytes
+        return total
+
+    def _check_shape(self, img):
+        """Görüntü boyutunun çizelgeyle aynı olduğunu doğrula"""
+        if img.shape != self.shape:
+            raise ValueError(f"Görüntü boyutu {img.shape}, çizelge boyutu {self.shape} ile uyuşmuyor")
+
+    def _substitute_rows(self, rows, inverse=False):
+        """Kanal satırlarına (C, H*W) kendi S-Box'larını uygula"""
+        if self.sboxes is not None:
+            tables = self.inverse_sboxes if inverse else self.sboxes
+            return tables[np.arange(len(tables))[:, None], rows]
+
+        return np.stack([s.inverse_substitute(row) if inverse else s.substitute(row)
+                         for s, row in zip(self.schedules, rows)])
+
+    def _flat_call(self, method, img, out, workspace):
+        """'flat' modda (H, W*C) çizelgesini görüntünün kopyasız görünümüyle çağır"""
+        H, W, C = self.shape
+        source = _kernel_input(img, (H, W * C), self.dtype, workspace, 'color_source')
+        target = None if out is None else flat_view(out, (H, W * C))
+        result = method(source, out=target, workspace=workspace)
+        return _store(out, result, self.shape)
+
+    def encrypt(self, img, out=None, workspace=None):
+        """
+        Renkli görüntüyü şifrele
+
+        Args:
+        img : numpy.ndarray (H, W, C) uint8 veya uint16
+        out : numpy.ndarray (H, W, C) - Sonucun yazılacağı dizi (img olabilir: yerinde)
+        workspace : Workspace - Kopyalama gereken durumlar için yeniden kullanılan tamponlar
+
+        Returns:
+        numpy.ndarray: Şifreli görüntü (H, W, C) (out verilmişse out)
+        """
+        self._check_shape(img)
+        _check_out(out, self.shape, self.dtype)
+        H, W, C = self.shape
+
+        if self.color_mode == 'flat':
+            return self._flat_call(self.schedules[0].encrypt, img, out, workspace)
+
+        img = np.asarray(img, dtype=self.dtype)
+
+        # Kanal düzlemleri (C, H*W)
+        planes = np.ascontiguousarray(np.moveaxis(img, -1, 0)).reshape(C, H * W)
+
+        with stage('permutation', planes.size):
+            if USE_NUMBA:
+                permuted = fast_permutation_apply_rows(planes, self.permutations)
+            else:
+                permuted = np.take_along_axis(planes, self.permutations, axis=1)
+
+        with stage('substitution', planes.size):
+            substituted = self._substitute_rows(permuted)
+
+        if self.color_mode == 'cross':
+            # Piksel sırasıyla araya girmiş tek zincir: her kanal sonraki tüm kanalları etkiler
+            with stage('diffusion', planes.size):
+                interleaved = np.ascontiguousarray(substituted.T).ravel()
+                encrypted = xor_diffusion(interleaved, self.key_stream)
+            return _store(out, encrypted, self.shape)
+
+        with stage('diffusion', planes.size):
+            if USE_NUMBA:
+                encrypted = fast_xor_diffusion_rows(substituted, self.key_streams)
+            else:
+                encrypted = numpy_xor_diffusion(substituted, self.key_streams)
+        if out is not None:
+            np.copyto(out, np.moveaxis(encrypted.reshape(C, H, W), 0, -1))
+            return out
+        return np.ascontiguousarray(encrypted.T).reshape(self.shape)
+
+    def decrypt(self, encrypted_img, out=None, workspace=None):
+        """
+        Şifreli renkli görüntüyü deşifrele
+
+        Args:
+        encrypted_img : numpy.ndarray (H, W, C) uint8 veya uint16
+        out : numpy.ndarray (H, W, C) - Sonucun yazılacağı dizi (encrypted_img olabilir)
+        workspace : Workspace - Kopyalama gereken durumlar için yeniden kullanılan tamponlar
+
+        Returns:
+        numpy.ndarray: Deşifre edilmiş görüntü (H, W, C) (out verilmişse out)
+        """
+        self._check_shape(encrypted_img)
+        _check_out(out, self.shape, self.dtype)
+        H, W, C = self.shape
+
+        if self.color_mode == 'flat':
+            return self._flat_call(self.schedules[0].decrypt, encrypted_img, out, workspace)
+
+        encrypted_img = np.asarray(encrypted_img, dtype=self.dtype)
+
+        N = encrypted_img.size
+
+        with stage('inverse_diffusion', N):
+            if self.color_mode == 'cross':
+                interleaved = inverse_xor_diffusion(encrypted_img.ravel(), self.key_stream)
+                substituted = np.ascontiguousarray(interleaved.reshape(H * W, C).T)
+            else:
+                rows = np.ascontiguousarray(np.moveaxis(encrypted_img, -1, 0)).reshape(C, H * W)
+                if USE_NUMBA:
+                    substituted = fast_inverse_xor_diffusion_rows(rows, self.key_streams)
+                else:
+                    substituted = numpy_inverse_xor_diffusion(rows, self.key_streams)
+
+        with stage('inverse_substitution', N):
+            permuted = self._substitute_rows(substituted, inverse=True)
+
+        with stage('inverse_permutation', N):
+            if USE_NUMBA:
+                planes = fast_permutation_apply_rows(permuted, self.inverse_permutations)
+            else:
+                planes = np.take_along_axis(permuted, self.inverse_permutations, axis=1)
+
+        if out is not None:
+            np.copyto(out, np.moveaxis(planes.reshape(C, H, W), 0, -1))
+            return out
+        return np.ascontiguousarray(planes.T).reshape(self.shape)
+
+    def __repr__(self):
+        H, W, C = self.shape
+        return f"ColorKeySchedule(shape={H}x{W}x{C}, color_mode='{self.color_mode}')"
+
+
+def make_key_schedule(base_key, shape, color_mode='flat', tile_size=None, **options):
+    """
+    Boyuta göre gri (H, W) veya renkli (H, W, C) çizelge oluştur
+
+    Args:
+    base_key : list [x0, u0, r, a, b, c, delta]
+    shape : (H, W) veya (H, W, C)
+    color_mode : Renkli görüntülerde kanal modu (gri görüntülerde yok sayılır)
+    tile_size : int - Verilirse döşemeli mod (bkz. tiled_encrypt.py)
+    **options : KeySchedule seçenekleri
+
+    Returns:
+    KeySchedule, ColorKeySchedule veya TiledKeySchedule
+    """
+    if tile_size:
+        from tiled_encrypt import TiledKeySchedule
+        return TiledKeySchedule(base_key, shape, tile_size, color_mode=color_mode, **options)
+    if len(shape) == 3:
+        return ColorKeySchedule(base_key, shape, color_mode=color_mode, **options)
+    if len(shape) != 2:
+        raise ValueError(f"Görüntü (H, W) veya (H, W, C) olmalı, gelen: {tuple(shape)}")
+    return KeySchedule(base_key, shape, **options)
+
+
+class KeyScheduleCache:
+    """
+    Sınırlı LRU çizelge önbelleği (thread-safe)
+
+    (anahtar, boyut, seçenekler) başına bir KeySchedule tutar; hem çizelge
+    sayısı hem de toplam bellek sınırlıdır. Sınır aşılınca en eski
+    kullanılan çizelge atılır; tek başına max_bytes'tan büyük çizelgeler
+    önbelleğe alınmaz (üretilip döndürülür).
+    Aynı çizelgeyi aynı anda isteyen iş parçacıkları tek bir üretimi bekler.
+    """
+
+    def __init__(self, max_size=SCHEDULE_CACHE_SIZE, max_bytes=SCHEDULE_CACHE_BYTES):
+        """
+        Args:
+        max_size : En fazla çizelge sayısı
+        max_bytes : En fazla toplam bellek (byte)
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._schedules = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(base_key, shape, **options):
+        """Önbellek anahtarı: (anahtar, boyut, sıralı seçenekler)"""
+        # sha256_key_derivation anahtarı str() ile özetler: 1 ve 1.0 farklı anahtarlardır
+        return (tuple(str(v) for v in base_key),
+                tuple(int(v) for v in shape),
+                tuple(sorted(options.items())))
+
+    @staticmethod
+    def _normalize(shape, options):
+        """Varsayılan seçenekler verilse de verilmese de aynı önbellek girdisi"""
+        if len(shape) == 2:
+            options.pop('color_mode', None)
+        for name, default in (('depth', 8), ('sbox_candidates', 1), ('sbox_bank', 1),
+                              ('sbox_bits', 8), ('diffusion_version', 1), ('key_version', 1),
+                              ('tile_size', None)):
+            if name in options and options[name] == default:
+                del options[name]
+        return options
+
+    def get(self, base_key, shape, **options):
+        """
+        Çizelgeyi önbellekten al, yoksa oluşturup ekle
+
+        Args:
+        base_key : list [x0, u0, r, a, b, c, delta]
+        shape : (H, W) veya (H, W, C)
+        **options : Çizelge seçenekleri (sbox_candidates, sbox_bank, sbox_bits, depth,
+                    diffusion_version, key_version, tile_size, renkli (H, W, C)
+                    boyutlarda color_mode)
+
+        Returns:
+        KeySchedule, ColorKeySchedule veya TiledKeySchedule
+        """
+        cache_key = self.make_key(base_key, shape, **self._normalize(shape, options))
+
+        with self._lock:
+            schedule = self._schedules.get(cache_key)
+            if schedule is not None:
+                self._schedules.move_to_end(cache_key)
+                self.hits += 1
+                return schedule
+            pending = self._pending.get(cache_key)
+            if pending is None:
+                self.misses += 1
+                pending = self._pending[cache_key] = Future()
+                builder = True
+            else:
+                self.hits += 1
+                builder = False
+
+        if not builder:
+            # Aynı çizelge başka bir iş parçacığında üretiliyor
+            return pending.result()
+
+        # Çizelge kilit dışında oluşturulur (diğer anahtarları isteyenler beklemez)
+        try:
+            schedule = make_key_schedule(base_key, shape, **options)
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[cache_key]
+            pending.set_exception(exc)
+            raise
+
+        with self._lock:
+            del self._pending[cache_key]
+            if schedule.nbytes <= self.max_bytes:
+                self._schedules[cache_key] = schedule
+                self._schedules.move_to_end(cache_key)
+                self._evict()
+        pending.set_result(schedule)
+
+        return schedule
+
+    def find(self, fingerprint, shape, **options):
+        """
+        Anahtar parmak izine (bkz. key_fingerprint) göre önbellekteki çizelgeyi bul
+
+        Kap dosyası başlığındaki parmak izi ile, anahtar yeniden
+        girilmeden önceden üretilmiş çizelge kullanılabilir.
+
+        Args:
+        fingerprint : str - key_fingerprint() çıktısı
+        shape : (H, W) veya (H, W, C)
+        **options : Çizelge seçenekleri (get() ile aynı)
+
+        Returns:
+        KeySchedule / ColorKeySchedule veya None (önbellekte yoksa)
+        """
+        wanted = self.make_key((), shape, **self._normalize(shape, options))[1:]
+        with self._lock:
+            for cache_key, schedule in reversed(self._schedules.items()):
+                if cache_key[1:] == wanted and key_fingerprint(cache_key[0]) == fingerprint:
+                    self._schedules.move_to_end(cache_key)
+                    self.hits += 1
+                    return schedule
+        return None
+
+    def _evict(self):
+        """Sınırlar aşıldıysa en eski çizelgeleri at"""
+        total = sum(s.nbytes for s in self._schedules.values())
+        while self._schedules and (len(self._schedules) > self.max_size or
+                                   total > self.max_bytes):
+            _, oldest = self._schedules.popitem(last=False)
+            total -= oldest.nbytes
+
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._schedules.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._schedules)
+
+    def __repr__(self):
+        return (f"KeyScheduleCache(size={len(self)}/{self.max_size}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+
+# Modül düzeyindeki varsayılan önbellek
+schedule_cache = KeyScheduleCache()
+
+
+def get_key_schedule(base_key, shape, **options):
+    """
+    Varsayılan önbellekten (anahtar, boyut) çizelgesini al
+
+    Args:
+    base_key : list [x0, u0, r, a, b, c, delta]
+    shape : (H, W) veya renkli (H, W, C)
+    **options : Çizelge seçenekleri (renkli görüntülerde color_mode dahil)
+
+    Returns:
+    KeySchedule veya ColorKeySchedule
+    """
+    return schedule_cache.get(base_key, shape, **options)
+
+
+def warm_up_kernels():
+    """
+    Numba çekirdeklerini (tekli, toplu, paralel tarama, 2-D, 16-bit ve renkli) önceden derle
+
+    İşlem havuzundan veya iş parçacıklarından önce ana süreçte çağrılır:
+    derlenen kod diske önbelleklendiği için işçiler ayrı ayrı JIT derlemesi
+    yapmaz, paralel çekirdeklerin iş parçacığı havuzu da ana iş parçacığında
+    başlatılmış olur. Paralel çekirdeklerin seri ikizleri (tek iş parçacıklı
+    çağıranlar, ör. şifreleme motoru) de derlenir.
+    """
+    _warm_up()
+    if USE_NUMBA and get_num_threads() > 1:
+        with kernel_threads(1):
+            _warm_up()
+
+
+def _warm_up():
+    """warm_up_kernels() örnek çağrıları (çağıran iş parçacığının çekirdek sayısıyla)"""
+    schedule = KeySchedule([0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05], (2, 2))
+    sample = np.zeros((1, 2, 2), dtype=np.uint8)
+    schedule.decrypt(schedule.encrypt(sample[0]))
+    schedule.decrypt_batch(schedule.encrypt_batch(sample))
+
+    schedule = KeySchedule([0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05], (2, 2), depth=16)
+    sample16 = sample.astype(np.uint16)
+    schedule.decrypt(schedule.encrypt(sample16[0]))
+    schedule.decrypt_batch(schedule.encrypt_batch(sample16))
+
+    # 2-D difüzyon (sürüm 2) çekirdekleri
+    for depth, frames in ((8, sample), (16, sample16)):
+        schedule = KeySchedule([0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05], (2, 2), depth=depth,
+                               diffusion_version=2)
+        schedule.decrypt_batch(schedule.encrypt_batch(frames))
+
+    color = np.zeros((2, 2, 3), dtype=np.uint8)
+    for color_mode in ('channel', 'cross'):
+        schedule = ColorKeySchedule([0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05], color.shape,
+                                    color_mode=color_mode)
+        schedule.decrypt(schedule.encrypt(color))
+
+    if USE_NUMBA:
+        # Büyük görüntülerin paralel tarama çekirdekleri (örnekler eşiğin altında kalır)
+        for depth, dtype in DEPTH_DTYPES.items():
+            data = np.zeros(4, dtype=dtype)
+            fast_inverse_xor_diffusion_parallel(fast_xor_diffusion_parallel(data, data, 2), data, 2)
+            schedule = KeySchedule([0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05], (2, 2), depth=depth)
+            fast_encrypt_fused_parallel(data, schedule.permutation, schedule.fused_sbox, data, 2,
+                                        np.empty_like(data))
+        # Döşemeli modun toplu FPLM ve DFS çekirdekleri (bkz. tiled_encrypt.py)
+        fplm_batch_sequences([[0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]], 2)
+        dfs_batch_indices([[0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]], 2, 2, np.int32)
+
+
+if __name__ == "__main__":
+    # Test kodu
+    import time
+
+    print("="*60)
+    print("Key Schedule Test")
+    print("="*60)
+
+    base_key = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+    images = np.random.randint(0, 256, (20, 128, 128), dtype=np.uint8)
+
+    start = time.time()
+    schedule = get_key_schedule(base_key, (128, 128))
+    build_time = (time.time() - start) * 1000
+    print(f"\nÇizelge oluşturuldu: {schedule}")
+    print(f"  Süre: {build_time:.2f} ms")
+
+    start = time.time()
+    encrypted = [get_key_schedule(base_key, (128, 128)).encrypt(img) for img in images]
+    per_image = (time.time() - start) * 1000 / len(images)
+    print(f"\nGörüntü başına şifreleme (önbellekli): {per_image:.3f} ms")
+
+    decrypted = [schedule.decrypt(enc) for enc in encrypted]
+    ok = all(np.array_equal(a, b) for a, b in zip(images, decrypted))
+    print(f"Deşifreleme başarılı mı? {ok}")
+    print(f"Önbellek: {schedule_cache}")
+
+    print("\n" + "="*60)
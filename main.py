@@ -16,6 +16,7 @@ import time
 import os
 import matplotlib.pyplot as plt
 from encryption import encrypt_image, decrypt_image, encrypt_image_from_array
+from instrumentation import collect_stages
 from security_metrics import SecurityMetrics
 
 
@@ -209,9 +210,10 @@ def test_performance(base_key):
         # Test görüntüsü oluştur
         test_img = np.random.randint(0, 256, (h, w), dtype=np.uint8)
         
-        # Şifreleme süresini ölç
+        # Şifreleme süresini ölç (aşama dökümüyle)
         start = time.time()
-        enc = encrypt_image_from_array(test_img, base_key)
+        with collect_stages() as timings:
+            enc = encrypt_image_from_array(test_img, base_key)
         enc_time = (time.time() - start) * 1000
         
         # Throughput hesapla (MB/s)
@@ -219,6 +221,8 @@ def test_performance(base_key):
         throughput = data_size_mb / (enc_time / 1000)
         
         print(f"{h}×{w:<10} {enc_time:<18.2f} ms {throughput:<18.2f} MB/s")
+        for name, seconds in timings.items():
+            print(f"    {name:<20} {seconds * 1000:>8.2f} ms")
     
     print("-"*70)
 
@@ -0,0 +1,368 @@
+"""
+ChaosPolybius-2026 - Bellek Dışı (Out-of-Core) Şifreleme
+
+RAM'e sığmayan görüntüleri (ör. 50k x 50k uydu karoları) np.memmap veya
+ham dosya üzerinden şifreler/deşifreler. Sonuç encrypt_image_from_array()
+ile bit bit aynıdır (normal decrypt_image() ile de çözülebilir), ancak:
+- Permütasyon, DFS yığını ve ziyaret bit haritası diskteki geçici
+  dosyalarda (np.memmap) tutulur; Python demet listesi oluşturulmaz
+- Anahtar akışı parça parça üretilir (FPLM durumu parçalar arasında taşınır)
+- Permütasyon, S-Box ve XOR difüzyonu parça parça yapılır; XOR zinciri
+  parça sınırında önceki parçanın son şifreli pikseliyle devam eder
+- Şifreli pikseller doğrudan çıktı memmap'ine yazılır
+
+Çalışma belleği (parça tamponları) max_memory ile sınırlıdır; diskteki
+tabloların sayfaları işletim sisteminin sayfa önbelleğinde tutulur ve
+bellek darlığında geri alınabilir.
+
+Kullanım:
+    python memmap_encrypt.py encrypt uydu.raw sifreli.raw --shape 50000 50000 --max-memory 1024
+    python memmap_encrypt.py decrypt sifreli.raw cozulmus.raw --shape 50000 50000
+    python memmap_encrypt.py encrypt uydu.npy sifreli.cpb     # Kap dosyası (cipher_container.py)
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from fplm import FPLM
+from toroidal_dfs import ToroidalDFS
+from dynamic_polybius import DynamicPolybius
+from key_schedule import (DEPTH_DTYPES, image_depth, sha256_key_derivation, xor_diffusion,
+                          inverse_xor_diffusion)
+from instrumentation import stage
+from cipher_container import CONTAINER_EXTENSION, create_container, read_container
+
+
+# Varsayılan çalışma belleği sınırı (parça tamponları)
+DEFAULT_MAX_MEMORY = 256 * 1024 * 1024
+
+# Parça pikseli başına geçici bellek üst sınırı (indeks, ara diziler,
+# float64 FPLM değerleri ve anahtar akışı dönüşümü)
+BYTES_PER_PIXEL = 64
+
+
+def open_image(image, shape=None, dtype=np.uint8, mode='r'):
+    """
+    Görüntüyü bellek eşlemeli olarak aç
+
+    Args:
+    image : numpy.ndarray / np.memmap (olduğu gibi döner), .npy dosyası,
+            .cpb kap dosyası (yalnızca okuma) veya ham (raw) piksel dosyası yolu
+    shape : tuple - Ham dosyalar ve yeni oluşturulan dosyalar için boyut
+    dtype : Ham dosyalar ve yeni dosyalar için piksel tipi (uint8 / uint16)
+    mode : 'r' (oku), 'r+' (yerinde yaz) veya 'w+' (oluştur)
+
+    Returns:
+    numpy.ndarray: np.memmap (dosya verildiyse)
+    """
+    if isinstance(image, np.ndarray):
+        return image
+
+    if str(image).endswith('.npy'):
+        if mode == 'w+':
+            return np.lib.format.open_memmap(image, mode='w+', dtype=dtype, shape=tuple(shape))
+        return np.load(image, mmap_mode=mode)
+
+    if str(image).endswith(CONTAINER_EXTENSION) and mode == 'r':
+        return read_container(image)[0]
+
+    if shape is None:
+        raise ValueError(f"Ham dosya için shape gerekli: {image}")
+    return np.memmap(image, dtype=dtype, mode=mode, shape=tuple(shape))
+
+
+class OutOfCoreSchedule:
+    """
+    KeySchedule'ın bellek dışı karşılığı
+
+    Permütasyon diskteki geçici bir dosyada tutulur, anahtar akışı her
+    geçişte parça parça yeniden üretilir; RAM'de yalnızca S-Box ve bir
+    parçalık tamponlar bulunur. Renkli (H, W, C) görüntüler 'flat' modda
+    (H, W*C) olarak işlenir.
+    """
+
+    def __init__(self, base_key, shape, sbox_candidates=1, sbox_bank=1, sbox_bits=8, depth=8,
+                 max_memory=DEFAULT_MAX_MEMORY, scratch_dir=None):
+        """
+        Args:
+        base_key : list [x0, u0, r, a, b, c, delta]
+        shape : (H, W) veya (H, W, C) görüntü boyutu
+        sbox_candidates, sbox_bank, sbox_bits, depth : KeySchedule seçenekleri
+        max_memory : int - Çalışma belleği sınırı (byte)
+        scratch_dir : str - Geçici tabloların klasörü (varsayılan: sistem geçici klasörü)
+        """
+        if depth not in DEPTH_DTYPES:
+            raise ValueError(f"depth: {tuple(DEPTH_DTYPES)} değerlerinden biri olmalı")
+        if depth == 16 and (sbox_candidates > 1 or sbox_bank > 1 or sbox_bits != 8):
+            raise ValueError("16-bit derinlik yalnızca tek S-Box modunda kullanılabilir")
+        if len(shape) not in (2, 3):
+            raise ValueError(f"Görüntü (H, W) veya (H, W, C) olmalı, gelen: {tuple(shape)}")
+
+        H, W = int(shape[0]), int(np.prod(shape[1:]))
+        N = H * W
+
+        self.image_shape = tuple(int(v) for v in shape)
+        self.shape = (H, W)
+        self.sbox_bank = sbox_bank
+        self.sbox_bits = sbox_bits
+        self.depth = depth
+        self.dtype = np.dtype(DEPTH_DTYPES[depth])
+
+        # Parça uzunluğu çift: 16-bit piksel çiftleri parça sınırında bölünmez
+        self.chunk_pixels = max(2, int(max_memory) // BYTES_PER_PIXEL) & ~1
+
+        # KeySchedule ile aynı FPLM'ler; difüzyon FPLM'i her geçişte baştan kurulur
+        with stage('key_derivation'):
+            self.dynamic_key = sha256_key_derivation(None, base_key)
+        fplm_perm = FPLM(*self.dynamic_key)
+        fplm_sbox = FPLM(*self.dynamic_key)
+
+        self.scratch = tempfile.mkdtemp(prefix='chaospolybius_', dir=scratch_dir)
+        index_dtype = np.uint32 if N <= 2**32 else np.int64
+
+        # Permütasyon (Toroidal DFS): yol, yığın ve bit haritası diskte
+        self.permutation = self._scratch_array('permutation.bin', index_dtype, N)
+        visited = self._scratch_array('visited.bin', np.uint8, (N + 7) // 8)
+        stack = self._scratch_array('stack.bin', index_dtype, 3 * N + 1)
+
+        with stage('dfs_path', N):
+            ToroidalDFS(H, W, fplm_perm).generate_path_indices(
+                out=self.permutation, visited=visited, stack=stack)
+
+        del visited, stack
+        os.remove(os.path.join(self.scratch, 'visited.bin'))
+        os.remove(os.path.join(self.scratch, 'stack.bin'))
+
+        # S-Box (küçük, RAM'de)
+        with stage('sbox_build'):
+            self.sbox = DynamicPolybius(fplm_sbox, candidates=sbox_candidates,
+                                        bank_size=sbox_bank, bits=max(sbox_bits, depth))
+
+    def _scratch_array(self, name, dtype, length):
+        """Geçici klasörde seyrek (sparse) bir np.memmap dosyası oluştur"""
+        return np.memmap(os.path.join(self.scratch, name), dtype=dtype, mode='w+',
+                         shape=(max(int(length), 1),))[:length]
+
+    def _substitute(self, data, start, inverse=False):
+        """
+        KeySchedule.substitute() / inverse_substitute() ile aynı işlemi
+        düz konumları [start, start + len(data)) olan parçaya uygula
+        """
+        if self.depth == 16:
+            return (self.sbox.inverse_sbox16 if inverse else self.sbox.sbox16)[data]
+        if self.sbox_bits == 16:
+            # Parçalar çift konumda başlar: çiftler tam görüntüdekiyle aynı
+            if inverse:
+                return self.sbox.inverse_substitute_pairs(data)
+            return self.sbox.substitute_pairs(data)
+        if self.sbox_bank > 1:
+            H, W = self.shape
+            rows = np.arange(start, start + len(data)) // W
+            tables = self.sbox.inverse_bank if inverse else self.sbox.sbox_bank
+            return tables[rows * len(tables) // H, data]
+        return (self.sbox.inverse_sbox if inverse else self.sbox.sbox)[data]
+
+    def _check_image(self, image):
+        """Görüntü boyutu ve tipinin çizelgeyle aynı olduğunu doğrula"""
+        if image.shape != self.image_shape or image.dtype != self.dtype:
+            raise ValueError(f"Görüntü {image.shape} {image.dtype}, çizelge "
+                             f"{self.image_shape} {self.dtype} ile uyuşmuyor")
+
+    def encrypt(self, source, target):
+        """
+        source görüntüsünü parça parça şifreleyip target'a yaz
+
+        Args:
+        source : numpy.ndarray / np.memmap - Orijinal görüntü
+        target : numpy.ndarray / np.memmap - Şifreli çıktı (aynı boyut ve tip)
+        """
+        self._check_image(source)
+        self._check_image(target)
+        src = source.reshape(-1)
+        dst = target.reshape(-1)
+        fplm_diff = FPLM(*self.dynamic_key)
+        carry = 0
+
+        for start in range(0, len(src), self.chunk_pixels):
+            stop = min(start + self.chunk_pixels, len(src))
+            n = stop - start
+
+            # Permütasyon: bu parçanın kaynak pikselleri (DFS yolu yerel olduğu için
+            # okumalar kaynağın küçük bir bölgesinde yoğunlaşır)
+            with stage('permutation', n):
+                permuted = src[self.permutation[start:stop]]
+            with stage('substitution', n):
+                substituted = self._substitute(permuted, start)
+            with stage('keystream', n):
+                key_stream = fplm_diff.get_key_stream(n, bits=self.depth)
+
+            # XOR zinciri önceki parçanın son şifreli pikseliyle devam eder
+            with stage('diffusion', n):
+                substituted[0] ^= carry
+                encrypted = xor_diffusion(substituted, key_stream)
+
+            dst[start:stop] = encrypted
+            carry = encrypted[-1]
+
+        if isinstance(target, np.memmap):
+            target.flush()
+
+    def decrypt(self, source, target):
+        """
+        Şifreli source görüntüsünü parça parça deşifreleyip target'a yaz
+
+        Args:
+        source : numpy.ndarray / np.memmap - Şifreli görüntü
+        target : numpy.ndarray / np.memmap - Deşifre çıktısı (aynı boyut ve tip)
+        """
+        self._check_image(source)
+        self._check_image(target)
+        src = source.reshape(-1)
+        dst = target.reshape(-1)
+        fplm_diff = FPLM(*self.dynamic_key)
+        carry = 0
+
+        for start in range(0, len(src), self.chunk_pixels):
+            stop = min(start + self.chunk_pixels, len(src))
+            n = stop - start
+
+            encrypted = np.asarray(src[start:stop])
+            with stage('keystream', n):
+                key_stream = fplm_diff.get_key_stream(n, bits=self.depth)
+
+            with stage('inverse_diffusion', n):
+                substituted = inverse_xor_diffusion(encrypted, key_stream)
+                substituted[0] ^= carry
+                carry = encrypted[-1]
+
+            with stage('inverse_substitution', n):
+                permuted = self._substitute(substituted, start, inverse=True)
+
+            # Ters permütasyon: pikseller DFS konumlarına dağıtılır
+            with stage('inverse_permutation', n):
+                dst[self.permutation[start:stop]] = permuted
+
+        if isinstance(target, np.memmap):
+            target.flush()
+
+    def close(self):
+        """Diskteki geçici tabloları sil"""
+        self.permutation = None
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return (f"OutOfCoreSchedule(shape={'x'.join(map(str, self.image_shape))}, "
+                f"depth={self.depth}, chunk_pixels={self.chunk_pixels})")
+
+
+def _run(mode, source, target, base_key, shape, dtype, max_memory, scratch_dir, options):
+    """Ortak şifreleme/deşifreleme yolu"""
+    src = open_image(source, shape=shape, dtype=dtype, mode='r')
+    if isinstance(target, str) and target.endswith(CONTAINER_EXTENSION):
+        # Şifreli çıktı doğrudan kap dosyasının verisine yazılır
+        if mode != 'encrypt':
+            raise ValueError("Kap dosyası (.cpb) yalnızca şifreli çıktı olabilir")
+        dst = create_container(target, src.shape, src.dtype, base_key=base_key, **options)
+    else:
+        dst = open_image(target, shape=src.shape, dtype=src.dtype, mode='w+')
+
+    with OutOfCoreSchedule(base_key, src.shape, depth=image_depth(src), max_memory=max_memory,
+                           scratch_dir=scratch_dir, **options) as schedule:
+        if mode == 'encrypt':
+            schedule.encrypt(src, dst)
+        else:
+            schedule.decrypt(src, dst)
+
+    return dst
+
+
+def encrypt_memmap(source, target, base_key, shape=None, dtype=np.uint8,
+                   max_memory=DEFAULT_MAX_MEMORY, scratch_dir=None, sbox_candidates=1,
+                   sbox_bank=1, sbox_bits=8):
+    """
+    Görüntüyü bellek dışı şifrele (sonuç encrypt_image_from_array() ile aynı)
+
+    Args:
+    source : np.memmap / numpy.ndarray, .npy veya ham dosya yolu
+    target : np.memmap / numpy.ndarray veya oluşturulacak .npy / .cpb / ham dosya yolu
+    base_key : list - Anahtar
+    shape, dtype : Ham girdi dosyasının boyutu ve piksel tipi
+    max_memory : int - Çalışma belleği sınırı (byte)
+    scratch_dir : str - Geçici tabloların klasörü (büyük görüntülerde hızlı bir disk)
+    sbox_candidates, sbox_bank, sbox_bits : Şifreleme seçenekleri
+
+    Returns:
+    numpy.ndarray: Şifreli görüntü (dosya verildiyse np.memmap)
+    """
+    options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank, 'sbox_bits': sbox_bits}
+    return _run('encrypt', source, target, base_key, shape, dtype, max_memory, scratch_dir, options)
+
+
+def decrypt_memmap(source, target, base_key, shape=None, dtype=np.uint8,
+                   max_memory=DEFAULT_MAX_MEMORY, scratch_dir=None, sbox_candidates=1,
+                   sbox_bank=1, sbox_bits=8):
+    """
+    Şifreli görüntüyü bellek dışı deşifrele
+
+    Args:
+    source : np.memmap / numpy.ndarray, .npy, .cpb veya ham dosya yolu (şifreli)
+    target : np.memmap / numpy.ndarray veya oluşturulacak .npy / ham dosya yolu
+    base_key : list - Şifreleme anahtarı
+    shape, dtype : Ham girdi dosyasının boyutu ve piksel tipi
+    max_memory : int - Çalışma belleği sınırı (byte)
+    scratch_dir : str - Geçici tabloların klasörü
+    sbox_candidates, sbox_bank, sbox_bits : Şifrelemede kullanılan seçenekler
+
+    Returns:
+    numpy.ndarray: Deşifre edilmiş görüntü (dosya verildiyse np.memmap)
+    """
+    options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank, 'sbox_bits': sbox_bits}
+    return _run('decrypt', source, target, base_key, shape, dtype, max_memory, scratch_dir, options)
+
+
+def main(argv=None):
+    """Komut satırı giriş noktası"""
+    parser = argparse.ArgumentParser(
+        description="ChaosPolybius-2026 bellek dışı (memmap) şifreleme/deşifreleme")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('source', help="Girdi: .npy, .cpb veya ham piksel dosyası")
+    parser.add_argument('output', help="Çıktı: .npy, ham piksel dosyası veya (şifrelemede) .cpb")
+    parser.add_argument('--shape', type=int, nargs='+', default=None,
+                        help="Ham dosya boyutu: H W [C]")
+    parser.add_argument('--dtype', choices=['uint8', 'uint16'], default='uint8')
+    parser.add_argument('--key', type=float, nargs=7, default=[0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1],
+                        metavar=('X0', 'U0', 'R', 'A', 'B', 'C', 'DELTA'))
+    parser.add_argument('--max-memory', type=int, default=DEFAULT_MAX_MEMORY // 2**20,
+                        help="Çalışma belleği sınırı (MB)")
+    parser.add_argument('--scratch-dir', default=None,
+                        help="Geçici permütasyon tablolarının klasörü")
+    parser.add_argument('--sbox-candidates', type=int, default=1)
+    parser.add_argument('--sbox-bank', type=int, default=1)
+    parser.add_argument('--sbox-bits', type=int, choices=[8, 16], default=8)
+    args = parser.parse_args(argv)
+
+    func = encrypt_memmap if args.mode == 'encrypt' else decrypt_memmap
+    start = time.time()
+    result = func(args.source, args.output, args.key, shape=args.shape, dtype=args.dtype,
+                  max_memory=args.max_memory * 2**20, scratch_dir=args.scratch_dir,
+                  sbox_candidates=args.sbox_candidates, sbox_bank=args.sbox_bank,
+                  sbox_bits=args.sbox_bits)
+    elapsed = time.time() - start
+
+    print(f"{'x'.join(map(str, result.shape))} {result.dtype}: {elapsed:.1f} s, "
+          f"{result.nbytes / 1e6 / elapsed:.1f} MB/s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,283 @@
+"""
+ChaosPolybius-2026 - Paylaşımlı Bellekli Paralel Şifreleme
+
+Bellekteki görüntüleri işlem havuzunda şifreler/deşifreler. Piksel verisi
+pickle'lanmaz: girdiler tek bir multiprocessing.shared_memory tamponuna
+yerleştirilir, işçiler bu tampona ve önceden ayrılmış çıktı tamponuna
+isimle bağlanır. Süreçler arasında yalnızca (başlangıç, bitiş) indeksleri
+gider.
+
+Kullanım:
+    encrypted = encrypt_images_parallel(stack, base_key, workers=8)
+    decrypted = decrypt_images_parallel(encrypted, base_key, workers=8)
+"""
+
+import os
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+from key_schedule import (DEPTH_DTYPES, USE_NUMBA, get_key_schedule, image_depth,
+                          warm_up_kernels)
+
+if USE_NUMBA:
+    from fast_numba import set_kernel_threads
+
+
+# İşçi süreç durumu (Pool initializer ile bir kez ayarlanır)
+_worker_state = {}
+
+
+class SharedImageBuffer:
+    """
+    Farklı boyutlu uint8 (veya uint16) görüntüleri tek bir paylaşımlı bellek bloğunda tutar
+
+    Görüntü i, [offsets[i], offsets[i] + H*W) piksel aralığında C sırasıyla
+    saklanır. Ana süreç create() ile oluşturur; işçiler name ile attach eder.
+    """
+
+    def __init__(self, shapes, name=None, dtype=np.uint8):
+        """
+        Args:
+        shapes : list of (H, W) - Görüntü boyutları
+        name : str - Var olan bloğa bağlanmak için isim (None = yeni blok oluştur)
+        dtype : Piksel tipi (np.uint8 veya np.uint16)
+        """
+        self.shapes = [tuple(int(v) for v in shape) for shape in shapes]
+        self.dtype = np.dtype(dtype)
+        sizes = np.array([H * W for H, W in self.shapes], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self.nbytes = int(self.offsets[-1]) * self.dtype.itemsize
+        self.owner = name is None
+
+        # Boyutu 0 olan blok oluşturulamaz
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner,
+                                              size=max(self.nbytes, 1))
+        self.name = self.shm.name
+        self.buffer = np.ndarray((int(self.offsets[-1]),), dtype=self.dtype, buffer=self.shm.buf)
+
+    def image(self, index):
+        """
+        Görüntü index'in (H, W) görünümü (kopya değil)
+
+        Returns:
+        numpy.ndarray: Paylaşımlı belleğe bakan görünüm
+        """
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.buffer[start:stop].reshape(self.shapes[index])
+
+    def frames(self, start, stop):
+        """
+        Aynı boyutlu ardışık görüntüler [start, stop) için (N, H, W) görünümü
+
+        Returns:
+        numpy.ndarray: Paylaşımlı belleğe bakan görünüm
+        """
+        H, W = self.shapes[start]
+        return self.buffer[self.offsets[start]:self.offsets[stop]].reshape(stop - start, H, W)
+
+    def close(self):
+        """Bu süreçteki bağlantıyı kapat; sahipse bloğu sil"""
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.shapes)
+
+
+def _init_worker(mode, base_key, options, shapes, input_name, output_name):
+    """İşçi süreç başlangıcı: paylaşımlı tamponlara isimle bağlan"""
+    # Her süreç tek çekirdekte çalışır: paralel çekirdekler de tüm CPU'ları
+    # kullanırsa süreç × iş parçacığı aşırı aboneliği oluşur
+    if USE_NUMBA:
+        set_kernel_threads(1)
+
+    dtype = DEPTH_DTYPES[options['depth']]
+    _worker_state.update(mode=mode, base_key=base_key, options=options,
+                         source=SharedImageBuffer(shapes, name=input_name, dtype=dtype),
+                         target=SharedImageBuffer(shapes, name=output_name, dtype=dtype))
+
+
+def _process_range(task):
+    """
+    [start, stop) görüntülerini işle; sonuç doğrudan çıktı tamponuna yazılır
+
+    Aralık aynı boyutlu görüntülerden oluşur ve tek bir toplu çağrıyla işlenir.
+    """
+    start, stop = task
+    state = _worker_state
+    source, target = state['source'], state['target']
+
+    schedule = get_key_schedule(state['base_key'], source.shapes[start], **state['options'])
+    frames = source.frames(start, stop)
+
+    if state['mode'] == 'encrypt':
+        schedule.encrypt_batch(frames, out=target.frames(start, stop))
+    else:
+        schedule.decrypt_batch(frames, out=target.frames(start, stop))
+
+    return stop - start
+
+
+def plan_ranges(shapes, workers, tasks_per_worker=4):
+    """
+    Görüntüleri aynı boyutlu, yaklaşık eşit piksel yüklü aralıklara böl
+
+    Args:
+    shapes : list of (H, W)
+    workers : int - Süreç sayısı
+    tasks_per_worker : int - Yük dengesi için işçi başına görev sayısı
+
+    Returns:
+    list of (start, stop)
+    """
+    if not shapes:
+        return []
+
+    total = sum(H * W for H, W in shapes)
+    budget = max(1, total // (workers * tasks_per_worker))
+
+    ranges = []
+    start, load = 0, 0
+    for i, (H, W) in enumerate(shapes):
+        if i > start and (shapes[i] != shapes[start] or load >= budget):
+            ranges.append((start, i))
+            start, load = i, 0
+        load += H * W
+    ranges.append((start, len(shapes)))
+
+    return ranges
+
+
+def _run_parallel(mode, images, base_key, workers, options):
+    """Ortak şifreleme/deşifreleme yolu"""
+    stacked = isinstance(images, np.ndarray) and images.ndim == 3
+    shapes = [img.shape for img in images]
+    for shape in shapes:
+        if len(shape) != 2:
+            raise ValueError(f"Gri seviye (H, W) görüntü bekleniyor, gelen: {shape}")
+
+    # Tüm görüntüler aynı derinlikte olmalı (8-bit veya 16-bit)
+    # (0, H, W) yığınının derinliği dtype'tan gelir; boş liste 8-bit sayılır
+    depths = {image_depth(images)} if stacked else ({image_depth(img) for img in images} or {8})
+    if len(depths) > 1:
+        raise ValueError("8-bit ve 16-bit görüntüler aynı çağrıda karıştırılamaz")
+    options = dict(options, depth=depths.pop())
+    dtype = DEPTH_DTYPES[options['depth']]
+
+    workers = workers or os.cpu_count() or 1
+
+    with SharedImageBuffer(shapes, dtype=dtype) as source, \
+            SharedImageBuffer(shapes, dtype=dtype) as target:
+        # Tek kopya: girdiler paylaşımlı belleğe
+        if stacked:
+            source.buffer[:] = np.ascontiguousarray(images).ravel()
+        else:
+            for i, img in enumerate(images):
+                source.image(i)[...] = img
+
+        ranges = plan_ranges(source.shapes, workers)
+
+        if workers == 1 or len(ranges) <= 1:
+            # Havuz kurmaya değmez: aynı tamponlar üzerinde bu süreçte çalış
+            _worker_state.update(mode=mode, base_key=base_key, options=options,
+                                 source=source, target=target)
+            try:
+                for task in ranges:
+                    _process_range(task)
+            finally:
+                _worker_state.clear()
+        else:
+            # 'spawn': fork, numba'nın TBB/OpenMP iş parçacığı havuzlarıyla kilitlenebilir
+            warm_up_kernels()
+            pool = get_context('spawn').Pool(min(workers, len(ranges)), initializer=_init_worker,
+                                             initargs=(mode, base_key, options, source.shapes,
+                                                       source.name, target.name))
+            with pool:
+                for _ in pool.imap_unordered(_process_range, ranges):
+                    pass
+
+        # Tek kopya: sonuçlar paylaşımlı bellekten çıkar (blok silinmeden önce)
+        result = target.buffer.copy()
+
+    if stacked:
+        return result.reshape(images.shape)
+
+    return [result[target.offsets[i]:target.offsets[i + 1]].reshape(shape)
+            for i, shape in enumerate(shapes)]
+
+
+def encrypt_images_parallel(images, base_key, workers=None, sbox_candidates=1, sbox_bank=1,
+                            sbox_bits=8, diffusion_version=1, key_version=1):
+    """
+    Görüntüleri işlem havuzunda şifrele (piksel verisi pickle'lanmaz)
+
+    Her görüntü encrypt_image_from_array() sonucu ile bit bit aynıdır.
+
+    Args:
+    images : numpy.ndarray (N, H, W) veya (H, W) görüntü listesi (boyutlar farklı olabilir;
+             uint8 veya uint16)
+    base_key : list - Anahtar
+    workers : int - Süreç sayısı (varsayılan: tüm çekirdekler)
+    sbox_candidates, sbox_bank, sbox_bits, diffusion_version, key_version : Şifreleme seçenekleri
+
+    Returns:
+    numpy.ndarray (N, H, W) veya görüntü listesi (girdiyle aynı biçim)
+    """
+    options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank, 'sbox_bits': sbox_bits,
+               'diffusion_version': diffusion_version, 'key_version': key_version}
+    return _run_parallel('encrypt', images, base_key, workers, options)
+
+
+def decrypt_images_parallel(encrypted_images, base_key, workers=None, sbox_candidates=1,
+                            sbox_bank=1, sbox_bits=8, diffusion_version=1, key_version=1):
+    """
+    Şifreli görüntüleri işlem havuzunda deşifrele (piksel verisi pickle'lanmaz)
+
+    Args:
+    encrypted_images : numpy.ndarray (N, H, W) veya (H, W) görüntü listesi
+    base_key : list - Şifreleme anahtarı
+    workers : int - Süreç sayısı (varsayılan: tüm çekirdekler)
+    sbox_candidates, sbox_bank, sbox_bits, diffusion_version, key_version :
+        Şifrelemede kullanılan seçenekler
+
+    Returns:
+    numpy.ndarray (N, H, W) veya görüntü listesi (girdiyle aynı biçim)
+    """
+    options = {'sbox_candidates': sbox_candidates, 'sbox_bank': sbox_bank, 'sbox_bits': sbox_bits,
+               'diffusion_version': diffusion_version, 'key_version': key_version}
+    return _run_parallel('decrypt', encrypted_images, base_key, workers, options)
+
+
+if __name__ == "__main__":
+    # Test kodu
+    import time
+    from encryption import encrypt_image_from_array
+
+    print("="*60)
+    print("Paylaşımlı Bellekli Paralel Şifreleme Test")
+    print("="*60)
+
+    base_key = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+    stack = np.random.randint(0, 256, (32, 512, 512), dtype=np.uint8)
+    workers = os.cpu_count() or 1
+
+    start = time.time()
+    encrypted = encrypt_images_parallel(stack, base_key, workers=workers)
+    elapsed = time.time() - start
+    print(f"\n{len(stack)} kare ({stack.nbytes / 1e6:.1f} MB), {workers} süreç: "
+          f"{elapsed:.2f} s, {stack.nbytes / 1e6 / elapsed:.1f} MB/s")
+
+    decrypted = decrypt_images_parallel(encrypted, base_key, workers=workers)
+    print(f"Deşifreleme başarılı mı? {np.array_equal(decrypted, stack)}")
+    print(f"Tek görüntü sonucu ile aynı mı? "
+          f"{np.array_equal(encrypted[5], encrypt_image_from_array(stack[5], base_key))}")
+
+    print("\n" + "="*60)
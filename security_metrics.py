@@ -14,6 +14,19 @@ import cv2
 from scipy import stats
 
 
+def intensity_levels(image):
+    """
+    Görüntünün gri seviye sayısı (uint16 -> 65536, diğerleri -> 256)
+    
+    Args:
+    image : numpy.ndarray
+    
+    Returns:
+    int: Histogram kutusu sayısı
+    """
+    return 65536 if image.dtype == np.uint16 else 256
+
+
 class SecurityMetrics:
     """
     Görüntü şifreleme güvenlik metrikleri
@@ -48,8 +61,9 @@ class SecurityMetrics:
         """
         Unified Average Changing Intensity (UACI)
         
-        Piksel değişimlerinin ortalama yoğunluğunu ölçer.
-        İdeal değer: %33.4635 (8-bit görüntü için)
+        Piksel değişimlerinin ortalama yoğunluğunu ölçer; farklar en büyük
+        piksel değerine (8-bit: 255, 16-bit: 65535) bölünür.
+        İdeal değer: %33.4635 (8-bit görüntü için), ~%33.33 (16-bit)
         
         Args:
         img1, img2 : numpy.ndarray
@@ -64,7 +78,8 @@ class SecurityMetrics:
         abs_diff = np.abs(img1.astype(float) - img2.astype(float))
         
         # UACI formülü
-        uaci_value = (np.sum(abs_diff) / (255 * img1.size)) * 100
+        max_value = intensity_levels(img1) - 1
+        uaci_value = (np.sum(abs_diff) / (max_value * img1.size)) * 100
         
         return uaci_value
     
@@ -74,7 +89,7 @@ class SecurityMetrics:
         Shannon Entropisi
         
         Bilgi entropisi. Görüntünün rastgelelik derecesini ölçer.
-        İdeal değer: 8.0 (8-bit görüntü için)
+        İdeal değer: 8.0 (8-bit görüntü için), 16.0 (16-bit, 65536 kutu)
         
         Args:
         image : numpy.ndarray
@@ -83,7 +98,8 @@ class SecurityMetrics:
         float: Entropi değeri (bit)
         """
         # Histogram hesapla
-        hist = cv2.calcHist([image], [0], None, [256], [0, 256])
+        levels = intensity_levels(image)
+        hist = cv2.calcHist([image], [0], None, [levels], [0, levels])
         hist = hist.ravel() / hist.sum()  # Normalize et
         
         # Sıfır olmayan olasılıkları al
@@ -165,20 +181,20 @@ class SecurityMetrics:
         Returns:
         dict: Test sonuçları
         """
-        # Histogram
-        hist = cv2.calcHist([image], [0], None, [256], [0, 256])
-        hist = hist.ravel()
+        # Histogram (renkli görüntülerde tüm kanalların değerleri)
+        levels = intensity_levels(image)
+        hist = np.bincount(image.ravel(), minlength=levels).astype(np.float64)
         
         # Beklenen değer (uniform dağılım)
-        expected = image.size / 256
+        expected = image.size / levels
         
         # Chi-square istatistiği: χ² = Σ[(O - E)² / E]
         chi_square = np.sum((hist - expected)**2 / expected)
         
-        # Serbestlik derecesi: df = 256 - 1 = 255
-        df = 255
+        # Serbestlik derecesi: df = 256 - 1 = 255 (16-bit: 65535)
+        df = levels - 1
         
-        # Kritik değer (α=0.05, df=255)
+        # Kritik değer (α=0.05)
         critical_value = stats.chi2.ppf(1 - alpha, df)
         
         # p-değeri
@@ -195,6 +211,70 @@ class SecurityMetrics:
             'passed': passed
         }
     
+    @staticmethod
+    def channel_metrics(image, other=None, sample_size=3000):
+        """
+        Kanal başına entropi, korelasyon ve (other verilirse) NPCR / UACI
+        
+        Tüm kanallar tek vektörize geçişte hesaplanır: histogramlar tek
+        bincount ile, korelasyonlar her yön için tüm kanallarda aynı
+        rastgele piksel çiftleriyle.
+        
+        Args:
+        image : numpy.ndarray - (H, W) veya (H, W, C) görüntü
+        other : numpy.ndarray - NPCR/UACI için karşılaştırılacak görüntü (opsiyonel)
+        sample_size : int - Yön başına rastgele piksel çifti sayısı
+        
+        Returns:
+        dict: (C,) array'ler - entropy, correlation_h, correlation_v, correlation_d
+              ve other verildiyse npcr, uaci (yüzde)
+        """
+        img = image if image.ndim == 3 else image[..., None]
+        H, W, C = img.shape
+        flat = img.reshape(-1, C)
+        
+        # Kanal başına histogram: kanal c'nin değerleri [c*L, (c+1)*L) aralığına
+        levels = intensity_levels(image)
+        offsets = np.arange(C, dtype=np.int64) * levels
+        hist = np.bincount((flat + offsets).ravel(), minlength=levels * C).reshape(C, levels)
+        prob = hist / flat.shape[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            entropy = -np.sum(np.where(prob > 0, prob * np.log2(prob), 0.0), axis=1)
+        
+        results = {'entropy': entropy}
+        
+        # Korelasyon: (yön, çift, kanal) yığınları üzerinde Pearson katsayısı
+        steps = {'h': (0, 1), 'v': (1, 0), 'd': (1, 1)}
+        A, B = [], []
+        for dy, dx in steps.values():
+            x = np.random.randint(0, H - dy, sample_size)
+            y = np.random.randint(0, W - dx, sample_size)
+            A.append(img[x, y])
+            B.append(img[x + dy, y + dx])
+        A = np.stack(A).astype(np.float64)
+        B = np.stack(B).astype(np.float64)
+        
+        A -= A.mean(axis=1, keepdims=True)
+        B -= B.mean(axis=1, keepdims=True)
+        numerator = np.sum(A * B, axis=1)
+        denominator = np.sqrt(np.sum(A**2, axis=1) * np.sum(B**2, axis=1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = np.where(denominator > 0, numerator / denominator, 0.0)
+        
+        for row, direction in enumerate(steps):
+            results[f'correlation_{direction}'] = correlation[row]
+        
+        # NPCR / UACI (kanal başına)
+        if other is not None:
+            if other.shape != image.shape:
+                raise ValueError("Görüntüler aynı boyutta olmalı")
+            other_flat = (other if other.ndim == 3 else other[..., None]).reshape(-1, C)
+            results['npcr'] = np.mean(flat != other_flat, axis=0) * 100
+            abs_diff = np.abs(flat.astype(np.int32) - other_flat.astype(np.int32))
+            results['uaci'] = np.mean(abs_diff, axis=0) / (levels - 1) * 100
+        
+        return results
+    
     @staticmethod
     def key_sensitivity(encrypt_func, image, key1, key2):
         """
@@ -228,26 +308,38 @@ class SecurityMetrics:
         Kapsamlı güvenlik analizi yap
         
         Args:
-        original : numpy.ndarray - Orijinal görüntü
+        original : numpy.ndarray - Orijinal görüntü ((H, W) veya (H, W, C))
         encrypted : numpy.ndarray - Şifreli görüntü
         
         Returns:
-        dict: Tüm metrikler
+        dict: Tüm metrikler (renkli görüntülerde ek olarak kanal başına
+              'channels_original' / 'channels_encrypted')
         """
-        results = {}
-        
-        # Entropi
-        results['entropy_original'] = SecurityMetrics.entropy(original)
-        results['entropy_encrypted'] = SecurityMetrics.entropy(encrypted)
-        
-        # Korelasyon
-        results['correlation_original_h'] = SecurityMetrics.correlation(original, 'horizontal')
-        results['correlation_original_v'] = SecurityMetrics.correlation(original, 'vertical')
-        results['correlation_original_d'] = SecurityMetrics.correlation(original, 'diagonal')
-        
-        results['correlation_encrypted_h'] = SecurityMetrics.correlation(encrypted, 'horizontal')
-        results['correlation_encrypted_v'] = SecurityMetrics.correlation(encrypted, 'vertical')
-        results['correlation_encrypted_d'] = SecurityMetrics.correlation(encrypted, 'diagonal')
+        # Hedef entropi = piksel bit derinliği
+        results = {'bits': int(np.log2(intensity_levels(encrypted)))}
+        
+        if original.ndim == 3:
+            # Renkli: kanal başına metrikler, özet değerler kanal ortalaması
+            for name, image in (('original', original), ('encrypted', encrypted)):
+                channels = SecurityMetrics.channel_metrics(image)
+                results[f'channels_{name}'] = channels
+                results[f'entropy_{name}'] = float(channels['entropy'].mean())
+                for direction in 'hvd':
+                    results[f'correlation_{name}_{direction}'] = float(
+                        channels[f'correlation_{direction}'].mean())
+        else:
+            # Entropi
+            results['entropy_original'] = SecurityMetrics.entropy(original)
+            results['entropy_encrypted'] = SecurityMetrics.entropy(encrypted)
+            
+            # Korelasyon
+            results['correlation_original_h'] = SecurityMetrics.correlation(original, 'horizontal')
+            results['correlation_original_v'] = SecurityMetrics.correlation(original, 'vertical')
+            results['correlation_original_d'] = SecurityMetrics.correlation(original, 'diagonal')
+            
+            results['correlation_encrypted_h'] = SecurityMetrics.correlation(encrypted, 'horizontal')
+            results['correlation_encrypted_v'] = SecurityMetrics.correlation(encrypted, 'vertical')
+            results['correlation_encrypted_d'] = SecurityMetrics.correlation(encrypted, 'diagonal')
         
         # Chi-square
         results['chi_square_original'] = SecurityMetrics.chi_square_test(original)
@@ -272,9 +364,10 @@ class SecurityMetrics:
         print("-"*60)
         print(f"Orijinal:  {results['entropy_original']:.4f} bit")
         print(f"Şifreli:   {results['entropy_encrypted']:.4f} bit")
-        print(f"Hedef:     8.0000 bit")
+        bits = results.get('bits', 8)
+        print(f"Hedef:     {bits:.4f} bit")
         
-        if results['entropy_encrypted'] > 7.99:
+        if results['entropy_encrypted'] > bits - 0.01:
             print("✅ Entropi testi GEÇTI")
         else:
             print("❌ Entropi düşük")
@@ -304,6 +397,17 @@ class SecurityMetrics:
         else:
             print("⚠️  Korelasyon yüksek")
         
+        # Kanal başına
+        if 'channels_encrypted' in results:
+            channels = results['channels_encrypted']
+            print("\nŞifreli Görüntü (kanal başına):")
+            print(f"  {'Kanal':<8}{'Entropi':>10}{'Yatay':>10}{'Dikey':>10}{'Çapraz':>10}")
+            for c in range(len(channels['entropy'])):
+                print(f"  {c:<8}{channels['entropy'][c]:>10.4f}"
+                      f"{channels['correlation_h'][c]:>10.4f}"
+                      f"{channels['correlation_v'][c]:>10.4f}"
+                      f"{channels['correlation_d'][c]:>10.4f}")
+        
         # Chi-square
         print("\n[3] CHI-SQUARE UNİFORMİTY TEST")
         print("-"*60)
@@ -13,6 +13,7 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 from encryption import encrypt_image_from_array, decrypt_image
+from instrumentation import collect_stages, format_stages
 from security_metrics import SecurityMetrics
 from quantum_simulator import QuantumSimulator
 
@@ -258,11 +259,13 @@ with tab_encrypt:
                 with st.spinner("Sifreleniyor..."):
                     add_log("Sifreleme basliyor...")
                     t0 = time.time()
-                    enc = encrypt_image_from_array(st.session_state["original"], base_key)
+                    with collect_stages() as timings:
+                        enc = encrypt_image_from_array(st.session_state["original"], base_key)
                     elapsed = (time.time() - t0) * 1000
                     st.session_state["encrypted"] = enc
                     st.session_state["decrypted"] = None
                     add_log("Sifreleme tamamlandi (" + str(round(elapsed, 1)) + " ms)")
+                    add_log("   " + format_stages(timings))
                 st.rerun()
 
         if decrypt_btn:
@@ -274,16 +277,18 @@ with tab_encrypt:
                 with st.spinner("Desifreleniyor..."):
                     add_log("Desifreleme basliyor...")
                     t0 = time.time()
-                    dec = decrypt_image(
-                        st.session_state["encrypted"], base_key,
-                        st.session_state["original"]
-                    )
+                    with collect_stages() as timings:
+                        dec = decrypt_image(
+                            st.session_state["encrypted"], base_key,
+                            st.session_state["original"]
+                        )
                     elapsed = (time.time() - t0) * 1000
                     st.session_state["decrypted"] = dec
                     mse = float(np.mean(
                         (st.session_state["original"].astype(float) - dec.astype(float)) ** 2
                     ))
                     add_log("Desifreleme tamamlandi (" + str(round(elapsed, 1)) + " ms)")
+                    add_log("   " + format_stages(timings))
                     if mse == 0:
                         add_log("   MSE: 0.000000 BASARILI")
                     else:
@@ -0,0 +1,211 @@
+"""
+Klasör Toplu Şifreleme Testi (işlem havuzu, atomik yazma, manifest ile devam)
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import cv2
+import numpy as np
+from batch_encrypt import atomic_write_png, run_batch, MANIFEST_NAME
+from encryption import encrypt_image_from_array
+
+# İşlem havuzu işçileri spawn ile başlar ve bu modülü yeniden import eder
+if __name__ == "__main__":
+    print("="*60)
+    print("Klasör Toplu Şifreleme Testi")
+    print("="*60)
+
+    key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+    work = tempfile.mkdtemp()
+    src = os.path.join(work, 'girdi')
+    enc = os.path.join(work, 'sifreli')
+    dec = os.path.join(work, 'cozulmus')
+
+    images = {}
+    for i in range(6):
+        rel = os.path.join('alt' if i % 2 else '', f'img_{i}.png')
+        img = np.random.randint(0, 256, (32 + i, 40), dtype=np.uint8)
+        os.makedirs(os.path.dirname(os.path.join(src, rel)), exist_ok=True)
+        cv2.imwrite(os.path.join(src, rel), img)
+        images[rel] = img
+
+    # 1. Şifreleme
+    print("\n1. Klasör şifreleniyor...")
+    stats = run_batch('encrypt', src, enc, base_key=key, workers=2, verbose=False)
+    print(f"   {stats['processed']} dosya, {stats['files_per_sec']:.1f} dosya/s, {stats['mb_per_sec']:.3f} MB/s")
+
+    enc_ok = stats['processed'] == 6 and stats['errors'] == 0
+    for rel, img in images.items():
+        out = cv2.imread(os.path.join(enc, rel), cv2.IMREAD_GRAYSCALE)
+        enc_ok = enc_ok and out is not None and np.array_equal(out, encrypt_image_from_array(img, key))
+
+    leftovers = [f for _, _, files in os.walk(enc) for f in files if '.tmp-' in f]
+
+    if enc_ok and not leftovers:
+        print("   ✅ Çıktılar encrypt_image_from_array ile aynı, geçici dosya kalmadı")
+    else:
+        print("   ❌ Toplu şifreleme hatalı!")
+
+    # 2. Devam etme: tamamlanmış dosyalar tekrar işlenmez
+    print("\n2. Manifest ile devam kontrol ediliyor...")
+    stats = run_batch('encrypt', src, enc, base_key=key, workers=2, verbose=False)
+
+    if stats['processed'] == 0 and stats['skipped'] == 6:
+        print("   ✅ İkinci çalıştırma tüm dosyaları atladı")
+    else:
+        print("   ❌ Tamamlanmış dosyalar tekrar işlendi!")
+
+    # Kesintiyi taklit et: bir çıktı silinmiş, bir kaydın yerinde yarım satır var
+    manifest_path = os.path.join(enc, MANIFEST_NAME)
+    with open(manifest_path) as f:
+        lines = f.readlines()
+    with open(manifest_path, 'w') as f:
+        f.writelines(lines[:-1])
+        f.write(lines[-1][:10])
+    os.remove(os.path.join(enc, 'img_0.png'))
+
+    stats = run_batch('encrypt', src, enc, base_key=key, workers=2, verbose=False)
+    expected = 1 if json.loads(lines[-1])['input'] == 'img_0.png' else 2
+
+    if stats['processed'] == expected and stats['skipped'] == 6 - expected:
+        print("   ✅ Kesintiden sonra yalnızca eksik dosyalar işlendi")
+    else:
+        print(f"   ❌ Devam hatalı: {stats['processed']} işlendi, {expected} bekleniyordu")
+
+    try:
+        run_batch('encrypt', src, enc, base_key=[0.5] + key[1:], workers=1, verbose=False)
+        print("   ❌ Farklı anahtarla aynı manifest'e devam edildi!")
+    except ValueError:
+        print("   ✅ Farklı anahtarla başka işin manifest'i reddediliyor")
+
+    # 3. Glob ile deşifreleme
+    print("\n3. Glob deseniyle deşifreleme...")
+    stats = run_batch('decrypt', os.path.join(enc, '**', '*.png'), dec, base_key=key,
+                      workers=2, verbose=False)
+
+    dec_ok = stats['processed'] == 6
+    for rel, img in images.items():
+        out = cv2.imread(os.path.join(dec, rel), cv2.IMREAD_GRAYSCALE)
+        dec_ok = dec_ok and out is not None and np.array_equal(out, img)
+
+    if dec_ok:
+        print("   ✅ Tüm dosyalar orijinale geri döndü")
+    else:
+        print("   ❌ Toplu deşifreleme hatalı!")
+
+    # 4. Boru hattı (okuma -> şifreleme -> yazma iş parçacıkları)
+    print("\n4. Boru hattı kontrol ediliyor...")
+    piped = os.path.join(work, 'boru')
+    with open(os.path.join(src, 'bozuk.png'), 'wb') as f:
+        f.write(b'PNG degil')
+    stats = run_batch('encrypt', src, piped, base_key=key, pipeline=True, readers=2, writers=2,
+                      queue_size=2, verbose=False)
+
+    pipe_ok = stats['processed'] == 6 and stats['errors'] == 1
+    for rel in images:
+        pipe_ok = pipe_ok and np.array_equal(
+            cv2.imread(os.path.join(piped, rel), cv2.IMREAD_GRAYSCALE),
+            cv2.imread(os.path.join(enc, rel), cv2.IMREAD_GRAYSCALE))
+
+    if pipe_ok:
+        print("   ✅ Boru hattı çıktıları işlem havuzu ile aynı, bozuk dosya hata olarak kaydedildi")
+    else:
+        print("   ❌ Boru hattı hatalı!")
+
+    stats = run_batch('encrypt', src, piped, base_key=key, pipeline=True, verbose=False)
+    if stats['processed'] == 0 and stats['skipped'] == 6 and stats['errors'] == 1:
+        print("   ✅ Boru hattı manifest ile devam ediyor (hatalı dosya yeniden deneniyor)")
+    else:
+        print("   ❌ Boru hattı devam etmesi hatalı!")
+
+    # 5. Renkli klasör (paralel kanal çekirdekleri boru hattı iş parçacığında)
+    print("\n5. Renkli boru hattı kontrol ediliyor...")
+    color_src = os.path.join(work, 'renkli')
+    os.makedirs(color_src)
+    color = np.random.randint(0, 256, (20, 30, 3), dtype=np.uint8)
+    cv2.imwrite(os.path.join(color_src, 'renkli.png'), color)
+
+    run_batch('encrypt', color_src, os.path.join(work, 'renkli_sifreli'), base_key=key,
+              color_mode='cross', pipeline=True, verbose=False)
+    run_batch('decrypt', os.path.join(work, 'renkli_sifreli'), os.path.join(work, 'renkli_cozulmus'),
+              base_key=key, color_mode='cross', pipeline=True, verbose=False)
+
+    color_enc = cv2.imread(os.path.join(work, 'renkli_sifreli', 'renkli.png'), cv2.IMREAD_UNCHANGED)
+    color_dec = cv2.imread(os.path.join(work, 'renkli_cozulmus', 'renkli.png'), cv2.IMREAD_UNCHANGED)
+    if (np.array_equal(color_enc, encrypt_image_from_array(color, key, color_mode='cross')) and
+            np.array_equal(color_dec, color)):
+        print("   ✅ Renkli görüntüler kanalları korunarak şifrelendi ve deşifre edildi")
+    else:
+        print("   ❌ Renkli toplu şifreleme hatalı!")
+
+    # 6. Aynı adlı farklı uzantılı girdiler (a.png ve a.bmp -> a.png) işlem başlamadan reddediliyor
+    print("\n6. Çıktı adı çakışması kontrol ediliyor...")
+    same_src = os.path.join(work, 'ayni_ad')
+    os.makedirs(os.path.join(same_src, 'alt'))
+    for rel in ('a.png', 'a.bmp', os.path.join('alt', 'a.png')):
+        cv2.imwrite(os.path.join(same_src, rel), images['img_0.png'])
+    same_out = os.path.join(work, 'ayni_ad_sifreli')
+    try:
+        run_batch('encrypt', same_src, same_out, base_key=key, workers=1, verbose=False)
+        rejected = False
+    except ValueError as exc:
+        rejected = 'a.bmp' in str(exc) and 'alt' not in str(exc)
+
+    if rejected and not os.path.exists(same_out):
+        print("   ✅ Çakışan girdiler listelendi, hiçbir çıktı yazılmadı")
+    else:
+        print("   ❌ Aynı adlı girdiler birbirinin çıktısının üzerine yazıyor!")
+
+    # 7. Aynı süreçte iş parçacıkları aynı hedefe yazıyor: her biri kendi geçici dosyasıyla
+    print("\n7. İş parçacıklı atomik yazma kontrol ediliyor...")
+    target = os.path.join(work, 'yaris', 'hedef.png')
+    frames = [np.full((64, 64), i, dtype=np.uint8) for i in range(8)]
+    write_errors = []
+    barrier = threading.Barrier(len(frames))
+
+    def write(frame):
+        try:
+            barrier.wait()
+            for _ in range(20):
+                atomic_write_png(target, frame)
+        except Exception as exc:
+            write_errors.append(exc)
+
+    writers = [threading.Thread(target=write, args=(frame,)) for frame in frames]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    final = cv2.imread(target, cv2.IMREAD_GRAYSCALE)
+
+    if (not write_errors and final is not None and any(np.array_equal(final, f) for f in frames)
+            and os.listdir(os.path.dirname(target)) == ['hedef.png']):
+        print(f"   ✅ {len(frames)} iş parçacığı: hata yok, dosya tam, geçici dosya kalmadı")
+    else:
+        print(f"   ❌ Eşzamanlı yazma hatalı: {write_errors[:3]}")
+
+    # 8. Çıktı klasörü girdinin içinde: ikinci çalıştırma şifreli çıktıları girdi saymıyor
+    print("\n8. Girdi içindeki çıktı klasörü kontrol ediliyor...")
+    nested_src = os.path.join(work, 'ic_ice')
+    nested_out = os.path.join(nested_src, 'sifreli')
+    os.makedirs(nested_src)
+    for i in range(3):
+        cv2.imwrite(os.path.join(nested_src, f'img_{i}.png'), images['img_0.png'])
+
+    first = run_batch('encrypt', nested_src, nested_out, base_key=key, workers=1, verbose=False)
+    second = run_batch('encrypt', nested_src, nested_out, base_key=key, workers=1, verbose=False)
+    nested_files = sorted(f for f in os.listdir(nested_out) if f.endswith('.png'))
+
+    if (first['processed'] == 3 and second['processed'] == 0 and second['skipped'] == 3 and
+            nested_files == ['img_0.png', 'img_1.png', 'img_2.png'] and
+            not os.path.exists(os.path.join(nested_out, 'sifreli'))):
+        print("   ✅ Önceki çıktılar yeniden şifrelenmedi")
+    else:
+        print("   ❌ Çıktı klasöründeki dosyalar girdi olarak işlendi!")
+
+    shutil.rmtree(work)
+
+    print("\n" + "="*60)
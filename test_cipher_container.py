@@ -0,0 +1,140 @@
+"""
+Şifreli Görüntü Kap Dosyası (.cpb) Testi
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import cv2
+import numpy as np
+from cipher_container import (CONTAINER_EXTENSION, PAYLOAD_ALIGN, write_container, read_container,
+                              read_header, verify_container, decrypt_container, container_schedule)
+from key_schedule import KeyScheduleCache, get_key_schedule, key_fingerprint, schedule_cache
+from encryption import encrypt_image_from_array
+from batch_encrypt import run_batch
+from memmap_encrypt import encrypt_memmap
+
+# İşlem havuzu işçileri spawn ile başlar ve bu modülü yeniden import eder
+if __name__ == "__main__":
+    print("="*60)
+    print("Şifreli Görüntü Kap Dosyası Testi")
+    print("="*60)
+
+    key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+    work = tempfile.mkdtemp()
+    gray = np.random.randint(0, 256, (61, 47), dtype=np.uint8)
+    deep = np.random.randint(0, 65536, (33, 41), dtype=np.uint16)
+    color = np.random.randint(0, 256, (23, 19, 3), dtype=np.uint8)
+
+    # 1. Gri, uint16, renkli ve seçenekli görüntüler kaptan deşifre ediliyor
+    print("\n1. Gidiş-dönüş kontrol ediliyor...")
+    cases = [('gri', gray, {}), ('uint16', deep, {}), ('renkli', color, {'color_mode': 'cross'}),
+             ('seçenekli', gray, {'sbox_bank': 4, 'diffusion_version': 2, 'key_version': 2})]
+    failed = []
+    for name, img, options in cases:
+        path = os.path.join(work, name + CONTAINER_EXTENSION)
+        encrypted = encrypt_image_from_array(img, key, **options)
+        write_container(path, encrypted, base_key=key, **options)
+        loaded, header = read_container(path)
+        if (not isinstance(loaded, np.memmap) or not np.array_equal(loaded, encrypted) or
+                header['options'].get('color_mode') != options.get('color_mode') or
+                not np.array_equal(decrypt_container(path, key), img)):
+            failed.append(name)
+
+    if not failed:
+        print(f"   ✅ {len(cases)} durumda memmap okuma ve başlıktaki seçeneklerle deşifreleme doğru")
+    else:
+        print(f"   ❌ Hatalı durumlar: {failed}")
+
+    # 2. Yığın, hizalı veri, parça indeksi ve bozulma tespiti
+    print("\n2. Yığın ve parça indeksi kontrol ediliyor...")
+    stack = np.random.randint(0, 256, (5, 40, 30), dtype=np.uint8)
+    schedule = get_key_schedule(key, stack.shape[1:])
+    path = os.path.join(work, 'yigin' + CONTAINER_EXTENSION)
+    write_container(path, schedule.encrypt_batch(stack), base_key=key, stack=True, chunk_bytes=2400)
+    header = read_header(path)
+    sound = not verify_container(path)
+
+    with open(path, 'r+b') as f:
+        f.seek(header['payload_offset'] + 3 * 1200 + 7)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    if (header['stack'] and header['payload_offset'] % PAYLOAD_ALIGN == 0 and
+            len(header['chunks']) == 3 and sound and verify_container(path) == [1] and
+            os.path.getsize(path) == header['payload_offset'] + stack.nbytes):
+        print(f"   ✅ Veri {header['payload_offset']} byte'ta, {len(header['chunks'])} parça; "
+              f"bozuk parça bulundu")
+    else:
+        print(f"   ❌ Yığın başlığı hatalı: {header}")
+
+    # 3. Yanlış anahtar reddediliyor; önbellekteki çizelge parmak iziyle bulunuyor
+    print("\n3. Anahtar parmak izi kontrol ediliyor...")
+    path = os.path.join(work, 'gri' + CONTAINER_EXTENSION)
+    try:
+        decrypt_container(path, [0.5] + key[1:])
+        rejected = False
+    except ValueError:
+        rejected = True
+
+    cache = KeyScheduleCache()
+    cached = cache.get(key, gray.shape, key_version=2)
+    hits = schedule_cache.hits
+    found = container_schedule(read_header(path))
+    if (rejected and found is get_key_schedule(key, gray.shape) and schedule_cache.hits > hits and
+            cache.find(key_fingerprint(key), gray.shape, key_version=2) is cached and
+            cache.find(key_fingerprint(key), gray.shape) is None and
+            np.array_equal(decrypt_container(path), gray)):
+        print("   ✅ Yanlış anahtar reddedildi; anahtarsız deşifreleme önbellekten yapıldı")
+    else:
+        print("   ❌ Parmak izi kontrolü veya önbellek araması hatalı!")
+
+    # 4. Toplu şifreleme --format container ve bellek dışı şifreleme .cpb hedefi
+    print("\n4. Toplu ve bellek dışı şifreleme kontrol ediliyor...")
+    src = os.path.join(work, 'girdi')
+    os.makedirs(src)
+    images = {f'img_{i}.png': np.random.randint(0, 256, (32 + i, 40), dtype=np.uint8)
+              for i in range(3)}
+    for name, img in images.items():
+        cv2.imwrite(os.path.join(src, name), img)
+
+    enc, dec = os.path.join(work, 'sifreli'), os.path.join(work, 'cozulmus')
+    stats = run_batch('encrypt', src, enc, base_key=key, workers=2, fmt='container', verbose=False)
+    run_batch('decrypt', enc, dec, base_key=key, workers=2, verbose=False)
+    batch_ok = stats['processed'] == 3 and stats['errors'] == 0 and all(
+        np.array_equal(read_container(os.path.join(enc, f'img_{i}' + CONTAINER_EXTENSION))[0],
+                       encrypt_image_from_array(img, key)) and
+        np.array_equal(cv2.imread(os.path.join(dec, name), cv2.IMREAD_UNCHANGED), img)
+        for i, (name, img) in enumerate(images.items()))
+
+    big = np.random.randint(0, 256, (300, 200), dtype=np.uint8)
+    path = os.path.join(work, 'bellek_disi' + CONTAINER_EXTENSION)
+    encrypt_memmap(big, path, key, max_memory=64 * 1024)
+    memmap_ok = (np.array_equal(read_container(path)[0], encrypt_image_from_array(big, key)) and
+                 np.array_equal(decrypt_container(path, key), big))
+
+    if batch_ok and memmap_ok:
+        print("   ✅ Toplu kap çıktısı deşifre edildi; bellek dışı şifreleme kaba yazdı")
+    else:
+        print(f"   ❌ Toplu: {batch_ok}, bellek dışı: {memmap_ok}")
+
+    # 5. PNG ile karşılaştırma (yalnızca bilgi)
+    print("\n5. 2048x2048 şifreli görüntü yazma/okuma süresi...")
+    encrypted = np.random.randint(0, 256, (2048, 2048), dtype=np.uint8)
+    png_path = os.path.join(work, 'hiz.png')
+    cpb_path = os.path.join(work, 'hiz' + CONTAINER_EXTENSION)
+    start = time.perf_counter()
+    cv2.imwrite(png_path, encrypted)
+    cv2.imread(png_path, cv2.IMREAD_UNCHANGED)
+    png_time = time.perf_counter() - start
+    start = time.perf_counter()
+    write_container(cpb_path, encrypted, base_key=key)
+    read_container(cpb_path)
+    cpb_time = time.perf_counter() - start
+    print(f"   PNG: {png_time * 1000:.1f} ms, kap: {cpb_time * 1000:.1f} ms "
+          f"({png_time / cpb_time:.1f}x)")
+
+    shutil.rmtree(work, ignore_errors=True)
+    print("\n" + "="*60)
@@ -0,0 +1,106 @@
+"""
+Renkli (3/4 kanal) Görüntü Şifreleme Testi
+"""
+
+import os
+import tempfile
+import cv2
+import numpy as np
+from encryption import encrypt_image, encrypt_image_from_array, decrypt_image
+from key_schedule import get_key_schedule, channel_key, COLOR_MODES
+from security_metrics import SecurityMetrics
+
+print("="*60)
+print("Renkli Görüntü Şifreleme Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+# 1. Üç mod, BGR ve BGRA, tüm S-Box seçenekleri
+print("\n1. Şifreleme / deşifreleme kontrol ediliyor...")
+for channels in (3, 4):
+    img = np.random.randint(0, 256, (30, 22, channels), dtype=np.uint8)
+    for mode in COLOR_MODES:
+        ok = True
+        for options in [{}, {'sbox_bank': 4}, {'sbox_bits': 16}]:
+            encrypted = encrypt_image_from_array(img, key, color_mode=mode, **options)
+            decrypted = decrypt_image(encrypted, key, None, color_mode=mode, **options)
+            ok = ok and encrypted.shape == img.shape and np.array_equal(decrypted, img)
+        
+        if ok:
+            print(f"   ✅ {channels} kanal, '{mode}': tüm S-Box seçenekleriyle tersinir")
+        else:
+            print(f"   ❌ {channels} kanal, '{mode}': deşifreleme başarısız!")
+
+# 2. Mod tanımları
+print("\n2. Mod tanımları kontrol ediliyor...")
+img = np.random.randint(0, 256, (30, 22, 3), dtype=np.uint8)
+
+flat = encrypt_image_from_array(img, key, color_mode='flat')
+if np.array_equal(flat.reshape(30, -1), encrypt_image_from_array(img.reshape(30, -1), key)):
+    print("   ✅ 'flat' = araya girmiş (H, W*C) gri seviye şifreleme")
+else:
+    print("   ❌ 'flat' modu beklenen alan üzerinde çalışmıyor!")
+
+channel = encrypt_image_from_array(img, key, color_mode='channel')
+color_schedule = get_key_schedule(key, img.shape, color_mode='channel')
+schedules = color_schedule.schedules
+key_range_ok = all(0.0 < v < 1.0 for c in range(1, 4) for v in channel_key(key, c)[:2])
+if (np.array_equal(channel[..., 0], encrypt_image_from_array(np.ascontiguousarray(img[..., 0]), key)) and
+        len({s.permutation.tobytes() for s in schedules}) == 3 and key_range_ok and
+        color_schedule.nbytes > sum(s.nbytes for s in schedules)):
+    print("   ✅ 'channel': kanal başına bağımsız çizelgeler (kanal 0 = ana anahtar)")
+else:
+    print("   ❌ 'channel' modu hatalı!")
+
+# Kanallar arası difüzyon: ilk kanaldaki değişim diğer kanallara yayılmalı
+modified = img.copy()
+schedule = get_key_schedule(key, img.shape, color_mode='cross')
+first = schedule.permutations[0, 0]
+modified.reshape(-1, 3)[first, 0] ^= 1
+
+cross_diff = encrypt_image_from_array(modified, key, color_mode='cross') != \
+    encrypt_image_from_array(img, key, color_mode='cross')
+channel_diff = encrypt_image_from_array(modified, key, color_mode='channel') != channel
+
+if cross_diff[..., 1:].any() and not channel_diff[..., 1:].any():
+    print("   ✅ 'cross': tek kanaldaki değişim diğer kanallara yayılıyor")
+else:
+    print("   ❌ Kanallar arası difüzyon hatalı!")
+
+# 3. Dosya yolu: renkler korunuyor
+print("\n3. Dosyadan renkli şifreleme...")
+path = os.path.join(tempfile.mkdtemp(), 'renkli.png')
+cv2.imwrite(path, img)
+encrypted = encrypt_image(path, key, color_mode='cross')
+
+if encrypted.shape == img.shape and np.array_equal(
+        decrypt_image(encrypted, key, None, color_mode='cross'), img):
+    print("   ✅ encrypt_image(color_mode=...) renkleri koruyor")
+else:
+    print("   ❌ Dosyadan renkli şifreleme hatalı!")
+os.remove(path)
+
+# 4. Kanal başına metrikler
+print("\n4. Kanal başına metrikler kontrol ediliyor...")
+encrypted = encrypt_image_from_array(img, key, color_mode='channel')
+other = encrypt_image_from_array(modified, key, color_mode='channel')
+metrics = SecurityMetrics.channel_metrics(encrypted, other)
+
+single = [(SecurityMetrics.entropy(np.ascontiguousarray(encrypted[..., c])),
+           SecurityMetrics.npcr(encrypted[..., c], other[..., c]),
+           SecurityMetrics.uaci(encrypted[..., c], other[..., c])) for c in range(3)]
+
+metrics_ok = all(abs(metrics['entropy'][c] - e) < 1e-5 and
+                 abs(metrics['npcr'][c] - n) < 1e-9 and
+                 abs(metrics['uaci'][c] - u) < 1e-9 for c, (e, n, u) in enumerate(single))
+metrics_ok = metrics_ok and all(metrics[f'correlation_{d}'].shape == (3,) for d in 'hvd')
+
+if metrics_ok:
+    print("   ✅ Kanal başına entropi/NPCR/UACI tek kanal hesaplarıyla aynı")
+else:
+    print("   ❌ Kanal başına metrikler hatalı!")
+
+print(f"   Entropi: {np.round(metrics['entropy'], 4)}, NPCR: {np.round(metrics['npcr'], 2)}")
+
+print("\n" + "="*60)
@@ -0,0 +1,118 @@
+"""
+2-D Satır/Sütun Difüzyonu (diffusion_version=2) Testi
+"""
+
+import time
+import numpy as np
+import key_schedule
+from key_schedule import KeySchedule, get_key_schedule, USE_NUMBA
+from encryption import (encrypt_image_from_array, decrypt_image, encrypt_images_from_array,
+                        decrypt_images)
+
+print("="*60)
+print("2-D Difüzyon Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+
+def npcr(a, b):
+    return np.mean(a != b) * 100
+
+
+gray = np.random.randint(0, 256, (61, 300), dtype=np.uint8)
+deep = np.random.randint(0, 65536, (33, 41), dtype=np.uint16)
+color = np.random.randint(0, 256, (23, 19, 3), dtype=np.uint8)
+stack = np.random.randint(0, 256, (3, 61, 300), dtype=np.uint8)
+
+# 1. Tersinirlik (Numba ve NumPy yolu aynı sonucu veriyor)
+print("\n1. Tersinirlik kontrol ediliyor...")
+cases = [('gri', gray, {}), ('uint16', deep, {}), ('16-bit S-Box', gray, {'sbox_bits': 16}),
+         ('renkli flat', color, {'color_mode': 'flat'})]
+
+expected = {name: encrypt_image_from_array(img, key, diffusion_version=2, **options)
+            for name, img, options in cases}
+expected_batch = encrypt_images_from_array(stack, key, diffusion_version=2)
+
+saved = key_schedule.USE_NUMBA
+for use_numba in sorted({saved, False}, reverse=True):
+    key_schedule.USE_NUMBA = use_numba
+    label = 'Numba' if use_numba else 'NumPy'
+    try:
+        ok = True
+        for name, img, options in cases:
+            encrypted = encrypt_image_from_array(img, key, diffusion_version=2, **options)
+            decrypted = decrypt_image(encrypted, key, None, diffusion_version=2, **options)
+            ok = ok and np.array_equal(encrypted, expected[name]) and np.array_equal(decrypted, img)
+        batch = encrypt_images_from_array(stack, key, diffusion_version=2)
+        ok = (ok and np.array_equal(batch, expected_batch) and
+              np.array_equal(batch[1], encrypt_image_from_array(stack[1], key, diffusion_version=2))
+              and np.array_equal(decrypt_images(batch, key, diffusion_version=2), stack))
+    finally:
+        key_schedule.USE_NUMBA = saved
+
+    if ok:
+        print(f"   ✅ {label}: gri, uint16, 16-bit S-Box, renkli ve toplu şifreleme tersinir")
+    else:
+        print(f"   ❌ {label}: 2-D difüzyon sonucu hatalı!")
+
+# 2. Ortadaki tek piksel değişimi tüm görüntüye yayılıyor
+print("\n2. Çığ etkisi (ortadaki piksel +1) kontrol ediliyor...")
+# Satır geçişinden sonra farkı 1/256 olasılıkla kaybolan sütunlar NPCR'yi
+# ~%0.4 düşürebilir; eşik sabit tohumlu görüntüyle sınanır
+img = np.random.default_rng(2026).integers(0, 256, (256, 256), dtype=np.uint8)
+modified = img.copy()
+modified[128, 128] = np.uint8((int(modified[128, 128]) + 1) % 256)
+
+results = {}
+for version in (1, 2):
+    results[version] = npcr(encrypt_image_from_array(img, key, diffusion_version=version),
+                            encrypt_image_from_array(modified, key, diffusion_version=version))
+
+if results[2] > 99.0:
+    print(f"   ✅ NPCR sürüm 1: {results[1]:.2f}%, sürüm 2: {results[2]:.2f}%")
+else:
+    print(f"   ❌ Sürüm 2 NPCR düşük: {results[2]:.2f}%")
+
+# 3. Varsayılan sürüm 1 değişmedi, sürümler ayrı önbellek girdisi
+print("\n3. Varsayılan sürüm kontrol ediliyor...")
+schedule = get_key_schedule(key, gray.shape)
+if (schedule.diffusion_version == 1 and schedule is get_key_schedule(key, gray.shape,
+                                                                     diffusion_version=1) and
+        schedule is not get_key_schedule(key, gray.shape, diffusion_version=2) and
+        np.array_equal(encrypt_image_from_array(gray, key),
+                       KeySchedule(key, gray.shape).encrypt(gray)) and
+        not np.array_equal(encrypt_image_from_array(gray, key), expected['gri'])):
+    print("   ✅ Sürüm 1 varsayılan, sürüm 2 farklı şifreli görüntü üretiyor")
+else:
+    print("   ❌ Varsayılan sürüm veya önbellek anahtarı hatalı!")
+
+# 4. Geçersiz seçenekler
+print("\n4. Geçersiz seçenekler kontrol ediliyor...")
+errors = 0
+for options in ({'diffusion_version': 3},
+                {'color_mode': 'channel', 'diffusion_version': 2},
+                {'color_mode': 'cross', 'diffusion_version': 2}):
+    try:
+        get_key_schedule(key, color.shape, **options)
+    except ValueError:
+        errors += 1
+
+if errors == 3:
+    print("   ✅ Bilinmeyen sürüm ve 'channel'/'cross' ile sürüm 2 reddedildi")
+else:
+    print(f"   ❌ {3 - errors} geçersiz seçenek kabul edildi!")
+
+# 5. Süre (yalnızca bilgi)
+print(f"\n5. 1024x1024 görüntü başına süre (en iyi 5, {'Numba' if USE_NUMBA else 'NumPy'})...")
+img = np.random.randint(0, 256, (1024, 1024), dtype=np.uint8)
+for version in (1, 2):
+    schedule = get_key_schedule(key, img.shape, diffusion_version=version)
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        schedule.encrypt(img)
+        best = min(best, time.perf_counter() - start)
+    print(f"   sürüm {version}: {best * 1000:.2f} ms")
+
+print("\n" + "="*60)
@@ -0,0 +1,112 @@
+"""
+Tek Geçişli (Permütasyon + S-Box + Difüzyon) Çekirdek Testi
+"""
+
+import os
+import sys
+import time
+
+# Paralel parça yolunu tek çekirdekli makinelerde de sınamak için en az 4 iş parçacığı
+# (Numba başka bir modülce yüklendiyse ayar değiştirilemez)
+if 'numba' not in sys.modules:
+    os.environ.setdefault('NUMBA_NUM_THREADS', '4')
+
+import numpy as np
+import key_schedule
+from key_schedule import USE_NUMBA, KeySchedule, warm_up_kernels
+
+print("="*60)
+print("Tek Geçişli Çekirdek Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+if not USE_NUMBA:
+    print("\n⚠️  Numba yok - tek geçişli çekirdek testi atlandı")
+else:
+    from fast_numba import (fast_encrypt_fused, fast_encrypt_fused_parallel, fast_decrypt_fused,
+                            get_num_threads)
+    warm_up_kernels()
+
+    def staged(schedule, run):
+        """Aynı çizelgeyle ayrı ayrı aşamalardan (tek geçiş kapalı) geçen sonuç"""
+        sbox = schedule.fused_sbox
+        schedule.fused_sbox = None
+        try:
+            return run()
+        finally:
+            schedule.fused_sbox = sbox
+
+    # 1. Çekirdekler parça sayısından bağımsız, aşamalı yolla bit bit aynı
+    print("\n1. Çekirdekler kontrol ediliyor...")
+    kernels_ok = True
+    for depth, levels in ((8, 256), (16, 65536)):
+        for shape in ((1, 1), (1, 2), (3, 5), (37, 29), (128, 100)):
+            schedule = KeySchedule(key, shape, depth=depth)
+            flat = np.random.randint(0, levels, shape[0] * shape[1]).astype(schedule.dtype)
+            expected = staged(schedule, lambda: schedule.encrypt(flat.reshape(shape))).ravel()
+            args = (schedule.permutation, schedule.fused_sbox, schedule.key_stream)
+            kernels_ok = kernels_ok and np.array_equal(
+                fast_encrypt_fused(flat, *args, np.empty_like(flat)), expected)
+            for chunks in (1, 2, 3, 8, 64):
+                kernels_ok = (kernels_ok and
+                              np.array_equal(fast_encrypt_fused_parallel(
+                                  flat, *args, chunks, np.empty_like(flat)), expected) and
+                              np.array_equal(fast_decrypt_fused(
+                                  expected, schedule.permutation, schedule.fused_inverse_sbox,
+                                  schedule.key_stream, chunks, np.empty_like(flat)), flat))
+
+    if kernels_ok:
+        print("   ✅ uint8/uint16, 1x1-128x100, 1-64 parça: aşamalı yolla aynı ve tersinir")
+    else:
+        print("   ❌ Tek geçişli çekirdek farklı sonuç verdi!")
+
+    # 2. Çizelge: tekli, paralel eşik üstü ve toplu şifreleme aynı
+    print(f"\n2. Çizelge kontrol ediliyor ({get_num_threads()} iş parçacığı)...")
+    gray = np.random.randint(0, 256, (300, 220), dtype=np.uint8)
+    stack = np.random.randint(0, 256, (5, 300, 220), dtype=np.uint8)
+    schedule = KeySchedule(key, gray.shape)
+    expected = staged(schedule, lambda: schedule.encrypt(gray))
+    expected_batch = staged(schedule, lambda: schedule.encrypt_batch(stack))
+
+    threshold = key_schedule.PARALLEL_DIFFUSION_MIN
+    key_schedule.PARALLEL_DIFFUSION_MIN = 1024
+    try:
+        encrypted = schedule.encrypt(gray)
+        decrypted = schedule.decrypt(encrypted)
+    finally:
+        key_schedule.PARALLEL_DIFFUSION_MIN = threshold
+    batch = schedule.encrypt_batch(stack)
+
+    if (schedule.fused and np.array_equal(encrypted, expected) and
+            np.array_equal(decrypted, gray) and np.array_equal(batch, expected_batch) and
+            np.array_equal(schedule.decrypt_batch(batch), stack)):
+        print("   ✅ Tekli (paralel) ve toplu şifreleme aynı, tersinir")
+    else:
+        print("   ❌ Çizelgenin tek geçişli yolu farklı!")
+
+    # 3. Banka, piksel çifti S-Box'ı ve 2-D difüzyon aşamalı yolda kalıyor
+    print("\n3. Tek geçiş dışı modlar kontrol ediliyor...")
+    unfused = [KeySchedule(key, (8, 8), **options).fused
+               for options in ({'sbox_bank': 4}, {'sbox_bits': 16}, {'diffusion_version': 2})]
+    if not any(unfused) and KeySchedule(key, (8, 8), depth=16).fused:
+        print("   ✅ Yalnızca tek tablolu S-Box modları tek geçişte")
+    else:
+        print(f"   ❌ Beklenmeyen tek geçiş durumu: {unfused}")
+
+    # 4. Süre (gerçek çekirdek sayısına bağlı; yalnızca bilgi)
+    print(f"\n4. 2048x2048 görüntü başına süre (en iyi 10, {os.cpu_count()} CPU)...")
+    schedule = KeySchedule(key, (2048, 2048))
+    img = np.random.randint(0, 256, (2048, 2048), dtype=np.uint8)
+    for name, run in (('tek geçiş', lambda: schedule.encrypt(img)),
+                      ('aşamalı', lambda: staged(schedule, lambda: schedule.encrypt(img))),
+                      ('ters, tek geçiş', lambda: schedule.decrypt(img)),
+                      ('ters, aşamalı', lambda: staged(schedule, lambda: schedule.decrypt(img)))):
+        best = float('inf')
+        for _ in range(10):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        print(f"   {name:<16} {best * 1000:.2f} ms")
+
+print("\n" + "="*60)
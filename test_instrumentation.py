@@ -0,0 +1,125 @@
+"""
+Aşama Süreleri ve Sayaçlar Testi
+"""
+
+import contextlib
+import io
+import logging
+import threading
+import numpy as np
+from instrumentation import (COUNTERS, STAGES, add_hook, remove_hook, collect_stages,
+                             format_stages, stage)
+from key_schedule import get_key_schedule
+
+print("="*60)
+print("Aşama Süreleri ve Sayaçlar Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+# 1. Şifreleme stdout'a yazmıyor, ilerleme logger'a gidiyor
+print("\n1. Loglama kontrol ediliyor...")
+records = []
+handler = logging.Handler()
+handler.emit = records.append
+log = logging.getLogger('chaospolybius')
+log.addHandler(handler)
+log.setLevel(logging.DEBUG)
+
+stdout = io.StringIO()
+with contextlib.redirect_stdout(stdout):
+    from encryption import encrypt_image_from_array, decrypt_image, encrypt_images_from_array
+    img = np.random.randint(0, 256, (48, 40), dtype=np.uint8)
+    encrypted = encrypt_image_from_array(img, key)
+    decrypt_image(encrypted, key, None)
+
+log.removeHandler(handler)
+log.setLevel(logging.NOTSET)
+
+if stdout.getvalue() == "" and any(r.getMessage().startswith("Deşifreleme") for r in records):
+    print(f"   ✅ stdout boş, {len(records)} log kaydı (aşama süreleri DEBUG seviyesinde)")
+else:
+    print(f"   ❌ stdout'a yazıldı: {stdout.getvalue()!r}")
+
+# 2. Aşama dökümü (yeni çizelge: tüm aşamalar; önbellekten: yalnızca görüntü aşamaları)
+print("\n2. Aşama dökümü kontrol ediliyor...")
+img = np.random.randint(0, 256, (37, 29), dtype=np.uint8)
+# Numba ile üç görüntü aşaması tek geçişli 'fused' çekirdeğinde ölçülür
+if get_key_schedule(key, (48, 40)).fused:
+    image_stages, inverse_stages = ['fused'], ['inverse_fused']
+else:
+    image_stages = ['permutation', 'substitution', 'diffusion']
+    inverse_stages = ['inverse_diffusion', 'inverse_substitution', 'inverse_permutation']
+with collect_stages() as first:
+    encrypted = encrypt_image_from_array(img, key)
+with collect_stages() as cached:
+    encrypt_image_from_array(img, key)
+with collect_stages() as inverse:
+    decrypt_image(encrypted, key, None)
+
+if (list(first) == list(STAGES[:5]) + image_stages and
+        list(cached) == image_stages and list(inverse) == inverse_stages and
+        all(seconds >= 0 for seconds in first.values())):
+    print("   ✅ Çizelge + görüntü aşamaları sırayla ölçüldü")
+    print(f"   {format_stages(first)}")
+else:
+    print(f"   ❌ Beklenmeyen aşamalar: {list(first)}, {list(cached)}, {list(inverse)}")
+
+# 3. Birikimli sayaçlar ve hook
+print("\n3. Sayaçlar ve hook kontrol ediliyor...")
+calls = []
+
+
+def record_hook(name, seconds, pixels):
+    calls.append((name, pixels))
+
+
+def broken_hook(name, seconds, pixels):
+    raise RuntimeError("hook hatası")    # Hatalı hook şifrelemeyi bozmamalı
+
+
+add_hook(record_hook)
+add_hook(broken_hook)
+logging.getLogger('chaospolybius').disabled = True
+
+COUNTERS.reset()
+stack = np.random.randint(0, 256, (4, 37, 29), dtype=np.uint8)
+batch = encrypt_images_from_array(stack, key)
+snapshot = COUNTERS.snapshot()
+
+remove_hook(record_hook)
+remove_hook(broken_hook)
+logging.getLogger('chaospolybius').disabled = False
+
+if (np.array_equal(batch[2], encrypt_image_from_array(stack[2], key)) and
+        calls == [(name, stack.size) for name in image_stages] and
+        snapshot[image_stages[-1]]['calls'] == 1 and
+        snapshot[image_stages[-1]]['pixels'] == stack.size):
+    print("   ✅ Hook her aşamada çağrıldı, sayaçlar piksel sayısını biriktirdi")
+else:
+    print(f"   ❌ Hook/sayaç hatalı: {calls}, {snapshot}")
+
+# 4. collect_stages iş parçacığına özel
+print("\n4. İş parçacığı ayrımı kontrol ediliyor...")
+other = {}
+
+
+def worker():
+    with collect_stages() as timings:
+        with stage('diffusion', 10):
+            pass
+    other.update(timings)
+
+
+with collect_stages() as mine:
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+if mine == {} and list(other) == ['diffusion']:
+    print("   ✅ Başka iş parçacığının aşamaları bu dökümü etkilemiyor")
+else:
+    print(f"   ❌ Dökümler karıştı: {mine}, {other}")
+
+print("\n" + COUNTERS.report())
+print("\n" + "="*60)
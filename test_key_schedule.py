@@ -0,0 +1,131 @@
+"""
+Anahtar Çizelgesi Testi (KeySchedule ve LRU önbelleği)
+"""
+
+import numpy as np
+from fplm import FPLM
+from toroidal_dfs import ToroidalDFS
+from dynamic_polybius import DynamicPolybius
+from key_schedule import KeySchedule, KeyScheduleCache, get_key_schedule, sha256_key_derivation
+from encryption import (encrypt_image_from_array, decrypt_image,
+                        encrypt_images_from_array, decrypt_images)
+
+print("="*60)
+print("Anahtar Çizelgesi Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+H, W = 48, 40
+
+# 1. Çizelge tabloları eski adım adım üretimle aynı olmalı
+print("\n1. Çizelge tabloları kontrol ediliyor...")
+schedule = KeySchedule(key, (H, W))
+
+dynamic_key = sha256_key_derivation(None, key)
+fplm_perm, fplm_sbox, fplm_diff = (FPLM(*dynamic_key) for _ in range(3))
+path = ToroidalDFS(H, W, fplm_perm).generate_path()
+sbox = DynamicPolybius(fplm_sbox)
+key_stream = fplm_diff.get_key_stream(H * W)
+
+tables_ok = (np.array_equal(schedule.permutation, [r * W + c for r, c in path]) and
+             np.array_equal(schedule.permutation[schedule.inverse_permutation], np.arange(H * W)) and
+             np.array_equal(schedule.sbox.sbox, sbox.sbox) and
+             np.array_equal(schedule.key_stream, key_stream))
+
+if tables_ok:
+    print("   ✅ Permütasyon, S-Box ve anahtar akışı aynı")
+else:
+    print("   ❌ Çizelge tabloları farklı!")
+
+# 2. Şifreleme / deşifreleme
+print("\n2. Şifreleme / deşifreleme kontrol ediliyor...")
+images = np.random.randint(0, 256, (5, H, W), dtype=np.uint8)
+
+enc_ok = all(np.array_equal(schedule.encrypt(img), encrypt_image_from_array(img, key))
+             for img in images)
+dec_ok = all(np.array_equal(schedule.decrypt(schedule.encrypt(img)), img) for img in images)
+
+if enc_ok and dec_ok:
+    print("   ✅ Çizelge ile şifreleme encrypt_image_from_array ile aynı ve tersinir")
+else:
+    print("   ❌ Çizelge ile şifreleme/deşifreleme hatalı!")
+
+for options in [{'sbox_bank': 4}, {'sbox_bits': 16}, {'sbox_candidates': 4}]:
+    img = images[0]
+    encrypted = encrypt_image_from_array(img, key, **options)
+    if np.array_equal(decrypt_image(encrypted, key, img, **options), img):
+        print(f"   ✅ {options} ile şifreleme/deşifreleme başarılı")
+    else:
+        print(f"   ❌ {options} ile deşifreleme başarısız!")
+
+try:
+    schedule.encrypt(np.zeros((W, H), dtype=np.uint8))
+    print("   ❌ Yanlış boyut kabul edildi!")
+except ValueError:
+    print("   ✅ Yanlış boyut ValueError veriyor")
+
+# 3. Önbellek
+print("\n3. LRU önbelleği kontrol ediliyor...")
+first = get_key_schedule(key, (H, W))
+second = get_key_schedule(list(key), (H, W))
+other = get_key_schedule(key, (H, W), sbox_bank=4)
+
+if first is second and first is not other:
+    print("   ✅ Aynı (anahtar, boyut, seçenekler) için çizelge yeniden kullanılıyor")
+else:
+    print("   ❌ Önbellek çizelgeyi yeniden kullanmıyor!")
+
+cache = KeyScheduleCache(max_size=2)
+a = cache.get(key, (8, 8))
+b = cache.get(key, (8, 9))
+cache.get(key, (8, 8))          # a en son kullanılan olur
+c = cache.get(key, (8, 10))     # b atılmalı
+
+if len(cache) == 2 and cache.get(key, (8, 8)) is a and cache.get(key, (8, 9)) is not b:
+    print("   ✅ Sayı sınırında en eski kullanılan çizelge atılıyor")
+else:
+    print("   ❌ LRU atma hatalı!")
+
+small = KeyScheduleCache(max_bytes=1)
+too_big = small.get(key, (8, 8))
+fits = KeyScheduleCache(max_bytes=too_big.nbytes + 100)
+fits.get(key, (8, 8))
+fits.get(key, (8, 9))
+
+if (len(small) == 0 and small.get(key, (8, 8)) is not too_big and len(fits) == 1 and
+        too_big.permutation.dtype == np.int32 and too_big.inverse_permutation.dtype == np.int32):
+    print("   ✅ Bellek sınırı uygulanıyor (sınırdan büyük çizelge tutulmuyor; int32 indeksler)")
+else:
+    print("   ❌ Bellek sınırı uygulanmıyor!")
+
+# 4. Toplu (N, H, W) şifreleme
+print("\n4. Toplu şifreleme kontrol ediliyor...")
+for options in [{}, {'sbox_bank': 4}, {'sbox_bits': 16}]:
+    for shape in [(H, W), (33, 17)]:
+        stack = np.random.randint(0, 256, (6,) + shape, dtype=np.uint8)
+        encrypted = encrypt_images_from_array(stack, key, **options)
+        single = np.stack([encrypt_image_from_array(img, key, **options) for img in stack])
+        
+        batch_ok = (np.array_equal(encrypted, single) and
+                    np.array_equal(decrypt_images(encrypted, key, **options), stack) and
+                    np.array_equal(decrypt_image(encrypted[3], key, None, **options), stack[3]))
+        
+        if batch_ok:
+            print(f"   ✅ {shape} {options}: kareler tek tek sonuçla aynı ve ayrı deşifre edilebiliyor")
+        else:
+            print(f"   ❌ {shape} {options}: toplu şifreleme farklı!")
+
+color_stack = np.random.randint(0, 256, (2, H, W, 3), dtype=np.uint8)
+rejected = 0
+for batch_func in (encrypt_images_from_array, decrypt_images):
+    try:
+        batch_func(color_stack, key)
+    except ValueError:
+        rejected += 1
+
+if rejected == 2:
+    print("   ✅ (N, H, W, C) yığını açık hata ile reddediliyor")
+else:
+    print("   ❌ (N, H, W, C) yığını reddedilmedi!")
+
+print("\n" + "="*60)
@@ -0,0 +1,104 @@
+"""
+Aşama Başına Alt Anahtar (key_version=2) ve Eşzamanlı Çizelge Üretimi Testi
+"""
+
+import os
+import time
+import numpy as np
+import key_schedule
+from key_schedule import KeySchedule, get_key_schedule, stage_key, sha256_key_derivation, USE_NUMBA
+from instrumentation import collect_stages
+from encryption import encrypt_image_from_array, decrypt_image
+
+print("="*60)
+print("Anahtar Sürümü ve Eşzamanlı Çizelge Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+gray = np.random.randint(0, 256, (61, 47), dtype=np.uint8)
+deep = np.random.randint(0, 65536, (33, 41), dtype=np.uint16)
+color = np.random.randint(0, 256, (23, 19, 3), dtype=np.uint8)
+
+# 1. Alt anahtarlar birbirinden ve dinamik anahtardan farklı
+print("\n1. Alt anahtarlar kontrol ediliyor...")
+dynamic_key = sha256_key_derivation(None, key)
+subkeys = [stage_key(dynamic_key, name) for name in ('permutation', 'sbox', 'diffusion')]
+pairs = {tuple(subkey[:2]) for subkey in subkeys} | {tuple(dynamic_key[:2])}
+if (len(pairs) == 4 and all(subkey[2:] == dynamic_key[2:] for subkey in subkeys) and
+        all(0 <= v < 1 for subkey in subkeys for v in subkey[:2]) and
+        stage_key(dynamic_key, 'sbox') == subkeys[1]):
+    print("   ✅ Permütasyon, S-Box ve difüzyon alt anahtarları ayrı ve deterministik")
+else:
+    print(f"   ❌ Alt anahtarlar hatalı: {subkeys}")
+
+# 2. Sürüm 2 tersinir, sürüm 1'den farklı; sürüm 1 varsayılan
+print("\n2. Tersinirlik kontrol ediliyor...")
+cases = [('gri', gray, {}), ('uint16', deep, {}), ('banka', gray, {'sbox_bank': 4}),
+         ('2-D difüzyon', gray, {'diffusion_version': 2})]
+cases += [(mode, color, {'color_mode': mode}) for mode in ('flat', 'channel', 'cross')]
+
+failed = []
+for name, img, options in cases:
+    encrypted = encrypt_image_from_array(img, key, key_version=2, **options)
+    decrypted = decrypt_image(encrypted, key, None, key_version=2, **options)
+    if (not np.array_equal(decrypted, img) or
+            np.array_equal(encrypted, encrypt_image_from_array(img, key, **options))):
+        failed.append(name)
+
+schedule = get_key_schedule(key, gray.shape)
+if (not failed and schedule.key_version == 1 and
+        schedule is get_key_schedule(key, gray.shape, key_version=1) and
+        schedule is not get_key_schedule(key, gray.shape, key_version=2)):
+    print(f"   ✅ {len(cases)} modda sürüm 2 tersinir ve farklı; sürüm 1 varsayılan")
+else:
+    print(f"   ❌ Hatalı modlar: {failed}")
+
+# 3. Eşzamanlı üretim seri üretimle aynı tabloları veriyor
+print("\n3. Eşzamanlı üretim kontrol ediliyor...")
+threshold = key_schedule.CONCURRENT_BUILD_MIN
+tables = ('permutation', 'inverse_permutation', 'key_stream', 'column_key_stream')
+same = True
+for options in ({}, {'key_version': 2}, {'diffusion_version': 2, 'depth': 16}):
+    try:
+        key_schedule.CONCURRENT_BUILD_MIN = 1
+        with collect_stages() as timings:
+            concurrent = KeySchedule(key, (64, 80), **options)
+        key_schedule.CONCURRENT_BUILD_MIN = 1 << 62
+        serial = KeySchedule(key, (64, 80), **options)
+    finally:
+        key_schedule.CONCURRENT_BUILD_MIN = threshold
+    for table in tables:
+        a, b = getattr(concurrent, table), getattr(serial, table)
+        same = same and (a is b is None or np.array_equal(a, b))
+    same = (same and np.array_equal(concurrent.sbox.sbox, serial.sbox.sbox) and
+            {'dfs_path', 'index_build', 'sbox_build', 'keystream'} <= set(timings))
+
+if same:
+    print("   ✅ Tablolar aynı, arka plan aşamaları collect_stages() ile ölçülüyor")
+else:
+    print("   ❌ Eşzamanlı üretim farklı sonuç verdi!")
+
+# 4. Geçersiz sürüm
+print("\n4. Geçersiz sürüm kontrol ediliyor...")
+try:
+    KeySchedule(key, (8, 8), key_version=3)
+    print("   ❌ key_version=3 kabul edildi!")
+except ValueError:
+    print("   ✅ Bilinmeyen anahtar sürümü reddedildi")
+
+# 5. Çizelge üretim süresi (yalnızca bilgi)
+print(f"\n5. 2048x2048 çizelge üretim süresi ({'Numba' if USE_NUMBA else 'NumPy'}, "
+      f"{os.cpu_count()} CPU)...")
+for label, size in (('seri', 1 << 62), ('eşzamanlı', threshold)):
+    key_schedule.CONCURRENT_BUILD_MIN = size
+    try:
+        with collect_stages() as timings:
+            start = time.perf_counter()
+            KeySchedule(key, (2048, 2048), key_version=2)
+            elapsed = time.perf_counter() - start
+    finally:
+        key_schedule.CONCURRENT_BUILD_MIN = threshold
+    slowest = max(timings[name] for name in ('dfs_path', 'sbox_build', 'keystream'))
+    print(f"   {label:<10} {elapsed * 1000:.0f} ms (en yavaş aşama {slowest * 1000:.0f} ms)")
+
+print("\n" + "="*60)
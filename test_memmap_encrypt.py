@@ -0,0 +1,120 @@
+"""
+Bellek Dışı (memmap) Şifreleme Testi
+"""
+
+import os
+import shutil
+import tempfile
+import tracemalloc
+import numpy as np
+from fplm import FPLM
+from toroidal_dfs import ToroidalDFS
+from encryption import encrypt_image_from_array, decrypt_image
+from memmap_encrypt import OutOfCoreSchedule, encrypt_memmap, decrypt_memmap
+
+print("="*60)
+print("Bellek Dışı (memmap) Şifreleme Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+work = tempfile.mkdtemp()
+
+# 1. Derlenmiş DFS = Python DFS
+print("\n1. İndeks tabanlı DFS kontrol ediliyor...")
+dfs_ok = True
+for shape in [(1, 1), (1, 7), (13, 1), (16, 16), (37, 23)]:
+    reference = ToroidalDFS(*shape, FPLM(0.123, 0.456, 3.7))
+    reference.generate_path()
+    fast = ToroidalDFS(*shape, FPLM(0.123, 0.456, 3.7))
+    indices = fast.generate_path_indices()
+    dfs_ok = dfs_ok and np.array_equal(indices, reference.path_indices()) and \
+        fast.fplm.x_curr == reference.fplm.x_curr
+
+if dfs_ok:
+    print("   ✅ generate_path_indices() Python DFS ile aynı yol ve FPLM durumu")
+else:
+    print("   ❌ İndeks tabanlı DFS farklı!")
+
+# 2. Parçalı şifreleme = tüm görüntü şifrelemesi (çok küçük parçalar)
+print("\n2. Parçalı şifreleme kontrol ediliyor...")
+cases = [
+    ('tek S-Box', np.random.randint(0, 256, (37, 23), dtype=np.uint8), {}),
+    ('aday arama', np.random.randint(0, 256, (20, 20), dtype=np.uint8), {'sbox_candidates': 3}),
+    ('banka', np.random.randint(0, 256, (31, 17), dtype=np.uint8), {'sbox_bank': 4}),
+    ('16-bit S-Box', np.random.randint(0, 256, (25, 19), dtype=np.uint8), {'sbox_bits': 16}),
+    ('uint16', np.random.randint(0, 65536, (29, 21), dtype=np.uint16), {}),
+    ('renkli', np.random.randint(0, 256, (15, 11, 3), dtype=np.uint8), {}),
+]
+for name, img, options in cases:
+    expected = encrypt_image_from_array(img, key, **options)
+    encrypted = np.empty_like(img)
+    decrypted = np.empty_like(img)
+    with OutOfCoreSchedule(key, img.shape, depth=img.itemsize * 8, max_memory=64 * 6,
+                           **options) as schedule:
+        schedule.encrypt(img, encrypted)
+        schedule.decrypt(encrypted, decrypted)
+        chunks = -(-img.size // schedule.chunk_pixels)
+
+    if np.array_equal(encrypted, expected) and np.array_equal(decrypted, img):
+        print(f"   ✅ {name}: {chunks} parça, sonuç encrypt_image_from_array ile aynı")
+    else:
+        print(f"   ❌ {name}: parçalı şifreleme farklı!")
+
+# 3. Dosyalar: ham ve .npy
+print("\n3. Ham ve .npy dosyaları kontrol ediliyor...")
+img = np.random.randint(0, 256, (120, 90), dtype=np.uint8)
+img.tofile(os.path.join(work, 'goruntu.raw'))
+np.save(os.path.join(work, 'goruntu.npy'), img)
+
+enc_raw = encrypt_memmap(os.path.join(work, 'goruntu.raw'), os.path.join(work, 'sifreli.raw'),
+                         key, shape=img.shape, max_memory=4096)
+enc_npy = encrypt_memmap(os.path.join(work, 'goruntu.npy'), os.path.join(work, 'sifreli.npy'),
+                         key, max_memory=4096)
+dec_raw = decrypt_memmap(os.path.join(work, 'sifreli.raw'), os.path.join(work, 'cozulmus.raw'),
+                         key, shape=img.shape, max_memory=4096)
+dec_npy = decrypt_memmap(os.path.join(work, 'sifreli.npy'), os.path.join(work, 'cozulmus.npy'),
+                         key, max_memory=4096)
+
+if (isinstance(enc_raw, np.memmap) and
+        np.array_equal(enc_raw, encrypt_image_from_array(img, key)) and
+        np.array_equal(np.load(os.path.join(work, 'sifreli.npy')), enc_raw) and
+        np.array_equal(decrypt_image(np.load(os.path.join(work, 'sifreli.npy')), key, None), img) and
+        np.array_equal(dec_raw, img) and np.array_equal(dec_npy, img)):
+    print("   ✅ Ham ve .npy dosyaları şifrelendi, normal decrypt_image ile çözülüyor")
+else:
+    print("   ❌ Dosya şifreleme hatalı!")
+
+scratch = os.path.join(work, 'gecici')
+os.makedirs(scratch)
+with OutOfCoreSchedule(key, img.shape, scratch_dir=scratch) as schedule:
+    tables = sorted(os.listdir(schedule.scratch))
+if tables == ['permutation.bin'] and os.listdir(scratch) == []:
+    print("   ✅ Permütasyon tablosu diskte tutuldu ve kapatınca silindi")
+else:
+    print(f"   ❌ Geçici tablolar: {tables}, kalan: {os.listdir(scratch)}")
+
+# 4. Çalışma belleği max_memory ile sınırlı
+print("\n4. Çalışma belleği kontrol ediliyor...")
+big = np.lib.format.open_memmap(os.path.join(work, 'buyuk.npy'), mode='w+',
+                                dtype=np.uint8, shape=(1024, 1024))
+big[:] = np.random.randint(0, 256, big.shape, dtype=np.uint8)
+target = np.lib.format.open_memmap(os.path.join(work, 'buyuk_sifreli.npy'), mode='w+',
+                                   dtype=np.uint8, shape=big.shape)
+max_memory = 2**20
+
+with OutOfCoreSchedule(key, big.shape, max_memory=max_memory) as schedule:
+    tracemalloc.start()
+    schedule.encrypt(big, target)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+# Tam görüntü şifrelemesi yalnızca permütasyon için 4 MB (int32) ayırır
+if peak <= max_memory and np.array_equal(target, encrypt_image_from_array(np.asarray(big), key)):
+    print(f"   ✅ 1 MB görüntü: tepe bellek {peak / 2**20:.2f} MB (sınır {max_memory / 2**20:.0f} MB)")
+else:
+    print(f"   ❌ Tepe bellek {peak / 2**20:.2f} MB, sınır {max_memory / 2**20:.0f} MB!")
+
+del big, target, enc_raw, enc_npy, dec_raw, dec_npy
+shutil.rmtree(work, ignore_errors=True)
+
+print("\n" + "="*60)
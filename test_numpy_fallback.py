@@ -0,0 +1,178 @@
+"""
+Saf NumPy (Numba'sız) Şifreleme Yolu Testi
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import key_schedule
+import memmap_encrypt
+import tiled_encrypt
+import toroidal_dfs
+from key_schedule import (get_key_schedule, numpy_xor_diffusion, numpy_inverse_xor_diffusion,
+                          COLOR_MODES)
+from fplm import FPLM
+from encryption import (encrypt_image_from_array, decrypt_image, encrypt_images_from_array,
+                        decrypt_images)
+
+print("="*60)
+print("Saf NumPy Şifreleme Yolu Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+
+def reference_diffusion(data, key_stream):
+    """Tanımdan XOR zinciri: c[i] = p[i] ^ k[i] ^ c[i-1]"""
+    result = np.empty_like(data)
+    prev = 0
+    for i in range(len(data)):
+        prev = data[i] ^ key_stream[i] ^ prev
+        result[i] = prev
+    return result
+
+
+# 1. Önek XOR taraması = tanımdaki zincir
+print("\n1. NumPy XOR difüzyonu kontrol ediliyor...")
+scan_ok = True
+for dtype, levels in ((np.uint8, 256), (np.uint16, 65536)):
+    for length in list(range(1, 20)) + [255, 1001]:
+        rows = np.random.randint(0, levels, (3, length)).astype(dtype)
+        stream = np.random.randint(0, levels, length).astype(dtype)
+        encrypted = numpy_xor_diffusion(rows, stream)
+        scan_ok = scan_ok and encrypted.dtype == dtype and all(
+            np.array_equal(encrypted[i], reference_diffusion(rows[i], stream)) for i in range(3))
+        scan_ok = scan_ok and np.array_equal(numpy_inverse_xor_diffusion(encrypted, stream), rows)
+
+if scan_ok:
+    print("   ✅ uint8/uint16, 1-1001 uzunluk: zincir tanımla aynı ve tersinir")
+else:
+    print("   ❌ NumPy XOR difüzyonu hatalı!")
+
+# 2. Tüm şifreleme modları Numba'sız aynı sonucu veriyor
+print("\n2. Numba'sız şifreleme kontrol ediliyor...")
+gray = np.random.randint(0, 256, (37, 29), dtype=np.uint8)
+deep = np.random.randint(0, 65536, (21, 17), dtype=np.uint16)
+color = np.random.randint(0, 256, (13, 11, 3), dtype=np.uint8)
+stack = np.random.randint(0, 256, (4, 37, 29), dtype=np.uint8)
+cases = [('gri', gray, {}), ('banka', gray, {'sbox_bank': 4}),
+         ('16-bit S-Box', gray, {'sbox_bits': 16}), ('uint16', deep, {})] + [(mode, color, {'color_mode': mode}) for mode in COLOR_MODES]
+cases += [('döşemeli', gray, {'tile_size': 16}), ('döşemeli renkli', color, {'tile_size': 8})]
+
+expected = {name: encrypt_image_from_array(img, key, **options) for name, img, options in cases}
+expected_batch = encrypt_images_from_array(stack, key)
+
+saved = key_schedule.USE_NUMBA
+saved_dfs = toroidal_dfs.USE_NUMBA
+key_schedule.USE_NUMBA = tiled_encrypt.USE_NUMBA = False
+try:
+    for name, img, options in cases:
+        encrypted = encrypt_image_from_array(img, key, **options)
+        decrypted = decrypt_image(encrypted, key, None, **options)
+        if np.array_equal(encrypted, expected[name]) and np.array_equal(decrypted, img):
+            print(f"   ✅ {name}: aynı şifreli görüntü, tersinir")
+        else:
+            print(f"   ❌ {name}: Numba'sız sonuç farklı!")
+
+    batch = encrypt_images_from_array(stack, key)
+    with memmap_encrypt.OutOfCoreSchedule(key, gray.shape, max_memory=64 * 100) as schedule:
+        chunked = np.empty_like(gray)
+        schedule.encrypt(gray, chunked)
+
+    if (np.array_equal(batch, expected_batch) and np.array_equal(decrypt_images(batch, key), stack)
+            and np.array_equal(chunked, expected['gri'])):
+        print("   ✅ Toplu ve parçalı (memmap) şifreleme de aynı")
+    else:
+        print("   ❌ Toplu/parçalı Numba'sız şifreleme farklı!")
+
+    # Bellek dışı DFS: ziyaret haritası ve yığın verilen tamponlarda, demet listesi yok
+    N = gray.size
+    expected_path = toroidal_dfs.ToroidalDFS(*gray.shape, FPLM(*key)).generate_path_indices()
+    toroidal_dfs.USE_NUMBA = False
+    visited = np.zeros((N + 7) // 8, dtype=np.uint8)
+    dfs_stack = np.full(3 * N + 1, -1, dtype=np.int64)
+    dfs = toroidal_dfs.ToroidalDFS(*gray.shape, FPLM(*key))
+    path = dfs.generate_path_indices(out=np.empty(N, dtype=np.uint32), visited=visited,
+                                     stack=dfs_stack)
+
+    with memmap_encrypt.OutOfCoreSchedule(key, gray.shape, max_memory=64 * 100) as schedule:
+        chunked = np.empty_like(gray)
+        schedule.encrypt(gray, chunked)
+
+    if (np.array_equal(path, expected_path) and dfs.path == [] and
+            np.unpackbits(visited, bitorder='little')[:N].all() and np.any(dfs_stack >= 0) and
+            np.array_equal(chunked, expected['gri'])):
+        print("   ✅ Numba'sız bellek dışı DFS verilen tamponları kullanıyor, sonuç aynı")
+    else:
+        print("   ❌ Numba'sız bellek dışı DFS tamponları kullanmıyor!")
+
+    # 3. Hız (çizelge önbellekte; görüntü başına maliyet)
+    print("\n3. 1024x1024 görüntü başına süre (en iyi 10)...")
+    img = np.random.randint(0, 256, (1024, 1024), dtype=np.uint8)
+    schedule = get_key_schedule(key, img.shape)
+    timings = {}
+    for use_numba in (saved, False):
+        key_schedule.USE_NUMBA = use_numba
+        best = float('inf')
+        for _ in range(10):
+            start = time.perf_counter()
+            schedule.encrypt(img)
+            best = min(best, time.perf_counter() - start)
+        timings['Numba' if use_numba else 'NumPy'] = best * 1000
+    print("   " + ", ".join(f"{name}: {ms:.2f} ms" for name, ms in timings.items()))
+finally:
+    key_schedule.USE_NUMBA = tiled_encrypt.USE_NUMBA = saved
+    toroidal_dfs.USE_NUMBA = saved_dfs
+
+# 4. Numba gerçekten yüklenemiyor (ImportError): tüm modüller açılıyor, sonuç aynı
+print("\n4. Numba import edilemezken şifreleme kontrol ediliyor...")
+script = """
+import hashlib
+import sys
+
+
+class BlockNumba:
+    def find_spec(self, name, path=None, target=None):
+        if name == 'numba' or name.startswith('numba.'):
+            raise ImportError(f"No module named '{name}'")
+
+
+sys.meta_path.insert(0, BlockNumba())
+import numpy as np
+import batch_encrypt, cipher_container, memmap_encrypt, parallel_encrypt
+from key_schedule import USE_NUMBA
+from encryption import encrypt_image_from_array, decrypt_image
+from threaded_encrypt import EncryptionEngine
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+rng = np.random.default_rng(42)
+images = [rng.integers(0, 256, (37, 29), dtype=np.uint8),
+          rng.integers(0, 65536, (21, 17), dtype=np.uint16),
+          rng.integers(0, 256, (13, 11, 3), dtype=np.uint8)]
+ok = 'numba' not in sys.modules and not USE_NUMBA
+for img in images:
+    encrypted = encrypt_image_from_array(img, key)
+    ok &= np.array_equal(decrypt_image(encrypted, key, None), img)
+    print(hashlib.sha256(encrypted.tobytes()).hexdigest())
+with EncryptionEngine(key, threads=2) as engine:
+    ok &= np.array_equal(engine.decrypt(engine.encrypt(images[0])), images[0])
+print(ok)
+"""
+environment = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+result = subprocess.run([sys.executable, '-c', script], env=environment, capture_output=True,
+                        text=True)
+rng = np.random.default_rng(42)
+images = [rng.integers(0, 256, (37, 29), dtype=np.uint8),
+          rng.integers(0, 65536, (21, 17), dtype=np.uint16),
+          rng.integers(0, 256, (13, 11, 3), dtype=np.uint8)]
+digests = [hashlib.sha256(encrypt_image_from_array(img, key).tobytes()).hexdigest()
+           for img in images]
+
+if result.returncode == 0 and result.stdout.split() == digests + ['True']:
+    print("   ✅ numba engellenmiş süreçte şifreleme aynı, deşifreleme ve motor çalışıyor")
+else:
+    print(f"   ❌ Süreç çıkış kodu {result.returncode}: {result.stderr.strip()[-300:]}")
+
+print("\n" + "="*60)
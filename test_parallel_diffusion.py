@@ -0,0 +1,95 @@
+"""
+Çok Çekirdekli XOR Difüzyonu (Paralel Önek Taraması) Testi
+"""
+
+import os
+import sys
+import time
+
+# Dağıtım yolunu tek çekirdekli makinelerde de sınamak için en az 4 iş parçacığı
+# (Numba başka bir modülce yüklendiyse ayar değiştirilemez)
+if 'numba' not in sys.modules:
+    os.environ.setdefault('NUMBA_NUM_THREADS', '4')
+
+import numpy as np
+import key_schedule
+from key_schedule import USE_NUMBA, get_key_schedule, warm_up_kernels
+from encryption import encrypt_image_from_array, decrypt_image
+
+print("="*60)
+print("Paralel XOR Difüzyonu Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+if not USE_NUMBA:
+    print("\n⚠️  Numba yok - paralel çekirdek testi atlandı")
+else:
+    from fast_numba import (fast_xor_diffusion, fast_inverse_xor_diffusion,
+                            fast_xor_diffusion_parallel, fast_inverse_xor_diffusion_parallel,
+                            get_num_threads)
+    warm_up_kernels()
+
+    # 1. Parça sayısından bağımsız olarak tek zincirle bit bit aynı
+    print("\n1. Paralel tarama çekirdekleri kontrol ediliyor...")
+    kernels_ok = True
+    for dtype, levels in ((np.uint8, 256), (np.uint16, 65536)):
+        for length in (1, 2, 3, 7, 100, 1001, 65537):
+            data = np.random.randint(0, levels, length).astype(dtype)
+            stream = np.random.randint(0, levels, length).astype(dtype)
+            expected = fast_xor_diffusion(data, stream)
+            for chunks in (1, 2, 3, 8, 64):
+                encrypted = fast_xor_diffusion_parallel(data, stream, chunks)
+                kernels_ok = (kernels_ok and encrypted.dtype == dtype and
+                              np.array_equal(encrypted, expected) and
+                              np.array_equal(fast_inverse_xor_diffusion_parallel(
+                                  encrypted, stream, chunks), data))
+
+    if kernels_ok:
+        print("   ✅ uint8/uint16, 1-65537 uzunluk, 1-64 parça: tek zincirle aynı ve tersinir")
+    else:
+        print("   ❌ Paralel tarama farklı sonuç verdi!")
+
+    # 2. Eşik üstündeki görüntüler paralel yoldan aynı şifreli görüntüyü veriyor
+    print(f"\n2. Şifreleme kontrol ediliyor ({get_num_threads()} iş parçacığı)...")
+    gray = np.random.randint(0, 256, (700, 500), dtype=np.uint8)
+    color = np.random.randint(0, 256, (300, 400, 3), dtype=np.uint8)
+
+    threshold = key_schedule.PARALLEL_DIFFUSION_MIN
+    key_schedule.PARALLEL_DIFFUSION_MIN = gray.size + color.size + 1
+    expected = [encrypt_image_from_array(gray, key),
+                encrypt_image_from_array(color, key, color_mode='cross')]
+    key_schedule.PARALLEL_DIFFUSION_MIN = 1024
+    try:
+        parallel = key_schedule._diffusion_chunks(gray.size) > 1
+        encrypted = [encrypt_image_from_array(gray, key),
+                     encrypt_image_from_array(color, key, color_mode='cross')]
+        decrypted = [decrypt_image(encrypted[0], key, None),
+                     decrypt_image(encrypted[1], key, None, color_mode='cross')]
+    finally:
+        key_schedule.PARALLEL_DIFFUSION_MIN = threshold
+
+    if (parallel and all(np.array_equal(e, x) for e, x in zip(encrypted, expected)) and
+            np.array_equal(decrypted[0], gray) and np.array_equal(decrypted[1], color)):
+        print("   ✅ Gri ve 'cross' renkli görüntüler paralel taramayla aynı, tersinir")
+    else:
+        print("   ❌ Paralel şifreleme yolu farklı!")
+
+    # 3. Süre (gerçek çekirdek sayısına bağlı; yalnızca bilgi)
+    print(f"\n3. 2048x2048 difüzyon süresi (en iyi 10, {os.cpu_count()} CPU)...")
+    schedule = get_key_schedule(key, (2048, 2048))
+    data = np.random.randint(0, 256, 2048 * 2048, dtype=np.uint8)
+    for name, run in (('tek zincir', lambda: fast_xor_diffusion(data, schedule.key_stream)),
+                      ('paralel', lambda: fast_xor_diffusion_parallel(
+                          data, schedule.key_stream, get_num_threads())),
+                      ('ters, tek', lambda: fast_inverse_xor_diffusion(data, schedule.key_stream)),
+                      ('ters, paralel', lambda: fast_inverse_xor_diffusion_parallel(
+                          data, schedule.key_stream, get_num_threads()))):
+        best = float('inf')
+        for _ in range(10):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        print(f"   {name:<14} {best * 1000:.2f} ms")
+
+print("\n" + "="*60)
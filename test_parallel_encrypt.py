@@ -0,0 +1,90 @@
+"""
+Paylaşımlı Bellekli Paralel Şifreleme Testi
+"""
+
+import numpy as np
+from parallel_encrypt import (encrypt_images_parallel, decrypt_images_parallel,
+                              SharedImageBuffer, plan_ranges)
+from encryption import encrypt_image_from_array
+
+# İşlem havuzu işçileri spawn ile başlar ve bu modülü yeniden import eder
+if __name__ == "__main__":
+    print("="*60)
+    print("Paralel Şifreleme Testi")
+    print("="*60)
+
+    key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+    # 1. (N, H, W) yığını
+    print("\n1. Yığın paralel şifreleniyor...")
+    stack = np.random.randint(0, 256, (10, 40, 30), dtype=np.uint8)
+    encrypted = encrypt_images_parallel(stack, key, workers=3)
+    single = np.stack([encrypt_image_from_array(img, key) for img in stack])
+
+    if np.array_equal(encrypted, single) and np.array_equal(decrypt_images_parallel(encrypted, key, workers=3), stack):
+        print("   ✅ Paralel sonuç tek görüntü sonucu ile aynı ve tersinir")
+    else:
+        print("   ❌ Paralel yığın şifrelemesi hatalı!")
+
+    # 2. Farklı boyutlu görüntü listesi ve S-Box seçenekleri
+    print("\n2. Farklı boyutlu liste kontrol ediliyor...")
+    images = [np.random.randint(0, 256, shape, dtype=np.uint8)
+              for shape in [(20, 20), (20, 20), (33, 17), (8, 64), (33, 17)]]
+
+    for options in [{}, {'sbox_bank': 4}, {'sbox_bits': 16}]:
+        encrypted = encrypt_images_parallel(images, key, workers=2, **options)
+        decrypted = decrypt_images_parallel(encrypted, key, workers=2, **options)
+        list_ok = all(np.array_equal(enc, encrypt_image_from_array(img, key, **options)) and
+                      np.array_equal(dec, img)
+                      for img, enc, dec in zip(images, encrypted, decrypted))
+    
+        if list_ok:
+            print(f"   ✅ {options}: her görüntü doğru şifrelendi ve geri döndü")
+        else:
+            print(f"   ❌ {options}: liste şifrelemesi hatalı!")
+
+    # 3. Aralık planı ve paylaşımlı tampon
+    print("\n3. Aralık planı ve paylaşımlı tampon kontrol ediliyor...")
+    shapes = [(4, 4)] * 5 + [(2, 3)] * 3 + [(4, 4)]
+    ranges = plan_ranges(shapes, workers=2)
+    covered = [i for start, stop in ranges for i in range(start, stop)]
+    same_shape = all(len({shapes[i] for i in range(start, stop)}) == 1 for start, stop in ranges)
+
+    with SharedImageBuffer(shapes) as buf:
+        attached = SharedImageBuffer(shapes, name=buf.name)
+        attached.image(6)[...] = 7
+        shared_ok = np.all(buf.image(6) == 7) and buf.nbytes == 5 * 16 + 3 * 6 + 16
+        attached.close()
+
+    if covered == list(range(len(shapes))) and same_shape and shared_ok:
+        print("   ✅ Aralıklar tüm görüntüleri aynı boyutlu gruplarla kapsıyor, tampon paylaşılıyor")
+    else:
+        print("   ❌ Aralık planı veya paylaşımlı tampon hatalı!")
+
+    # 4. 16-bit yığın (paylaşımlı tampon uint16)
+    print("\n4. 16-bit yığın paralel şifreleniyor...")
+    stack16 = np.random.randint(0, 65536, (6, 24, 20), dtype=np.uint16)
+    encrypted = encrypt_images_parallel(stack16, key, workers=2)
+    single = np.stack([encrypt_image_from_array(img, key) for img in stack16])
+
+    if (encrypted.dtype == np.uint16 and np.array_equal(encrypted, single) and
+            np.array_equal(decrypt_images_parallel(encrypted, key, workers=2), stack16)):
+        print("   ✅ 16-bit paralel sonuç tek görüntü sonucu ile aynı ve tersinir")
+    else:
+        print("   ❌ 16-bit paralel şifreleme hatalı!")
+
+    # 5. Boş girdi (havuz kurulmadan boş sonuç döner)
+    print("\n5. Boş liste ve sıfır uzunluklu yığın kontrol ediliyor...")
+    empty_list = encrypt_images_parallel([], key, workers=4)
+    empty_stack = np.zeros((0, 12, 9), dtype=np.uint16)
+    encrypted = encrypt_images_parallel(empty_stack, key, workers=4)
+    decrypted = decrypt_images_parallel(encrypted, key, workers=4)
+
+    if (empty_list == [] and decrypt_images_parallel([], key, workers=4) == [] and
+            encrypted.shape == (0, 12, 9) and encrypted.dtype == np.uint16 and
+            decrypted.shape == (0, 12, 9)):
+        print("   ✅ Boş girdiler boş sonuç döndürüyor")
+    else:
+        print("   ❌ Boş girdi işlenemedi!")
+
+    print("\n" + "="*60)
@@ -0,0 +1,236 @@
+"""
+S-Box Metrik Testi (vektörize metrikler vs. kaba kuvvet referansı)
+"""
+
+import numpy as np
+from fplm import FPLM
+from dynamic_polybius import (DynamicPolybius, MAX_SBOX_CANDIDATES, CANDIDATE_MIN_DISTINCT,
+                              candidate_sequences, distinct_counts)
+from sbox_metrics import SBoxMetrics
+from encryption import encrypt_image_from_array, decrypt_image
+
+print("="*60)
+print("S-Box Metrik Testi")
+print("="*60)
+
+sbox = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99))
+S = [int(v) for v in sbox.sbox]
+
+# 1. SAC matrisi
+print("\n1. SAC matrisi kontrol ediliyor...")
+sac_ref = np.zeros((8, 8))
+for x in range(256):
+    for i in range(8):
+        diff = S[x] ^ S[x ^ (1 << i)]
+        for j in range(8):
+            sac_ref[i, j] += (diff >> j) & 1
+sac_ref /= 256
+
+sac = sbox.sac_matrix()
+print(f"   SAC ortalama: {sac.mean():.4f}")
+
+if np.allclose(sac, sac_ref):
+    print("   ✅ SAC matrisi kaba kuvvet sonucuyla aynı")
+else:
+    print("   ❌ SAC matrisi farklı!")
+
+# 2. Avalanche (bit 0) geriye uyumluluk
+avalanche_ref = sum(bin(S[x] ^ S[x ^ 1]).count('1') for x in range(256)) / 256
+
+if sbox.avalanche_effect() == avalanche_ref:
+    print("   ✅ avalanche_effect() eski sonuçla aynı")
+else:
+    print("   ❌ avalanche_effect() farklı!")
+
+# 3. Toplu (batch) tarama tek tek hesapla aynı olmalı
+print("\n2. Toplu SAC taraması kontrol ediliyor...")
+fplm = FPLM(x0=0.5, u0=0.3)
+batch = np.stack([DynamicPolybius(fplm).sbox for _ in range(8)])
+
+batch_sac = SBoxMetrics.sac_matrix(batch)
+single_sac = np.stack([SBoxMetrics.sac_matrix(s) for s in batch])
+
+if batch_sac.shape == (8, 8, 8) and np.allclose(batch_sac, single_sac):
+    print("   ✅ Toplu SAC tek tek hesapla aynı")
+else:
+    print("   ❌ Toplu SAC farklı!")
+
+bic = sbox.bit_independence()
+print(f"   BIC max korelasyon: {bic['max_correlation']:.4f}")
+
+# 4. LAT / nonlinearity (FWHT) - kaba kuvvet Walsh toplamıyla karşılaştır
+print("\n3. LAT ve nonlinearity kontrol ediliyor...")
+parity = [bin(v).count('1') & 1 for v in range(256)]
+lat = sbox.linear_approximation_table()
+
+lat_ok = True
+for a in [0, 1, 7, 100, 255]:
+    for b in [1, 2, 64, 129, 255]:
+        count = sum(1 for x in range(256) if parity[a & x] == parity[b & S[x]])
+        lat_ok = lat_ok and (count - 128 == lat[a, b])
+
+if lat_ok:
+    print("   ✅ LAT kaba kuvvet sonucuyla aynı")
+else:
+    print("   ❌ LAT farklı!")
+
+nl = sbox.nonlinearity()
+print(f"   Nonlinearity: {nl}")
+
+if nl == 128 - np.abs(lat[:, 1:]).max():
+    print("   ✅ Nonlinearity LAT ile tutarlı")
+else:
+    print("   ❌ Nonlinearity LAT ile tutarsız!")
+
+# AES S-Box'ının bilinen nonlinearity değeri 112
+aes_sbox = np.frombuffer(bytes.fromhex(
+    "637c777bf26b6fc53001672bfed7ab76ca82c97dfa5947f0add4a2af9ca472c0"
+    "b7fd9326363ff7cc34a5e5f171d8311504c723c31896059a071280e2eb27b275"
+    "09832c1a1b6e5aa0523bd6b329e32f8453d100ed20fcb15b6acbbe394a4c58cf"
+    "d0efaafb434d338545f9027f503c9fa851a3408f929d38f5bcb6da2110fff3d2"
+    "cd0c13ec5f974417c4a77e3d645d197360814fdc222a908846eeb814de5e0bdb"
+    "e0323a0a4906245cc2d3ac629195e479e7c8376d8dd54ea96c56f4ea657aae08"
+    "ba78252e1ca6b4c6e8dd741f4bbd8b8a703eb5664803f60e613557b986c11d9e"
+    "e1f8981169d98e949b1e87e9ce5528df8ca1890dbfe6426841992d0fb054bb16"
+), dtype=np.uint8)
+
+if SBoxMetrics.nonlinearity(aes_sbox) == 112:
+    print("   ✅ AES S-Box nonlinearity = 112")
+else:
+    print("   ❌ AES S-Box nonlinearity yanlış!")
+
+
+# 5. DDT / BCT - kaba kuvvet tanımıyla karşılaştır
+print("\n4. DDT ve BCT kontrol ediliyor...")
+ddt_ref = np.zeros((256, 256), dtype=int)
+for dx in range(256):
+    for x in range(256):
+        ddt_ref[dx, S[x] ^ S[x ^ dx]] += 1
+
+if np.array_equal(sbox.difference_distribution_table(), ddt_ref):
+    print("   ✅ DDT kaba kuvvet sonucuyla aynı")
+else:
+    print("   ❌ DDT farklı!")
+
+inverse = [int(v) for v in sbox.inverse_sbox]
+bct = SBoxMetrics.boomerang_connectivity_table(sbox.sbox)
+
+bct_ok = True
+for a in [0, 1, 9, 200, 255]:
+    for b in [0, 3, 17, 128, 255]:
+        count = sum(1 for x in range(256)
+                    if inverse[S[x] ^ b] ^ inverse[S[x ^ a] ^ b] == a)
+        bct_ok = bct_ok and (count == bct[a, b])
+
+if bct_ok:
+    print("   ✅ BCT kaba kuvvet sonucuyla aynı")
+else:
+    print("   ❌ BCT farklı!")
+
+aes_diff = SBoxMetrics.differential_summary(aes_sbox)
+print(f"   S-Box diferansiyel düzgünlük: {sbox.differential_uniformity()}")
+
+if aes_diff['differential_uniformity'] == 4 and aes_diff['boomerang_uniformity'] == 6:
+    print("   ✅ AES S-Box: diferansiyel = 4, boomerang = 6")
+else:
+    print("   ❌ AES S-Box diferansiyel/boomerang değerleri yanlış!")
+
+# 6. Anahtar-bağımlı S-Box araması
+print("\n5. Anahtar-bağımlı S-Box araması kontrol ediliyor...")
+searched = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99), candidates=8)
+repeated = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99), candidates=8)
+result = searched.search_result
+print(f"   Seçilen aday: {result['index']}, nonlinearity: {result['nonlinearity']}, "
+      f"diferansiyel: {result['differential_uniformity']}")
+
+if (np.array_equal(searched.sbox, repeated.sbox) and
+        sorted(searched.sbox.tolist()) == list(range(256)) and
+        result['nonlinearity'] >= nl):
+    print("   ✅ Arama tekrarlanabilir ve klasik S-Box'tan zayıf değil")
+else:
+    print("   ❌ Arama sonucu hatalı!")
+
+# Demo anahtarının kendi a, b, c, delta değerleriyle akışlar sabit noktaya oturur;
+# adaylar tüm parametreleri türettiği için arama yine güçlü S-Box bulmalı
+key = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+demo = DynamicPolybius(FPLM(*key), candidates=MAX_SBOX_CANDIDATES)
+streams = candidate_sequences(FPLM(*key), MAX_SBOX_CANDIDATES - 1)
+
+if (demo.search_result['nonlinearity'] >= 90 and demo.search_result['differential_uniformity'] <= 16
+        and np.all(distinct_counts(streams) >= CANDIDATE_MIN_DISTINCT)):
+    print(f"   ✅ Demo anahtarı: sabit akışlar atlandı, NL {demo.search_result['nonlinearity']}, "
+          f"diferansiyel {demo.search_result['differential_uniformity']}")
+else:
+    print(f"   ❌ Demo anahtarı için arama zayıf S-Box seçti: {demo.search_result}")
+
+test_img = np.random.randint(0, 256, (64, 64), dtype=np.uint8)
+encrypted = encrypt_image_from_array(test_img, key, sbox_candidates=8)
+decrypted = decrypt_image(encrypted, key, test_img, sbox_candidates=8)
+
+if np.array_equal(test_img, decrypted):
+    print("   ✅ Aramalı S-Box ile şifreleme/deşifreleme başarılı")
+else:
+    print("   ❌ Aramalı S-Box ile deşifreleme başarısız!")
+
+# 7. Bölge başına S-Box bankası
+print("\n6. S-Box bankası kontrol ediliyor...")
+bank = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99), bank_size=8)
+single = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99))
+
+identity = np.arange(256)
+bank_ok = (bank.sbox_bank.shape == (8, 256) and
+           np.array_equal(bank.sbox_bank[0], single.sbox) and
+           all(np.array_equal(inv[tbl], identity)
+               for tbl, inv in zip(bank.sbox_bank, bank.inverse_bank)) and
+           len({tbl.tobytes() for tbl in bank.sbox_bank}) == 8)
+
+data = np.random.randint(0, 256, (16, 10), dtype=np.uint8)
+substituted = bank.substitute_bank(data)
+expected = np.stack([bank.sbox_bank[r * 8 // 16][row] for r, row in enumerate(data)])
+bank_ok = bank_ok and np.array_equal(substituted, expected)
+bank_ok = bank_ok and np.array_equal(bank.inverse_substitute_bank(substituted), data)
+
+if bank_ok:
+    print("   ✅ Banka tabloları, satır bantları ve tersleri doğru")
+else:
+    print("   ❌ S-Box bankası hatalı!")
+
+encrypted = encrypt_image_from_array(test_img, key, sbox_bank=8)
+decrypted = decrypt_image(encrypted, key, test_img, sbox_bank=8)
+
+if np.array_equal(test_img, decrypted):
+    print("   ✅ S-Box bankası ile şifreleme/deşifreleme başarılı")
+else:
+    print("   ❌ S-Box bankası ile deşifreleme başarısız!")
+
+# 8. 16-bit piksel çifti S-Box'ı
+print("\n7. 16-bit piksel çifti S-Box'ı kontrol ediliyor...")
+pair = DynamicPolybius(FPLM(x0=0.123, u0=0.456, r=3.99), bits=16)
+
+data = np.random.randint(0, 256, 1001, dtype=np.uint8)
+substituted = pair.substitute_pairs(data)
+low, high = data[0:1000:2].astype(int), data[1:1000:2].astype(int)
+expected = pair.sbox16[low | (high << 8)]
+
+pair_ok = (np.array_equal(pair.sbox, single.sbox) and
+           sorted(pair.sbox16.tolist()) == list(range(65536)) and
+           np.array_equal(substituted[0:1000:2], expected & 0xFF) and
+           np.array_equal(substituted[1:1000:2], expected >> 8) and
+           substituted[-1] == pair.sbox[data[-1]] and
+           np.array_equal(pair.inverse_substitute_pairs(substituted), data))
+
+if pair_ok:
+    print("   ✅ 16-bit tablo, little-endian çiftler ve ters tablo doğru")
+else:
+    print("   ❌ 16-bit S-Box hatalı!")
+
+odd_img = np.random.randint(0, 256, (33, 17), dtype=np.uint8)
+encrypted = encrypt_image_from_array(odd_img, key, sbox_bits=16)
+decrypted = decrypt_image(encrypted, key, odd_img, sbox_bits=16)
+
+if np.array_equal(odd_img, decrypted):
+    print("   ✅ 16-bit S-Box ile şifreleme/deşifreleme başarılı (tek piksel sayısı)")
+else:
+    print("   ❌ 16-bit S-Box ile deşifreleme başarısız!")
+
+print("\n" + "="*60)
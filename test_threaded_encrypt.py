@@ -0,0 +1,197 @@
+"""
+İş Parçacığı Güvenli Şifreleme Motoru (GIL'i Bırakan Çekirdekler) Testi
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Paralel çekirdekleri tek çekirdekli makinelerde de iş parçacıklarından sınamak için
+# (Numba başka bir modülce yüklendiyse ayar değiştirilemez)
+if 'numba' not in sys.modules:
+    os.environ.setdefault('NUMBA_NUM_THREADS', '4')
+
+import numpy as np
+from key_schedule import USE_NUMBA, KeyScheduleCache, get_key_schedule
+from threaded_encrypt import EncryptionEngine, encrypt_images_threaded, decrypt_images_threaded
+from encryption import encrypt_image_from_array
+from benchmark_threads import run_threads
+
+print("="*60)
+print("İş Parçacığı Güvenli Şifreleme Motoru Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+engine = EncryptionEngine(key, threads=4)
+
+
+def longest_gap(run):
+    """run() arka planda çalışırken ana iş parçacığının en uzun bekleme süresi (s)"""
+    worker = threading.Thread(target=run)
+    gap, last = 0.0, time.perf_counter()
+    worker.start()
+    while worker.is_alive():
+        now = time.perf_counter()
+        gap, last = max(gap, now - last), now
+    worker.join()
+    return gap
+
+
+# 1. Çekirdekler GIL'i bırakıyor (ana iş parçacığı çekirdek süresince çalışmaya devam eder)
+print("\n1. GIL bırakma kontrol ediliyor...")
+if not USE_NUMBA:
+    print("   ⚠️  Numba yok - GIL testi atlandı")
+else:
+    from fast_numba import fast_encrypt_fused, fast_decrypt_fused, fast_fplm_sequence
+
+    N = 1 << 25
+    flat = np.zeros(N, dtype=np.uint8)
+    perm = np.arange(N, dtype=np.int64)
+    sbox = np.arange(256, dtype=np.uint8)
+    out = np.empty_like(flat)
+    kernels = {
+        'fast_encrypt_fused': lambda: fast_encrypt_fused(flat, perm, sbox, flat, out),
+        'fast_decrypt_fused': lambda: fast_decrypt_fused(flat, perm, sbox, flat, 1, out),
+        'fast_fplm_sequence': lambda: fast_fplm_sequence(0.1, 0.2, 3.7, 0.1, 0.2, 0.3, 0.05, N),
+    }
+    held = []
+    for name, run in kernels.items():
+        run()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        gap = longest_gap(run)
+        if gap > elapsed / 2:
+            held.append(f"{name} ({gap * 1000:.0f}/{elapsed * 1000:.0f} ms)")
+
+    if not held:
+        print(f"   ✅ {len(kernels)} çekirdek çalışırken ana iş parçacığı beklemedi")
+    else:
+        print(f"   ❌ GIL'i tutan çekirdekler: {held}")
+
+# 2. Aynı anda farklı görüntüler: tek iş parçacıklı sonuçla aynı
+print("\n2. Eşzamanlı şifreleme kontrol ediliyor...")
+rng = np.random.default_rng(48)
+jobs = [rng.integers(0, 256, (61, 47), dtype=np.uint8),
+        rng.integers(0, 65536, (33, 41), dtype=np.uint16),
+        rng.integers(0, 256, (23, 19, 3), dtype=np.uint8),
+        rng.integers(0, 256, (700, 500), dtype=np.uint8)] * 4
+expected = [encrypt_image_from_array(img, key) for img in jobs]
+results = [None] * len(jobs)
+errors = []
+
+
+def work(i):
+    try:
+        engine.init_thread()
+        for _ in range(5):
+            encrypted = engine.encrypt(jobs[i])
+            results[i] = (np.array_equal(encrypted, expected[i]) and
+                          np.array_equal(engine.decrypt(encrypted), jobs[i]))
+    except Exception as exc:
+        errors.append(exc)
+
+
+workers = [threading.Thread(target=work, args=(i,)) for i in range(len(jobs))]
+for worker in workers:
+    worker.start()
+for worker in workers:
+    worker.join()
+
+if not errors and all(results):
+    print(f"   ✅ {len(jobs)} iş parçacığı: gri, uint16, renkli ve büyük görüntüler doğru")
+else:
+    print(f"   ❌ Hatalı sonuçlar: {results.count(False)}, hatalar: {errors}")
+
+# 3. encrypt_many / decrypt_many ve modül fonksiyonları
+print("\n3. Havuzlu toplu işlem kontrol ediliyor...")
+stack = rng.integers(0, 256, (6, 40, 30), dtype=np.uint8)
+encrypted_stack = engine.encrypt_many(stack)
+mixed = engine.encrypt_many(jobs[:4])
+versioned = encrypt_images_threaded(stack, key, threads=3, key_version=2)
+if (all(np.array_equal(a, encrypt_image_from_array(b, key)) for a, b in zip(encrypted_stack, stack))
+        and all(np.array_equal(a, b) for a, b in zip(mixed, expected[:4])) and
+        np.array_equal(engine.decrypt_many(encrypted_stack), stack) and
+        np.array_equal(decrypt_images_threaded(versioned, key, threads=3, key_version=2), stack) and
+        np.array_equal(versioned[0], encrypt_image_from_array(stack[0], key, key_version=2))):
+    print("   ✅ Yığın, karışık liste ve anahtar sürümü 2 doğru")
+else:
+    print("   ❌ Havuzlu toplu işlem sonucu farklı!")
+
+# int64 girdi encrypt_image_from_array() gibi uint8'e çevrilir
+wide = rng.integers(0, 256, (40, 30), dtype=np.int64)
+encrypted_wide = engine.encrypt(wide)
+if (encrypted_wide.dtype == np.uint8 and
+        np.array_equal(encrypted_wide, encrypt_image_from_array(wide, key)) and
+        np.array_equal(engine.decrypt(encrypted_wide.astype(np.int64)), wide)):
+    print("   ✅ int64 girdi tek görüntü yoluyla aynı biçimde şifreleniyor")
+else:
+    print("   ❌ int64 girdi farklı işlendi!")
+
+# 4. Aynı çizelgeyi isteyen iş parçacıkları tek üretimi bekliyor; çizelgede FPLM durumu yok
+print("\n4. Çizelge önbelleği kontrol ediliyor...")
+cache = KeyScheduleCache()
+schedules = []
+barrier = threading.Barrier(6)
+
+
+def fetch():
+    barrier.wait()
+    schedules.append(cache.get(key, (300, 300)))
+
+
+workers = [threading.Thread(target=fetch) for _ in range(6)]
+for worker in workers:
+    worker.start()
+for worker in workers:
+    worker.join()
+
+if (len(schedules) == 6 and all(s is schedules[0] for s in schedules) and cache.misses == 1
+        and get_key_schedule(key, (61, 47)).sbox.fplm is None):
+    print(f"   ✅ 6 eşzamanlı istek, tek üretim: {cache}")
+else:
+    print(f"   ❌ Çizelge birden çok kez üretildi: {cache}")
+
+# 5. İş parçacığı güvenli olmayan 'workqueue' katmanında motor çökmüyor (seri çekirdekler)
+print("\n5. workqueue katmanı kontrol ediliyor...")
+script = """
+import numpy as np
+from threaded_encrypt import EncryptionEngine
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+rng = np.random.default_rng(0)
+stack = rng.integers(0, 256, (8, 600, 600), dtype=np.uint8)
+color = list(rng.integers(0, 256, (4, 200, 150, 3), dtype=np.uint8))
+with EncryptionEngine(key, threads=4, kernel_threads=4) as engine:
+    ok = np.array_equal(engine.decrypt_many(engine.encrypt_many(stack)), stack)
+    decrypted = engine.decrypt_many(engine.encrypt_many(color))
+    ok &= all(np.array_equal(a, b) for a, b in zip(decrypted, color))
+with EncryptionEngine(key, threads=4, diffusion_version=2) as engine:
+    ok &= np.array_equal(engine.decrypt_many(engine.encrypt_many(stack)), stack)
+print(ok, engine.kernel_threads)
+"""
+environment = dict(os.environ, NUMBA_THREADING_LAYER='workqueue', NUMBA_NUM_THREADS='4',
+                   PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+result = subprocess.run([sys.executable, '-c', script], env=environment, capture_output=True,
+                        text=True)
+if not USE_NUMBA:
+    print("   ⚠️  Numba yok - workqueue testi atlandı")
+elif result.returncode == 0 and result.stdout.split() == ['True', '1']:
+    print("   ✅ 8 eşzamanlı 600x600 görüntü, renkli ve 2-D difüzyon; kernel_threads 1'e indi")
+else:
+    print(f"   ❌ Süreç çıkış kodu {result.returncode}: {result.stderr.strip()[-300:]}")
+
+# 6. Ölçekleme (gerçek çekirdek sayısına bağlı; yalnızca bilgi)
+cpus = os.cpu_count() or 1
+threads = max(2, min(4, cpus))
+print(f"\n6. 16 görüntü 512x512, 1 ve {threads} iş parçacığı ({cpus} CPU)...")
+images = rng.integers(0, 256, (16, 512, 512), dtype=np.uint8)
+engine.encrypt(images[0])
+single = run_threads(engine, images, 1)
+multi = run_threads(engine, images, threads)
+print(f"   1 iş parçacığı: {single * 1000:.1f} ms, {threads} iş parçacığı: {multi * 1000:.1f} ms "
+      f"({single / multi:.2f}x)")
+
+engine.close()
+print("\n" + "="*60)
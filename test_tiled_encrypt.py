@@ -0,0 +1,167 @@
+"""
+Döşemeli Şifreleme ve Bölge Deşifreleme Testi
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from fplm import fplm_batch_sequences
+from key_schedule import get_key_schedule
+from encryption import encrypt_image_from_array, decrypt_image
+from cipher_container import (CONTAINER_EXTENSION, check_container, create_container, read_header,
+                              write_container, decrypt_container, decrypt_container_region)
+
+print("="*60)
+print("Döşemeli Şifreleme Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+rng = np.random.default_rng(50)
+gray = rng.integers(0, 256, (300, 517), dtype=np.uint8)
+deep = rng.integers(0, 65536, (130, 97), dtype=np.uint16)
+color = rng.integers(0, 256, (70, 90, 3), dtype=np.uint8)
+
+# 1. Tersinirlik (kenar döşemeleri dahil) ve döşemesiz moddan farklılık
+print("\n1. Tersinirlik kontrol ediliyor...")
+cases = [('gri', gray, 128), ('uint16', deep, 64), ('renkli', color, 32),
+         ('tek döşeme', gray, 1024), ('1 piksel kenar', gray[:257, :129], 128)]
+failed = []
+for name, img, tile_size in cases:
+    encrypted = encrypt_image_from_array(img, key, tile_size=tile_size)
+    if (not np.array_equal(decrypt_image(encrypted, key, None, tile_size=tile_size), img) or
+            np.array_equal(encrypted, encrypt_image_from_array(img, key))):
+        failed.append(name)
+
+if not failed:
+    print(f"   ✅ {len(cases)} durumda döşemeli şifreleme tersinir ve döşemesiz moddan farklı")
+else:
+    print(f"   ❌ Hatalı durumlar: {failed}")
+
+# 2. Bölge deşifreleme kırpılmış görüntüyle aynı
+print("\n2. Bölge deşifreleme kontrol ediliyor...")
+schedule = get_key_schedule(key, gray.shape, tile_size=128)
+encrypted = schedule.encrypt(gray)
+regions = [(0, 0, 300, 517), (0, 0, 1, 1), (299, 516, 1, 1), (100, 120, 50, 300),
+           (127, 127, 2, 2), (250, 400, 50, 117)]
+regions += [(int(y), int(x), int(rng.integers(1, 300 - y + 1)), int(rng.integers(1, 517 - x + 1)))
+            for y, x in zip(rng.integers(0, 300, 10), rng.integers(0, 517, 10))]
+wrong = [r for r in regions
+         if not np.array_equal(schedule.decrypt_region(encrypted, *r),
+                               gray[r[0]:r[0] + r[2], r[1]:r[1] + r[3]])]
+
+color_schedule = get_key_schedule(key, color.shape, tile_size=32)
+color_region = color_schedule.decrypt_region(color_schedule.encrypt(color), 20, 25, 30, 40)
+color_ok = np.array_equal(color_region, color[20:50, 25:65])
+try:
+    schedule.decrypt_region(encrypted, 200, 0, 101, 10)
+    bounds_ok = False
+except ValueError:
+    bounds_ok = True
+
+if not wrong and color_ok and bounds_ok:
+    print(f"   ✅ {len(regions)} bölge ve renkli bölge doğru; görüntü dışı bölge reddedildi")
+else:
+    print(f"   ❌ Hatalı bölgeler: {wrong}, renkli: {color_ok}, sınır: {bounds_ok}")
+
+# 3. Döşemeler bağımsız: bölge dışındaki döşemeler okunmuyor, bozulma döşemede kalıyor
+print("\n3. Döşeme bağımsızlığı kontrol ediliyor...")
+damaged = encrypted.copy()
+damaged[:128, 128:256] ^= 0xFF            # (0, 1) döşemesi
+decrypted = schedule.decrypt(damaged)
+changed = decrypted != gray
+region_ok = np.array_equal(schedule.decrypt_region(damaged, 130, 0, 170, 517),
+                           gray[130:300]) and schedule.tiles_in(130, 0, 170, 517)[0] == (1, 0)
+
+flat = schedule.encrypt(np.zeros(gray.shape, dtype=np.uint8))
+tiles_differ = not np.array_equal(flat[:128, :128], flat[:128, 128:256])
+
+# Aynı boyutlu döşemelerin permütasyonları birbirinin toroidal ötelemesi değil
+first, second = schedule._permutations(
+    [key for key, _ in schedule._tile_keys([(0, 0), (1, 1)])], [(128, 128)] * 2)
+dy, dx = (second[0] // 128 - first[0] // 128) % 128, (second[0] - first[0]) % 128
+shifted = (first // 128 + dy) % 128 * 128 + (first + dx) % 128
+permutations_differ = not np.array_equal(shifted, second)
+
+# 16-bit anahtar akışı platformdan bağımsız (little-endian)
+deep_schedule = get_key_schedule(key, deep.shape, depth=16, tile_size=64)
+tile_key = deep_schedule._tile_keys([(0, 0)])[0][1]
+stream = deep_schedule._key_streams([tile_key], [64 * 64])[0]
+words = (fplm_batch_sequences([tile_key], 2)[0] * 2.0**32).astype(np.uint64)
+little_endian = stream.dtype == np.uint16 and list(stream[:4]) == [
+    words[0] & 0xFFFF, words[0] >> 16, words[1] & 0xFFFF, words[1] >> 16]
+
+if changed[:128, 128:256].any() and not changed[:, :128].any() and \
+        not changed[128:].any() and not changed[:, 256:].any() and region_ok and \
+        tiles_differ and permutations_differ and little_endian:
+    print("   ✅ Bozulma yalnızca kendi döşemesinde; döşeme permütasyonları ve akışları farklı")
+else:
+    print("   ❌ Döşemeler birbirine bağımlı!")
+
+# 4. Desteklenmeyen seçenekler reddediliyor
+print("\n4. Seçenek kontrolü...")
+rejected = 0
+for img, options in ((gray, {'diffusion_version': 2}), (gray, {'sbox_bank': 4}),
+                     (color, {'color_mode': 'channel'}), (gray, {'key_version': 2})):
+    try:
+        encrypt_image_from_array(img, key, tile_size=64, **options)
+    except ValueError:
+        rejected += 1
+if rejected == 4:
+    print("   ✅ 2-D difüzyon, S-Box bankası, kanal modu ve key_version=2 reddedildi")
+else:
+    print(f"   ❌ Reddedilen: {rejected}/4")
+
+# 5. Döşemeli kap dosyası: başlıkta döşeme boyutu, bölge memmap'ten deşifre
+print("\n5. Döşemeli kap dosyası kontrol ediliyor...")
+work = tempfile.mkdtemp()
+path = os.path.join(work, 'dosemeli' + CONTAINER_EXTENSION)
+write_container(path, encrypted, base_key=key, tile_size=128)
+plain_path = os.path.join(work, 'dosemesiz' + CONTAINER_EXTENSION)
+write_container(plain_path, encrypt_image_from_array(gray, key), base_key=key)
+header, plain_header = read_header(path), read_header(plain_path)
+
+try:
+    check_container(plain_header, key, tile_size=128)
+    mismatch = False
+except ValueError:
+    mismatch = True
+
+if (header['options']['tile_size'] == 128 and header['tile_version'] == 1 and
+        header['version'] == 2 and plain_header['version'] == 1 and
+        'tile_size' not in plain_header['options'] and mismatch and
+        np.array_equal(decrypt_container_region(path, 100, 120, 50, 300, key),
+                       gray[100:150, 120:420]) and
+        np.array_equal(decrypt_container_region(plain_path, 100, 120, 50, 300, key),
+                       gray[100:150, 120:420]) and
+        np.array_equal(decrypt_container(path, key), gray)):
+    print("   ✅ Döşeme boyutu başlıkta; bölge ve tüm görüntü kaptan deşifre edildi")
+else:
+    print(f"   ❌ Döşemeli kap hatalı: {header}")
+
+# 6. Büyük görüntüden ekran bölgesi (yalnızca bilgi)
+size = 8192
+print(f"\n6. {size}x{size} kaptan 1024x1024 bölge...")
+big_path = os.path.join(work, 'buyuk' + CONTAINER_EXTENSION)
+big = create_container(big_path, (size, size), np.uint8, base_key=key, tile_size=256)
+for y in range(0, size, 1024):
+    big[y:y + 1024] = rng.integers(0, 256, (1024, size), dtype=np.uint8)
+start = time.perf_counter()
+get_key_schedule(key, big.shape, tile_size=256).encrypt(big, out=big)
+big.flush()
+encrypt_time = time.perf_counter() - start
+del big
+
+decrypt_container_region(big_path, 0, 0, 256, 256, key)
+start = time.perf_counter()
+view = decrypt_container_region(big_path, 3000, 5000, 1024, 1024, key)
+region_time = time.perf_counter() - start
+start = time.perf_counter()
+decrypt_container(big_path, key)
+full_time = time.perf_counter() - start
+print(f"   Yerinde şifreleme: {encrypt_time:.2f} s, bölge: {region_time * 1000:.1f} ms, "
+      f"tüm görüntü: {full_time * 1000:.0f} ms ({full_time / region_time:.0f}x)")
+
+shutil.rmtree(work, ignore_errors=True)
+print("\n" + "="*60)
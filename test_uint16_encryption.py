@@ -0,0 +1,129 @@
+"""
+16-bit Derinlik (uint16) Görüntü Şifreleme Testi
+"""
+
+import os
+import tempfile
+import cv2
+import numpy as np
+from fplm import FPLM
+from encryption import (encrypt_image, encrypt_image_from_array, decrypt_image,
+                        encrypt_images_from_array, decrypt_images)
+from key_schedule import get_key_schedule, COLOR_MODES
+from security_metrics import SecurityMetrics
+
+print("="*60)
+print("16-bit Görüntü Şifreleme Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+# 1. 16-bit anahtar akışı ve S-Box
+print("\n1. 16-bit anahtar akışı ve S-Box kontrol ediliyor...")
+values = FPLM(0.123, 0.456, 3.7).generate(1000)
+stream8 = FPLM(0.123, 0.456, 3.7).get_key_stream(1000)
+stream16 = FPLM(0.123, 0.456, 3.7).get_key_stream(1000, bits=16)
+
+schedule = get_key_schedule(key, (40, 30), depth=16)
+if (stream8.dtype == np.uint8 and stream16.dtype == np.uint16 and
+        np.array_equal(stream16, (values * 65535).astype(np.int64) % 65536) and
+        schedule.key_stream.dtype == np.uint16 and
+        sorted(schedule.sbox.sbox16.tolist()) == list(range(65536))):
+    print("   ✅ Anahtar akışı uint16, piksel S-Box'ı 65536 elemanlı permütasyon")
+else:
+    print("   ❌ 16-bit anahtar akışı veya S-Box hatalı!")
+
+# 2. Gri, toplu ve renkli şifreleme
+print("\n2. Şifreleme / deşifreleme kontrol ediliyor...")
+img = np.random.randint(0, 65536, (40, 30), dtype=np.uint16)
+encrypted = encrypt_image_from_array(img, key)
+
+# 256'dan büyük değerlerin tamamı kullanılmalı (8-bit'e kesilmemeli)
+if (encrypted.dtype == np.uint16 and encrypted.max() > 255 and
+        np.array_equal(decrypt_image(encrypted, key, None), img)):
+    print("   ✅ uint16 görüntü 16-bit şifrelendi ve geri döndü")
+else:
+    print("   ❌ uint16 şifreleme hatalı!")
+
+stack = np.random.randint(0, 65536, (5, 40, 30), dtype=np.uint16)
+batch = encrypt_images_from_array(stack, key)
+if (np.array_equal(batch[3], encrypt_image_from_array(stack[3], key)) and
+        np.array_equal(decrypt_images(batch, key), stack)):
+    print("   ✅ Toplu 16-bit şifreleme tek görüntü sonucu ile aynı ve tersinir")
+else:
+    print("   ❌ Toplu 16-bit şifreleme hatalı!")
+
+color = np.random.randint(0, 65536, (20, 16, 3), dtype=np.uint16)
+color_ok = True
+for mode in COLOR_MODES:
+    encrypted = encrypt_image_from_array(color, key, color_mode=mode)
+    color_ok = color_ok and encrypted.dtype == np.uint16 and np.array_equal(
+        decrypt_image(encrypted, key, None, color_mode=mode), color)
+
+if color_ok:
+    print("   ✅ 16-bit renkli görüntüler tüm modlarda tersinir")
+else:
+    print("   ❌ 16-bit renkli şifreleme hatalı!")
+
+# 8-bit ve 16-bit aynı boyut için ayrı çizelgeler kullanmalı (depth=8 varsayılanla aynı girdi)
+if (get_key_schedule(key, (40, 30)).depth == 8 and
+        get_key_schedule(key, (40, 30), depth=16).depth == 16 and
+        get_key_schedule(key, (40, 30), depth=8) is get_key_schedule(key, (40, 30))):
+    print("   ✅ Çizelge önbelleği derinliğe göre ayrılıyor")
+else:
+    print("   ❌ Çizelge önbelleği derinlikleri karıştırıyor!")
+
+# Diğer türler (int64, float) eskisi gibi uint8'e çevrilip şifreleniyor
+small = np.random.randint(0, 256, (40, 30), dtype=np.uint8)
+coerced = [encrypt_image_from_array(small.astype(dtype), key) for dtype in (np.int64, np.float64)]
+if all(c.dtype == np.uint8 and np.array_equal(c, encrypt_image_from_array(small, key))
+       for c in coerced) and np.array_equal(
+           decrypt_image(coerced[0].astype(np.int64), key, None), small):
+    print("   ✅ int64 ve float girdiler uint8 olarak şifreleniyor")
+else:
+    print("   ❌ uint8/uint16 dışı girdiler hatalı!")
+
+# 3. Dosyadan: 16-bit PNG/TIFF kesilmeden okunuyor
+print("\n3. 16-bit dosyalar kontrol ediliyor...")
+work = tempfile.mkdtemp()
+files_ok = True
+for ext in ('.png', '.tif'):
+    path = os.path.join(work, 'derin' + ext)
+    cv2.imwrite(path, img)
+    encrypted = encrypt_image(path, key)
+    files_ok = files_ok and np.array_equal(encrypted, encrypt_image_from_array(img, key))
+    os.remove(path)
+
+if files_ok:
+    print("   ✅ encrypt_image 16-bit PNG ve TIFF dosyalarını uint16 olarak şifreliyor")
+else:
+    print("   ❌ 16-bit dosyalar kesiliyor!")
+
+# 4. 16-bit metrikler
+print("\n4. 16-bit metrikler kontrol ediliyor...")
+modified = img.copy()
+modified[0, 0] ^= 1
+enc1 = encrypt_image_from_array(img, key)
+enc2 = encrypt_image_from_array(modified, key)
+
+hist = np.bincount(enc1.ravel(), minlength=65536) / enc1.size
+hist = hist[hist > 0]
+entropy_ref = -np.sum(hist * np.log2(hist))
+uaci_ref = np.mean(np.abs(enc1.astype(np.int64) - enc2.astype(np.int64))) / 65535 * 100
+
+channels = SecurityMetrics.channel_metrics(enc1, enc2)
+metrics_ok = (abs(SecurityMetrics.entropy(enc1) - entropy_ref) < 1e-5 and
+              abs(SecurityMetrics.uaci(enc1, enc2) - uaci_ref) < 1e-9 and
+              abs(channels['entropy'][0] - entropy_ref) < 1e-9 and
+              abs(channels['uaci'][0] - uaci_ref) < 1e-9 and
+              SecurityMetrics.chi_square_test(enc1)['df'] == 65535)
+
+if metrics_ok:
+    print("   ✅ Entropi 65536 kutu, UACI 65535'e göre, chi-square df = 65535")
+else:
+    print("   ❌ 16-bit metrikler hatalı!")
+
+print(f"   Entropi: {SecurityMetrics.entropy(enc1):.4f} bit "
+      f"(en fazla log2({enc1.size}) = {np.log2(enc1.size):.4f})")
+
+print("\n" + "="*60)
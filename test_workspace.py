@@ -0,0 +1,139 @@
+"""
+Workspace, out= ve Yerinde Şifreleme Testi
+"""
+
+import tracemalloc
+import numpy as np
+import key_schedule
+from workspace import Workspace, flat_view
+from encryption import (encrypt_image_from_array, decrypt_image, encrypt_images_from_array,
+                        decrypt_images)
+
+print("="*60)
+print("Workspace ve Yerinde Şifreleme Testi")
+print("="*60)
+
+key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+
+# 1. Tampon yeniden kullanımı ve bellek sınırı
+print("\n1. Workspace tamponları kontrol ediliyor...")
+workspace = Workspace(max_bytes=3000)
+first = workspace.buffer('source', (10, 100), np.uint8)
+same = workspace.buffer('source', (10, 100), np.uint8)
+workspace.buffer('source', (10, 100), np.uint16)
+workspace.buffer('target', (10, 100), np.uint8)
+
+if (first is same and workspace.hits == 1 and workspace.misses == 3 and
+        workspace.nbytes <= 3000 and len(workspace) == 2 and
+        flat_view(first, (1000,)) is not None and flat_view(first[:, :50], (500,)) is None):
+    print(f"   ✅ Aynı (ad, boyut, dtype) aynı tampon, eski tamponlar atıldı: {workspace}")
+else:
+    print(f"   ❌ Workspace hatalı: {workspace}")
+
+# 2. out= ve yerinde şifreleme tüm modlarda aynı sonucu veriyor
+print("\n2. out= ve yerinde şifreleme kontrol ediliyor...")
+gray = np.random.randint(0, 256, (37, 29), dtype=np.uint8)
+deep = np.random.randint(0, 65536, (21, 17), dtype=np.uint16)
+color = np.random.randint(0, 256, (13, 11, 3), dtype=np.uint8)
+cases = [('gri', gray, {}), ('uint16', deep, {}), ('banka', gray, {'sbox_bank': 4}),
+         ('2-D difüzyon', gray, {'diffusion_version': 2})]
+cases += [(mode, color, {'color_mode': mode}) for mode in ('flat', 'channel', 'cross')]
+
+saved = key_schedule.USE_NUMBA
+workspace = Workspace()
+for use_numba in sorted({saved, False}, reverse=True):
+    key_schedule.USE_NUMBA = use_numba
+    failed = []
+    try:
+        for name, img, options in cases:
+            expected = encrypt_image_from_array(img, key, **options)
+            out = np.empty_like(img)
+            result = encrypt_image_from_array(img, key, out=out, workspace=workspace, **options)
+            buf = img.copy()
+            encrypt_image_from_array(buf, key, out=buf, workspace=workspace, **options)
+            ok = result is out and np.array_equal(out, expected) and np.array_equal(buf, expected)
+            decrypt_image(buf, key, None, out=buf, workspace=workspace, **options)
+            if not (ok and np.array_equal(buf, img)):
+                failed.append(name)
+    finally:
+        key_schedule.USE_NUMBA = saved
+
+    label = 'Numba' if use_numba else 'NumPy'
+    if not failed:
+        print(f"   ✅ {label}: {len(cases)} modda out= ve yerinde şifreleme/deşifreleme doğru")
+    else:
+        print(f"   ❌ {label}: hatalı modlar {failed}")
+
+# 3. Adımlı görünümler (kırpma, seyreltme, transpoz) ve adımlı out
+print("\n3. Adımlı görünümler kontrol ediliyor...")
+canvas = np.random.randint(0, 256, (200, 300), dtype=np.uint8)
+views = {'kırpma': canvas[10:47, 5:34], 'seyreltme': canvas[::4, ::6][:37, :29],
+         'transpoz': canvas[:29, :37].T}
+views_ok = True
+for name, view in views.items():
+    expected = encrypt_image_from_array(np.ascontiguousarray(view), key)
+    target = np.zeros((100, 100), dtype=np.uint8)
+    strided_out = target[3:40, 7:36]
+    encrypt_image_from_array(view, key, out=strided_out, workspace=workspace)
+    original = view.copy()
+    encrypt_image_from_array(view, key, out=view, workspace=workspace)
+    views_ok = (views_ok and np.array_equal(strided_out, expected) and
+                np.array_equal(view, expected) and target[:3].sum() == 0)
+    decrypt_image(view, key, None, out=view, workspace=workspace)
+    views_ok = views_ok and np.array_equal(view, original)
+
+stack = np.random.randint(0, 256, (4, 37, 29), dtype=np.uint8)
+expected = encrypt_images_from_array(stack, key)
+big = np.zeros((8, 37, 29), dtype=np.uint8)
+big[::2] = stack
+encrypt_images_from_array(big[::2], key, out=big[::2], workspace=workspace)
+views_ok = views_ok and np.array_equal(big[::2], expected) and not big[1::2].any()
+decrypt_images(big[::2], key, out=big[::2], workspace=workspace)
+views_ok = views_ok and np.array_equal(big[::2], stack)
+
+if views_ok:
+    print("   ✅ Kırpılmış/seyreltilmiş/transpoz görüntü ve yığın dilimi yerinde şifrelendi")
+else:
+    print("   ❌ Adımlı görünüm sonucu farklı!")
+
+# 4. Sıcak yolda ayırma yok (Numba tek geçiş: yalnızca küçük nesneler)
+print("\n4. Bellek ayırma kontrol ediliyor...")
+img = np.random.randint(0, 256, (512, 512), dtype=np.uint8)
+out = np.empty_like(img)
+encrypt_image_from_array(img, key, out=out, workspace=workspace)
+encrypt_image_from_array(out, key, out=out, workspace=workspace)
+
+peaks = {}
+for label, run in (('yeni dizi', lambda: encrypt_image_from_array(img, key)),
+                   ('out=', lambda: encrypt_image_from_array(img, key, out=out,
+                                                            workspace=workspace)),
+                   ('yerinde', lambda: encrypt_image_from_array(out, key, out=out,
+                                                                workspace=workspace))):
+    tracemalloc.start()
+    run()
+    peaks[label] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+summary = ", ".join(f"{label}: {peak / 1024:.0f} KB" for label, peak in peaks.items())
+if not key_schedule.get_key_schedule(key, img.shape).fused:
+    print(f"   ⚠️  Numba yok - yalnızca bilgi: {summary}")
+elif peaks['out='] < img.nbytes // 4 and peaks['yerinde'] < img.nbytes // 4:
+    print(f"   ✅ Görüntü boyutunda ayırma yok ({summary})")
+else:
+    print(f"   ❌ Sıcak yolda görüntü boyutunda ayırma: {summary}")
+
+# 5. Uyumsuz out reddediliyor
+print("\n5. Uyumsuz out kontrol ediliyor...")
+errors = 0
+for bad in (np.empty((37, 28), np.uint8), np.empty((37, 29), np.uint16)):
+    try:
+        encrypt_image_from_array(gray, key, out=bad)
+    except ValueError:
+        errors += 1
+
+if errors == 2:
+    print("   ✅ Yanlış boyut ve dtype reddedildi")
+else:
+    print(f"   ❌ {2 - errors} uyumsuz out kabul edildi!")
+
+print("\n" + "="*60)
@@ -0,0 +1,272 @@
+"""
+ChaosPolybius-2026 - İş Parçacığı Güvenli Şifreleme Motoru
+
+Web sunucusu gibi tek süreçte birçok iş parçacığının farklı görüntüleri
+şifrelediği durumlar için. Ağır aşamaların hepsi GIL'i bırakan Numba
+çekirdeklerinde çalışır; çizelgeler üretildikten sonra değişmez ve
+iş parçacıkları arasında paylaşılan değişken FPLM durumu yoktur. Her iş
+parçacığı kendi Workspace tamponlarını kullanır. Böylece verim iş
+parçacığı sayısıyla (çekirdek sayısına kadar) yaklaşık doğrusal artar.
+
+Kullanım:
+    engine = EncryptionEngine(base_key, threads=8)    # Ana iş parçacığında oluşturulur
+    encrypted = engine.encrypt(img)                   # Herhangi bir iş parçacığından
+    encrypted_list = engine.encrypt_many(images)      # Motorun iş parçacığı havuzunda
+
+    encrypted = encrypt_images_threaded(stack, base_key, threads=8)
+
+İşlem havuzlu sürüm için bkz. parallel_encrypt.py (piksel verisi süreçler
+arasında paylaşımlı bellekle taşınır).
+"""
+
+import contextlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from key_schedule import USE_NUMBA, image_depth, pixel_array, schedule_cache, warm_up_kernels
+from workspace import Workspace
+
+if USE_NUMBA:
+    from fast_numba import kernel_threads, parallel_threadsafe, set_kernel_threads
+
+
+class EncryptionEngine:
+    """
+    İş parçacığı güvenli şifreleme/deşifreleme motoru
+
+    Aynı motor birçok iş parçacığından aynı anda kullanılabilir. Sonuçlar
+    encrypt_image_from_array() / decrypt_image() ile bit bit aynıdır.
+    """
+
+    def __init__(self, base_key, threads=None, kernel_threads=1, cache=None, **options):
+        """
+        Args:
+        base_key : list [x0, u0, r, a, b, c, delta]
+        threads : int - encrypt_many()/decrypt_many() iş parçacığı sayısı
+                  (varsayılan: tüm çekirdekler)
+        kernel_threads : int - Motor iş parçacıklarında paralel çekirdeklerin iş parçacığı
+                         sayısı (1 = her görüntü tek çekirdekte seri çekirdeklerle; iş
+                         parçacıkları ölçeklenir). Numba'nın iş parçacığı katmanı 'workqueue'
+                         ise (tbb kurulu değil) 1'e indirilir.
+        cache : KeyScheduleCache - Çizelge önbelleği (varsayılan: modül önbelleği)
+        **options : Çizelge seçenekleri (sbox_candidates, sbox_bank, sbox_bits,
+                    diffusion_version, key_version, color_mode)
+        """
+        self.base_key = list(base_key)
+        self.threads = threads or os.cpu_count() or 1
+        self.kernel_threads = kernel_threads
+        self.cache = schedule_cache if cache is None else cache
+        self.options = dict(options)
+        self._local = threading.local()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        # Paralel çekirdeklerin iş parçacığı havuzu ana iş parçacığında başlamalı
+        warm_up_kernels()
+
+        # 'workqueue' katmanında paralel çekirdekler aynı anda tek iş parçacığından çağrılabilir
+        if USE_NUMBA and self.kernel_threads > 1 and not parallel_threadsafe():
+            self.kernel_threads = 1
+
+    def schedule(self, shape, depth=8):
+        """
+        (boyut, derinlik) çizelgesi (önbellekte yoksa bir kez üretilir)
+
+        Returns:
+        KeySchedule veya ColorKeySchedule
+        """
+        options = dict(self.options)
+        if len(shape) == 3:
+            options.setdefault('color_mode', 'flat')
+        return self.cache.get(self.base_key, shape, depth=depth, **options)
+
+    @property
+    def workspace(self):
+        """Çağıran iş parçacığına ait çalışma tamponları"""
+        workspace = getattr(self._local, 'workspace', None)
+        if workspace is None:
+            workspace = self._local.workspace = Workspace()
+        return workspace
+
+    def encrypt(self, img, out=None):
+        """
+        Görüntüyü şifrele (thread-safe)
+
+        Args:
+        img : numpy.ndarray - (H, W) gri veya (H, W, C) renkli, uint8 veya uint16
+              (diğer türler encrypt_image_from_array() gibi uint8'e çevrilir)
+        out : numpy.ndarray - Sonucun yazılacağı dizi (img olabilir: yerinde şifreleme)
+
+        Returns:
+        numpy.ndarray: Şifreli görüntü (out verilmişse out)
+        """
+        img = pixel_array(img)
+        with self._kernel_threads():
+            schedule = self.schedule(img.shape, image_depth(img))
+            return schedule.encrypt(img, out=out, workspace=self.workspace)
+
+    def decrypt(self, encrypted_img, out=None):
+        """
+        Şifreli görüntüyü deşifrele (thread-safe)
+
+        Args:
+        encrypted_img : numpy.ndarray - Şifreli görüntü (uint8/uint16 dışı türler uint8'e çevrilir)
+        out : numpy.ndarray - Sonucun yazılacağı dizi (encrypted_img olabilir)
+
+        Returns:
+        numpy.ndarray: Deşifre edilmiş görüntü (out verilmişse out)
+        """
+        encrypted_img = pixel_array(encrypted_img)
+        with self._kernel_threads():
+            schedule = self.schedule(encrypted_img.shape, image_depth(encrypted_img))
+            return schedule.decrypt(encrypted_img, out=out, workspace=self.workspace)
+
+    def _kernel_threads(self):
+        """Çağrı süresince paralel çekirdekleri kernel_threads ile sınırla (önceki ayar korunur)"""
+        if USE_NUMBA:
+            return kernel_threads(self.kernel_threads)
+        return contextlib.nullcontext()
+
+    def init_thread(self):
+        """
+        Çağıran iş parçacığını motor için ayarla (paralel çekirdekler kernel_threads ile sınırlı)
+
+        Motorun havuzu bunu kendisi çağırır. encrypt()/decrypt() sınırı her çağrıda
+        kendisi uygular; bu yalnızca iş parçacığının diğer çekirdek çağrıları için gerekir.
+        """
+        if USE_NUMBA:
+            set_kernel_threads(self.kernel_threads)
+
+    def _executor(self):
+        """encrypt_many()/decrypt_many() iş parçacığı havuzu (ilk kullanımda oluşturulur)"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.threads,
+                                                thread_name_prefix='encryption-engine',
+                                                initializer=self.init_thread)
+            return self._pool
+
+    def _map(self, method, images, out):
+        """images'ın her elemanını havuzda method ile işle (sonuç sırası korunur)"""
+        if isinstance(images, np.ndarray) and images.ndim >= 3 and out is None:
+            out = np.empty_like(images)
+        if out is None:
+            return list(self._executor().map(method, images))
+
+        def process(i):
+            method(images[i], out=out[i])
+
+        for _ in self._executor().map(process, range(len(images))):
+            pass
+        return out
+
+    def encrypt_many(self, images, out=None):
+        """
+        Görüntüleri motorun iş parçacığı havuzunda şifrele
+
+        Args:
+        images : numpy.ndarray (N, H, W) / (N, H, W, C) yığın veya görüntü listesi
+                 (boyutlar farklı olabilir)
+        out : numpy.ndarray - Yığın için sonucun yazılacağı dizi (images olabilir)
+
+        Returns:
+        numpy.ndarray (yığın) veya görüntü listesi (girdiyle aynı biçim)
+        """
+        return self._map(self.encrypt, images, out)
+
+    def decrypt_many(self, encrypted_images, out=None):
+        """
+        Şifreli görüntüleri motorun iş parçacığı havuzunda deşifrele
+
+        Args:
+        encrypted_images : numpy.ndarray yığın veya görüntü listesi
+        out : numpy.ndarray - Yığın için sonucun yazılacağı dizi (encrypted_images olabilir)
+
+        Returns:
+        numpy.ndarray (yığın) veya görüntü listesi (girdiyle aynı biçim)
+        """
+        return self._map(self.decrypt, encrypted_images, out)
+
+    def close(self):
+        """İş parçacığı havuzunu kapat"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return (f"EncryptionEngine(threads={self.threads}, kernel_threads={self.kernel_threads}, "
+                f"options={self.options})")
+
+
+def encrypt_images_threaded(images, base_key, threads=None, **options):
+    """
+    Görüntüleri tek süreçte iş parçacığı havuzunda şifrele
+
+    Her görüntü encrypt_image_from_array() sonucu ile bit bit aynıdır.
+
+    Args:
+    images : numpy.ndarray yığın veya görüntü listesi (uint8 veya uint16)
+    base_key : list - Anahtar
+    threads : int - İş parçacığı sayısı (varsayılan: tüm çekirdekler)
+    **options : Şifreleme seçenekleri (bkz. EncryptionEngine)
+
+    Returns:
+    numpy.ndarray (yığın) veya görüntü listesi (girdiyle aynı biçim)
+    """
+    with EncryptionEngine(base_key, threads=threads, **options) as engine:
+        return engine.encrypt_many(images)
+
+
+def decrypt_images_threaded(encrypted_images, base_key, threads=None, **options):
+    """
+    Şifreli görüntüleri tek süreçte iş parçacığı havuzunda deşifrele
+
+    Args:
+    encrypted_images : numpy.ndarray yığın veya görüntü listesi
+    base_key : list - Şifreleme anahtarı
+    threads : int - İş parçacığı sayısı (varsayılan: tüm çekirdekler)
+    **options : Şifrelemede kullanılan seçenekler
+
+    Returns:
+    numpy.ndarray (yığın) veya görüntü listesi (girdiyle aynı biçim)
+    """
+    with EncryptionEngine(base_key, threads=threads, **options) as engine:
+        return engine.decrypt_many(encrypted_images)
+
+
+if __name__ == "__main__":
+    # Test kodu
+    import time
+    from encryption import encrypt_image_from_array
+
+    print("="*60)
+    print("İş Parçacığı Güvenli Şifreleme Motoru Test")
+    print("="*60)
+
+    base_key = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+    stack = np.random.randint(0, 256, (32, 512, 512), dtype=np.uint8)
+    threads = os.cpu_count() or 1
+
+    with EncryptionEngine(base_key, threads=threads) as engine:
+        engine.encrypt(stack[0])
+        start = time.perf_counter()
+        encrypted = engine.encrypt_many(stack)
+        elapsed = time.perf_counter() - start
+        print(f"\n{len(stack)} kare ({stack.nbytes / 1e6:.1f} MB), {threads} iş parçacığı: "
+              f"{elapsed:.2f} s, {stack.nbytes / 1e6 / elapsed:.1f} MB/s")
+
+        decrypted = engine.decrypt_many(encrypted)
+        print(f"Deşifreleme başarılı mı? {np.array_equal(decrypted, stack)}")
+        print(f"Tek görüntü sonucu ile aynı mı? "
+              f"{np.array_equal(encrypted[5], encrypt_image_from_array(stack[5], base_key))}")
+
+    print("\n" + "="*60)
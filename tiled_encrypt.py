@@ -0,0 +1,366 @@
+"""
+ChaosPolybius-2026 - Döşemeli (Tiled) Şifreleme ve Bölge Deşifreleme
+
+Görüntüleyiciler dev bir şifreli görüntünün yalnızca ekrandaki bölgesine
+ihtiyaç duyar; normal mod ise tek permütasyon ve tek XOR zinciri nedeniyle
+her seferinde tüm görüntüyü çözer. Döşemeli modda görüntü tile_size x
+tile_size döşemelere bölünür ve her döşeme bağımsız şifrelenir:
+
+- Permütasyon: döşemeye özgü Toroidal DFS yolu; DFS'in FPLM'i döşeme
+  permütasyon alt anahtarından (stage_key ile anahtar + döşeme numarası)
+  başlar
+- S-Box: tüm döşemelerde ortak (anahtardan); blok şifrelerdeki gibi sabit
+  S-Box, döşemeler arasındaki farkı permütasyon ve anahtar akışı sağlar
+- Anahtar akışı ve XOR zinciri: döşemeye özgü; FPLM döşeme alt
+  anahtarından başlar ve her değerinden 4 byte alınır
+
+Böylece herhangi bir dikdörtgen bölge yalnızca örtüştüğü döşemeler
+okunarak deşifre edilir (np.memmap / kap dosyasında diğer döşemelerin
+sayfalarına dokunulmaz). Döşeme permütasyonları dfs_batch_indices, anahtar
+akışları fplm_batch_sequences ile toplu (Numba varsa paralel) üretilir;
+bölge süresinin çoğu döşeme DFS'lerindedir.
+
+Mod sürümlüdür (TILE_VERSION): türetme etiketleri sürümü içerir ve kap
+dosyası başlığına yazılır.
+
+Kullanım:
+    encrypted = encrypt_image_from_array(img, base_key, tile_size=256)
+    schedule = get_key_schedule(base_key, encrypted.shape, tile_size=256)
+    view = schedule.decrypt_region(encrypted, top, left, 1024, 1024)
+"""
+
+import numpy as np
+from fplm import FPLM, fplm_batch_sequences
+from toroidal_dfs import dfs_batch_indices
+from dynamic_polybius import DynamicPolybius
+from key_schedule import (DEPTH_DTYPES, USE_NUMBA, _check_out, index_dtype, inverse_xor_diffusion,
+                          sha256_key_derivation, stage_key, xor_diffusion)
+from instrumentation import stage
+
+if USE_NUMBA:
+    from fast_numba import fast_encrypt_fused, fast_decrypt_fused
+
+
+# Döşemeli mod sürümü (türetme etiketlerine ve kap başlığına girer)
+TILE_VERSION = 1
+TILE_VERSIONS = (1,)
+
+# Varsayılan döşeme kenarı (piksel): 256x256 = 64 KB (8-bit gri)
+DEFAULT_TILE_SIZE = 256
+
+# Anahtar akışları bu kadar döşeme için birlikte üretilir (float64 ara bellek sınırı)
+TILE_BATCH = 32
+
+# FPLM değeri başına anahtar akışı byte'ı ([0, 1) değerinin ilk 32 biti)
+KEYSTREAM_BYTES = 4
+
+
+class TiledKeySchedule:
+    """
+    Döşemeli mod anahtar çizelgesi (gri (H, W) veya renkli (H, W, C) 'flat')
+
+    Çizelge yalnızca ortak S-Box'ı tutar; döşeme permütasyonları ve anahtar
+    akışları her işlemde yalnızca gereken döşemeler için üretilir.
+    Üretimden sonra değişmez (iş parçacıkları arasında paylaşılabilir).
+    """
+
+    def __init__(self, base_key, shape, tile_size=DEFAULT_TILE_SIZE, color_mode='flat',
+                 sbox_candidates=1, sbox_bank=1, sbox_bits=8, depth=8, diffusion_version=1,
+                 key_version=1):
+        """
+        Args:
+        base_key : list [x0, u0, r, a, b, c, delta]
+        shape : (H, W) veya (H, W, C) görüntü boyutu
+        tile_size : int - Döşeme kenarı (piksel)
+        color_mode : Renkli görüntülerde yalnızca 'flat' (döşeme (h, w*C) olarak işlenir)
+        sbox_candidates : Anahtar-bağımlı S-Box araması aday sayısı
+        depth : Piksel derinliği, 8 (uint8) veya 16 (uint16)
+        sbox_bank, sbox_bits, diffusion_version, key_version : Döşemeli modda yalnızca
+            varsayılanlar (döşeme alt anahtarları her zaman aşama başınadır)
+        """
+        if depth not in DEPTH_DTYPES:
+            raise ValueError(f"depth: {tuple(DEPTH_DTYPES)} değerlerinden biri olmalı")
+        if int(tile_size) < 1:
+            raise ValueError("tile_size pozitif olmalı")
+        if sbox_bank != 1 or sbox_bits != 8 or diffusion_version != 1 or key_version != 1:
+            raise ValueError("Döşemeli mod yalnızca tek S-Box, diffusion_version=1 ve "
+                             "key_version=1 ile kullanılabilir")
+        if len(shape) == 3 and color_mode != 'flat':
+            raise ValueError("Döşemeli mod renkli görüntülerde yalnızca 'flat' modda "
+                             "kullanılabilir")
+        if len(shape) not in (2, 3):
+            raise ValueError(f"Görüntü (H, W) veya (H, W, C) olmalı, gelen: {tuple(shape)}")
+
+        self.base_key = list(base_key)
+        self.shape = tuple(int(v) for v in shape)
+        self.tile_size = int(tile_size)
+        self.channels = self.shape[2] if len(self.shape) == 3 else 1
+        self.depth = depth
+        self.dtype = np.dtype(DEPTH_DTYPES[depth])
+        self.tile_version = TILE_VERSION
+        H, W = self.shape[:2]
+        self.grid = (-(-H // self.tile_size), -(-W // self.tile_size))
+
+        with stage('key_derivation'):
+            self.dynamic_key = sha256_key_derivation(None, base_key)
+
+        with stage('sbox_build'):
+            fplm = FPLM(*stage_key(self.dynamic_key, 'tile_sbox', TILE_VERSION))
+            self.sbox = DynamicPolybius(fplm, candidates=sbox_candidates, bits=depth)
+            self.sbox.fplm = None
+        if depth == 16:
+            self.tile_sbox, self.tile_inverse_sbox = self.sbox.sbox16, self.sbox.inverse_sbox16
+        else:
+            self.tile_sbox, self.tile_inverse_sbox = self.sbox.sbox, self.sbox.inverse_sbox
+
+    @property
+    def nbytes(self):
+        """Çizelgenin tuttuğu tabloların toplam bellek boyutu (byte)"""
+        total = self.sbox.sbox_bank.nbytes + self.sbox.inverse_bank.nbytes
+        if self.sbox.sbox16 is not None:
+            total += self.sbox.sbox16.nbytes + self.sbox.inverse_sbox16.nbytes
+        return total
+
+    def tile_bounds(self, ty, tx):
+        """
+        Döşemenin görüntüdeki sınırları
+
+        Returns:
+        tuple: (y0, y1, x0, x1)
+        """
+        H, W = self.shape[:2]
+        y0, x0 = ty * self.tile_size, tx * self.tile_size
+        return y0, min(y0 + self.tile_size, H), x0, min(x0 + self.tile_size, W)
+
+    def tiles_in(self, top, left, height, width):
+        """
+        Bölgeyle örtüşen döşemeler
+
+        Args:
+        top, left : int - Bölgenin sol üst köşesi
+        height, width : int - Bölge boyutu
+
+        Returns:
+        list: [(ty, tx)] satır sırasıyla
+        """
+        H, W = self.shape[:2]
+        if not (0 <= top and 0 <= left and height > 0 and width > 0 and
+                top + height <= H and left + width <= W):
+            raise ValueError(f"Bölge ({top}, {left}, {height}, {width}) görüntü ({H}x{W}) dışında")
+        ts = self.tile_size
+        return [(ty, tx) for ty in range(top // ts, (top + height - 1) // ts + 1)
+                for tx in range(left // ts, (left + width - 1) // ts + 1)]
+
+    def _tile_keys(self, tiles):
+        """
+        Döşeme alt anahtarları (DFS ve anahtar akışı FPLM'leri)
+
+        Returns:
+        list: [(permütasyon alt anahtarı, anahtar akışı alt anahtarı)]
+        """
+        return [(stage_key(self.dynamic_key, f"tile_permutation,{ty},{tx}", TILE_VERSION),
+                 stage_key(self.dynamic_key, f"tile,{ty},{tx}", TILE_VERSION))
+                for ty, tx in tiles]
+
+    def _permutations(self, keys, shapes):
+        """Döşeme permütasyonları (aynı boyuttakiler tek toplu DFS çağrısında)"""
+        permutations = [None] * len(keys)
+        for h, w in set(shapes):
+            indices = [i for i, shape in enumerate(shapes) if shape == (h, w)]
+            n = h * w * self.channels
+            with stage('dfs_path', n * len(indices)):
+                batch = dfs_batch_indices([keys[i] for i in indices], h, w * self.channels,
+                                          index_dtype(n))
+            for i, permutation in zip(indices, batch):
+                permutations[i] = permutation
+        return permutations
+
+    def _key_streams(self, keys, sizes):
+        """
+        Döşeme anahtar akışları (aynı uzunluktakiler tek toplu FPLM çağrısında)
+
+        FPLM adımı başına bir byte yerine değerin ilk 32 biti (KEYSTREAM_BYTES)
+        kullanılır: bölge deşifrelemede süreyi FPLM adımları belirler.
+        """
+        streams = [None] * len(keys)
+        itemsize = self.dtype.itemsize
+        for n in set(sizes):
+            indices = [i for i, size in enumerate(sizes) if size == n]
+            with stage('keystream', n * len(indices)):
+                steps = -(-n * itemsize // KEYSTREAM_BYTES)
+                values = fplm_batch_sequences([keys[i] for i in indices], steps)
+                words = (values * 2.0**32).astype('<u4')
+                # 16-bit akış her platformda little-endian okunur (şifreli görüntü aynı kalır)
+                batch = words.view(np.uint8)[:, :n * itemsize].view(
+                    self.dtype.newbyteorder('<')).astype(self.dtype, copy=False)
+            for i, stream in zip(indices, batch):
+                streams[i] = stream
+        return streams
+
+    def _encrypt_tile(self, tile, permutation, key_stream, out):
+        """Döşemeyi (düz) permütasyon, S-Box ve XOR zinciriyle şifrele"""
+        if USE_NUMBA:
+            return fast_encrypt_fused(tile, permutation, self.tile_sbox, key_stream, out)
+        out[:] = xor_diffusion(np.take(self.tile_sbox, tile[permutation]), key_stream)
+        return out
+
+    def _decrypt_tile(self, encrypted, permutation, key_stream, out):
+        """Şifreli döşemeyi (düz) deşifrele (permütasyon scatter ile geri alınır)"""
+        if USE_NUMBA:
+            return fast_decrypt_fused(encrypted, permutation, self.tile_inverse_sbox, key_stream,
+                                      1, out)
+        substituted = inverse_xor_diffusion(encrypted, key_stream)
+        out[permutation] = np.take(self.tile_inverse_sbox, substituted)
+        return out
+
+    def _check_shape(self, img):
+        """Görüntü boyutunun çizelgeyle aynı olduğunu doğrula"""
+        if img.shape != self.shape:
+            raise ValueError(f"Görüntü boyutu {img.shape}, çizelge boyutu {self.shape} ile uyuşmuyor")
+
+    def _run(self, tiles, source, target, inverse, region, workspace):
+        """
+        Döşemeleri TILE_BATCH'lik gruplarla işle
+
+        source tüm görüntüdür; target şifrelemede tüm görüntü, deşifrelemede
+        region = (top, left) köşeli bölgedir (döşemenin yalnızca kesişimi yazılır).
+        """
+        top, left = region
+        height, width = target.shape[:2]
+        for start in range(0, len(tiles), TILE_BATCH):
+            group = tiles[start:start + TILE_BATCH]
+            bounds = [self.tile_bounds(ty, tx) for ty, tx in group]
+            keys = self._tile_keys(group)
+            shapes = [(y1 - y0, x1 - x0) for y0, y1, x0, x1 in bounds]
+            sizes = [h * w * self.channels for h, w in shapes]
+            permutations = self._permutations([key for key, _ in keys], shapes)
+            streams = self._key_streams([key for _, key in keys], sizes)
+
+            with stage('inverse_tiles' if inverse else 'tiles', sum(sizes)):
+                for (y0, y1, x0, x1), permutation, key_stream in zip(bounds, permutations,
+                                                                      streams):
+                    h, w = y1 - y0, x1 - x0
+                    block_shape = (h, w) + self.shape[2:]
+                    if workspace is not None:
+                        tile = workspace.buffer('tile', block_shape, self.dtype)
+                        result = workspace.buffer('tile_result', block_shape, self.dtype)
+                    else:
+                        tile = np.empty(block_shape, self.dtype)
+                        result = np.empty(block_shape, self.dtype)
+
+                    np.copyto(tile, source[y0:y1, x0:x1])
+                    if not inverse:
+                        self._encrypt_tile(tile.reshape(-1), permutation, key_stream,
+                                           result.reshape(-1))
+                        target[y0:y1, x0:x1] = result
+                        continue
+
+                    self._decrypt_tile(tile.reshape(-1), permutation, key_stream,
+                                       result.reshape(-1))
+                    # Döşemenin bölgeyle kesişimi
+                    iy0, iy1 = max(y0, top), min(y1, top + height)
+                    ix0, ix1 = max(x0, left), min(x1, left + width)
+                    target[iy0 - top:iy1 - top, ix0 - left:ix1 - left] = \
+                        result[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0]
+        return target
+
+    def _all_tiles(self):
+        """Tüm döşemeler, satır sırasıyla"""
+        return [(ty, tx) for ty in range(self.grid[0]) for tx in range(self.grid[1])]
+
+    def encrypt(self, img, out=None, workspace=None):
+        """
+        Görüntüyü döşeme döşeme şifrele (img ve out np.memmap olabilir)
+
+        Args:
+        img : numpy.ndarray (H, W) / (H, W, C) uint8 (depth=16 ise uint16)
+        out : numpy.ndarray - Sonucun yazılacağı dizi (img olabilir: yerinde şifreleme)
+        workspace : Workspace - Döşeme tamponları için
+
+        Returns:
+        numpy.ndarray: Şifreli görüntü (out verilmişse out)
+        """
+        self._check_shape(img)
+        _check_out(out, self.shape, self.dtype)
+        target = np.empty(self.shape, self.dtype) if out is None else out
+        return self._run(self._all_tiles(), img, target, False, (0, 0), workspace)
+
+    def decrypt(self, encrypted_img, out=None, workspace=None):
+        """
+        Şifreli görüntünün tamamını deşifrele
+
+        Args:
+        encrypted_img : numpy.ndarray - Şifreli görüntü (np.memmap olabilir)
+        out : numpy.ndarray - Sonucun yazılacağı dizi (encrypted_img olabilir)
+        workspace : Workspace - Döşeme tamponları için
+
+        Returns:
+        numpy.ndarray: Deşifre edilmiş görüntü (out verilmişse out)
+        """
+        self._check_shape(encrypted_img)
+        _check_out(out, self.shape, self.dtype)
+        target = np.empty(self.shape, self.dtype) if out is None else out
+        return self._run(self._all_tiles(), encrypted_img, target, True, (0, 0), workspace)
+
+    def decrypt_region(self, encrypted_img, top, left, height, width, out=None, workspace=None):
+        """
+        Dikdörtgen bölgeyi yalnızca örtüştüğü döşemeleri okuyarak deşifrele
+
+        Args:
+        encrypted_img : numpy.ndarray - Tüm şifreli görüntü (np.memmap / kap dosyası olabilir)
+        top, left : int - Bölgenin sol üst köşesi
+        height, width : int - Bölge boyutu
+        out : numpy.ndarray (height, width[, C]) - Sonucun yazılacağı dizi
+        workspace : Workspace - Döşeme tamponları için
+
+        Returns:
+        numpy.ndarray: Deşifre edilmiş bölge (out verilmişse out)
+        """
+        self._check_shape(encrypted_img)
+        tiles = self.tiles_in(top, left, height, width)
+        shape = (height, width) + self.shape[2:]
+        _check_out(out, shape, self.dtype)
+        target = np.empty(shape, self.dtype) if out is None else out
+        return self._run(tiles, encrypted_img, target, True, (top, left), workspace)
+
+    def __repr__(self):
+        return (f"TiledKeySchedule(shape={'x'.join(map(str, self.shape))}, "
+                f"tile_size={self.tile_size}, grid={self.grid[0]}x{self.grid[1]}, "
+                f"depth={self.depth}, tile_version={self.tile_version})")
+
+
+if __name__ == "__main__":
+    # Test kodu
+    import time
+    from encryption import encrypt_image_from_array, decrypt_image
+    from key_schedule import get_key_schedule
+
+    print("="*60)
+    print("Döşemeli Şifreleme ve Bölge Deşifreleme Test")
+    print("="*60)
+
+    base_key = [0.5, 0.3, 3.99, 0.2, 0.3, 0.4, 0.1]
+    img = np.random.randint(0, 256, (4096, 4096), dtype=np.uint8)
+
+    start = time.perf_counter()
+    encrypted = encrypt_image_from_array(img, base_key, tile_size=256)
+    print(f"\n4096x4096 döşemeli şifreleme: {time.perf_counter() - start:.2f} s")
+
+    schedule = get_key_schedule(base_key, img.shape, tile_size=256)
+    print(schedule)
+    schedule.decrypt_region(encrypted, 0, 0, 256, 256)
+
+    start = time.perf_counter()
+    view = schedule.decrypt_region(encrypted, 1000, 1500, 1024, 1024)
+    region_time = time.perf_counter() - start
+    start = time.perf_counter()
+    decrypted = decrypt_image(encrypted, base_key, None, tile_size=256)
+    full_time = time.perf_counter() - start
+
+    print(f"1024x1024 bölge: {region_time * 1000:.1f} ms "
+          f"({len(schedule.tiles_in(1000, 1500, 1024, 1024))} döşeme), "
+          f"tüm görüntü: {full_time * 1000:.1f} ms")
+    print(f"Bölge doğru mu? {np.array_equal(view, img[1000:2024, 1500:2524])}")
+    print(f"Deşifreleme başarılı mı? {np.array_equal(decrypted, img)}")
+
+    print("\n" + "="*60)
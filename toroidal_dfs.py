@@ -10,6 +10,39 @@ Rapordaki Bölüm 4.2'yi uygular.
 import numpy as np
 from fplm import FPLM
 
+# Numba hızlandırma (opsiyonel - yoksa Python DFS kullanılır)
+try:
+    from fast_numba import fast_toroidal_dfs, fast_toroidal_dfs_batch
+    USE_NUMBA = True
+except ImportError:
+    USE_NUMBA = False
+
+
+def dfs_batch_indices(params, height, width, dtype=np.int64):
+    """
+    Aynı boyutta birden çok bağımsız DFS permütasyonunu toplu (Numba varsa paralel) üret
+
+    Args:
+    params : (K, 7) array-like - her satır FPLM anahtarı [x0, u0, r, a, b, c, delta]
+    height, width : Izgara boyutu
+    dtype : İndeks dtype'ı
+
+    Returns:
+    numpy.ndarray: (K, H*W) - satır k,
+        ToroidalDFS(height, width, FPLM(*params[k])).generate_path_indices()
+    """
+    states = np.array(params, dtype=np.float64).reshape(-1, 7)
+    states[:, 0] %= 1.0
+    states[:, 1] %= 1.0
+    paths = np.empty((len(states), height * width), dtype=dtype)
+
+    if USE_NUMBA:
+        return fast_toroidal_dfs_batch(height, width, states, paths)
+
+    for k, key in enumerate(states.tolist()):
+        ToroidalDFS(height, width, FPLM(*key)).generate_path_indices(paths[k])
+    return paths
+
 
 class ToroidalDFS:
     """
@@ -148,6 +181,113 @@ class ToroidalDFS:
         
         return self.path
     
+    def path_indices(self):
+        """
+        Gezinti yolunu düzleştirilmiş (r * W + c) indekslere çevir
+        
+        Returns:
+        numpy.ndarray: (H*W,) int64 permütasyon indeksleri
+        """
+        if not self.path:
+            return np.zeros(0, dtype=np.int64)
+        
+        coords = np.asarray(self.path, dtype=np.int64)
+        return coords[:, 0] * self.W + coords[:, 1]
+    
+    def generate_path_indices(self, out=None, visited=None, stack=None):
+        """
+        Gezinti yolunu doğrudan düz indekslere üret
+        
+        generate_path() + path_indices() ile aynı sonucu verir ve FPLM'i aynı
+        adım sayısı kadar ilerletir. Numba varsa DFS derlenmiş kodda çalışır
+        ve (satır, sütun) demet listesi hiç oluşturulmaz; self.path boş kalır.
+        
+        Tamponlar verilirse (ör. diskteki np.memmap dosyaları) Numba olmadan da
+        kullanılır: bellek dışı şifrelemede H*W boyutlu hiçbir tablo RAM'de tutulmaz.
+        
+        Args:
+        out : (H*W,) tamsayı dizi - Çıktı indeksleri (varsayılan: int64)
+        visited : ((H*W + 7) // 8,) sıfırlanmış uint8 - Ziyaret bit haritası
+        stack : (3*H*W + 1,) out ile aynı dtype - DFS yığını
+        
+        Returns:
+        numpy.ndarray: (H*W,) permütasyon indeksleri (out verildiyse out)
+        """
+        N = self.H * self.W
+        if out is None:
+            out = np.empty(N, dtype=np.int64)
+        
+        if not USE_NUMBA:
+            if visited is None and stack is None:
+                self.generate_path()
+                out[:] = self.path_indices()
+            else:
+                self._buffered_dfs(out, visited, stack)
+            return out
+        
+        if visited is None:
+            visited = np.zeros((N + 7) // 8, dtype=np.uint8)
+        if stack is None:
+            # Yalnızca kullanılan sayfalar belleğe girer (pratikte ~N eleman)
+            stack = np.empty(3 * N + 1, dtype=out.dtype)
+        
+        fplm = self.fplm
+        state = np.array([fplm.x_prev, fplm.x_curr, fplm.r, fplm.a, fplm.b, fplm.c, fplm.delta],
+                         dtype=np.float64)
+        fast_toroidal_dfs(self.H, self.W, state, out, visited, stack)
+        
+        fplm.x_prev, fplm.x_curr = float(state[0]), float(state[1])
+        fplm.iteration_count += N + 1
+        self.path = []
+        
+        return out
+    
+    def _buffered_dfs(self, out, visited, stack):
+        """
+        Numba'sız DFS: generate_path() ile aynı sıra, ancak verilen tamponlarla
+
+        Ziyaret bit haritası ve yığın çağıranın tamponlarında (ör. np.memmap)
+        tutulur, indeksler doğrudan out'a yazılır; demet listesi oluşturulmaz.
+        """
+        H, W = self.H, self.W
+        N = H * W
+        if visited is None:
+            visited = np.zeros((N + 7) // 8, dtype=np.uint8)
+        if stack is None:
+            stack = np.empty(3 * N + 1, dtype=out.dtype)
+        
+        start_val = self.fplm.step()
+        start = (int(start_val * H) % H) * W + int((start_val * 1000) * W) % W
+        
+        n = 0
+        # k = 0: başlangıç noktası; k > 0: ziyaret edilmemiş kalan düğüm k - 1
+        for k in range(N + 1):
+            root = start if k == 0 else k - 1
+            if visited[root >> 3] & (1 << (root & 7)):
+                continue
+            
+            stack[0] = root
+            top = 1
+            while top > 0:
+                top -= 1
+                curr = int(stack[top])
+                if visited[curr >> 3] & (1 << (curr & 7)):
+                    continue
+                
+                visited[curr >> 3] |= 1 << (curr & 7)
+                out[n] = curr
+                n += 1
+                
+                row, col = divmod(curr, W)
+                neighbors = [((row - 1) % H) * W + col, ((row + 1) % H) * W + col,
+                             row * W + (col - 1) % W, row * W + (col + 1) % W]
+                for nbr in reversed(self.shuffle_neighbors(neighbors)):
+                    if not visited[nbr >> 3] & (1 << (nbr & 7)):
+                        stack[top] = nbr
+                        top += 1
+        
+        self.path = []
+    
     def visualize_path(self, save_path=None):
         """
         Gezinti yolunu görselleştir
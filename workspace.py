@@ -0,0 +1,156 @@
+"""
+Workspace - Yeniden Kullanılan Çalışma Tamponları
+
+Yüksek hızlı servislerde her şifreleme çağrısının görüntü boyutunda
+geçici diziler ayırıp bırakması bellek ayırıcıda çalkantıya ve sayfa
+hatalarına yol açar. Workspace, (ad, boyut, dtype) başına bir tampon
+tutar ve aynı boyuttaki sonraki çağrılarda aynı belleği verir.
+
+Kullanım:
+    from workspace import Workspace
+
+    workspace = Workspace()                 # İş parçacığı başına bir tane
+    out = np.empty_like(frames[0])
+    for img in frames:
+        encrypt_image_from_array(img, base_key, out=out, workspace=workspace)
+
+    # Yerinde şifreleme (girdi tamponu çıktı olarak da kullanılır)
+    encrypt_image_from_array(buf, base_key, out=buf, workspace=workspace)
+
+Workspace iş parçacığı güvenli değildir; her iş parçacığı kendi
+Workspace nesnesini kullanmalıdır.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Varsayılan sınır: toplam tampon boyutu (byte)
+WORKSPACE_BYTES = 256 * 1024 * 1024
+
+
+class Workspace:
+    """
+    (ad, boyut, dtype) başına yeniden kullanılan tamponlar (LRU)
+
+    Toplam boyut max_bytes'ı aşarsa en eski kullanılan tamponlar atılır
+    (en son istenen tampon her zaman tutulur).
+    """
+
+    def __init__(self, max_bytes=WORKSPACE_BYTES):
+        """
+        Args:
+        max_bytes : int - Tutulan tamponların toplam boyut sınırı (byte)
+        """
+        self.max_bytes = max_bytes
+        self._buffers = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def buffer(self, name, shape, dtype):
+        """
+        Tamponu al; yoksa oluştur
+
+        Döndürülen dizinin içeriği tanımsızdır (np.empty gibi) ve aynı
+        (ad, boyut, dtype) ile yapılan sonraki çağrıda yeniden verilir.
+
+        Args:
+        name : str - Tamponun kullanım amacı (ör. 'source', 'target')
+        shape : tuple - Dizi boyutu
+        dtype : numpy dtype
+
+        Returns:
+        numpy.ndarray: C-sıralı tampon
+        """
+        key = (name, tuple(int(v) for v in shape), np.dtype(dtype))
+        array = self._buffers.get(key)
+        if array is not None:
+            self._buffers.move_to_end(key)
+            self.hits += 1
+            return array
+
+        self.misses += 1
+        array = np.empty(key[1], dtype=key[2])
+        self._buffers[key] = array
+        self._evict()
+        return array
+
+    def _evict(self):
+        """Sınır aşıldıysa en eski tamponları at"""
+        total = self.nbytes
+        while len(self._buffers) > 1 and total > self.max_bytes:
+            _, oldest = self._buffers.popitem(last=False)
+            total -= oldest.nbytes
+
+    @property
+    def nbytes(self):
+        """Tutulan tamponların toplam boyutu (byte)"""
+        return sum(array.nbytes for array in self._buffers.values())
+
+    def clear(self):
+        """Tüm tamponları bırak"""
+        self._buffers.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def __repr__(self):
+        return (f"Workspace(buffers={len(self)}, nbytes={self.nbytes}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+
+def flat_view(array, shape):
+    """
+    Diziyi kopyalamadan yeniden boyutlandır
+
+    Args:
+    array : numpy.ndarray
+    shape : tuple - Yeni boyut
+
+    Returns:
+    numpy.ndarray veya None: Aynı belleğe bakan görünüm; bellek düzeni
+    izin vermiyorsa (ör. adımlı dilim) None
+    """
+    view = array.view()
+    try:
+        view.shape = shape
+    except AttributeError:
+        return None
+    return view
+
+
+if __name__ == "__main__":
+    import time
+    from encryption import encrypt_image_from_array, decrypt_image
+
+    print("="*60)
+    print("Workspace Test")
+    print("="*60)
+
+    key = [0.123, 0.456, 3.7, 0.1, 0.2, 0.3, 0.05]
+    workspace = Workspace()
+    img = np.random.randint(0, 256, (1024, 1024), dtype=np.uint8)
+    out = np.empty_like(img)
+    encrypt_image_from_array(img, key)
+
+    for label, run in (('yeni dizi', lambda: encrypt_image_from_array(img, key)),
+                       ('out=', lambda: encrypt_image_from_array(img, key, out=out,
+                                                                workspace=workspace)),
+                       ('yerinde', lambda: encrypt_image_from_array(out, key, out=out,
+                                                                    workspace=workspace))):
+        best = float('inf')
+        for _ in range(20):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<10} {best * 1000:.2f} ms")
+
+    buf = img.copy()
+    encrypt_image_from_array(buf, key, out=buf, workspace=workspace)
+    decrypt_image(buf, key, None, out=buf, workspace=workspace)
+    print(f"\nYerinde şifreleme + deşifreleme tersinir: {np.array_equal(buf, img)}")
+    print(workspace)
+    print("\n" + "="*60)